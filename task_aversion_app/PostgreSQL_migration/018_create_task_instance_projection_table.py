@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL Migration 018: Create task_instance_projection table
+
+Creates the typed analytics projection of task_instances (one row per instance).
+- task_instance_projection: instance_id (PK, FK to task_instances with CASCADE), user_id,
+  projection_version, resolved attribute floats, skills_improved, created_at, updated_at
+
+Rows are filled lazily: Analytics._load_instances() resolves and writes back any
+instance without a current projection, and InstanceManager refreshes the row on write.
+Idempotent: skips if the table already exists.
+
+Prerequisites:
+- Migration 003 (task_instances table) must be completed
+- DATABASE_URL must point to PostgreSQL
+"""
+import os
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_ROOT / ".env")
+    load_dotenv()
+except ImportError:
+    pass
+
+from backend.database import engine, TaskInstanceProjection
+from sqlalchemy import inspect
+
+
+def table_exists(table_name: str) -> bool:
+    """Return True if table exists."""
+    try:
+        inspector = inspect(engine)
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def migrate() -> bool:
+    """Create task_instance_projection table if it does not exist."""
+    print("=" * 70)
+    print("PostgreSQL Migration 018: Create task_instance_projection table")
+    print("=" * 70)
+    print("\nCreates: task_instance_projection (typed analytics columns per instance).")
+    print()
+
+    database_url = os.getenv("DATABASE_URL", "")
+    if not database_url:
+        print("[ERROR] DATABASE_URL is not set.")
+        return False
+    if not database_url.startswith("postgresql"):
+        print("[ERROR] This migration is for PostgreSQL only.")
+        return False
+    if not table_exists("task_instances"):
+        print("[ERROR] task_instances table does not exist. Run migration 003 first.")
+        return False
+
+    if table_exists("task_instance_projection"):
+        print("[NOTE] task_instance_projection already exists. Skipping (idempotent).")
+        return True
+
+    try:
+        print("Creating task_instance_projection table...")
+        TaskInstanceProjection.__table__.create(engine, checkfirst=True)
+        print("[OK] task_instance_projection table created.")
+
+        # Verify
+        inspector = inspect(engine)
+        required_cols = [
+            "instance_id", "user_id", "projection_version", "duration_minutes", "relief_score",
+            "expected_relief", "expected_aversion", "actual_stress", "updated_at",
+        ]
+        cols = [c["name"] for c in inspector.get_columns("task_instance_projection")]
+        missing = [c for c in required_cols if c not in cols]
+        if missing:
+            print(f"[WARNING] task_instance_projection missing columns: {missing}")
+            return False
+        print("  [OK] task_instance_projection: columns verified.")
+
+        print("\n[SUCCESS] Migration 018 complete.")
+        return True
+    except Exception as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
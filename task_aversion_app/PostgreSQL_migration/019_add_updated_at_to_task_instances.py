@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Migration 019: Add updated_at to task_instances.
+
+Adds updated_at (datetime) column set on every ORM write, plus index
+idx_taskinstance_user_updated (user_id, updated_at). Analytics uses it as the
+high-water mark for incremental refresh of its cached instances frame, and to
+detect task_instance_projection rows that are older than their instance.
+
+Idempotent: safe to run multiple times (checks for column/index first).
+Supports both PostgreSQL and SQLite (uses TIMESTAMP vs DATETIME as appropriate).
+Does not backfill existing rows; updated_at stays NULL until a row is next written.
+"""
+import os
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_ROOT / ".env")
+    load_dotenv()
+except ImportError:
+    pass
+
+from sqlalchemy import inspect, text
+from backend.database import engine
+
+
+def table_exists(table_name: str) -> bool:
+    """Return True if table exists."""
+    try:
+        inspector = inspect(engine)
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Return True if column exists on table."""
+    try:
+        inspector = inspect(engine)
+        columns = [c["name"] for c in inspector.get_columns(table_name)]
+        return column_name in columns
+    except Exception:
+        return False
+
+
+def migrate():
+    """Add updated_at (and its index) to task_instances if missing. Idempotent; no data changes."""
+    print("=" * 70)
+    print("Migration 019: Add updated_at to task_instances")
+    print("=" * 70)
+
+    database_url = os.getenv("DATABASE_URL", "")
+    if not database_url:
+        print("[ERROR] DATABASE_URL not set")
+        return False
+
+    if not table_exists("task_instances"):
+        print("[ERROR] task_instances table does not exist. Run earlier migrations first.")
+        return False
+
+    # PostgreSQL: TIMESTAMP WITHOUT TIME ZONE (nullable); SQLite: DATETIME
+    if database_url.startswith("postgresql"):
+        column_stmt = "ALTER TABLE task_instances ADD COLUMN updated_at TIMESTAMP WITHOUT TIME ZONE"
+    else:
+        column_stmt = "ALTER TABLE task_instances ADD COLUMN updated_at DATETIME"
+    # Both dialects support CREATE INDEX IF NOT EXISTS
+    index_stmt = (
+        "CREATE INDEX IF NOT EXISTS idx_taskinstance_user_updated "
+        "ON task_instances (user_id, updated_at)"
+    )
+
+    try:
+        with engine.connect() as conn:
+            if column_exists("task_instances", "updated_at"):
+                print("[OK] Column updated_at already exists. Skipping (idempotent).")
+            else:
+                conn.execute(text(column_stmt))
+                print("[OK] Column updated_at added to task_instances (existing rows unchanged, updated_at=NULL)")
+            conn.execute(text(index_stmt))
+            conn.commit()
+        print("[OK] Index idx_taskinstance_user_updated present")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
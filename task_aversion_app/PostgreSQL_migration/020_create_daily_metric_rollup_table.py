@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL Migration 020: Create daily_metric_rollup table
+
+Creates the per-user daily aggregates of per-instance analytics metrics.
+- daily_metric_rollup: id (PK), user_id (FK to users with CASCADE), date, metric_key,
+  sum, count, min, max, updated_at; unique (user_id, date, metric_key) and
+  index idx_daily_metric_rollup_user_metric_date (user_id, metric_key, date)
+
+Rows are filled lazily: Analytics rebuilds a user's rollup on the first metric
+history read that finds it missing or stale, and InstanceManager re-aggregates
+the affected days on every write to a completed instance.
+Idempotent: skips if the table already exists.
+
+Prerequisites:
+- Migration 009 (users table) must be completed
+- DATABASE_URL must point to PostgreSQL
+"""
+import os
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_ROOT / ".env")
+    load_dotenv()
+except ImportError:
+    pass
+
+from backend.database import engine, DailyMetricRollup
+from sqlalchemy import inspect
+
+
+def table_exists(table_name: str) -> bool:
+    """Return True if table exists."""
+    try:
+        inspector = inspect(engine)
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def migrate() -> bool:
+    """Create daily_metric_rollup table if it does not exist."""
+    print("=" * 70)
+    print("PostgreSQL Migration 020: Create daily_metric_rollup table")
+    print("=" * 70)
+    print("\nCreates: daily_metric_rollup (per-user daily metric aggregates).")
+    print()
+
+    database_url = os.getenv("DATABASE_URL", "")
+    if not database_url:
+        print("[ERROR] DATABASE_URL is not set.")
+        return False
+    if not database_url.startswith("postgresql"):
+        print("[ERROR] This migration is for PostgreSQL only.")
+        return False
+    if not table_exists("users"):
+        print("[ERROR] users table does not exist. Run migration 009 first.")
+        return False
+
+    if table_exists("daily_metric_rollup"):
+        print("[NOTE] daily_metric_rollup already exists. Skipping (idempotent).")
+        return True
+
+    try:
+        print("Creating daily_metric_rollup table...")
+        DailyMetricRollup.__table__.create(engine, checkfirst=True)
+        print("[OK] daily_metric_rollup table created.")
+
+        # Verify
+        inspector = inspect(engine)
+        required_cols = ["id", "user_id", "date", "metric_key", "sum", "count", "min", "max", "updated_at"]
+        cols = [c["name"] for c in inspector.get_columns("daily_metric_rollup")]
+        missing = [c for c in required_cols if c not in cols]
+        if missing:
+            print(f"[WARNING] daily_metric_rollup missing columns: {missing}")
+            return False
+        print("  [OK] daily_metric_rollup: columns verified.")
+
+        print("\n[SUCCESS] Migration 020 complete.")
+        return True
+    except Exception as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
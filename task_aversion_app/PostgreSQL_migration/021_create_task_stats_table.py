@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL Migration 021: Create task_stats table
+
+Creates the per-user, per-task statistics read by the initialize/recommend paths.
+- task_stats: (user_id, task_id) composite PK (user_id FK to users with CASCADE),
+  instance/initialized/completed counts, predicted_averages / actual_averages (JSONB),
+  avg_time_estimate, initial and baseline aversions, latest values,
+  source_updated_at, updated_at
+
+Rows are filled lazily: InstanceManager rebuilds a user's rows on the first stats
+read that finds them missing or stale, and recomputes a task's row on every
+write to one of its instances.
+Idempotent: skips if the table already exists.
+
+Prerequisites:
+- Migration 009 (users table) must be completed
+- DATABASE_URL must point to PostgreSQL
+"""
+import os
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_ROOT / ".env")
+    load_dotenv()
+except ImportError:
+    pass
+
+from backend.database import engine, TaskStats
+from sqlalchemy import inspect
+
+
+def table_exists(table_name: str) -> bool:
+    """Return True if table exists."""
+    try:
+        inspector = inspect(engine)
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def migrate() -> bool:
+    """Create task_stats table if it does not exist."""
+    print("=" * 70)
+    print("PostgreSQL Migration 021: Create task_stats table")
+    print("=" * 70)
+    print("\nCreates: task_stats (per-user, per-task statistics).")
+    print()
+
+    database_url = os.getenv("DATABASE_URL", "")
+    if not database_url:
+        print("[ERROR] DATABASE_URL is not set.")
+        return False
+    if not database_url.startswith("postgresql"):
+        print("[ERROR] This migration is for PostgreSQL only.")
+        return False
+    if not table_exists("users"):
+        print("[ERROR] users table does not exist. Run migration 009 first.")
+        return False
+
+    if table_exists("task_stats"):
+        print("[NOTE] task_stats already exists. Skipping (idempotent).")
+        return True
+
+    try:
+        print("Creating task_stats table...")
+        TaskStats.__table__.create(engine, checkfirst=True)
+        print("[OK] task_stats table created.")
+
+        # Verify
+        inspector = inspect(engine)
+        required_cols = [
+            "user_id", "task_id", "instance_count", "initialized_count", "completed_count",
+            "predicted_averages", "actual_averages", "avg_time_estimate", "initial_aversion",
+            "baseline_aversion_robust", "baseline_aversion_sensitive",
+            "last_initialized_at", "last_completed_at", "last_expected_aversion", "last_actual_relief",
+            "source_updated_at", "updated_at",
+        ]
+        cols = [c["name"] for c in inspector.get_columns("task_stats")]
+        missing = [c for c in required_cols if c not in cols]
+        if missing:
+            print(f"[WARNING] task_stats missing columns: {missing}")
+            return False
+        print("  [OK] task_stats: columns verified.")
+
+        print("\n[SUCCESS] Migration 021 complete.")
+        return True
+    except Exception as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
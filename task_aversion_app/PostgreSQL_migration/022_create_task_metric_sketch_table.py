@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL Migration 022: Create task_metric_sketch table
+
+Creates the per-user, per-task monthly quantile sketches of instance metrics.
+- task_metric_sketch: id (PK), user_id (FK to users with CASCADE), task_id, metric_key,
+  month, instance_count, sketch (JSONB), updated_at;
+  unique (user_id, task_id, metric_key, month)
+
+Rows are filled lazily: InstanceManager rebuilds a user's sketches on the first
+quantile read that finds them missing or stale, and re-sketches the affected
+months on every write to an instance.
+Idempotent: skips if the table already exists.
+
+Prerequisites:
+- Migration 009 (users table) must be completed
+- DATABASE_URL must point to PostgreSQL
+"""
+import os
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_ROOT / ".env")
+    load_dotenv()
+except ImportError:
+    pass
+
+from backend.database import engine, TaskMetricSketch
+from sqlalchemy import inspect
+
+
+def table_exists(table_name: str) -> bool:
+    """Return True if table exists."""
+    try:
+        inspector = inspect(engine)
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def migrate() -> bool:
+    """Create task_metric_sketch table if it does not exist."""
+    print("=" * 70)
+    print("PostgreSQL Migration 022: Create task_metric_sketch table")
+    print("=" * 70)
+    print("\nCreates: task_metric_sketch (per-task monthly quantile sketches).")
+    print()
+
+    database_url = os.getenv("DATABASE_URL", "")
+    if not database_url:
+        print("[ERROR] DATABASE_URL is not set.")
+        return False
+    if not database_url.startswith("postgresql"):
+        print("[ERROR] This migration is for PostgreSQL only.")
+        return False
+    if not table_exists("users"):
+        print("[ERROR] users table does not exist. Run migration 009 first.")
+        return False
+
+    if table_exists("task_metric_sketch"):
+        print("[NOTE] task_metric_sketch already exists. Skipping (idempotent).")
+        return True
+
+    try:
+        print("Creating task_metric_sketch table...")
+        TaskMetricSketch.__table__.create(engine, checkfirst=True)
+        print("[OK] task_metric_sketch table created.")
+
+        # Verify
+        inspector = inspect(engine)
+        required_cols = ["id", "user_id", "task_id", "metric_key", "month", "instance_count", "sketch", "updated_at"]
+        cols = [c["name"] for c in inspector.get_columns("task_metric_sketch")]
+        missing = [c for c in required_cols if c not in cols]
+        if missing:
+            print(f"[WARNING] task_metric_sketch missing columns: {missing}")
+            return False
+        print("  [OK] task_metric_sketch: columns verified.")
+
+        print("\n[SUCCESS] Migration 022 complete.")
+        return True
+    except Exception as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Migration 023: Add extra_preferences to user_preferences.
+
+Adds the extra_preferences JSON column (JSONB on PostgreSQL). UserStateManager
+keeps preference keys that have no column of their own there (task_horizon_days,
+recommendation_weights, milestones, ...), now that preferences are read from the
+user_preferences table instead of user_preferences.csv.
+
+Idempotent: safe to run multiple times (checks for the column first).
+Supports both PostgreSQL and SQLite. Existing rows get '{}'; users that only exist
+in user_preferences.csv are copied into the table on their first read.
+"""
+import os
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_ROOT / ".env")
+    load_dotenv()
+except ImportError:
+    pass
+
+from sqlalchemy import inspect, text
+from backend.database import engine
+
+
+def table_exists(table_name: str) -> bool:
+    """Return True if table exists."""
+    try:
+        inspector = inspect(engine)
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Return True if column exists on table."""
+    try:
+        inspector = inspect(engine)
+        columns = [c["name"] for c in inspector.get_columns(table_name)]
+        return column_name in columns
+    except Exception:
+        return False
+
+
+def migrate():
+    """Add extra_preferences to user_preferences if missing. Idempotent."""
+    print("=" * 70)
+    print("Migration 023: Add extra_preferences to user_preferences")
+    print("=" * 70)
+
+    database_url = os.getenv("DATABASE_URL", "")
+    if not database_url:
+        print("[ERROR] DATABASE_URL not set")
+        return False
+
+    if not table_exists("user_preferences"):
+        print("[ERROR] user_preferences table does not exist. Run migration 007 first.")
+        return False
+
+    # PostgreSQL: JSONB; SQLite: JSON (stored as TEXT)
+    if database_url.startswith("postgresql"):
+        column_stmt = "ALTER TABLE user_preferences ADD COLUMN extra_preferences JSONB DEFAULT '{}'::jsonb"
+    else:
+        column_stmt = "ALTER TABLE user_preferences ADD COLUMN extra_preferences JSON DEFAULT '{}'"
+
+    try:
+        with engine.connect() as conn:
+            if column_exists("user_preferences", "extra_preferences"):
+                print("[OK] Column extra_preferences already exists. Skipping (idempotent).")
+            else:
+                conn.execute(text(column_stmt))
+                conn.commit()
+                print("[OK] Column extra_preferences added to user_preferences")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
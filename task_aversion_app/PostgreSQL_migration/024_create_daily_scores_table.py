@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL Migration 024: Create daily_scores table
+
+Creates the per-user ledger of finalized daily scores.
+- daily_scores: id (PK), user_id (FK to users with CASCADE), date, score_type,
+  formula_version, score, task_count, source_updated_at, last_completed_at, computed_at;
+  unique (user_id, date, score_type, formula_version);
+  index (user_id, score_type, formula_version, score) for top-N days
+
+Rows are filled lazily: Analytics computes a closed day the first time it is
+needed (or when its completions changed) and stores it.
+Idempotent: skips if the table already exists.
+
+Prerequisites:
+- Migration 009 (users table) must be completed
+- DATABASE_URL must point to PostgreSQL
+"""
+import os
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_ROOT / ".env")
+    load_dotenv()
+except ImportError:
+    pass
+
+from backend.database import engine, DailyScore
+from sqlalchemy import inspect
+
+
+def table_exists(table_name: str) -> bool:
+    """Return True if table exists."""
+    try:
+        inspector = inspect(engine)
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def migrate() -> bool:
+    """Create daily_scores table if it does not exist."""
+    print("=" * 70)
+    print("PostgreSQL Migration 024: Create daily_scores table")
+    print("=" * 70)
+    print("\nCreates: daily_scores (per-user daily score ledger).")
+    print()
+
+    database_url = os.getenv("DATABASE_URL", "")
+    if not database_url:
+        print("[ERROR] DATABASE_URL is not set.")
+        return False
+    if not database_url.startswith("postgresql"):
+        print("[ERROR] This migration is for PostgreSQL only.")
+        return False
+    if not table_exists("users"):
+        print("[ERROR] users table does not exist. Run migration 009 first.")
+        return False
+
+    if table_exists("daily_scores"):
+        print("[NOTE] daily_scores already exists. Skipping (idempotent).")
+        return True
+
+    try:
+        print("Creating daily_scores table...")
+        DailyScore.__table__.create(engine, checkfirst=True)
+        print("[OK] daily_scores table created.")
+
+        # Verify
+        inspector = inspect(engine)
+        required_cols = [
+            "id", "user_id", "date", "score_type", "formula_version", "score",
+            "task_count", "source_updated_at", "last_completed_at", "computed_at",
+        ]
+        cols = [c["name"] for c in inspector.get_columns("daily_scores")]
+        missing = [c for c in required_cols if c not in cols]
+        if missing:
+            print(f"[WARNING] daily_scores missing columns: {missing}")
+            return False
+        print("  [OK] daily_scores: columns verified.")
+
+        print("\n[SUCCESS] Migration 024 complete.")
+        return True
+    except Exception as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Migration 025: Add execution_score to task_instances.
+
+Adds execution_score (float) and execution_score_version (string). InstanceManager
+stores an instance's execution score when it is completed, with the formula
+version it was computed with; the dashboard averages the stored scores instead of
+recomputing them (see backend/execution_score.py).
+
+Idempotent: safe to run multiple times (checks for each column first).
+Supports both PostgreSQL and SQLite. Does not backfill: existing completed rows
+keep NULL until they are scored on first read, or by
+InstanceManager.recompute_execution_scores().
+"""
+import os
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(_ROOT / ".env")
+    load_dotenv()
+except ImportError:
+    pass
+
+from sqlalchemy import inspect, text
+from backend.database import engine
+
+
+def table_exists(table_name: str) -> bool:
+    """Return True if table exists."""
+    try:
+        inspector = inspect(engine)
+        return table_name in inspector.get_table_names()
+    except Exception:
+        return False
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Return True if column exists on table."""
+    try:
+        inspector = inspect(engine)
+        columns = [c["name"] for c in inspector.get_columns(table_name)]
+        return column_name in columns
+    except Exception:
+        return False
+
+
+def migrate():
+    """Add execution_score and execution_score_version to task_instances if missing. Idempotent."""
+    print("=" * 70)
+    print("Migration 025: Add execution_score to task_instances")
+    print("=" * 70)
+
+    database_url = os.getenv("DATABASE_URL", "")
+    if not database_url:
+        print("[ERROR] DATABASE_URL not set")
+        return False
+
+    if not table_exists("task_instances"):
+        print("[ERROR] task_instances table does not exist. Run earlier migrations first.")
+        return False
+
+    # PostgreSQL: DOUBLE PRECISION / VARCHAR; SQLite: REAL / VARCHAR
+    if database_url.startswith("postgresql"):
+        columns = {
+            "execution_score": "ALTER TABLE task_instances ADD COLUMN execution_score DOUBLE PRECISION",
+            "execution_score_version": "ALTER TABLE task_instances ADD COLUMN execution_score_version VARCHAR",
+        }
+    else:
+        columns = {
+            "execution_score": "ALTER TABLE task_instances ADD COLUMN execution_score REAL",
+            "execution_score_version": "ALTER TABLE task_instances ADD COLUMN execution_score_version VARCHAR",
+        }
+
+    try:
+        with engine.connect() as conn:
+            for column, stmt in columns.items():
+                if column_exists("task_instances", column):
+                    print(f"[OK] Column {column} already exists. Skipping (idempotent).")
+                else:
+                    conn.execute(text(stmt))
+                    print(f"[OK] Column {column} added to task_instances (existing rows unchanged, NULL)")
+            conn.commit()
+        return True
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate()
+    sys.exit(0 if success else 1)
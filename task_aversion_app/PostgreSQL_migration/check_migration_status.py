@@ -428,9 +428,88 @@ def main():
     else:
         print("  [SKIP] task_instances table does not exist (run migration 003 first)")
 
+    # Check for Migration 018: task_instance_projection table
+    print("\nMigration 018: task_instance_projection table (PostgreSQL)")
+    if check_table_exists('task_instance_projection'):
+        print("  [OK] task_instance_projection table exists")
+    else:
+        print("  [MISSING] task_instance_projection table does not exist")
+        print("  -> Run: python PostgreSQL_migration/018_create_task_instance_projection_table.py")
+
+    # Check for Migration 019: updated_at on task_instances
+    print("\nMigration 019: updated_at on task_instances")
+    if check_table_exists('task_instances'):
+        inspector = inspect(engine)
+        cols = [c['name'] for c in inspector.get_columns('task_instances')]
+        if 'updated_at' in cols:
+            print("  [OK] task_instances has updated_at column")
+        else:
+            print("  [MISSING] task_instances missing updated_at column")
+            print("  -> Run: python PostgreSQL_migration/019_add_updated_at_to_task_instances.py")
+    else:
+        print("  [SKIP] task_instances table does not exist (run migration 003 first)")
+
+    # Check for Migration 020: daily_metric_rollup table
+    print("\nMigration 020: daily_metric_rollup table (PostgreSQL)")
+    if check_table_exists('daily_metric_rollup'):
+        print("  [OK] daily_metric_rollup table exists")
+    else:
+        print("  [MISSING] daily_metric_rollup table does not exist")
+        print("  -> Run: python PostgreSQL_migration/020_create_daily_metric_rollup_table.py")
+
+    # Check for Migration 021: task_stats table
+    print("\nMigration 021: task_stats table (PostgreSQL)")
+    if check_table_exists('task_stats'):
+        print("  [OK] task_stats table exists")
+    else:
+        print("  [MISSING] task_stats table does not exist")
+        print("  -> Run: python PostgreSQL_migration/021_create_task_stats_table.py")
+
+    # Check for Migration 022: task_metric_sketch table
+    print("\nMigration 022: task_metric_sketch table (PostgreSQL)")
+    if check_table_exists('task_metric_sketch'):
+        print("  [OK] task_metric_sketch table exists")
+    else:
+        print("  [MISSING] task_metric_sketch table does not exist")
+        print("  -> Run: python PostgreSQL_migration/022_create_task_metric_sketch_table.py")
+
+    # Check for Migration 023: extra_preferences on user_preferences
+    print("\nMigration 023: extra_preferences on user_preferences")
+    if check_table_exists('user_preferences'):
+        inspector = inspect(engine)
+        cols = [c['name'] for c in inspector.get_columns('user_preferences')]
+        if 'extra_preferences' in cols:
+            print("  [OK] user_preferences has extra_preferences column")
+        else:
+            print("  [MISSING] user_preferences missing extra_preferences column")
+            print("  -> Run: python PostgreSQL_migration/023_add_extra_preferences_to_user_preferences.py")
+    else:
+        print("  [SKIP] user_preferences table does not exist (run migration 007 first)")
+
+    # Check for Migration 024: daily_scores table
+    print("\nMigration 024: daily_scores table")
+    if check_table_exists('daily_scores'):
+        print("  [OK] daily_scores table exists")
+    else:
+        print("  [MISSING] daily_scores table does not exist")
+        print("  -> Run: python PostgreSQL_migration/024_create_daily_scores_table.py")
+
+    # Check for Migration 025: execution_score on task_instances
+    print("\nMigration 025: execution_score on task_instances")
+    if check_table_exists('task_instances'):
+        inspector = inspect(engine)
+        cols = [c['name'] for c in inspector.get_columns('task_instances')]
+        if 'execution_score' in cols and 'execution_score_version' in cols:
+            print("  [OK] task_instances has execution_score and execution_score_version columns")
+        else:
+            print("  [MISSING] task_instances missing execution_score/execution_score_version columns")
+            print("  -> Run: python PostgreSQL_migration/025_add_execution_score_to_task_instances.py")
+    else:
+        print("  [SKIP] task_instances table does not exist (run migration 003 first)")
+
     print()
     print("=" * 70)
-    print("\nSummary: Run migrations in order (001 through 017)")
+    print("\nSummary: Run migrations in order (001 through 025)")
     print("All migrations are idempotent - safe to run multiple times.")
     print("To reset and re-run everything: python reset_database.py")
     print("=" * 70)
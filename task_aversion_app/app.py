@@ -1,4 +1,5 @@
 # app.py
+import multiprocessing
 import os
 from pathlib import Path
 
@@ -32,6 +33,7 @@ except Exception as e:
 from backend.task_manager import TaskManager
 from backend.emotion_manager import EmotionManager
 from backend.routine_scheduler import start_scheduler
+from backend.precompute_worker import start_precompute_worker
 from backend.auth import get_current_user, oauth_callback
 
 from ui.dashboard import build_dashboard, build_dashboard_mobile_b
@@ -248,7 +250,9 @@ def _backend_label() -> str:
     return 'Database'
 
 
-if __name__ in {"__main__", "__mp_main__"}:
+# Worker processes of the analytics process pool (spawn) import this module as __mp_main__;
+# only the main process starts the server, scheduler and workers.
+if __name__ in {"__main__", "__mp_main__"} and multiprocessing.parent_process() is None:
     import os
     import sys
 
@@ -462,6 +466,19 @@ if __name__ in {"__main__", "__mp_main__"}:
 
     app.add_middleware(MigrationRedirectMiddleware)
 
+    # One data snapshot per page load: tasks, instances and popup state are loaded
+    # once and shared by every backend call of the render (backend/request_context)
+    from backend.request_context import request_data_context
+
+    class RequestDataContextMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            if request.url.path.startswith(('/static/', '/_nicegui/')):
+                return await call_next(request)
+            with request_data_context():
+                return await call_next(request)
+
+    app.add_middleware(RequestDataContextMiddleware)
+
     # Add query logging middleware (lightweight, can be disabled via env var)
     if os.getenv('ENABLE_QUERY_LOGGING', '1').lower() in ('1', 'true', 'yes'):
         try:
@@ -473,6 +490,10 @@ if __name__ in {"__main__", "__mp_main__"}:
     
     # Start routine scheduler
     start_scheduler()
+    # Start background precompute of dashboard / analytics payloads
+    start_precompute_worker()
+    from backend.analytics_pool import shutdown_analytics_pool
+    app.on_shutdown(shutdown_analytics_pool)
     host = os.getenv('NICEGUI_HOST', '127.0.0.1')  # Default to localhost, use env var in Docker
     # Storage secret for browser storage (required for OAuth session management)
     # Use environment variable or generate a default (not secure for production)
@@ -20,20 +20,43 @@ warnings.filterwarnings('ignore', message='.*A value is trying to be set on a co
 from scipy import stats
 
 from .task_schema import TASK_ATTRIBUTES, attribute_defaults
+from .bounded_cache import get_cache
+from .cache_registry import cache_registry, INSTANCES, TASKS, PRODUCTIVITY_SETTINGS, GAP_PREFERENCE
+from .request_context import memo as request_memo
+from .execution_score import EXECUTION_SCORE_VERSION
+from .csv_journal import get_csv_journal
 from .gap_detector import GapDetector
 from .user_state import UserStateManager
 from .profiling import get_profiler
+from . import recommendation_engine
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 
-# Execution Score Formula Version
-EXECUTION_SCORE_VERSION = '1.2'
+# Execution Score Formula Version: EXECUTION_SCORE_VERSION in backend/execution_score.py
+# (the score is stored per instance with its version)
 
 # Completion Efficiency Score Formula Version (renamed from Productivity Score)
 COMPLETION_EFFICIENCY_SCORE_VERSION = '1.1'
 # Backward compatibility alias
 PRODUCTIVITY_SCORE_VERSION = COMPLETION_EFFICIENCY_SCORE_VERSION
 
+# Grit Score Formula Version (stored daily grit scores are recomputed when it changes)
+GRIT_SCORE_VERSION = '1.0'
+
+# Daily averages returned by calculate_daily_scores
+DAILY_SCORE_TYPES = ('completion_efficiency_score', 'execution_score', 'grit_score', 'composite_score')
+
+# Formula versions of the rows kept in the daily_scores ledger (backend/daily_score_ledger.py).
+# completion_efficiency_total is the day total of
+# calculate_daily_completion_efficiency_score_with_idle_refresh.
+DAILY_SCORE_VERSIONS = {
+    'completion_efficiency_score': COMPLETION_EFFICIENCY_SCORE_VERSION,
+    'execution_score': EXECUTION_SCORE_VERSION,
+    'grit_score': GRIT_SCORE_VERSION,
+    'composite_score': f'{COMPLETION_EFFICIENCY_SCORE_VERSION}/{EXECUTION_SCORE_VERSION}/{GRIT_SCORE_VERSION}',
+    'completion_efficiency_total': COMPLETION_EFFICIENCY_SCORE_VERSION,
+}
+
 
 class Analytics:
     """Central analytics + lightweight recommendation helper."""
@@ -43,43 +66,87 @@ class Analytics:
     # This is acceptable since old 0-10 data was only used for a short time.
     
     # Cache for expensive operations
-    # User-specific caches: {user_id: cache_value}
-    _relief_summary_cache = {}  # {user_id: cache_value}
-    _relief_summary_cache_time = {}  # {user_id: timestamp}
-    _life_balance_cache: Dict[str, Dict[str, Any]] = {}  # {user_id: cache_value}
-    _life_balance_cache_time: Dict[str, float] = {}  # {user_id: timestamp}
-    _composite_scores_cache = {}  # {user_id: cache_value}
-    _composite_scores_cache_time = {}  # {user_id: timestamp}
+    # User-specific caches keyed by str(user_id), bounded LRU + TTL (see backend/bounded_cache.py).
+    # Entry caps bound memory by the number of users that have visited analytics pages;
+    # instances frames are also byte-bounded since they grow with each user's history.
     _cache_ttl_seconds = 300  # Cache for 5 minutes (optimized for dashboard performance)
+    _cache_max_users = 128
+    _instances_cache_max_bytes = 256 * 1024 * 1024
+    _relief_summary_cache = get_cache('analytics.relief_summary', _cache_max_users, ttl_seconds=_cache_ttl_seconds)
+    _life_balance_cache = get_cache('analytics.life_balance', _cache_max_users, ttl_seconds=_cache_ttl_seconds)
+    _composite_scores_cache = get_cache('analytics.composite_scores', _cache_max_users, ttl_seconds=_cache_ttl_seconds)
     
     # Cache for _load_instances() - separate caches for all vs completed_only, keyed by user_id
-    _instances_cache_all = {}  # {user_id: cache_value}
-    _instances_cache_all_time = {}  # {user_id: timestamp}
-    _instances_cache_completed = {}  # {user_id: cache_value}
-    _instances_cache_completed_time = {}  # {user_id: timestamp}
+    _instances_cache_all = get_cache('analytics.instances_all', _cache_max_users,
+                                     max_bytes=_instances_cache_max_bytes, ttl_seconds=_cache_ttl_seconds)
+    _instances_cache_completed = get_cache('analytics.instances_completed', _cache_max_users,
+                                           max_bytes=_instances_cache_max_bytes, ttl_seconds=_cache_ttl_seconds)
+    
+    # Projected base frames behind _load_instances() (DB path), patched with changed rows instead of
+    # reloaded. Not cleared by _invalidate_instances_cache(); a full reload happens after max age.
+    # {(user_id, completed_only): (base_df, high_water_mark, full_load_time)}
+    _instances_base_cache = get_cache('analytics.instances_base', 2 * _cache_max_users,
+                                      max_bytes=_instances_cache_max_bytes)
+    _instances_base_max_age_seconds = 3600
+    # Re-fetch window below the high-water mark (covers writes committed while the last query ran)
+    _instances_delta_overlap = timedelta(seconds=5)
     
     # Cache for get_dashboard_metrics(), keyed by user_id
-    _dashboard_metrics_cache = {}  # {user_id: cache_value}
-    _dashboard_metrics_cache_time = {}  # {user_id: timestamp}
+    _dashboard_metrics_cache = get_cache('analytics.dashboard_metrics', _cache_max_users, ttl_seconds=_cache_ttl_seconds)
     
-    # Cache for calculate_time_tracking_consistency_score(), keyed by user_id
-    _time_tracking_cache = {}  # {user_id: cache_value}
-    _time_tracking_cache_time = {}  # {user_id: timestamp}
-    _time_tracking_cache_params = {}  # {user_id: (days, target_sleep_hours)} - Store params to invalidate on param change
+    # Cache for calculate_time_tracking_consistency_score(), keyed by user_id.
+    # Value is ((days, target_sleep_hours), result) so a param change is a miss.
+    _time_tracking_cache = get_cache('analytics.time_tracking', _cache_max_users, ttl_seconds=_cache_ttl_seconds)
     
     # Cache for chart data methods, keyed by user_id
-    _trend_series_cache = {}  # {user_id: cache_value}
-    _trend_series_cache_time = {}  # {user_id: timestamp}
-    _attribute_distribution_cache = {}  # {user_id: cache_value}
-    _attribute_distribution_cache_time = {}  # {user_id: timestamp}
-    _stress_dimension_cache = {}  # {user_id: cache_value}
-    _stress_dimension_cache_time = {}  # {user_id: timestamp}
+    _trend_series_cache = get_cache('analytics.trend_series', _cache_max_users, ttl_seconds=_cache_ttl_seconds)
+    _attribute_distribution_cache = get_cache('analytics.attribute_distribution', _cache_max_users,
+                                              ttl_seconds=_cache_ttl_seconds)
+    _stress_dimension_cache = get_cache('analytics.stress_dimension', _cache_max_users, ttl_seconds=_cache_ttl_seconds)
     
     # Cache for rankings (keyed by user_id, then metric/top_n)
-    _rankings_cache = {}  # {user_id: {(metric, top_n): (result, timestamp)}}
-    _leaderboard_cache = {}  # {user_id: cache_value}
-    _leaderboard_cache_time = {}  # {user_id: timestamp}
-    _leaderboard_cache_top_n = {}  # {user_id: top_n}
+    _rankings_cache = get_cache('analytics.rankings', _cache_max_users)  # {user_id: {(metric, top_n): (result, timestamp)}}
+    # Value is (top_n, result)
+    _leaderboard_cache = get_cache('analytics.leaderboard', _cache_max_users, ttl_seconds=_cache_ttl_seconds)
+    
+    # Task x feature matrix behind the recommendations (see recommendation_engine), keyed by user_id
+    _task_features_cache = get_cache('analytics.task_features', _cache_max_users, ttl_seconds=_cache_ttl_seconds)
+    # Recommendations per user: candidate pools {(mode, filters, ...): CandidatePool} and
+    # ranked results {(mode, metrics, filters, limit, ...): [rec, ...]}, newest entries kept per user
+    _recommendation_pools_cache = get_cache('analytics.recommendation_pools', _cache_max_users,
+                                            ttl_seconds=_cache_ttl_seconds)
+    _recommendations_cache = get_cache('analytics.recommendations', _cache_max_users, ttl_seconds=_cache_ttl_seconds)
+    _recommendation_entries_per_user = 64
+    
+    # Daily history metrics get_metric_histories() derives from one completed-instances frame:
+    # metric -> daily aggregation ('mean' of per-instance values, 'sum' for time totals).
+    # Metrics not listed here and not in _COMPOSITE_HISTORY_METRICS are read from actual/predicted JSON.
+    SERIES_HISTORY_METRICS = {
+        'stress_level': 'mean',
+        'net_wellbeing': 'mean',
+        'net_wellbeing_normalized': 'mean',
+        'relief_score': 'mean',
+        'behavioral_score': 'mean',
+        'stress_efficiency': 'mean',
+        'expected_relief': 'mean',
+        'net_relief': 'mean',
+        'serendipity_factor': 'mean',
+        'disappointment_factor': 'mean',
+        'work_time': 'sum',
+        'play_time': 'sum',
+        'duration': 'mean',
+        'time_actual_minutes': 'mean',
+        'mental_energy_needed': 'mean',
+        'task_difficulty': 'mean',
+        'emotional_load': 'mean',
+        'environmental_fit': 'mean',
+        'environmental_effect': 'mean',
+    }
+    # Histories that need more than one instance per value; computed by their own methods
+    _COMPOSITE_HISTORY_METRICS = frozenset({
+        'execution_score', 'grit_score', 'sleep_score', 'thoroughness_score', 'thoroughness_factor',
+        'stress_relief_correlation_score',
+    })
     
     @staticmethod
     def calculate_difficulty_bonus(
@@ -489,6 +556,41 @@ class Analytics:
         # Clamp to 1.0 - 2.0 range (max bonus = 1.0 = 100% = 2x multiplier)
         return max(1.0, min(2.0, multiplier))
     
+    @staticmethod
+    def calculate_aversion_multipliers_batch(initial_aversion, current_aversion) -> np.ndarray:
+        """Vectorized calculate_aversion_multiplier() without stress/load inputs.
+
+        This is the optimized production version. For formula logic reference,
+        see calculate_aversion_multiplier() (difficulty bonus with load 0, improvement bonus).
+
+        Args:
+            initial_aversion: Array-like of initial aversion (0-100); NaN/None = unknown
+            current_aversion: Array-like of current aversion (0-100); NaN/None = unknown
+
+        Returns:
+            numpy array of multipliers (1.0 to 2.0)
+        """
+        initial = pd.to_numeric(pd.Series(initial_aversion, dtype=object), errors='coerce').to_numpy(dtype=float)
+        current = pd.to_numeric(pd.Series(current_aversion, dtype=object), errors='coerce').to_numpy(dtype=float)
+        current_clamped = np.clip(current, 0.0, 100.0)
+
+        # Difficulty bonus: load is 0 when no stress/mental/difficulty inputs are given
+        difficulty_bonus = np.where(
+            np.isnan(current), 0.0, np.clip(1.0 - np.exp(-(0.7 * current_clamped) / 50.0), 0.0, 1.0)
+        )
+
+        improvement = np.clip(initial, 0.0, 100.0) - current_clamped
+        with np.errstate(invalid='ignore'):
+            has_improvement = improvement > 0
+        improvement_bonus = np.where(
+            has_improvement, np.clip(1.0 - np.exp(-np.where(has_improvement, improvement, 0.0) / 30.0), 0.0, 1.0), 0.0
+        )
+
+        total_bonus = np.maximum(difficulty_bonus, improvement_bonus)
+        both = (difficulty_bonus > 0.3) & (improvement_bonus > 0.3)
+        combined_bonus = np.where(both, np.minimum(1.0, total_bonus + 0.1), total_bonus)
+        return np.clip(1.0 + combined_bonus, 1.0, 2.0)
+
     @staticmethod
     def get_task_type_multiplier(task_type: Optional[str]) -> float:
         """Get task type multiplier for points calculation.
@@ -516,6 +618,16 @@ class Analytics:
         else:
             return 1.0
     
+    @staticmethod
+    def get_task_type_multipliers_batch(task_types) -> np.ndarray:
+        """Vectorized get_task_type_multiplier() over an array-like of task types."""
+        series = pd.Series(task_types, dtype=object)
+        normalized = series.astype(str).str.strip().str.lower()
+        mults = np.ones(len(series))
+        mults[normalized.isin(['self care', 'selfcare', 'self-care']).to_numpy()] = 3.0
+        mults[(normalized == 'play').to_numpy()] = 0.5
+        return mults
+
     def calculate_completion_efficiency_score(self, row: pd.Series, self_care_tasks_per_day: Dict[str, int], weekly_avg_time: float = 0.0,
                                               work_play_time_per_day: Optional[Dict[str, Dict[str, float]]] = None,
                                               play_penalty_threshold: float = 2.0,
@@ -1024,7 +1136,8 @@ class Analytics:
         self,
         row: pd.Series,
         task_completion_counts: Dict[str, int],
-        instances_df: Optional[pd.DataFrame] = None
+        instances_df: Optional[pd.DataFrame] = None,
+        persistence_factor: Optional[float] = None
     ) -> float:
         """Calculate grit score with:
         - Persistence factor (continuing despite obstacles) - NEW in v1.2
@@ -1034,6 +1147,9 @@ class Analytics:
         
         Grit = persistence + focus + passion + time_bonus
         
+        persistence_factor: precomputed calculate_persistence_factor() value for this row
+        (e.g. from calculate_window_factors_batch); computed here when None.
+        
         Returns:
             Grit score (higher = more grit/persistence with passion), 0 on error.
         """
@@ -1097,11 +1213,12 @@ class Analytics:
             passion_factor = max(0.5, min(1.5, passion_factor))
             
             # Calculate persistence factor (continuing despite obstacles)
-            persistence_factor = self.calculate_persistence_factor(
-                row=row,
-                task_completion_counts=task_completion_counts,
-                instances_df=instances_df
-            )
+            if persistence_factor is None:
+                persistence_factor = self.calculate_persistence_factor(
+                    row=row,
+                    task_completion_counts=task_completion_counts,
+                    instances_df=instances_df
+                )
             # Returns 0.0-1.0, scale to 0.5-1.5 range to provide boost
             persistence_factor_scaled = 0.5 + persistence_factor * 1.0
             
@@ -1310,8 +1427,12 @@ class Analytics:
             )
         )
         
-        # Consistency score: use neutral 0.5 for batch (full calculation is expensive)
-        consistency_score = np.full(n, 0.5)
+        # Consistency score: 30-day same-task regularity from sorted sliding windows
+        consistency_score = self.calculate_window_factors_batch(
+            df,
+            task_completion_counts=task_completion_counts,
+            instances_df=instances_df if instances_df is not None else df
+        )['persistence_consistency']
         
         persistence_factor = (
             obstacle_score * 0.4 +
@@ -1469,7 +1590,9 @@ class Analytics:
             np.where(completion_counts <= 5, 0.5 + (completion_counts - 1) / 4.0 * 0.3,
                 np.where(completion_counts <= 10, 0.8 + (completion_counts - 5) / 5.0 * 0.2, 1.0))
         )
-        consistency_score = np.full(n, 0.5)
+        consistency_score = self.calculate_window_factors_batch(
+            completed, task_completion_counts=task_completion_counts, instances_df=df
+        )['persistence_consistency']
         persistence_factor = obstacle_score * 0.4 + aversion_score * 0.3 + repetition_score * 0.2 + consistency_score * 0.1
         persistence_factor_scaled = 0.5 + persistence_factor * 1.0
         # Per-row focus from emotion_values (positive/negative focus-related emotions)
@@ -2045,19 +2168,13 @@ class Analytics:
                 persistence_factors = (raw_multiplier * decay).clip(1.0, 5.0)
                 persistence_values = persistence_factors.tolist()
                 
-                # Perseverance factor still needs per-row calculation (calls complex method)
-                perseverance_values = []
-                for idx, row in completed.iterrows():
-                    try:
-                        persistence_factor = float(persistence_factors.loc[idx])
-                        perseverance_factor = self.calculate_perseverance_factor_v1_3(
-                            row=row,
-                            task_completion_counts=completion_counts,
-                            persistence_factor=persistence_factor
-                        )
-                        perseverance_values.append(perseverance_factor)
-                    except Exception:
-                        continue
+                # Perseverance factor for all rows at once (sorted sliding windows)
+                perseverance_values = self.calculate_window_factors_batch(
+                    completed,
+                    task_completion_counts=completion_counts,
+                    persistence_factors=persistence_factors.to_numpy(),
+                    instances_df=instances_df
+                )['perseverance_factor'].tolist()
             else:
                 perseverance_values = []
                 persistence_values = []
@@ -2740,6 +2857,28 @@ class Analytics:
         
         return is_spontaneous, max(0.0, spike_amount)
     
+    @staticmethod
+    def detect_spontaneous_aversion_batch(baseline_aversion, current_aversion) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized detect_spontaneous_aversion(). NaN/None inputs count as missing (no spike).
+
+        Returns:
+            Tuple of (is_spontaneous bool array, spike_amount array clipped at 0)
+        """
+        baseline = pd.to_numeric(pd.Series(baseline_aversion, dtype=object), errors='coerce').to_numpy(dtype=float)
+        current = pd.to_numeric(pd.Series(current_aversion, dtype=object), errors='coerce').to_numpy(dtype=float)
+        known = ~np.isnan(baseline) & ~np.isnan(current)
+        baseline = np.clip(np.where(known, baseline, 0.0), 0.0, 100.0)
+        current = np.clip(np.where(known, current, 0.0), 0.0, 100.0)
+
+        # Progressive threshold (calculate_spontaneous_aversion_threshold)
+        threshold = np.where(
+            baseline <= 25, 10.0 + baseline * 0.10,
+            np.where(baseline <= 50, 5.0 + baseline * 0.10, baseline * 0.10)
+        )
+        spike = current - baseline
+        is_spontaneous = known & (spike > threshold)
+        return is_spontaneous, np.where(known, np.maximum(0.0, spike), 0.0)
+
     @staticmethod
     def calculate_obstacles_bonus_multiplier(spike_amount: float) -> float:
         """Calculate weekly bonus multiplier based on obstacles overcome.
@@ -2961,6 +3100,13 @@ class Analytics:
         
         return False
     
+    @staticmethod
+    def _test_task_mask(task_names: pd.Series) -> pd.Series:
+        """Vectorized _is_test_task() over a Series of task names."""
+        names = task_names.where(task_names.notna(), '').astype(str).str.lower().str.strip()
+        pattern = 'test|devtest|dev test|example|fix|completion test|dev'
+        return names.str.contains(pattern, regex=True) & (names != 'nan')
+
     @staticmethod
     def calculate_obstacles_scores(
         baseline_aversion: Optional[float],
@@ -2997,6 +3143,8 @@ class Analytics:
         Returns:
             Dictionary with keys: 'expected_only', 'actual_only', 'minimum', 'average', 
             'net_penalty', 'net_bonus', 'net_weighted', each with score value
+        
+        Reference version; get_relief_summary uses calculate_obstacles_scores_batch().
         """
         is_spontaneous, spike_amount = Analytics.detect_spontaneous_aversion(
             baseline_aversion, current_aversion
@@ -3105,6 +3253,64 @@ class Analytics:
             'net_weighted': round(score_net_weighted, 2)
         }
     
+    @staticmethod
+    def calculate_obstacles_scores_batch(
+        baseline_aversion,
+        current_aversion,
+        expected_relief,
+        actual_relief
+    ) -> Dict[str, np.ndarray]:
+        """Vectorized batch calculation of obstacles overcome scores.
+
+        This is the optimized production version. For formula logic reference,
+        see calculate_obstacles_scores() which has the same calculation per row.
+        NaN/None inputs count as missing.
+
+        Returns:
+            Dict with the same keys as calculate_obstacles_scores(), each a numpy array
+        """
+        is_spontaneous, spike = Analytics.detect_spontaneous_aversion_batch(baseline_aversion, current_aversion)
+        active = is_spontaneous & (spike > 0)
+        spike = np.clip(spike, 0.0, 100.0)
+
+        expected = np.clip(pd.to_numeric(pd.Series(expected_relief, dtype=object), errors='coerce').to_numpy(dtype=float), 0.0, 100.0)
+        actual = np.clip(pd.to_numeric(pd.Series(actual_relief, dtype=object), errors='coerce').to_numpy(dtype=float), 0.0, 100.0)
+        has_expected = ~np.isnan(expected)
+        has_actual = ~np.isnan(actual)
+        has_both = has_expected & has_actual
+        net_relief = actual - expected  # NaN unless both known
+
+        def _score_with_relief(relief: np.ndarray) -> np.ndarray:
+            multiplier = 1.0 + (spike / 100.0) * (1.0 - relief / 100.0) * 9.0
+            score = (spike * multiplier) / 50.0
+            return np.where(np.isnan(relief), 0.0, score)
+
+        score_expected = _score_with_relief(expected)
+        score_actual = _score_with_relief(actual)
+        relief_min = np.where(has_both, np.fmin(expected, actual), np.where(has_expected, expected, actual))
+        score_minimum = _score_with_relief(relief_min)
+        relief_avg = np.where(has_both, (expected + actual) / 2.0, np.where(has_expected, expected, actual))
+        score_average = _score_with_relief(relief_avg)
+
+        with np.errstate(invalid='ignore'):
+            penalty = has_both & (net_relief < 0)
+            bonus = has_both & (net_relief > 0)
+        score_net_penalty = np.where(penalty, score_expected * (1.0 + (np.abs(net_relief) / 100.0) * 0.5), score_expected)
+        score_net_bonus = np.where(bonus, score_expected * (1.0 - (net_relief / 100.0) * 0.2), score_expected)
+        net_factor = np.clip(1.0 - (net_relief / 200.0), 0.5, 1.5)
+        score_net_weighted = np.where(has_both, score_expected * net_factor, score_expected)
+
+        scores = {
+            'expected_only': score_expected,
+            'actual_only': score_actual,
+            'minimum': score_minimum,
+            'average': score_average,
+            'net_penalty': score_net_penalty,
+            'net_bonus': score_net_bonus,
+            'net_weighted': score_net_weighted,
+        }
+        return {key: np.round(np.where(active, values, 0.0), 2) for key, values in scores.items()}
+
     @staticmethod
     def calculate_obstacles_score(
         baseline_aversion: Optional[float],
@@ -3178,54 +3384,16 @@ class Analytics:
     def _invalidate_instances_cache(self, user_id: Optional[int] = None):
         """Invalidate the instances cache. Call this when instances are created/updated/deleted.
         
+        Drops the user's instances frames and every cached product registered as
+        depending on instances (see _register_analytics_caches). Other users'
+        entries are kept. The projected base frames (_instances_base_cache) are
+        kept too: the next load patches them with the rows changed since their
+        high-water mark.
+        
         Args:
             user_id: Optional user_id to invalidate cache for specific user. If None, clears all user caches.
         """
-        try:
-            from backend.instrumentation import log_cache_invalidation
-            log_cache_invalidation('Analytics', '_invalidate_instances_cache', user_id=user_id)
-        except ImportError:
-            pass
-        if user_id is not None:
-            cache_key = str(user_id)
-            if cache_key in self._instances_cache_all:
-                del self._instances_cache_all[cache_key]
-            if cache_key in self._instances_cache_all_time:
-                del self._instances_cache_all_time[cache_key]
-            if cache_key in self._instances_cache_completed:
-                del self._instances_cache_completed[cache_key]
-            if cache_key in self._instances_cache_completed_time:
-                del self._instances_cache_completed_time[cache_key]
-            if cache_key in self._dashboard_metrics_cache:
-                del self._dashboard_metrics_cache[cache_key]
-            if cache_key in self._dashboard_metrics_cache_time:
-                del self._dashboard_metrics_cache_time[cache_key]
-        else:
-            # Clear all user caches
-            self._instances_cache_all.clear()
-            self._instances_cache_all_time.clear()
-            self._instances_cache_completed.clear()
-            self._instances_cache_completed_time.clear()
-            self._dashboard_metrics_cache.clear()
-            self._dashboard_metrics_cache_time.clear()
-        # Invalidate chart and ranking caches too
-        self._trend_series_cache = None
-        # Clear all user-specific caches
-        self._trend_series_cache.clear()
-        self._trend_series_cache_time.clear()
-        self._attribute_distribution_cache.clear()
-        self._attribute_distribution_cache_time.clear()
-        self._stress_dimension_cache.clear()
-        self._stress_dimension_cache_time.clear()
-        self._rankings_cache.clear()
-        self._leaderboard_cache.clear()
-        self._leaderboard_cache_time.clear()
-        self._leaderboard_cache_top_n.clear()
-        # Also invalidate relief_summary and life_balance caches since they depend on instances
-        Analytics._relief_summary_cache.clear()
-        Analytics._relief_summary_cache_time.clear()
-        Analytics._life_balance_cache.clear()
-        Analytics._life_balance_cache_time.clear()
+        cache_registry.invalidate(INSTANCES, user_id)
 
     @staticmethod
     def _invalidate_relief_summary_cache(user_id: Optional[int] = None):
@@ -3234,22 +3402,47 @@ class Analytics:
         Args:
             user_id: Optional user_id to invalidate cache for specific user. If None, clears all user caches.
         """
-        try:
-            from backend.instrumentation import log_cache_invalidation
-            log_cache_invalidation('Analytics', '_invalidate_relief_summary_cache', user_id=user_id)
-        except ImportError:
-            pass
-        if user_id is not None:
-            cache_key = str(user_id)
-            if cache_key in Analytics._relief_summary_cache:
-                del Analytics._relief_summary_cache[cache_key]
-            if cache_key in Analytics._relief_summary_cache_time:
-                del Analytics._relief_summary_cache_time[cache_key]
-        else:
-            # Clear all user caches
-            Analytics._relief_summary_cache.clear()
-            Analytics._relief_summary_cache_time.clear()
+        cache_registry.invalidate_product('analytics.relief_summary', user_id)
     
+    def _load_projected_base(self, session, user_id: int, completed_only: bool = False) -> pd.DataFrame:
+        """Return the projected instances frame for a user, refreshing it incrementally.
+
+        The first load (or one older than _instances_base_max_age_seconds) reads every
+        row. Later loads read only rows with task_instances.updated_at at or after the
+        stored high-water mark, plus the live instance_id set to drop deleted rows, and
+        patch the cached frame. Derived columns are recomputed afterwards by the caller
+        over the whole frame (vectorized; stress_efficiency is normalized frame-wide).
+
+        Args:
+            session: Open database session
+            user_id: User ID to filter by (required for data isolation)
+            completed_only: If True, only completed instances
+
+        Returns:
+            Copy of the base frame (safe to modify)
+        """
+        import time
+        from backend.instance_projection import load_instance_ids, load_projected_instances, patch_projected_frame
+
+        base_key = (str(user_id), bool(completed_only))
+        cached = Analytics._instances_base_cache.get(base_key)
+        # Mark taken before querying so writes that land during the query are re-read next time
+        mark = datetime.utcnow() - self._instances_delta_overlap
+
+        if cached is not None and (time.time() - cached[2]) < self._instances_base_max_age_seconds:
+            base, since, full_load_time = cached
+            delta = load_projected_instances(
+                session, user_id, completed_only=completed_only, changed_since=since
+            )
+            live_ids = load_instance_ids(session, user_id, completed_only=completed_only)
+            base = patch_projected_frame(base, delta, live_ids)
+        else:
+            base = load_projected_instances(session, user_id, completed_only=completed_only)
+            full_load_time = time.time()
+
+        Analytics._instances_base_cache[base_key] = (base, mark, full_load_time)
+        return base.copy()
+
     def _get_user_id(self, user_id: Optional[int] = None) -> Optional[int]:
         """Get user_id from parameter or current authenticated user.
         
@@ -3282,6 +3475,21 @@ class Analytics:
         return df_all, df_completed
 
     def _load_instances(self, completed_only: bool = False, user_id: Optional[int] = None) -> pd.DataFrame:
+        """Load instances from database or CSV (a copy, safe to modify).
+
+        Within a page render the frame is memoized per request (see
+        backend/request_context); otherwise see _load_instances_frame.
+
+        Args:
+            completed_only: If True, only load completed instances
+            user_id: User ID to filter by (required for data isolation)
+        """
+        key = 'completed' if completed_only else 'all'
+        return request_memo(
+            INSTANCES, user_id, key, lambda: self._load_instances_frame(completed_only, user_id)
+        ).copy()
+
+    def _load_instances_frame(self, completed_only: bool = False, user_id: Optional[int] = None) -> pd.DataFrame:
         """Load instances from database or CSV.
 
         Uses caching to avoid repeated database queries. Cache is TTL-based (5 minutes)
@@ -3311,13 +3519,11 @@ class Analytics:
         # Check cache first - cache is now user-specific, keyed by user_id.
         # Normalize to str so int and str same value (e.g. 1 and "1") hit the same cache.
         cache_key = str(user_id) if user_id is not None else "default"
-        current_time = time.time()
 
         if completed_only:
             # Check completed instances cache for this user
-            if (cache_key in self._instances_cache_completed and 
-                cache_key in self._instances_cache_completed_time and
-                (current_time - self._instances_cache_completed_time[cache_key]) < self._cache_ttl_seconds):
+            cached = self._instances_cache_completed.get(cache_key)
+            if cached is not None:
                 # #region agent log
                 try:
                     _dur = (_time.perf_counter() - _load_start) * 1000
@@ -3326,12 +3532,11 @@ class Analytics:
                 except Exception:
                     pass
                 # #endregion
-                return self._instances_cache_completed[cache_key].copy()
+                return cached.copy()
         else:
             # Check all instances cache for this user
-            if (cache_key in self._instances_cache_all and 
-                cache_key in self._instances_cache_all_time and
-                (current_time - self._instances_cache_all_time[cache_key]) < self._cache_ttl_seconds):
+            cached = self._instances_cache_all.get(cache_key)
+            if cached is not None:
                 # #region agent log
                 try:
                     _dur = (_time.perf_counter() - _load_start) * 1000
@@ -3340,7 +3545,7 @@ class Analytics:
                 except Exception:
                     pass
                 # #endregion
-                return self._instances_cache_all[cache_key].copy()
+                return cached.copy()
 
         # Cache miss or expired - load from database/CSV
         # #region agent log
@@ -3380,101 +3585,24 @@ class Analytics:
                 return pd.DataFrame(columns=['completed_at'])
             
             try:
-                from backend.database import get_session, TaskInstance
+                from backend.database import get_session
                 session = get_session()
                 try:
-                    # OPTIMIZATION: Only load completed instances if requested
-                    # OPTIMIZATION: Use indexed column for filtering
-                    # CRITICAL: Always include user_id filter in initial query for security and performance
-                    if completed_only:
-                        # Filter to only completed instances at database level (much faster)
-                        # Uses index on completed_at for fast filtering.
-                        # Note: Do not use completed_at != '' - invalid for PostgreSQL timestamp.
-                        query = session.query(TaskInstance).filter(
-                            TaskInstance.user_id == user_id,
-                            TaskInstance.completed_at.isnot(None)
-                        )
-                    else:
-                        query = session.query(TaskInstance).filter(
-                            TaskInstance.user_id == user_id
-                        )
-                    
-                    instances = query.all()
-                    if not instances:
+                    # Select task_instances joined with its typed projection: attribute values were
+                    # resolved from the predicted/actual JSON when InstanceManager wrote the row, so
+                    # no per-row JSON unpacking happens here.
+                    # CRITICAL: user_id filter is applied inside the query for data isolation.
+                    df = self._load_projected_base(session, user_id, completed_only)
+                    if df.empty:
                         return pd.DataFrame(columns=['completed_at'])
                     
-                    # Convert to list of dicts
-                    data = [instance.to_dict() for instance in instances]
-                    
-                    # Convert to DataFrame
-                    df = pd.DataFrame(data).fillna('')
-                    
-                    # Ensure all required columns exist
-                    attr_defaults = attribute_defaults()
-                    def _ensure_column(col: str, default):
-                        if col not in df.columns:
-                            df[col] = default
-                    
-                    for attr, default in attr_defaults.items():
-                        _ensure_column(attr, default)
-                    _ensure_column('status', 'active')
-                    _ensure_column('completed_at', '')
-                    
                     # Apply gap filtering
                     df = self._apply_gap_filtering(df)
                     
-                    # Process JSON fields (same as CSV path)
-                    def _safe_json(cell: str) -> Dict:
-                        if isinstance(cell, dict):
-                            return cell
-                        cell = cell or '{}'
-                        try:
-                            return json.loads(cell)
-                        except Exception:
-                            return {}
-                    
-                    df['predicted_dict'] = df['predicted'].apply(_safe_json) if 'predicted' in df.columns else {}
-                    df['actual_dict'] = df['actual'].apply(_safe_json) if 'actual' in df.columns else {}
-                    
-                    # Fill attribute columns from JSON payloads if CSV column empty (same logic as CSV path)
+                    # Apply attribute defaults to the resolved columns (same defaults as CSV path)
                     for attr in TASK_ATTRIBUTES:
-                        column = attr.key
-                        df[column] = df[column].replace('', pd.NA)
-                        df[column] = df[column].fillna(df['actual_dict'].apply(lambda r: r.get(column)))
-                        df[column] = df[column].fillna(df['predicted_dict'].apply(lambda r: r.get(column)))
-                        # Special handling for relief_score
-                        if column == 'relief_score':
-                            df[column] = df[column].fillna(df['actual_dict'].apply(lambda r: r.get('actual_relief')))
-                        # Handle cognitive load components
-                        if column == 'mental_energy_needed':
-                            df[column] = df[column].fillna(df['actual_dict'].apply(lambda r: r.get('actual_mental_energy') or r.get('actual_cognitive')))
-                            df[column] = df[column].fillna(df['predicted_dict'].apply(lambda r: r.get('expected_mental_energy') or r.get('expected_cognitive_load') or r.get('expected_cognitive')))
-                        if column == 'task_difficulty':
-                            df[column] = df[column].fillna(df['actual_dict'].apply(lambda r: r.get('actual_difficulty') or r.get('actual_cognitive')))
-                            df[column] = df[column].fillna(df['predicted_dict'].apply(lambda r: r.get('expected_difficulty') or r.get('expected_cognitive_load') or r.get('expected_cognitive')))
-                        if column == 'emotional_load':
-                            df[column] = df[column].fillna(df['actual_dict'].apply(lambda r: r.get('actual_emotional')))
-                            df[column] = df[column].fillna(df['predicted_dict'].apply(lambda r: r.get('expected_emotional_load') or r.get('expected_emotional')))
-                        if column == 'duration_minutes':
-                            df[column] = df[column].fillna(df['actual_dict'].apply(lambda r: r.get('time_actual_minutes')))
-                            df[column] = df[column].fillna(df['predicted_dict'].apply(lambda r: r.get('time_estimate_minutes')))
-                        df[column] = df[column].fillna(attr.default)
-                        if attr.dtype == 'numeric':
-                            df[column] = pd.to_numeric(df[column], errors='coerce')
-                            df[column] = df[column].fillna(attr.default)
-                    
-                    # Handle physical_load
-                    if 'physical_load' not in df.columns:
-                        df['physical_load'] = pd.NA
-                    df['physical_load'] = df['physical_load'].replace('', pd.NA)
-                    df['physical_load'] = df['physical_load'].fillna(df['actual_dict'].apply(lambda r: r.get('actual_physical')))
-                    df['physical_load'] = df['physical_load'].fillna(df['predicted_dict'].apply(lambda r: r.get('expected_physical_load')))
-                    df['physical_load'] = pd.to_numeric(df['physical_load'], errors='coerce')
+                        df[attr.key] = df[attr.key].fillna(attr.default)
                     df['physical_load'] = df['physical_load'].fillna(0.0)
-                    
-                    # Extract expected_aversion from JSON
-                    df['expected_aversion'] = df['predicted_dict'].apply(lambda r: r.get('expected_aversion') if isinstance(r, dict) else None)
-                    df['expected_aversion'] = pd.to_numeric(df['expected_aversion'], errors='coerce')
                     df['expected_aversion'] = df['expected_aversion'].fillna(0.0)  # Default to 0 if missing
                     
                     # Calculate derived columns (same as CSV path below)
@@ -3539,15 +3667,7 @@ class Analytics:
                                 df['stress_efficiency'] = 100.0
                         df['stress_efficiency'] = df['stress_efficiency'].round(2)
                     
-                    # Calculate expected_relief: relief predicted before task (from predicted_dict)
-                    # Vectorized extraction from predicted_dict column
-                    if 'predicted_dict' in df.columns:
-                        # Extract expected_relief directly from dict column (vectorized)
-                        df['expected_relief'] = df['predicted_dict'].apply(
-                            lambda d: d.get('expected_relief', None) if isinstance(d, dict) else None
-                        )
-                    else:
-                        df['expected_relief'] = None
+                    # expected_relief: relief predicted before task (resolved projection column, NaN if missing)
                     df['expected_relief'] = pd.to_numeric(df['expected_relief'], errors='coerce')
                     
                     # Calculate net_relief: actual relief minus expected relief
@@ -3570,11 +3690,7 @@ class Analytics:
                         df['net_emotional'] = pd.to_numeric(df['net_emotional'], errors='coerce')
                     else:
                         df['net_emotional'] = None
-                    expected_emotional_series = df['predicted_dict'].apply(
-                        lambda r: (r.get('expected_emotional_load') or r.get('expected_emotional'))
-                        if isinstance(r, dict) else None
-                    )
-                    expected_emotional_series = pd.to_numeric(expected_emotional_series, errors='coerce')
+                    expected_emotional_series = pd.to_numeric(df['expected_emotional_load'], errors='coerce')
                     missing_net_emotional = df['net_emotional'].isna()
                     if missing_net_emotional.any():
                         df.loc[missing_net_emotional, 'net_emotional'] = (
@@ -3623,10 +3739,7 @@ class Analytics:
                     df['stress_relief_correlation_score'] = correlation_raw.clip(0.0, 100.0).round(2)
                     
                     # Stress misperception: direct (actual_stress) minus derived (stress_level)
-                    actual_stress_series = df['actual_dict'].apply(
-                        lambda r: r.get('actual_stress') if isinstance(r, dict) else None
-                    )
-                    actual_stress_series = pd.to_numeric(actual_stress_series, errors='coerce')
+                    actual_stress_series = pd.to_numeric(df['actual_stress'], errors='coerce')
                     df['actual_stress'] = actual_stress_series
                     df['stress_misperception'] = np.where(
                         actual_stress_series.notna(),
@@ -3665,16 +3778,13 @@ class Analytics:
                     write_key = str(user_id) if user_id is not None else "default"
                     if completed_only:
                         self._instances_cache_completed[write_key] = df.copy()
-                        self._instances_cache_completed_time[write_key] = time.time()
                     else:
                         self._instances_cache_all[write_key] = df.copy()
-                        self._instances_cache_all_time[write_key] = time.time()
                         # Batch optimization: fill completed cache from same load so one query serves both
                         if 'completed_at' in df.columns:
                             completed_mask = df['completed_at'].replace('', pd.NA).notna()
                             if completed_mask.any():
                                 self._instances_cache_completed[write_key] = df.loc[completed_mask].copy()
-                                self._instances_cache_completed_time[write_key] = time.time()
 
                     # #region agent log
                     try:
@@ -3695,7 +3805,8 @@ class Analytics:
         if not os.path.exists(self.instances_file):
             return pd.DataFrame(columns=['completed_at'])
 
-        df = pd.read_csv(self.instances_file).fillna('')
+        # Shared in-memory table (CSV + journal, or the Arrow snapshot): no text re-parse per load
+        df = get_csv_journal(self.instances_file, ['instance_id']).read().copy()
         attr_defaults = attribute_defaults()
 
         def _ensure_column(col: str, default):
@@ -4084,11 +4195,9 @@ class Analytics:
             # Filter to completed instances for CSV path
             if 'completed_at' in df.columns:
                 df = df[df['completed_at'].astype(str).str.strip() != '']
-            self._instances_cache_completed = df.copy()
-            self._instances_cache_completed_time = time.time()
+            self._instances_cache_completed[cache_key] = df.copy()
         else:
-            self._instances_cache_all = df.copy()
-            self._instances_cache_all_time = time.time()
+            self._instances_cache_all[cache_key] = df.copy()
         
         return df
 
@@ -4593,18 +4702,16 @@ class Analytics:
         
         # Check cache first (always cache full result, then filter if needed)
         # Cache is now user-specific, keyed by user_id. Normalize to str for consistent hits.
-        current_time = time.time()
         cache_key = str(user_id) if user_id is not None else "default"
-        if (cache_key in self._dashboard_metrics_cache and 
-            cache_key in self._dashboard_metrics_cache_time and
-            (current_time - self._dashboard_metrics_cache_time[cache_key]) < self._cache_ttl_seconds):
+        cached = self._dashboard_metrics_cache.get(cache_key)
+        if cached is not None:
             # Cache hit - filter if specific metrics requested and return (avoids slow recalc on VPS)
             if metrics is not None:
                 requested_metrics = self._expand_metric_dependencies(metrics)
                 def needs_metric(key: str) -> bool:
                     return key in requested_metrics
 
-                cached_data = self._dashboard_metrics_cache[cache_key]
+                cached_data = cached
                 filtered_result = {}
                 if 'counts' in cached_data:
                     filtered_result['counts'] = {
@@ -4640,7 +4747,7 @@ class Analytics:
                 # No filtering needed, return cached full result
                 duration = (time.perf_counter() - start) * 1000
                 print(f"[Analytics] get_dashboard_metrics (cached): {duration:.2f}ms")
-                return self._dashboard_metrics_cache[cache_key].copy()
+                return cached.copy()
         
         # Determine which metrics to calculate
         if metrics is not None:
@@ -5085,7 +5192,6 @@ class Analytics:
             import time
             write_key = str(user_id) if user_id is not None else "default"
             self._dashboard_metrics_cache[write_key] = result.copy()
-            self._dashboard_metrics_cache_time[write_key] = time.time()
         
         duration = (time.perf_counter() - start) * 1000
         print(f"[Analytics] get_dashboard_metrics: {duration:.2f}ms")
@@ -5112,11 +5218,9 @@ class Analytics:
         user_id = self._get_user_id(user_id)
         import time as time_module
         cache_key = str(user_id) if user_id is not None else "default"
-        current_time = time_module.time()
-        if (cache_key in Analytics._life_balance_cache and
-                cache_key in Analytics._life_balance_cache_time and
-                (current_time - Analytics._life_balance_cache_time[cache_key]) < self._cache_ttl_seconds):
-            return Analytics._life_balance_cache[cache_key]
+        cached = Analytics._life_balance_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         empty_result = {
             'work_count': 0,
@@ -5186,7 +5290,6 @@ class Analytics:
             'work_play_ratio': round(work_play_ratio, 3),
         }
         Analytics._life_balance_cache[cache_key] = result
-        Analytics._life_balance_cache_time[cache_key] = time_module.time()
         return result
 
     def get_target_sleep_hours(self, user_id: Optional[int] = None) -> float:
@@ -5753,17 +5856,13 @@ class Analytics:
         user_id = self._get_user_id(user_id)
         
         # Check cache (keyed by user_id and parameters)
-        cache_key = user_id if user_id is not None else "default"
+        cache_key = str(user_id) if user_id is not None else "default"
         params_key = (days, target_sleep_hours)
-        current_time = time.time()
-        if (cache_key in self._time_tracking_cache and 
-            cache_key in self._time_tracking_cache_time and
-            cache_key in self._time_tracking_cache_params and
-            self._time_tracking_cache_params[cache_key] == params_key and
-            (current_time - self._time_tracking_cache_time[cache_key]) < self._cache_ttl_seconds):
+        cached = self._time_tracking_cache.get(cache_key)
+        if cached is not None and cached[0] == params_key:
             duration = (time.perf_counter() - start) * 1000
             print(f"[Analytics] calculate_time_tracking_consistency_score (cached): {duration:.2f}ms")
-            return self._time_tracking_cache[cache_key].copy()
+            return cached[1].copy()
         if instances_df is not None:
             df = instances_df
         else:
@@ -5938,9 +6037,7 @@ class Analytics:
         }
         
         # Store in cache
-        self._time_tracking_cache[cache_key] = result.copy()
-        self._time_tracking_cache_time[cache_key] = time.time()
-        self._time_tracking_cache_params[cache_key] = params_key
+        self._time_tracking_cache[cache_key] = (params_key, result.copy())
         
         duration = (time.perf_counter() - start) * 1000
         print(f"[Analytics] calculate_time_tracking_consistency_score: {duration:.2f}ms")
@@ -6129,14 +6226,12 @@ class Analytics:
 
         # Check cache (only if calculating all metrics and not using pre-fetched data)
         if requested_metrics is None and not use_prefetched:
-            current_time = time_module.time()
             cache_key = str(user_id) if user_id is not None else "default"
-            if (cache_key in Analytics._composite_scores_cache and
-                cache_key in Analytics._composite_scores_cache_time and
-                (current_time - Analytics._composite_scores_cache_time[cache_key]) < Analytics._cache_ttl_seconds):
+            cached = Analytics._composite_scores_cache.get(cache_key)
+            if cached is not None:
                 duration = (time_module.perf_counter() - start) * 1000
                 print(f"[Analytics] get_all_scores_for_composite (cached): {duration:.2f}ms")
-                return Analytics._composite_scores_cache[cache_key].copy()
+                return cached.copy()
 
         scores = {}
 
@@ -6213,269 +6308,74 @@ class Analytics:
                 avg_self_care = float(counts.get('avg_daily_self_care_tasks', 0.0))
                 scores['self_care_frequency'] = min(100.0, avg_self_care * 20.0)  # 5 tasks = 100 score
         
-        # Execution score (average of recent completed instances)
-        # NOTE: Execution score is calculated separately in chunks by the dashboard
-        # to allow UI to remain responsive. Use get_execution_score_chunked() instead.
+        # Execution score (average of the stored scores of recent completed instances)
         if needs_metric('execution_score'):
-            scores['execution_score'] = 50.0  # Placeholder - will be updated by chunked calculation
+            scores['execution_score'] = self.get_recent_execution_score(user_id=user_id)
         
         # Cache the result (only if calculating all metrics)
         # Cache is now user-specific, keyed by user_id. Normalize to str for consistent hits.
         if requested_metrics is None:
             cache_key = str(user_id) if user_id is not None else "default"
             Analytics._composite_scores_cache[cache_key] = scores.copy()
-            Analytics._composite_scores_cache_time[cache_key] = time_module.time()
         
         duration = (time_module.perf_counter() - start) * 1000
         print(f"[Analytics] get_all_scores_for_composite: {duration:.2f}ms")
         return scores
     
-    def get_execution_score_chunked(self, state: Dict[str, any], batch_size: int = 5, user_id: str = "default", persist: bool = True) -> Dict[str, any]:
-        """Calculate execution score in chunks to allow UI to remain responsive.
+    def get_recent_execution_score(self, user_id: Optional[int] = None, limit: int = 50) -> float:
+        """Average execution score of the user's most recently completed instances.
         
-        Normalizes user_id: "default" and "default_user" are treated as the same for
-        persistence and instance loading (both mean unauthenticated/current user).
-        
-        This method processes instances in small batches, allowing the UI to respond
-        between batches. State is preserved between calls and can persist across page refreshes.
+        Scores are stored per instance at completion (task_instances.execution_score,
+        see backend/execution_score.py), so this is one indexed query; rows not yet
+        scored with EXECUTION_SCORE_VERSION are computed and stored first. With the
+        CSV backend the scores are computed from the instances frame.
         
         Args:
-            state: Dictionary containing:
-                - 'instances': List of instances to process (set on first call or loaded from persistence)
-                - 'current_index': Current index in instances list (0 on first call or loaded from persistence)
-                - 'execution_scores': List of calculated scores (empty on first call or loaded from persistence)
-                - 'completed': Whether all instances have been processed
-            batch_size: Number of instances to process per chunk (default 5)
-            user_id: User ID for persistence (default "default")
-            persist: Whether to save state to user_state (default True)
+            user_id: User ID (None = authenticated user)
+            limit: Number of recent completed instances to average (default 50)
             
         Returns:
-            Updated state dictionary with:
-                - 'completed': True if all instances processed, False otherwise
-                - 'avg_execution_score': Average score if completed, None otherwise
+            Average execution score (0-100); NEUTRAL_EXECUTION_SCORE (50.0) without completions
         """
-        import time as time_module
-        from .user_state import UserStateManager
-        
-        # Normalize default/default_user for persistence and instance loading
-        persist_key = "default" if user_id in ("default", "default_user") else user_id
-        
-        # Try to load persisted state if state is empty
-        if not state or 'instances' not in state or state.get('instances') is None:
-            if persist:
-                user_state = UserStateManager()
-                persisted = user_state.get_execution_score_chunk_state(persist_key)
-                if persisted:
-                    # Restore progress from persistence
-                    state['current_index'] = persisted.get('current_index', 0)
-                    state['execution_scores'] = persisted.get('execution_scores', [])
-                    state['completed'] = persisted.get('completed', False)
-                    # Reload instances list (not persisted due to size)
-                    # #region agent log
-                    load_instances_start = time_module.perf_counter()
-                    try:
-                        import json as json_module
-                        with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'LOAD', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'loading instances via list_recent_completed', 'data': {'limit': 50}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-                    except: pass
-                    # #endregion
-                    from .instance_manager import InstanceManager
-                    instance_manager = InstanceManager()
-                    # Convert string user_id to int for database queries
-                    user_id_int = None
-                    if isinstance(persist_key, str) and persist_key.isdigit():
-                        user_id_int = int(persist_key)
-                    else:
-                        # For "default"/"default_user" or other strings, use auth context
-                        user_id_int = self._get_user_id(None)
-                    state['instances'] = instance_manager.list_recent_completed(limit=50, user_id=user_id_int)
-                    # #region agent log
-                    load_instances_duration = time_module.perf_counter() - load_instances_start
-                    try:
-                        import json as json_module
-                        with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'LOAD', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'instances loaded', 'data': {'duration_seconds': load_instances_duration, 'instance_count': len(state['instances'])}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-                    except: pass
-                    # #endregion
-                    # If we had progress, resume from where we left off
-                    if state['current_index'] > 0 and not state['completed']:
-                        # #region agent log
-                        try:
-                            import json as json_module
-                            with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                                f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'CHUNK', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'resuming chunked execution score calculation from persistence', 'data': {'resume_index': state['current_index'], 'total': len(state['instances']), 'scores_so_far': len(state['execution_scores'])}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-                        except: pass
-                        # #endregion
-                        # Don't re-initialize, just continue processing
-                    else:
-                        # Fresh start
-                        state['current_index'] = 0
-                        state['execution_scores'] = []
-                        state['completed'] = False
-                else:
-                    # No persisted state - initialize fresh
-                    # #region agent log
-                    load_instances_start = time_module.perf_counter()
-                    try:
-                        import json as json_module
-                        with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'LOAD', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'loading instances via list_recent_completed', 'data': {'limit': 50}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-                    except: pass
-                    # #endregion
-                    from .instance_manager import InstanceManager
-                    instance_manager = InstanceManager()
-                    # Convert string user_id to int for database queries
-                    user_id_int = None
-                    if isinstance(persist_key, str) and persist_key.isdigit():
-                        user_id_int = int(persist_key)
-                    else:
-                        # For "default"/"default_user" or other strings, use auth context
-                        user_id_int = self._get_user_id(None)
-                    state['instances'] = instance_manager.list_recent_completed(limit=50, user_id=user_id_int)
-                    # #region agent log
-                    load_instances_duration = time_module.perf_counter() - load_instances_start
-                    try:
-                        import json as json_module
-                        with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'LOAD', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'instances loaded', 'data': {'duration_seconds': load_instances_duration, 'instance_count': len(state['instances'])}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-                    except: pass
-                    # #endregion
-                    state['current_index'] = 0
-                    state['execution_scores'] = []
-                    state['completed'] = False
-            else:
-                # Not persisting - initialize fresh
-                # #region agent log
-                load_instances_start = time_module.perf_counter()
-                try:
-                    import json as json_module
-                    with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                        f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'LOAD', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'loading instances via list_recent_completed', 'data': {'limit': 50}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-                except: pass
-                # #endregion
-                from .instance_manager import InstanceManager
-                instance_manager = InstanceManager()
-                # Convert string user_id to int for list_recent_completed()
-                user_id_int = None
-                if isinstance(persist_key, str) and persist_key.isdigit():
-                    user_id_int = int(persist_key)
-                else:
-                    # For "default"/"default_user" or other strings, use auth context
-                    user_id_int = self._get_user_id(None)
-                state['instances'] = instance_manager.list_recent_completed(limit=50, user_id=user_id_int)
-                # #region agent log
-                load_instances_duration = time_module.perf_counter() - load_instances_start
-                try:
-                    import json as json_module
-                    with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                        f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'LOAD', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'instances loaded', 'data': {'duration_seconds': load_instances_duration, 'instance_count': len(state['instances'])}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-                except: pass
-                # #endregion
-                state['current_index'] = 0
-                state['execution_scores'] = []
-                state['completed'] = False
-            
-            # #region agent log
-            try:
-                import json as json_module
-                with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                    f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'CHUNK', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'starting chunked execution score calculation', 'data': {'instance_count': len(state['instances']), 'batch_size': batch_size, 'resuming': state.get('current_index', 0) > 0}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-            except: pass
-            # #endregion
-        
-        # Process a batch of instances
-        instances = state['instances']
-        current_index = state['current_index']
-        execution_scores = state['execution_scores']
-        
-        end_index = min(current_index + batch_size, len(instances))
-        
-        # #region agent log
-        try:
-            import json as json_module
-            with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'CHUNK', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'processing batch', 'data': {'start_index': current_index, 'end_index': end_index, 'total': len(instances)}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-        except: pass
-        # #endregion
-        
-        # #region agent log
-        batch_start_time = time_module.perf_counter()
-        try:
-            import json as json_module
-            with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'H2', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'starting batch execution score calculation', 'data': {'batch_start': current_index, 'batch_end': end_index, 'batch_size': end_index - current_index}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-        except: pass
-        # #endregion
+        from .execution_score import (
+            INPUT_COLUMNS, NEUTRAL_EXECUTION_SCORE, compute_execution_scores, recent_execution_score,
+        )
+        user_id = self._get_user_id(user_id)
+        if user_id is None:
+            return NEUTRAL_EXECUTION_SCORE
         
-        for idx in range(current_index, end_index):
-            # #region agent log
-            instance_start = time_module.perf_counter()
-            try:
-                import json as json_module
-                with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                    f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'H3', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'calculating execution score for instance', 'data': {'instance_index': idx, 'total_instances': len(instances)}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-            except: pass
-            # #endregion
+        if os.getenv('USE_CSV', '').lower() not in ('1', 'true', 'yes'):
             try:
-                execution_score = self.calculate_execution_score(instances[idx])
-                # #region agent log
-                instance_duration = time_module.perf_counter() - instance_start
-                try:
-                    import json as json_module
-                    with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                        f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'H3', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'execution score calculated for instance', 'data': {'instance_index': idx, 'duration_seconds': instance_duration, 'score': execution_score}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-                except: pass
-                # #endregion
-                if execution_score is not None:
-                    execution_scores.append(execution_score)
+                from .database import get_session
+                average = recent_execution_score(get_session, int(user_id), limit)
+                return NEUTRAL_EXECUTION_SCORE if average is None else average
             except Exception as e:
-                print(f"[Analytics] Error calculating execution score for instance {idx}: {e}")
-        
-        # #region agent log
-        batch_duration = time_module.perf_counter() - batch_start_time
-        try:
-            import json as json_module
-            with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'H2', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'batch execution score calculation completed', 'data': {'batch_size': end_index - current_index, 'total_duration_seconds': batch_duration, 'avg_per_instance': batch_duration / (end_index - current_index) if (end_index - current_index) > 0 else 0}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-        except: pass
-        # #endregion
+                print(f"[Analytics] Stored execution scores unavailable, computing from instances: {e}")
         
-        state['current_index'] = end_index
-        state['execution_scores'] = execution_scores
+        df = self._load_instances(completed_only=True, user_id=user_id)
+        if df.empty or 'completed_at' not in df.columns:
+            return NEUTRAL_EXECUTION_SCORE
+        completed_at = pd.to_datetime(df['completed_at'], errors='coerce')
+        recent = df.loc[completed_at.notna()].assign(_completed=completed_at).nlargest(limit, '_completed')
+        if recent.empty:
+            return NEUTRAL_EXECUTION_SCORE
+        frame = recent.reindex(columns=list(INPUT_COLUMNS), fill_value='')
+        return float(compute_execution_scores(frame).mean())
+    
+    def get_execution_score_chunked(self, state: Dict[str, any], batch_size: int = 5, user_id: str = "default", persist: bool = True) -> Dict[str, any]:
+        """Deprecated: returns get_recent_execution_score() as a completed state in one call.
         
-        # Check if we're done
-        if end_index >= len(instances):
-            state['completed'] = True
-            avg_execution_score = sum(execution_scores) / len(execution_scores) if execution_scores else 50.0
-            state['avg_execution_score'] = avg_execution_score
-            
-            # Clear persisted state when completed
-            if persist:
-                try:
-                    user_state = UserStateManager()
-                    user_state.update_preference(persist_key, "execution_score_chunk_state", "")  # Clear it
-                except Exception as e:
-                    print(f"[Analytics] Error clearing persisted chunk state: {e}")
-            
-            # #region agent log
-            try:
-                import json as json_module
-                with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                    f.write(json_module.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'CHUNK', 'location': 'analytics.py:get_execution_score_chunked', 'message': 'chunked execution score calculation completed', 'data': {'total_instances': len(instances), 'score_count': len(execution_scores), 'avg_score': avg_execution_score}, 'timestamp': int(time_module.time() * 1000)}) + '\n')
-            except: pass
-            # #endregion
-        else:
-            state['completed'] = False
-            state['avg_execution_score'] = None
-            
-            # Persist progress after each chunk
-            if persist:
-                try:
-                    user_state = UserStateManager()
-                    user_state.set_execution_score_chunk_state(state, persist_key)
-                except Exception as e:
-                    print(f"[Analytics] Error persisting chunk state: {e}")
+        Execution scores are stored per instance now, so there is nothing left to
+        spread over UI ticks; batch_size and persist are ignored.
         
+        Returns:
+            state updated with 'completed': True and 'avg_execution_score'
+        """
+        persist_key = "default" if user_id in ("default", "default_user") else user_id
+        user_id_int = int(persist_key) if isinstance(persist_key, str) and persist_key.isdigit() else None
+        state = state if state is not None else {}
+        state['completed'] = True
+        state['avg_execution_score'] = self.get_recent_execution_score(user_id=user_id_int)
         return state
 
     def get_tracking_consistency_multiplier(self, days: int = 7) -> float:
@@ -7325,6 +7225,45 @@ class Analytics:
         # Clamp to valid range
         return max(0.0, min(1.0, perseverance_factor))
 
+    def calculate_window_factors_batch(
+        self,
+        rows: pd.DataFrame,
+        task_completion_counts: Optional[Dict[str, int]] = None,
+        persistence_factors: Optional[Any] = None,
+        instances_df: Optional[pd.DataFrame] = None,
+        user_id: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """Momentum, persistence and perseverance v1.3 factors for many rows at once.
+
+        Same values as calculate_momentum_factor(), calculate_persistence_factor()
+        and calculate_perseverance_factor_v1_3() applied per row, but the user's
+        completions are sorted once and every lookback window is found with
+        np.searchsorted (see backend.window_factors). O(n log n) instead of O(n^2).
+
+        Args:
+            rows: Instances to score
+            task_completion_counts: Optional dict mapping task_id to completion count
+            persistence_factors: Optional per-row completion count multipliers (perseverance)
+            instances_df: Pre-loaded instances the windows are taken from (default: load user's)
+            user_id: User ID (used when instances_df is not given)
+
+        Returns:
+            Dict of arrays aligned with rows: momentum_factor, persistence_factor,
+            perseverance_factor, persistence_consistency
+        """
+        from .window_factors import compute_window_factors
+
+        if instances_df is None:
+            instances_df = self._load_instances(user_id=self._get_user_id(user_id))
+        if persistence_factors is not None:
+            persistence_factors = np.asarray(persistence_factors, dtype=float)
+        return compute_window_factors(
+            rows,
+            instances_df,
+            task_completion_counts=task_completion_counts,
+            persistence_factors=persistence_factors,
+        )
+
     def calculate_daily_scores(self, target_date: Optional[datetime] = None, user_id: Optional[int] = None) -> Dict[str, float]:
         """Calculate daily aggregated scores for a specific date.
         
@@ -7334,6 +7273,9 @@ class Analytics:
         - Grit score (average)
         - Composite score (if available)
         
+        Closed days (before today) are read from the daily_scores ledger and
+        computed only when missing or stale (see _daily_score_ledger).
+        
         Args:
             target_date: Date to calculate scores for (default: yesterday)
             user_id: Optional user_id. If None, gets from authenticated session.
@@ -7345,6 +7287,16 @@ class Analytics:
         if target_date is None:
             target_date = datetime.now() - timedelta(days=1)
         
+        day = target_date.date() if isinstance(target_date, datetime) else target_date
+        if day < datetime.now().date():
+            stored = self._daily_score_ledger(user_id, day, day)
+            if stored is not None:
+                entry = stored.get(day, {})
+                return {score_type: float(entry.get(score_type, 0.0)) for score_type in DAILY_SCORE_TYPES}
+        return self._compute_daily_scores(target_date, user_id)
+    
+    def _compute_daily_scores(self, target_date: datetime, user_id: Optional[int]) -> Dict[str, float]:
+        """calculate_daily_scores() computed from the instances frame."""
         # Get date string for filtering
         target_date_str = target_date.strftime('%Y-%m-%d')
         
@@ -7501,6 +7453,37 @@ class Analytics:
             - segment_count (int): Always 1 (single day segment)
             - total_tasks (int): Total tasks completed in the day
         """
+        if target_date is not None:
+            day = target_date.date() if isinstance(target_date, datetime) else target_date
+            if day < datetime.now().date():
+                # Closed day: stored total from the daily_scores ledger
+                stored = self._daily_score_ledger(self._get_user_id(user_id), day, day)
+                if stored is not None:
+                    entry = stored.get(day)
+                    if not entry or not entry.get('task_count'):
+                        return {'daily_score': 0.0, 'segments': [], 'segment_count': 0, 'total_tasks': 0}
+                    total_score = float(entry.get('completion_efficiency_total', 0.0))
+                    segment_start = datetime.combine(day, datetime.min.time())
+                    return {
+                        'daily_score': round(total_score, 2),
+                        'segments': [{
+                            'start_time': segment_start,
+                            'end_time': entry.get('last_completed_at') or segment_start,
+                            'score': total_score,
+                            'task_count': entry['task_count'],
+                        }],
+                        'segment_count': 1,
+                        'total_tasks': entry['task_count'],
+                    }
+        return self._completion_efficiency_day_from_instances(target_date, idle_refresh_hours, user_id)
+    
+    def _completion_efficiency_day_from_instances(
+        self,
+        target_date: Optional[datetime] = None,
+        idle_refresh_hours: float = 8.0,
+        user_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """calculate_daily_completion_efficiency_score_with_idle_refresh() computed from the instances frame."""
         # #region agent log
         import json
         try:
@@ -7938,9 +7921,81 @@ class Analytics:
             'total_tasks': len(day_completions)
         }
     
+    def _daily_score_ledger_enabled(self, user_id: Optional[int]) -> bool:
+        """True when closed days' scores can come from the daily_scores ledger.
+        
+        Needs the database backend and a user. Not used with fresh_start gap
+        handling: the instances frame then drops the days before the largest gap,
+        which moves as new data arrives.
+        """
+        if user_id is None or os.getenv('USE_CSV', '').lower() in ('1', 'true', 'yes'):
+            return False
+        try:
+            return GapDetector().get_gap_handling_preference() != 'fresh_start'
+        except Exception:
+            return False
+    
+    def _ledger_compute_day(self, day, user_id: int) -> Dict[str, float]:
+        """Every ledger score of one closed day, computed from the instances frame."""
+        target = datetime.combine(day, datetime.min.time())
+        scores = dict(self._compute_daily_scores(target, user_id))
+        scores['completion_efficiency_total'] = self._completion_efficiency_day_from_instances(
+            target_date=target, user_id=user_id
+        )['daily_score']
+        return scores
+    
+    def _daily_score_versions(self) -> Dict[str, str]:
+        """DAILY_SCORE_VERSIONS tagged with the settings the ledger scores are computed with.
+        
+        calculate_completion_efficiency_score() reads the productivity settings and
+        the cancellation penalties; stored days computed with other values are stale.
+        """
+        from .daily_score_ledger import with_settings
+        return with_settings(DAILY_SCORE_VERSIONS, {
+            'productivity_settings': self.productivity_settings,
+            'cancellation_penalties': self.user_state.get_cancellation_penalties(self.default_user_id),
+        })
+    
+    def _daily_score_ledger(self, user_id: Optional[int], start=None, end=None, read=None):
+        """Closed days' scores from the daily_scores ledger.
+        
+        Computes and stores the closed days in [start, end] that are missing or
+        stale first (see backend/daily_score_ledger.py), then returns read(session),
+        by default load_day_scores() for the range.
+        
+        Returns:
+            read() result, or None when the ledger is not used (see
+            _daily_score_ledger_enabled) or fails; callers then compute from instances
+        """
+        if not self._daily_score_ledger_enabled(user_id):
+            return None
+        try:
+            from .database import get_session
+            from .daily_score_ledger import load_day_scores, sync_days
+            uid = int(user_id)
+            versions = self._daily_score_versions()
+            sync_days(get_session, uid, versions,
+                      lambda day: self._ledger_compute_day(day, user_id), start=start, end=end)
+            with get_session() as session:
+                if read is None:
+                    return load_day_scores(session, uid, versions, start, end)
+                return read(session, uid)
+        except Exception as e:
+            print(f"[Analytics] Daily score ledger unavailable, computing from instances: {e}")
+            return None
+    
+    def _today_daily_scores(self, user_id: Optional[int], now: datetime) -> Dict[str, float]:
+        """Today's calculate_daily_scores() (not stored; memoized per request)."""
+        return dict(request_memo(
+            INSTANCES, user_id, ('daily_scores', now.date()), lambda: self._compute_daily_scores(now, user_id)
+        ))
+    
     def get_historical_daily_scores(self, score_type: str = 'completion_efficiency_score', top_n: int = 10, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get historical daily scores sorted by value.
         
+        Closed days come from an indexed top-N query on the daily_scores ledger;
+        today is computed from instances and merged in.
+        
         Args:
             score_type: 'completion_efficiency_score', 'execution_score', 'grit_score', or 'composite_score'
             top_n: Number of top scores to return (default: 10)
@@ -7950,6 +8005,20 @@ class Analytics:
             List of dicts with 'date', 'score', sorted by score descending
         """
         user_id = self._get_user_id(user_id)
+        if score_type in DAILY_SCORE_VERSIONS:
+            from .daily_score_ledger import load_top_scores
+            version = self._daily_score_versions()[score_type]
+            top = self._daily_score_ledger(
+                user_id, read=lambda session, uid: load_top_scores(session, uid, score_type, version, top_n)
+            )
+            if top is not None:
+                today = datetime.now()
+                today_score = self._today_daily_scores(user_id, today).get(score_type, 0.0)
+                if today_score > 0:
+                    top.append({'date': today.date(), 'score': today_score})
+                    top.sort(key=lambda x: x['score'], reverse=True)
+                return top[:top_n]
+        
         df = self._load_instances(user_id=user_id)
         if df.empty or user_id is None:
             return []
@@ -8003,7 +8072,7 @@ class Analytics:
             target_date = datetime.now() - timedelta(days=1)
         
         # Calculate yesterday's scores
-        yesterday_scores = self.calculate_daily_scores(target_date=target_date)
+        yesterday_scores = self.calculate_daily_scores(target_date=target_date, user_id=user_id)
         
         # Check each score type for milestones
         milestones = []
@@ -8015,7 +8084,7 @@ class Analytics:
                 continue  # Skip if no valid score
             
             # Get historical top 10
-            historical = self.get_historical_daily_scores(score_type=score_type, top_n=10)
+            historical = self.get_historical_daily_scores(score_type=score_type, top_n=10, user_id=user_id)
             
             if not historical:
                 # First day with data - it's automatically the best
@@ -8129,11 +8198,16 @@ class Analytics:
         if week_completions.empty:
             return self._empty_weekly_summary()
         
-        # Calculate daily scores for each day in the week
+        # Calculate daily scores for each day in the week (closed days: one ledger range read)
+        stored = self._daily_score_ledger(user_id, start_date.date(), (start_date + timedelta(days=days - 1)).date())
         daily_scores_list = []
         for i in range(days):
             target_date = start_date + timedelta(days=i)
-            daily_scores = self.calculate_daily_scores(target_date=target_date, user_id=user_id)
+            if stored is not None and target_date.date() < end_date.date():
+                entry = stored.get(target_date.date(), {})
+                daily_scores = {score_type: float(entry.get(score_type, 0.0)) for score_type in DAILY_SCORE_TYPES}
+            else:
+                daily_scores = self.calculate_daily_scores(target_date=target_date, user_id=user_id)
             if daily_scores.get('completion_efficiency_score', 0) > 0 or \
                daily_scores.get('execution_score', 0) > 0 or \
                daily_scores.get('grit_score', 0) > 0:
@@ -8255,6 +8329,8 @@ class Analytics:
         
         See: docs/execution_module_v1.0.md for formula documentation.
         See: ui/analytics_glossary.py for the glossary definition.
+        Stored scores use the array form in backend/execution_score.py (compute_execution_scores):
+        change both together and bump EXECUTION_SCORE_VERSION.
         
         Args:
             row: Task instance row (pandas Series from CSV or dict from database)
@@ -8521,10 +8597,8 @@ class Analytics:
         # Check cache first
         # Cache is now user-specific, keyed by user_id. Normalize to str for consistent hits.
         cache_key = str(user_id) if user_id is not None else "default"
-        current_time = time_module.time()
-        if (cache_key in Analytics._relief_summary_cache and 
-            cache_key in Analytics._relief_summary_cache_time and
-            (current_time - Analytics._relief_summary_cache_time[cache_key]) < Analytics._cache_ttl_seconds):
+        cached = Analytics._relief_summary_cache.get(cache_key)
+        if cached is not None:
             # #region agent log
             try:
                 with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
@@ -8541,7 +8615,7 @@ class Analytics:
             # #endregion
             duration = (time_module.perf_counter() - total_start) * 1000
             print(f"[Analytics] get_relief_summary (cached): {duration:.2f}ms")
-            return Analytics._relief_summary_cache[cache_key]
+            return cached
         
         # #region agent log
         try:
@@ -8704,11 +8778,8 @@ class Analytics:
         # Calculate multipliers for all rows at once (vectorized)
         initial_av = relief_data['initial_aversion'].fillna(0.0)
         expected_av = relief_data['expected_aversion'].fillna(0.0)
-        # Vectorized multiplier calculation (faster than .apply())
-        relief_data['aversion_mult'] = [
-            self.calculate_aversion_multiplier(ia, ea) 
-            for ia, ea in zip(initial_av, expected_av)
-        ]
+        # Vectorized multiplier calculation (see calculate_aversion_multiplier for the row formula)
+        relief_data['aversion_mult'] = self.calculate_aversion_multipliers_batch(initial_av, expected_av)
         relief_data['default_relief_points'] = relief_data['default_relief_points'] * relief_data['aversion_mult']
         
         # Calculate net relief points (vectorized) - signed: can be negative
@@ -8759,9 +8830,8 @@ class Analytics:
             relief_data['task_type'] = 'Work'
         
         # Apply task type multipliers to relief points (OPTIMIZED: vectorized)
-        task_types = relief_data['task_type'].tolist()
-        type_mults = [self.get_task_type_multiplier(tt) for tt in task_types]
-        relief_data['default_relief_points'] = relief_data['default_relief_points'] * pd.Series(type_mults, index=relief_data.index)
+        type_mults = self.get_task_type_multipliers_batch(relief_data['task_type'])
+        relief_data['default_relief_points'] = relief_data['default_relief_points'] * type_mults
         
         # OPTIMIZED: Vectorized extraction of time_actual_minutes
         if 'actual_dict' in productivity_tasks.columns:
@@ -8801,10 +8871,9 @@ class Analytics:
         efficiency_start = time_module.time()
         # Calculate efficiency inline from already-loaded completed DataFrame
         if not completed.empty:
-            # Calculate efficiency for each completed task (vectorized where possible)
-            completed['efficiency_score'] = profiler.time_apply(
-                completed, self.calculate_efficiency_score, "calculate_efficiency_score", axis=1
-            )
+            # Calculate efficiency for each completed task (VECTORIZED; row formula: calculate_efficiency_score)
+            with profiler.section("calculate_efficiency_scores_batch"):
+                completed['efficiency_score'] = self.calculate_efficiency_scores_batch(completed)
             valid_efficiency = completed[completed['efficiency_score'] > 0]
             if not valid_efficiency.empty:
                 avg_efficiency = valid_efficiency['efficiency_score'].mean()
@@ -8843,7 +8912,7 @@ class Analytics:
         # Keep all tasks for relief calculations, but exclude test tasks from obstacles
         if 'task_name' in relief_data.columns:
             relief_data_for_obstacles = relief_data[
-                ~relief_data['task_name'].apply(self._is_test_task)
+                ~self._test_task_mask(relief_data['task_name'])
             ].copy()
         else:
             relief_data_for_obstacles = relief_data.copy()
@@ -8890,50 +8959,22 @@ class Analytics:
                 for tid in task_ids
             ]
             
-            # Calculate obstacles scores using multiple formulas for comparison
-            def _calculate_obstacles_scores_robust(row):
-                baseline = row.get('baseline_aversion_robust')
-                current = row.get('expected_aversion')
-                expected_relief = row.get('expected_relief')
-                actual_relief = row.get('actual_relief')
-                # Convert to float, handling NaN
-                expected_relief = float(expected_relief) if expected_relief is not None and not pd.isna(expected_relief) else None
-                actual_relief = float(actual_relief) if actual_relief is not None and not pd.isna(actual_relief) else None
-                scores = self.calculate_obstacles_scores(baseline, current, expected_relief, actual_relief)
-                return scores
-            
-            def _calculate_obstacles_scores_sensitive(row):
-                baseline = row.get('baseline_aversion_sensitive')
-                current = row.get('expected_aversion')
-                expected_relief = row.get('expected_relief')
-                actual_relief = row.get('actual_relief')
-                # Convert to float, handling NaN
-                expected_relief = float(expected_relief) if expected_relief is not None and not pd.isna(expected_relief) else None
-                actual_relief = float(actual_relief) if actual_relief is not None and not pd.isna(actual_relief) else None
-                scores = self.calculate_obstacles_scores(baseline, current, expected_relief, actual_relief)
-                return scores
-            
-            # Calculate all score variants
-            relief_data_for_obstacles['obstacles_scores_robust'] = profiler.time_apply(
-                relief_data_for_obstacles, _calculate_obstacles_scores_robust, "obstacles_scores_robust", axis=1
-            )
-            relief_data_for_obstacles['obstacles_scores_sensitive'] = profiler.time_apply(
-                relief_data_for_obstacles, _calculate_obstacles_scores_sensitive, "obstacles_scores_sensitive", axis=1
-            )
-            
-            # Extract individual scores for backward compatibility and new analytics (OPTIMIZED: vectorized)
+            # Calculate obstacles scores using multiple formulas for comparison (VECTORIZED;
+            # row formula: calculate_obstacles_scores)
+            # NaN aversions are read as 100: the row-wise version passed NaN (not None) through the
+            # min/max clamp in detect_spontaneous_aversion, and summary values must not shift.
             score_variants = ['expected_only', 'actual_only', 'minimum', 'average', 'net_penalty', 'net_bonus', 'net_weighted']
-            robust_scores_list = relief_data_for_obstacles['obstacles_scores_robust'].tolist()
-            sensitive_scores_list = relief_data_for_obstacles['obstacles_scores_sensitive'].tolist()
-            for variant in score_variants:
-                relief_data_for_obstacles[f'obstacles_score_{variant}_robust'] = [
-                    x.get(variant, 0.0) if isinstance(x, dict) else 0.0 
-                    for x in robust_scores_list
-                ]
-                relief_data_for_obstacles[f'obstacles_score_{variant}_sensitive'] = [
-                    x.get(variant, 0.0) if isinstance(x, dict) else 0.0 
-                    for x in sensitive_scores_list
-                ]
+            current_aversion_clamped = relief_data_for_obstacles['expected_aversion'].fillna(100.0)
+            with profiler.section("calculate_obstacles_scores_batch"):
+                for baseline_kind in ('robust', 'sensitive'):
+                    variant_scores = self.calculate_obstacles_scores_batch(
+                        relief_data_for_obstacles[f'baseline_aversion_{baseline_kind}'].fillna(100.0),
+                        current_aversion_clamped,
+                        relief_data_for_obstacles['expected_relief'],
+                        relief_data_for_obstacles['actual_relief'],
+                    )
+                    for variant in score_variants:
+                        relief_data_for_obstacles[f'obstacles_score_{variant}_{baseline_kind}'] = variant_scores[variant]
             
             # Keep backward compatibility: use expected_only as the default
             relief_data_for_obstacles['obstacles_score_robust'] = relief_data_for_obstacles['obstacles_score_expected_only_robust']
@@ -8954,30 +8995,17 @@ class Analytics:
             relief_data_for_obstacles['completed_at_dt'] = pd.to_datetime(relief_data_for_obstacles['completed_at'], errors='coerce')
             relief_data_last_7d = relief_data_for_obstacles[relief_data_for_obstacles['completed_at_dt'] >= seven_days_ago]
             
-            # Calculate max spike amount for weekly bonus
-            def _get_max_spike_robust(row):
-                baseline = row.get('baseline_aversion_robust')
-                current = row.get('expected_aversion')
-                is_spontaneous, spike_amount = self.detect_spontaneous_aversion(baseline, current)
-                return spike_amount if is_spontaneous else 0.0
-            
-            def _get_max_spike_sensitive(row):
-                baseline = row.get('baseline_aversion_sensitive')
-                current = row.get('expected_aversion')
-                is_spontaneous, spike_amount = self.detect_spontaneous_aversion(baseline, current)
-                return spike_amount if is_spontaneous else 0.0
-            
+            # Calculate max spike amount for weekly bonus (VECTORIZED; row formula: detect_spontaneous_aversion)
             if not relief_data_last_7d.empty:
-                # Use .copy() to avoid SettingWithCopyWarning
-                relief_data_last_7d = relief_data_last_7d.copy()
-                relief_data_last_7d['spike_amount_robust'] = profiler.time_apply(
-                    relief_data_last_7d, _get_max_spike_robust, "spike_amount_robust", axis=1
-                )
-                relief_data_last_7d['spike_amount_sensitive'] = profiler.time_apply(
-                    relief_data_last_7d, _get_max_spike_sensitive, "spike_amount_sensitive", axis=1
-                )
-                max_spike_robust = relief_data_last_7d['spike_amount_robust'].max() if 'spike_amount_robust' in relief_data_last_7d.columns else 0.0
-                max_spike_sensitive = relief_data_last_7d['spike_amount_sensitive'].max() if 'spike_amount_sensitive' in relief_data_last_7d.columns else 0.0
+                spikes = {}
+                for baseline_kind in ('robust', 'sensitive'):
+                    is_spontaneous, spike_amount = self.detect_spontaneous_aversion_batch(
+                        relief_data_last_7d[f'baseline_aversion_{baseline_kind}'].fillna(100.0),
+                        relief_data_last_7d['expected_aversion'].fillna(100.0),
+                    )
+                    spikes[baseline_kind] = float(np.where(is_spontaneous, spike_amount, 0.0).max())
+                max_spike_robust = spikes['robust']
+                max_spike_sensitive = spikes['sensitive']
             else:
                 max_spike_robust = 0.0
                 max_spike_sensitive = 0.0
@@ -9005,14 +9033,10 @@ class Analytics:
             else:
                 completed['task_type'] = 'Work'
         
-        # Calculate multipliers for each task (OPTIMIZED: vectorized)
-        initial_av_list = completed['initial_aversion'].fillna(0.0).tolist()
-        expected_av_list = completed['expected_aversion'].fillna(0.0).tolist()
-        task_type_list = completed['task_type'].fillna('Work').tolist()
-        completed['relief_multiplier'] = [
-            self.calculate_aversion_multiplier(ia, ea) * self.get_task_type_multiplier(tt)
-            for ia, ea, tt in zip(initial_av_list, expected_av_list, task_type_list)
-        ]
+        # Calculate multipliers for each task (VECTORIZED)
+        completed['relief_multiplier'] = self.calculate_aversion_multipliers_batch(
+            completed['initial_aversion'].fillna(0.0), completed['expected_aversion'].fillna(0.0)
+        ) * self.get_task_type_multipliers_batch(completed['task_type'].fillna('Work'))
         
         # Calculate relief_duration_score per task instance (relief_score × duration_minutes × multiplier)
         # Normalize by dividing by 60 to convert minutes to hours scale (keeps scores more reasonable)
@@ -9075,28 +9099,21 @@ class Analytics:
         
         # Calculate productivity multiplier (OPTIMIZED: vectorized)
         if not productivity_relief_data.empty:
-            task_type_list = productivity_relief_data['task_type'].fillna('Work').astype(str).str.strip().str.lower().tolist()
-            productivity_relief_data['productivity_multiplier'] = [
-                2.0 if tt == 'work' else (1.0 if tt in ['self care', 'selfcare', 'self-care'] else 1.0)
-                for tt in task_type_list
-            ]
+            task_type_normalized = productivity_relief_data['task_type'].fillna('Work').astype(str).str.strip().str.lower()
+            productivity_relief_data['productivity_multiplier'] = np.where(task_type_normalized == 'work', 2.0, 1.0)
             # Productivity points: we need to undo the relief task_type_multiplier and apply productivity multiplier instead
             # default_relief_points already has: (actual - expected) × aversion_mult × relief_task_type_mult
             # We want: (actual - expected) × aversion_mult × productivity_mult
             # So: productivity_points = default_relief_points / relief_task_type_mult × productivity_mult
             # Get the relief task type multiplier that was already applied (OPTIMIZED: vectorized)
-            task_type_list = productivity_relief_data['task_type'].fillna('Work').tolist()
-            productivity_relief_data['relief_task_type_mult'] = [
-                self.get_task_type_multiplier(tt) for tt in task_type_list
-            ]
-            # Calculate base points without task type multiplier (OPTIMIZED: vectorized)
+            relief_mults = self.get_task_type_multipliers_batch(productivity_relief_data['task_type'].fillna('Work'))
+            productivity_relief_data['relief_task_type_mult'] = relief_mults
+            # Calculate base points without task type multiplier (VECTORIZED)
             # Avoid division by zero - if relief_task_type_mult is 0 or very small, use default_relief_points directly
-            default_points = productivity_relief_data['default_relief_points'].tolist()
-            relief_mults = productivity_relief_data['relief_task_type_mult'].tolist()
-            productivity_relief_data['base_relief_points'] = [
-                dp / rm if rm > 0.01 else dp
-                for dp, rm in zip(default_points, relief_mults)
-            ]
+            default_points = productivity_relief_data['default_relief_points'].to_numpy(dtype=float)
+            productivity_relief_data['base_relief_points'] = np.where(
+                relief_mults > 0.01, default_points / np.where(relief_mults > 0.01, relief_mults, 1.0), default_points
+            )
             # Apply productivity multiplier
             productivity_relief_data['productivity_points'] = (
                 productivity_relief_data['base_relief_points'] * 
@@ -9161,21 +9178,8 @@ class Analytics:
             if 'completed_at_dt' not in completed.columns:
                 completed['completed_at_dt'] = pd.to_datetime(completed['completed_at'], errors='coerce')
             
-            # Get actual time from actual_dict
-            def _get_actual_time_for_work_play(row):
-                """Get actual time from actual_dict for work/play time calculation."""
-                try:
-                    actual_dict = row.get('actual_dict', {})
-                    if isinstance(actual_dict, dict):
-                        return float(actual_dict.get('time_actual_minutes', 0) or 0)
-                except (KeyError, TypeError, ValueError):
-                    pass
-                return 0.0
-            
-            completed['time_for_work_play'] = profiler.time_apply(
-                completed, _get_actual_time_for_work_play, "time_for_work_play", axis=1
-            )
-            completed['time_for_work_play'] = pd.to_numeric(completed['time_for_work_play'], errors='coerce').fillna(0.0)
+            # Get actual time from actual_dict (missing / non-numeric -> 0)
+            completed['time_for_work_play'] = self._actual_time_minutes(completed).fillna(0.0)
             
             # Filter to completed tasks with valid dates
             valid_for_work_play = completed[
@@ -9209,20 +9213,7 @@ class Analytics:
         
         # Calculate weekly average productivity time for bonus/penalty calculation
         # Get all completed tasks with actual time
-        def _get_actual_time_for_avg(row):
-            """Get actual time from actual_dict for weekly average calculation."""
-            try:
-                actual_dict = row.get('actual_dict', {})
-                if isinstance(actual_dict, dict):
-                    return actual_dict.get('time_actual_minutes', None)
-            except (KeyError, TypeError):
-                pass
-            return None
-        
-        completed['time_actual_for_avg'] = profiler.time_apply(
-            completed, _get_actual_time_for_avg, "time_actual_for_avg", axis=1
-        )
-        completed['time_actual_for_avg'] = pd.to_numeric(completed['time_actual_for_avg'], errors='coerce')
+        completed['time_actual_for_avg'] = self._actual_time_minutes(completed)
         
         # Calculate weekly average: average time per task across all completed tasks
         valid_times = completed[completed['time_actual_for_avg'].notna() & (completed['time_actual_for_avg'] > 0)]
@@ -9389,7 +9380,6 @@ class Analytics:
         # Cache is now user-specific, keyed by user_id. Normalize to str for consistent hits.
         cache_key = str(user_id) if user_id is not None else "default"
         Analytics._relief_summary_cache[cache_key] = result
-        Analytics._relief_summary_cache_time[cache_key] = time_module.time()
         
         total_time = (time_module.perf_counter() - total_start) * 1000
         print(f"[Analytics] get_relief_summary: {total_time:.2f}ms")
@@ -9884,6 +9874,8 @@ class Analytics:
         - Motivation factor: low motivation + high relief + good time ratio = bonus
         
         Returns efficiency score (0-100+ scale, higher is better).
+        
+        Reference version; get_relief_summary uses calculate_efficiency_scores_batch().
         """
         try:
             # Extract data
@@ -9958,6 +9950,87 @@ class Analytics:
             # Return 0 if calculation fails
             return 0.0
 
+    @staticmethod
+    def _actual_time_minutes(df: pd.DataFrame) -> pd.Series:
+        """time_actual_minutes from each row's actual_dict as a float Series (NaN when missing)."""
+        if 'actual_dict' not in df.columns:
+            return pd.Series(np.nan, index=df.index, dtype=float)
+        values = [d.get('time_actual_minutes') if isinstance(d, dict) else None for d in df['actual_dict'].tolist()]
+        return pd.to_numeric(pd.Series(values, index=df.index, dtype=object), errors='coerce').astype(float)
+
+    def calculate_efficiency_scores_batch(self, df: pd.DataFrame) -> np.ndarray:
+        """Vectorized batch calculation of efficiency scores.
+
+        This is the optimized production version. For formula logic reference,
+        see calculate_efficiency_score() which has the same calculation but is easier to read/modify.
+
+        Args:
+            df: DataFrame with actual_dict, predicted_dict and relief_score columns
+
+        Returns:
+            numpy array of efficiency scores, same length as df (0.0 where the row version returns 0.0)
+        """
+        n = len(df)
+        if n == 0:
+            return np.array([])
+
+        # === PHASE 1: Extract fields (single pass; rows the row version rejects stay 0.0) ===
+        actual_dicts = df['actual_dict'].tolist() if 'actual_dict' in df.columns else [{}] * n
+        predicted_dicts = df['predicted_dict'].tolist() if 'predicted_dict' in df.columns else [{}] * n
+        valid = np.zeros(n, dtype=bool)
+        completion_pct = np.zeros(n)
+        time_actual = np.zeros(n)
+        time_estimate = np.zeros(n)
+        motivation = np.full(n, np.nan)
+        for i, (actual, predicted) in enumerate(zip(actual_dicts, predicted_dicts)):
+            if not isinstance(actual, dict) or not isinstance(predicted, dict):
+                continue
+            try:
+                cp = actual.get('completion_percent', 0)
+                ta = actual.get('time_actual_minutes', 0)
+                te = predicted.get('time_estimate_minutes', 0)
+                mv = predicted.get('motivation', None)
+                completion_pct[i] = float(cp) if cp else 0.0
+                time_actual[i] = float(ta) if ta else 0.0
+                time_estimate[i] = float(te) if te else 0.0
+                if mv is not None:
+                    motivation[i] = float(mv)
+            except (TypeError, ValueError):
+                continue
+            valid[i] = True
+
+        if 'relief_score' in df.columns:
+            relief = pd.to_numeric(df['relief_score'], errors='coerce').to_numpy(dtype=float)
+        else:
+            relief = np.zeros(n)
+
+        # === PHASE 2: Time efficiency factor ===
+        with np.errstate(divide='ignore', invalid='ignore'):
+            has_time = (time_estimate > 0) & (time_actual > 0)
+            expected_time = (completion_pct / 100.0) * time_estimate
+            time_factor = np.where(
+                expected_time > 0,
+                expected_time / np.maximum(time_actual, 0.1) * (completion_pct / 100.0),
+                1.0,
+            )
+            over_time = has_time & (completion_pct >= 100) & (time_actual > time_estimate)
+            over_time_penalty = np.where(over_time, time_actual / np.where(time_estimate > 0, time_estimate, 1.0) - 1.0, 0.0)
+            relief_mitigation = np.minimum(relief / 10.0, 0.5)
+            time_factor = np.where(
+                over_time, np.maximum(0.5, 1.0 - over_time_penalty * (1.0 - relief_mitigation)), time_factor
+            )
+            time_factor = np.where(has_time, time_factor, 1.0)
+
+            # === PHASE 3: Relief and motivation bonuses ===
+            motivation_bonus = np.where(
+                (motivation < 5) & (relief >= 6),
+                (5 - motivation) * (relief / 10.0) * time_factor,
+                0.0,
+            )
+            efficiency = completion_pct * time_factor + relief * 2.0 + motivation_bonus
+
+        return np.where(valid, np.round(efficiency, 2), 0.0)
+
     def get_efficiency_summary(self) -> Dict[str, any]:
         """Calculate efficiency statistics for completed tasks."""
         user_id = self._get_user_id(None)
@@ -10120,6 +10193,12 @@ class Analytics:
             'environmental_effect': self.get_environmental_fit_history,  # Alias for environmental_fit
         }
         
+        # Per-instance metrics are answered from the daily_metric_rollup table (one range query)
+        if instances_completed_df is None:
+            rollup_history = self._get_rollup_metric_histories([metric_key], days=days, user_id=user_id)
+            if metric_key in rollup_history:
+                return rollup_history[metric_key]
+        
         if metric_key in metric_routes:
             uid = user_id if user_id is not None else self._get_user_id(None)
             routed_method = metric_routes[metric_key]
@@ -10241,37 +10320,234 @@ class Analytics:
             'three_month_average': three_month_average,
         }
     
-    def get_task_efficiency_history(self) -> Dict[str, float]:
-        """Get average efficiency score per task based on completed instances.
+    def get_metric_histories(
+        self, metric_keys: List[str], days: int = 90, user_id: Optional[int] = None,
+        instances_completed_df: Optional[pd.DataFrame] = None
+    ) -> Dict[str, Dict[str, any]]:
+        """Get historical daily data for several metrics in one pass.
         
-        Returns {task_id: avg_efficiency_score}
-        Useful for recommending tasks that have historically been efficient.
+        Returns the same per-metric result as get_generic_metric_history(), but
+        completed_at is parsed and the cutoff applied once, and every per-instance
+        series comes out of a single grouped aggregation. Without a frame, rolled-up
+        metrics are read from daily_metric_rollup in one query. Composite metrics
+        (_COMPOSITE_HISTORY_METRICS) still go through their own methods.
+        
+        Args:
+            metric_keys: Metric keys as accepted by get_generic_metric_history()
+            days: Number of days to look back (default 90)
+            user_id: Optional user ID for data isolation
+            instances_completed_df: Optional completed instances frame (skips _load_instances)
+        
+        Returns:
+            Dict of metric_key -> {'dates', 'values', 'current_value', 'weekly_average', 'three_month_average'}
         """
-        user_id = self._get_user_id(None)
-        df = self._load_instances(user_id=user_id)
-        completed = df[df['completed_at'].astype(str).str.len() > 0].copy()
+        keys = list(dict.fromkeys(metric_keys))
+        uid = self._get_user_id(user_id)
+        histories: Dict[str, Dict[str, any]] = {}
         
-        if completed.empty:
-            return {}
+        for key in keys:
+            if key in self._COMPOSITE_HISTORY_METRICS:
+                histories[key] = self.get_generic_metric_history(
+                    key, days=days, user_id=uid, instances_completed_df=instances_completed_df
+                )
+        if instances_completed_df is None:
+            pending = [key for key in keys if key not in histories]
+            histories.update(self._get_rollup_metric_histories(pending, days=days, user_id=uid))
+        
+        pending = [key for key in keys if key not in histories]
+        if pending:
+            if instances_completed_df is not None and not instances_completed_df.empty:
+                completed = instances_completed_df
+            else:
+                df = self._load_instances(completed_only=True, user_id=uid)
+                completed = df[df['completed_at'].astype(str).str.len() > 0]
+            histories.update(self._daily_histories_from_frame(completed, pending, days, uid))
+        return {key: histories[key] for key in keys}
+    
+    def _daily_histories_from_frame(
+        self, completed: pd.DataFrame, metric_keys: List[str], days: int, user_id: Optional[int]
+    ) -> Dict[str, Dict[str, any]]:
+        """Daily series for metric_keys from a completed instances frame (one groupby)."""
+        if completed.empty or 'completed_at' not in completed.columns:
+            return {key: self._daily_history_summary([], []) for key in metric_keys}
         
-        # Calculate efficiency for each completed task
-        completed['efficiency_score'] = completed.apply(self.calculate_efficiency_score, axis=1)
+        # Parse dates and apply the cutoff once for every series
+        completed_at = pd.to_datetime(completed['completed_at'], errors='coerce')
+        cutoff_date = datetime.now().date() - timedelta(days=days)
+        in_window = completed_at.notna() & (completed_at >= pd.Timestamp(cutoff_date))
+        completed = completed[in_window]
+        
+        task_types = None
+        if any(self.SERIES_HISTORY_METRICS.get(key) == 'sum' for key in metric_keys):
+            task_types = self._instance_task_types(completed, user_id)
+        series = pd.DataFrame(
+            {key: self._instance_metric_series(completed, key, task_types) for key in metric_keys},
+            index=completed.index,
+        )
+        series['__date'] = completed_at[in_window].dt.date
+        grouped = series.groupby('__date', sort=True).agg(['sum', 'count'])
+        
+        histories = {}
+        for key in metric_keys:
+            counts = grouped[(key, 'count')]
+            has_values = counts > 0
+            daily = grouped[(key, 'sum')][has_values]
+            if self.SERIES_HISTORY_METRICS.get(key, 'mean') == 'mean':
+                daily = daily / counts[has_values]
+            histories[key] = self._daily_history_summary([str(d) for d in daily.index], daily.tolist())
+        return histories
+    
+    def _instance_task_types(self, completed: pd.DataFrame, user_id: Optional[int]) -> Optional[pd.Series]:
+        """Normalized task_type per instance (missing = 'work'); None when tasks have no task_type."""
+        from .task_manager import TaskManager
+        tasks_df = TaskManager().get_all(user_id=user_id)
+        if tasks_df.empty or 'task_type' not in tasks_df.columns:
+            return None
+        type_by_task = tasks_df.drop_duplicates('task_id').set_index('task_id')['task_type']
+        task_types = completed['task_id'].map(type_by_task).fillna('Work')
+        return task_types.astype(str).str.strip().str.lower()
+    
+    def _instance_metric_series(
+        self, completed: pd.DataFrame, metric_key: str, task_types: Optional[pd.Series] = None
+    ) -> pd.Series:
+        """Per-instance values of a history metric (NaN = no value), as the per-metric history methods read them."""
+        def numeric(*columns: str) -> pd.Series:
+            for column in columns:
+                if column in completed.columns:
+                    return pd.to_numeric(completed[column], errors='coerce').astype('float64')
+            return pd.Series(np.nan, index=completed.index, dtype='float64')
+        
+        if metric_key == 'relief_score':
+            if 'relief_score_numeric' in completed.columns or 'relief_score' in completed.columns:
+                return numeric('relief_score_numeric', 'relief_score')
+            return self._payload_metric_values(completed, 'relief_score', sources=('actual_dict',)).fillna(
+                self._payload_metric_values(completed, 'actual_relief', sources=('actual_dict',))
+            )
+        if metric_key == 'net_relief':
+            if 'net_relief' in completed.columns:
+                return numeric('net_relief')
+            return numeric('relief_score_numeric', 'relief_score').fillna(0.0) - numeric('expected_relief').fillna(0.0)
+        if metric_key in ('serendipity_factor', 'disappointment_factor'):
+            if metric_key in completed.columns:
+                return numeric(metric_key)
+            net_relief = numeric('net_relief').fillna(0.0)
+            return (net_relief if metric_key == 'serendipity_factor' else -net_relief).clip(lower=0.0)
+        if metric_key in ('duration', 'time_actual_minutes', 'work_time', 'play_time'):
+            time_actual = self._payload_metric_values(completed, 'time_actual_minutes', sources=('actual_dict',))
+            if metric_key == 'work_time' and task_types is not None:
+                return time_actual.where(task_types.isin(['work', 'self care', 'selfcare', 'self-care']))
+            if metric_key == 'play_time' and task_types is not None:
+                return time_actual.where(task_types == 'play')
+            return time_actual
+        if metric_key in ('mental_energy_needed', 'task_difficulty', 'emotional_load'):
+            return numeric(metric_key, {
+                'mental_energy_needed': 'mental_energy_numeric',
+                'task_difficulty': 'task_difficulty_numeric',
+                'emotional_load': 'emotional_load_numeric',
+            }[metric_key])
+        if metric_key in ('environmental_fit', 'environmental_effect'):
+            if 'environmental_fit' in completed.columns or 'environmental_effect' in completed.columns:
+                return numeric('environmental_fit', 'environmental_effect')
+            return self._payload_metric_values(completed, 'environmental_fit', sources=('actual_dict',)).fillna(
+                self._payload_metric_values(completed, 'environmental_effect', sources=('actual_dict',))
+            )
+        if metric_key in self.SERIES_HISTORY_METRICS:
+            return numeric(metric_key)
+        # Generic metric: actual values first, predicted as fallback
+        return self._payload_metric_values(completed, metric_key)
+    
+    @staticmethod
+    def _payload_metric_values(
+        completed: pd.DataFrame, key: str, sources: Tuple[str, ...] = ('actual_dict', 'predicted_dict')
+    ) -> pd.Series:
+        """First numeric value of key in the given JSON payload columns, per instance (NaN if none)."""
+        columns = [completed[source] if source in completed.columns else [None] * len(completed) for source in sources]
+        values = []
+        for payloads in zip(*columns):
+            value = None
+            for payload in payloads:
+                if isinstance(payload, str):
+                    try:
+                        payload = json.loads(payload)
+                    except (ValueError, TypeError):
+                        payload = None
+                if isinstance(payload, dict) and payload.get(key) is not None:
+                    try:
+                        value = float(payload[key])
+                        break
+                    except (ValueError, TypeError):
+                        pass
+            values.append(value)
+        return pd.Series(values, index=completed.index, dtype='float64')
+    
+    @staticmethod
+    def _daily_history_summary(dates: List[str], values: List[float]) -> Dict[str, any]:
+        """History result dict (current value, last-7-entries and overall averages) for a daily series."""
+        current_value = values[-1] if values else 0.0
+        weekly_values = values[-7:] if len(values) >= 7 else values
+        weekly_average = sum(weekly_values) / len(weekly_values) if weekly_values else 0.0
+        three_month_average = sum(values) / len(values) if values else 0.0
+        return {
+            'dates': dates,
+            'values': values,
+            'current_value': current_value,
+            'weekly_average': weekly_average,
+            'three_month_average': three_month_average,
+        }
+    
+    def _get_rollup_metric_histories(
+        self, metric_keys: List[str], days: int = 90, user_id: Optional[int] = None
+    ) -> Dict[str, Dict[str, any]]:
+        """Get historical daily data for metrics from daily_metric_rollup (one query).
         
-        # Filter to valid efficiency scores
-        valid = completed[completed['efficiency_score'] > 0]
+        Returns only the metrics it could answer. Nothing is answered (caller falls
+        back to the frame-based history) when the metric is not rolled up (see
+        backend/metric_rollup.py), the CSV backend is in use, the fresh_start gap
+        preference filters instances, or the read fails. A stale rollup (instances
+        written outside InstanceManager) is rebuilt first.
+        """
+        from backend.metric_rollup import ensure_fresh, load_daily_histories, rollup_metric_key
         
-        if valid.empty:
+        rollup_keys = {key: rollup_metric_key(key) for key in metric_keys}
+        rollup_keys = {key: rollup_key for key, rollup_key in rollup_keys.items() if rollup_key is not None}
+        if not rollup_keys or os.getenv('USE_CSV', '').lower() in ('1', 'true', 'yes'):
+            return {}
+        uid = self._get_user_id(user_id)
+        if uid is None:
+            return {}
+        # fresh_start drops pre-gap instances in _apply_gap_filtering; the rollup keeps every day
+        if GapDetector().get_gap_handling_preference() == 'fresh_start':
             return {}
         
-        # Group by task_id and calculate average efficiency
-        task_efficiency = valid.groupby('task_id')['efficiency_score'].agg(['mean', 'count']).to_dict('index')
+        cutoff_date = datetime.now().date() - timedelta(days=days)
+        try:
+            from backend.database import get_session
+            session = get_session()
+            try:
+                ensure_fresh(session, uid)
+                daily = load_daily_histories(session, uid, set(rollup_keys.values()), cutoff_date)
+            finally:
+                session.close()
+        except Exception as e:
+            print(f"[Analytics] WARNING: daily_metric_rollup read failed for {sorted(rollup_keys)}: {e}")
+            return {}
         
-        # Convert to simpler format: {task_id: avg_efficiency}
-        result = {}
-        for tid, stats in task_efficiency.items():
-            result[tid] = round(float(stats['mean']), 2)
+        return {
+            key: self._daily_history_summary(
+                [str(row['date']) for row in daily[rollup_key]], [row['value'] for row in daily[rollup_key]]
+            )
+            for key, rollup_key in rollup_keys.items()
+        }
+    
+    def get_task_efficiency_history(self, user_id: Optional[int] = None) -> Dict[str, float]:
+        """Get average efficiency score per task based on completed instances.
         
-        return result
+        Returns {task_id: avg_efficiency_score}
+        Useful for recommending tasks that have historically been efficient.
+        Read from the cached task feature matrix (only scores > 0 are averaged).
+        """
+        efficiency = self._get_task_features(user_id)['historical_efficiency'].dropna()
+        return {tid: float(value) for tid, value in efficiency.items()}
 
     def get_execution_score_history(self, days: int = 90, user_id: Optional[int] = None) -> Dict[str, any]:
         """Get historical daily execution score data for trend analysis.
@@ -10433,10 +10709,19 @@ class Analytics:
         task_completion_counts = Counter(completed['task_id'].tolist())
         task_completion_counts_dict = dict(task_completion_counts)
         
-        # Calculate grit_score for each instance (pass df to avoid N+1 in persistence factor)
+        # Calculate grit_score for each instance; persistence factors for all rows in one pass
         completed = completed.copy()
+        persistence = pd.Series(
+            self.calculate_window_factors_batch(
+                completed, task_completion_counts=task_completion_counts_dict, instances_df=df
+            )['persistence_factor'],
+            index=completed.index
+        )
         completed['grit_score'] = completed.apply(
-            lambda row: self.calculate_grit_score(row, task_completion_counts_dict, instances_df=df),
+            lambda row: self.calculate_grit_score(
+                row, task_completion_counts_dict, instances_df=df,
+                persistence_factor=float(persistence.at[row.name])
+            ),
             axis=1
         )
         
@@ -12355,12 +12640,12 @@ class Analytics:
         # Get user_id if not provided
         user_id = self._get_user_id(user_id)
         
-        # Check cache (keyed by metric, top_n, and user_id)
-        # TODO: Make cache user-specific
+        # Check cache (keyed by user_id, then metric and top_n)
         cache_key = (metric, top_n)
+        user_rankings = self._rankings_cache.setdefault(str(user_id) if user_id is not None else "default", {})
         current_time = time.time()
-        if (user_id is None and cache_key in self._rankings_cache):
-            cached_result, cached_time = self._rankings_cache[cache_key]
+        if cache_key in user_rankings:
+            cached_result, cached_time = user_rankings[cache_key]
             if cached_time is not None and (current_time - cached_time) < self._cache_ttl_seconds:
                 duration = (time.perf_counter() - start) * 1000
                 print(f"[Analytics] get_task_performance_ranking (cached): {duration:.2f}ms (metric: {metric}, top_n: {top_n})")
@@ -12377,12 +12662,12 @@ class Analytics:
         else:
             # No way to determine completion - return empty result
             result = []
-            self._rankings_cache[cache_key] = (result, time.time())
+            user_rankings[cache_key] = (result, time.time())
             return result
         
         if completed.empty:
             result = []
-            self._rankings_cache[cache_key] = (result, time.time())
+            user_rankings[cache_key] = (result, time.time())
             return result
         
         # Map metric names to columns
@@ -12411,7 +12696,7 @@ class Analytics:
         
         if task_stats.empty:
             result = []
-            self._rankings_cache[cache_key] = (result, time.time())
+            user_rankings[cache_key] = (result, time.time())
             duration = (time.perf_counter() - start) * 1000
             print(f"[Analytics] get_task_performance_ranking: {duration:.2f}ms (no data, metric: {metric})")
             return result
@@ -12434,7 +12719,7 @@ class Analytics:
             })
         
         # Store in cache
-        self._rankings_cache[cache_key] = (copy.deepcopy(result), time.time())
+        user_rankings[cache_key] = (copy.deepcopy(result), time.time())
         
         duration = (time.perf_counter() - start) * 1000
         print(f"[Analytics] get_task_performance_ranking: {duration:.2f}ms (metric: {metric}, top_n: {top_n})")
@@ -12456,25 +12741,19 @@ class Analytics:
         user_id = self._get_user_id(user_id)
         
         # Check cache (keyed by user_id)
-        cache_key = user_id if user_id is not None else "default"
-        current_time = time.time()
-        if (cache_key in self._leaderboard_cache and 
-            cache_key in self._leaderboard_cache_time and
-            cache_key in self._leaderboard_cache_top_n and
-            self._leaderboard_cache_top_n[cache_key] == top_n and
-            (current_time - self._leaderboard_cache_time[cache_key]) < self._cache_ttl_seconds):
+        cache_key = str(user_id) if user_id is not None else "default"
+        cached = self._leaderboard_cache.get(cache_key)
+        if cached is not None and cached[0] == top_n:
             duration = (time.perf_counter() - start) * 1000
             print(f"[Analytics] get_stress_efficiency_leaderboard (cached): {duration:.2f}ms (top_n: {top_n})")
-            return copy.deepcopy(self._leaderboard_cache[cache_key])
+            return copy.deepcopy(cached[1])
         
         df = self._load_instances(user_id=user_id)
         
         # Check if DataFrame is empty or missing required columns
         if df.empty or 'completed_at' not in df.columns:
             result = []
-            self._leaderboard_cache[cache_key] = result
-            self._leaderboard_cache_time[cache_key] = time.time()
-            self._leaderboard_cache_top_n[cache_key] = top_n
+            self._leaderboard_cache[cache_key] = (top_n, result)
             duration = (time.perf_counter() - start) * 1000
             print(f"[Analytics] get_stress_efficiency_leaderboard: {duration:.2f}ms (no data)")
             return result
@@ -12483,9 +12762,7 @@ class Analytics:
         
         if completed.empty:
             result = []
-            self._leaderboard_cache[cache_key] = result
-            self._leaderboard_cache_time[cache_key] = time.time()
-            self._leaderboard_cache_top_n[cache_key] = top_n
+            self._leaderboard_cache[cache_key] = (top_n, result)
             duration = (time.perf_counter() - start) * 1000
             print(f"[Analytics] get_stress_efficiency_leaderboard: {duration:.2f}ms (no data)")
             return result
@@ -12495,9 +12772,7 @@ class Analytics:
         
         if valid.empty:
             result = []
-            self._leaderboard_cache[cache_key] = result
-            self._leaderboard_cache_time[cache_key] = time.time()
-            self._leaderboard_cache_top_n[cache_key] = top_n
+            self._leaderboard_cache[cache_key] = (top_n, result)
             duration = (time.perf_counter() - start) * 1000
             print(f"[Analytics] get_stress_efficiency_leaderboard: {duration:.2f}ms (no valid data)")
             return result
@@ -12534,9 +12809,7 @@ class Analytics:
             })
         
         # Store in cache
-        self._leaderboard_cache[cache_key] = copy.deepcopy(result)
-        self._leaderboard_cache_time[cache_key] = time.time()
-        self._leaderboard_cache_top_n[cache_key] = top_n
+        self._leaderboard_cache[cache_key] = (top_n, copy.deepcopy(result))
         
         duration = (time.perf_counter() - start) * 1000
         print(f"[Analytics] get_stress_efficiency_leaderboard: {duration:.2f}ms (top_n: {top_n})")
@@ -12579,93 +12852,18 @@ class Analytics:
         if all_tasks_df.empty:
             return []
         
-        # Load historical instance data to inform recommendations
-        instances_df = self._load_instances(user_id=user_id)
+        # Candidates from all task templates, with historical averages per task
+        candidates_df = self._template_candidates(all_tasks_df, self._get_task_features(user_id))
         
-        # Get historical averages per task from completed instances
-        completed = instances_df[instances_df['completed_at'].astype(str).str.len() > 0].copy() if not instances_df.empty else pd.DataFrame()
-        
-        # Calculate historical averages per task_id
-        task_stats = {}
-        if not completed.empty:
-            # Group by task_id and calculate averages
-            for task_id in completed['task_id'].unique():
-                task_completed = completed[completed['task_id'] == task_id]
-                if not task_completed.empty:
-                    # Convert columns to numeric before calculating means
-                    relief_series = pd.to_numeric(task_completed['relief_score'], errors='coerce')
-                    cognitive_series = pd.to_numeric(task_completed['cognitive_load'], errors='coerce')
-                    emotional_series = pd.to_numeric(task_completed['emotional_load'], errors='coerce')
-                    duration_series = pd.to_numeric(task_completed['duration_minutes'], errors='coerce')
-                    
-                    task_stats[task_id] = {
-                        'avg_relief': relief_series.mean() if relief_series.notna().any() else None,
-                        'avg_cognitive_load': cognitive_series.mean() if cognitive_series.notna().any() else None,
-                        'avg_emotional_load': emotional_series.mean() if emotional_series.notna().any() else None,
-                        'avg_duration': duration_series.mean() if duration_series.notna().any() else None,
-                        'count': len(task_completed),
-                    }
-        
-        # Get task efficiency history
-        task_efficiency = self.get_task_efficiency_history()
-        
-        # Build recommendation candidates from all task templates
-        candidates = []
-        max_duration_filter = None
-        if filters.get('max_duration'):
-            try:
-                max_duration_filter = float(filters['max_duration'])
-            except (ValueError, TypeError):
-                max_duration_filter = None
-        
-        for _, task_row in all_tasks_df.iterrows():
-            task_id = task_row['task_id']
-            task_name = task_row['name']
-            default_estimate = task_row.get('default_estimate_minutes', 0)
-            
-            try:
-                default_estimate = float(default_estimate) if default_estimate else 0
-            except (ValueError, TypeError):
-                default_estimate = 0
-            
-            # Get historical stats for this task
-            stats = task_stats.get(task_id, {})
-            avg_relief = stats.get('avg_relief') if stats.get('avg_relief') is not None else None
-            avg_cognitive = stats.get('avg_cognitive_load') if stats.get('avg_cognitive_load') is not None else None
-            avg_emotional = stats.get('avg_emotional_load') if stats.get('avg_emotional_load') is not None else None
-            avg_duration = stats.get('avg_duration') if stats.get('avg_duration') is not None else default_estimate
-            historical_efficiency = task_efficiency.get(task_id, 0)
-            
-            # Use historical data if available, otherwise use defaults
-            relief_score = avg_relief if avg_relief is not None else 5.0  # Default neutral
-            cognitive_load = avg_cognitive if avg_cognitive is not None else 5.0  # Default neutral
-            emotional_load = avg_emotional if avg_emotional is not None else 5.0  # Default neutral
-            duration_minutes = avg_duration if avg_duration else default_estimate
-            
-            # Apply max_duration filter after calculating duration_minutes
-            # Use the duration_minutes (which includes historical average if available)
-            if max_duration_filter is not None:
-                # Filter out tasks that exceed the max duration
-                # Note: tasks with 0 duration (unknown) will pass the filter
-                if duration_minutes > max_duration_filter:
-                    continue
-            
-            candidates.append({
-                'task_id': task_id,
-                'task_name': task_name,
-                'relief_score': relief_score,
-                'cognitive_load': cognitive_load,
-                'emotional_load': emotional_load,
-                'duration_minutes': duration_minutes,
-                'historical_efficiency': historical_efficiency,
-                'default_estimate': default_estimate,
-            })
+        # Apply max_duration filter to duration_minutes (historical average if available)
+        # Note: tasks with 0 duration (unknown) will pass the filter
+        _, max_duration_filter = self._duration_filter_bounds(filters)
+        if max_duration_filter is not None:
+            candidates_df = candidates_df[~(candidates_df['duration_minutes'] > max_duration_filter)]
         
-        if not candidates:
+        if candidates_df.empty:
             return []
         
-        candidates_df = pd.DataFrame(candidates)
-        
         ranked = []
         
         # Always include highest relief pick
@@ -12689,13 +12887,11 @@ class Analytics:
             ranked.append(self._task_to_recommendation(row.iloc[0], "Lowest Emotional Load"))
         
         # Always include lowest net load pick (cognitive + emotional)
-        candidates_df['net_load'] = candidates_df['cognitive_load'] + candidates_df['emotional_load']
         row = candidates_df.sort_values('net_load', ascending=True).head(1)
         if not row.empty:
             ranked.append(self._task_to_recommendation(row.iloc[0], "Lowest Net Load"))
         
         # Always include net relief picks for variety
-        candidates_df['net_relief_proxy'] = candidates_df['relief_score'] - candidates_df['cognitive_load']
         # Highest Net Relief
         row = candidates_df.sort_values('net_relief_proxy', ascending=False).head(1)
         if not row.empty:
@@ -12714,6 +12910,146 @@ class Analytics:
         
         return [r for r in ranked if r]
 
+    def _get_task_features(self, user_id: Optional[int] = None) -> pd.DataFrame:
+        """Task x feature matrix over the user's completed instances (see recommendation_engine).
+        
+        One groupby over the instances frame, cached per user until their instances change.
+        The cached frame is shared; callers must not mutate it.
+        """
+        user_id = self._get_user_id(user_id)
+        cache_key = str(user_id) if user_id is not None else "default"
+        cached = self._task_features_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        instances_df = self._load_instances(user_id=user_id)
+        completed = instances_df[instances_df['completed_at'].astype(str).str.len() > 0] if not instances_df.empty else pd.DataFrame()
+        efficiency = self.calculate_efficiency_scores_batch(completed) if not completed.empty else None
+        features = recommendation_engine.task_feature_matrix(completed, efficiency)
+        self._task_features_cache[cache_key] = features
+        return features
+    
+    @staticmethod
+    def _template_candidates(tasks_df: pd.DataFrame, features: pd.DataFrame) -> pd.DataFrame:
+        """One candidate row per task template: the task's historical averages, or neutral defaults."""
+        default_estimate = pd.to_numeric(
+            tasks_df['default_estimate_minutes'] if 'default_estimate_minutes' in tasks_df.columns else pd.Series(0, index=tasks_df.index),
+            errors='coerce',
+        ).fillna(0.0).to_numpy(dtype=float)
+        stats = features.reindex(tasks_df['task_id'].to_numpy())
+        
+        def feature(column: str, default: float) -> np.ndarray:
+            return stats[column].fillna(default).to_numpy(dtype=float)
+        
+        # Historical duration if known (and non-zero), otherwise the template estimate
+        avg_duration = stats['avg_duration'].to_numpy(dtype=float)
+        duration_minutes = np.where(np.isnan(avg_duration) | (avg_duration == 0), default_estimate, avg_duration)
+        candidates = pd.DataFrame({
+            'task_id': tasks_df['task_id'].to_numpy(),
+            'task_name': tasks_df['name'].to_numpy(),
+            'relief_score': feature('avg_relief', 5.0),  # Default neutral
+            'cognitive_load': feature('avg_cognitive_load', 5.0),  # Default neutral
+            'emotional_load': feature('avg_emotional_load', 5.0),  # Default neutral
+            'duration_minutes': duration_minutes,
+            'historical_efficiency': feature('historical_efficiency', 0.0),
+            'default_estimate': default_estimate,
+            'stress_level': feature('avg_stress_level', 50.0),  # Neutral midpoint
+            'behavioral_score': feature('avg_behavioral_score', 50.0),  # Neutral adherence
+            'net_wellbeing_normalized': feature('avg_net_wellbeing', 50.0),  # Neutral wellbeing (normalized)
+            'physical_load': feature('avg_physical_load', 0.0),  # Default minimal physical load
+        })
+        # Derived metrics
+        candidates['net_load'] = candidates['cognitive_load'] + candidates['emotional_load']
+        candidates['net_relief_proxy'] = candidates['relief_score'] - candidates['cognitive_load']
+        return candidates
+    
+    @staticmethod
+    def _duration_filter_bounds(filters: Dict) -> Tuple[Optional[float], Optional[float]]:
+        """(min_duration, max_duration) from recommendation filters; None where unset or invalid."""
+        bounds = []
+        for key in ('min_duration', 'max_duration'):
+            bound = None
+            if filters.get(key):
+                try:
+                    bound = float(filters[key])
+                except (ValueError, TypeError):
+                    bound = None
+            bounds.append(bound)
+        return bounds[0], bounds[1]
+    
+    @staticmethod
+    def _categories_match(categories_str: Any, query: str) -> bool:
+        """True if any category in the JSON list contains query (unparseable categories pass)."""
+        try:
+            categories_list = json.loads(categories_str) if categories_str else []
+        except Exception:
+            # If categories can't be parsed, skip this filter
+            return True
+        if not isinstance(categories_list, list):
+            categories_list = []
+        return any(query in str(cat).lower() for cat in categories_list)
+    
+    def _template_filter_mask(self, tasks_df: pd.DataFrame, filters: Dict) -> np.ndarray:
+        """Rows of tasks_df that pass the task_type, is_recurring and categories filters."""
+        keep = np.ones(len(tasks_df), dtype=bool)
+        
+        def column(name: str, default: str) -> pd.Series:
+            if name in tasks_df.columns:
+                return tasks_df[name].fillna(default).astype(str)
+            return pd.Series(default, index=tasks_df.index)
+        
+        task_type_filter = filters.get('task_type')
+        if task_type_filter:
+            keep &= (column('task_type', '').str.strip() == str(task_type_filter).strip()).to_numpy(dtype=bool)
+        
+        is_recurring_filter = filters.get('is_recurring')
+        if is_recurring_filter:
+            recurring = (column('is_recurring', 'False').str.strip().str.lower() == 'true').to_numpy(dtype=bool)
+            filter_str = str(is_recurring_filter).strip().lower()
+            if filter_str == 'true':
+                keep &= recurring
+            elif filter_str == 'false':
+                keep &= ~recurring
+        
+        # Categories filter (search in categories JSON)
+        categories_filter = filters.get('categories')
+        categories_query = str(categories_filter).strip().lower() if categories_filter else ''
+        if categories_query:
+            categories = tasks_df['categories'].tolist() if 'categories' in tasks_df.columns else ['[]'] * len(tasks_df)
+            keep &= np.array([self._categories_match(c, categories_query) for c in categories], dtype=bool)
+        
+        return keep
+    
+    @staticmethod
+    def _recommendation_key(value: Any) -> str:
+        """Order-independent cache key part for a filters or weights dict."""
+        return json.dumps(value or {}, sort_keys=True, default=str)
+    
+    def _remember_recommendation_entry(self, store, user_key: str, key: Tuple, value: Any) -> None:
+        """Store value under store[user_key][key], keeping the newest entries per user."""
+        entries = store.setdefault(user_key, {})
+        entries.pop(key, None)
+        entries[key] = value
+        while len(entries) > self._recommendation_entries_per_user:
+            entries.pop(next(iter(entries)))
+    
+    def _recommendation_pool(self, user_key: str, pool_key: Tuple, build) -> recommendation_engine.CandidatePool:
+        """Cached candidate pool for (mode, filters, ...), built with build() on a miss."""
+        pool = self._recommendation_pools_cache.get(user_key, {}).get(pool_key)
+        if pool is None:
+            pool = build()
+            self._remember_recommendation_entry(self._recommendation_pools_cache, user_key, pool_key, pool)
+        return pool
+    
+    @staticmethod
+    def _copy_recommendations(ranked: List[Dict[str, Any]], metrics: List[str]) -> List[Dict[str, Any]]:
+        """Copy of cached recommendations with metric_values in the requested metric order."""
+        ranked = copy.deepcopy(ranked)
+        for rec in ranked:
+            values = rec.get('metric_values') or {}
+            rec['metric_values'] = {metric: values.get(metric) for metric in metrics}
+        return ranked
+    
     def recommendations_by_category(self, metrics: Union[str, List[str]], filters: Optional[Dict[str, float]] = None, limit: int = 3, user_id: Optional[int] = None) -> List[Dict[str, str]]:
         """Generate recommendations ranked by a set of metrics.
 
@@ -12721,7 +13057,6 @@ class Analytics:
         the score; high-is-good metrics add their value, and low-is-good metrics
         add (100 - value) to prioritize lower numbers.
         """
-        from .task_manager import TaskManager
         from .recommendation_logger import recommendation_logger
         
         filters = {**self.default_filters(), **(filters or {})}
@@ -12733,221 +13068,68 @@ class Analytics:
             metrics = [metrics]
         metrics = [m for m in metrics if m] or ["relief_score"]
         
-        # Which metrics are better when low
-        low_is_good = {
-            "cognitive_load",
-            "emotional_load",
-            "net_load",
-            "duration_minutes",
-            "stress_level",
-            "physical_load",
-        }
-        
         # Get user_id if not provided
         user_id = self._get_user_id(user_id)
         
-        # Load all task templates
-        task_manager = TaskManager()
-        all_tasks_df = task_manager.get_all(user_id=user_id)
-        if all_tasks_df.empty:
-            return []
-        
-        # Load historical instance data to inform recommendations
-        instances_df = self._load_instances(user_id=user_id)
-        
-        # Get historical averages per task from completed instances
-        completed = instances_df[instances_df['completed_at'].astype(str).str.len() > 0].copy() if not instances_df.empty else pd.DataFrame()
-        
-        # Calculate historical averages per task_id
-        task_stats = {}
-        if not completed.empty:
-            # Group by task_id and calculate averages
-            for task_id in completed['task_id'].unique():
-                task_completed = completed[completed['task_id'] == task_id]
-                if not task_completed.empty:
-                    # Convert columns to numeric before calculating means
-                    relief_series = pd.to_numeric(task_completed['relief_score'], errors='coerce')
-                    cognitive_series = pd.to_numeric(task_completed['cognitive_load'], errors='coerce')
-                    emotional_series = pd.to_numeric(task_completed['emotional_load'], errors='coerce')
-                    duration_series = pd.to_numeric(task_completed['duration_minutes'], errors='coerce')
-                    
-                    task_stats[task_id] = {
-                        'avg_relief': relief_series.mean() if relief_series.notna().any() else None,
-                        'avg_cognitive_load': cognitive_series.mean() if cognitive_series.notna().any() else None,
-                        'avg_emotional_load': emotional_series.mean() if emotional_series.notna().any() else None,
-                        'avg_duration': duration_series.mean() if duration_series.notna().any() else None,
-                        'avg_stress_level': pd.to_numeric(task_completed['stress_level'], errors='coerce').mean() if 'stress_level' in task_completed and task_completed['stress_level'].notna().any() else None,
-                        'avg_behavioral_score': pd.to_numeric(task_completed['behavioral_score'], errors='coerce').mean() if 'behavioral_score' in task_completed and task_completed['behavioral_score'].notna().any() else None,
-                        'avg_net_wellbeing': pd.to_numeric(task_completed['net_wellbeing_normalized'], errors='coerce').mean() if 'net_wellbeing_normalized' in task_completed and task_completed['net_wellbeing_normalized'].notna().any() else None,
-                        'avg_physical_load': pd.to_numeric(task_completed['physical_load'], errors='coerce').mean() if 'physical_load' in task_completed and task_completed['physical_load'].notna().any() else None,
-                        'count': len(task_completed),
-                    }
-        
-        # Get task efficiency history
-        task_efficiency = self.get_task_efficiency_history()
-        
-        # Build recommendation candidates from all task templates
-        candidates = []
-        
-        # Parse filters
-        max_duration_filter = None
-        if filters.get('max_duration'):
-            try:
-                max_duration_filter = float(filters['max_duration'])
-            except (ValueError, TypeError):
-                max_duration_filter = None
-        
-        min_duration_filter = None
-        if filters.get('min_duration'):
-            try:
-                min_duration_filter = float(filters['min_duration'])
-            except (ValueError, TypeError):
-                min_duration_filter = None
-        
-        task_type_filter = filters.get('task_type')
-        is_recurring_filter = filters.get('is_recurring')
-        categories_filter = filters.get('categories')
-        
-        for _, task_row in all_tasks_df.iterrows():
-            task_id = task_row['task_id']
-            task_name = task_row['name']
-            default_estimate = task_row.get('default_estimate_minutes', 0)
-            task_type = task_row.get('task_type', '')
-            is_recurring = task_row.get('is_recurring', 'False')
-            categories_str = task_row.get('categories', '[]')
-            
-            # Apply task_type filter
-            if task_type_filter:
-                if str(task_type).strip() != str(task_type_filter).strip():
-                    continue
-            
-            # Apply is_recurring filter
-            if is_recurring_filter:
-                is_recurring_str = str(is_recurring).strip().lower()
-                filter_str = str(is_recurring_filter).strip().lower()
-                if filter_str == 'true' and is_recurring_str != 'true':
-                    continue
-                elif filter_str == 'false' and is_recurring_str == 'true':
-                    continue
-            
-            # Apply categories filter (search in categories JSON)
-            if categories_filter:
-                categories_query = str(categories_filter).strip().lower()
-                if categories_query:
-                    try:
-                        import json
-                        categories_list = json.loads(categories_str) if categories_str else []
-                        if not isinstance(categories_list, list):
-                            categories_list = []
-                        # Check if any category matches the search query
-                        categories_match = any(
-                            categories_query in str(cat).lower() 
-                            for cat in categories_list
-                        )
-                        if not categories_match:
-                            continue
-                    except (json.JSONDecodeError, Exception):
-                        # If categories can't be parsed, skip this filter
-                        pass
-            
-            try:
-                default_estimate = float(default_estimate) if default_estimate else 0
-            except (ValueError, TypeError):
-                default_estimate = 0
-            
-            # Get historical stats for this task
-            stats = task_stats.get(task_id, {})
-            avg_relief = stats.get('avg_relief') if stats.get('avg_relief') is not None else None
-            avg_cognitive = stats.get('avg_cognitive_load') if stats.get('avg_cognitive_load') is not None else None
-            avg_emotional = stats.get('avg_emotional_load') if stats.get('avg_emotional_load') is not None else None
-            avg_duration = stats.get('avg_duration') if stats.get('avg_duration') is not None else default_estimate
-            historical_efficiency = task_efficiency.get(task_id, 0)
-            avg_stress = stats.get('avg_stress_level') if stats.get('avg_stress_level') is not None else None
-            avg_behavioral = stats.get('avg_behavioral_score') if stats.get('avg_behavioral_score') is not None else None
-            avg_net_wellbeing = stats.get('avg_net_wellbeing') if stats.get('avg_net_wellbeing') is not None else None
-            avg_physical = stats.get('avg_physical_load') if stats.get('avg_physical_load') is not None else None
-            
-            # Use historical data if available, otherwise use defaults
-            relief_score = avg_relief if avg_relief is not None else 5.0  # Default neutral
-            cognitive_load = avg_cognitive if avg_cognitive is not None else 5.0  # Default neutral
-            emotional_load = avg_emotional if avg_emotional is not None else 5.0  # Default neutral
-            stress_level = avg_stress if avg_stress is not None else 50.0  # Neutral midpoint
-            behavioral_score = avg_behavioral if avg_behavioral is not None else 50.0  # Neutral adherence
-            net_wellbeing = avg_net_wellbeing if avg_net_wellbeing is not None else 50.0  # Neutral wellbeing (normalized)
-            physical_load = avg_physical if avg_physical is not None else 0.0  # Default minimal physical load
-            duration_minutes = avg_duration if avg_duration else default_estimate
-            
-            # Apply duration filters
-            if max_duration_filter is not None:
-                if duration_minutes > max_duration_filter:
-                    continue
-            if min_duration_filter is not None:
-                if duration_minutes < min_duration_filter:
-                    continue
-            
-            candidates.append({
-                'task_id': task_id,
-                'task_name': task_name,
-                'relief_score': relief_score,
-                'cognitive_load': cognitive_load,
-                'emotional_load': emotional_load,
-                'duration_minutes': duration_minutes,
-                'historical_efficiency': historical_efficiency,
-                'default_estimate': default_estimate,
-                'stress_level': stress_level,
-                'behavioral_score': behavioral_score,
-                'net_wellbeing_normalized': net_wellbeing,
-                'physical_load': physical_load,
-            })
-        
-        if not candidates:
+        # Cached result for this metric set and filters, else rank the cached candidate pool
+        user_key = str(user_id) if user_id is not None else "default"
+        filters_key = self._recommendation_key(filters)
+        cache_key = ('templates', tuple(sorted(metrics)), filters_key, limit)
+        ranked = self._recommendations_cache.get(user_key, {}).get(cache_key)
+        if ranked is None:
+            pool = self._recommendation_pool(
+                user_key, ('templates', filters_key), lambda: self._template_pool(user_id, filters),
+            )
+            ranked = self._template_recommendations(pool.rank(metrics, limit), metrics) if len(pool) else []
+            self._remember_recommendation_entry(self._recommendations_cache, user_key, cache_key, ranked)
+        if not ranked:
             return []
+        ranked = self._copy_recommendations(ranked, metrics)
         
-        candidates_df = pd.DataFrame(candidates)
-        
-        # Calculate derived metrics
-        candidates_df['net_load'] = candidates_df['cognitive_load'] + candidates_df['emotional_load']
-        candidates_df['net_relief_proxy'] = candidates_df['relief_score'] - candidates_df['cognitive_load']
-        
-        # Scoring helper: high-good adds value; low-good adds (100 - value)
-        def metric_score(metric_name: str, value: float) -> float:
-            try:
-                v = float(value) if value is not None else 0.0
-            except (ValueError, TypeError):
-                v = 0.0
-            if metric_name in low_is_good:
-                return max(0.0, 100.0 - v)
-            return v
-        
-        # Compute score per task
-        scores = []
-        for _, row in candidates_df.iterrows():
-            score_total = 0.0
-            for metric in metrics:
-                score_total += metric_score(metric, row.get(metric))
-            scores.append(score_total)
-        candidates_df['score'] = scores
-        
-        # Normalize scores to 0-100 range
-        # Use absolute normalization based on max possible score, not relative to candidates
-        # This ensures meaningful scores even with only one candidate
-        if len(scores) > 0:
-            num_metrics = len(metrics) if metrics else 1
-            max_possible_score = num_metrics * 100.0  # Each metric can contribute up to 100
-            
-            if max_possible_score > 0:
-                # Normalize: (score / max_possible) * 100
-                candidates_df['score_normalized'] = (candidates_df['score'] / max_possible_score) * 100.0
-                # Clamp to 0-100 range
-                candidates_df['score_normalized'] = candidates_df['score_normalized'].clip(0.0, 100.0)
-            else:
-                candidates_df['score_normalized'] = 50.0
-        else:
-            candidates_df['score_normalized'] = 50.0
+        # Log recommendation generation
+        try:
+            from .recommendation_logger import recommendation_logger
+            metric_list = metrics if isinstance(metrics, list) else [metrics] if metrics else []
+            recommendation_logger.log_recommendation_generated(
+                mode='templates',
+                metrics=metric_list,
+                filters=filters,
+                recommendations=ranked
+            )
+        except Exception as e:
+            # Don't fail if logging fails
+            import warnings
+            warnings.warn(f"Failed to log recommendations: {e}")
         
-        # Sort by score descending and take top N
-        top_n = candidates_df.sort_values('score', ascending=False).head(limit)
+        return ranked
+
+    def _template_pool(self, user_id: Optional[int], filters: Dict) -> recommendation_engine.CandidatePool:
+        """Task templates passing the filters, as a candidate pool for recommendations_by_category."""
+        from .task_manager import TaskManager
         
+        # Load all task templates
+        task_manager = TaskManager()
+        all_tasks_df = task_manager.get_all(user_id=user_id)
+        if all_tasks_df.empty:
+            return recommendation_engine.CandidatePool(pd.DataFrame())
+        
+        # Candidates from all task templates (historical averages from the cached feature matrix)
+        candidates_df = self._template_candidates(all_tasks_df, self._get_task_features(user_id))
+        
+        # Apply filters as one mask over the candidates
+        keep = self._template_filter_mask(all_tasks_df, filters)
+        min_duration_filter, max_duration_filter = self._duration_filter_bounds(filters)
+        duration = candidates_df['duration_minutes'].to_numpy()
+        if max_duration_filter is not None:
+            keep &= ~(duration > max_duration_filter)
+        if min_duration_filter is not None:
+            keep &= ~(duration < min_duration_filter)
+        candidates_df = candidates_df[keep]
+        
+        return recommendation_engine.CandidatePool(candidates_df)
+    
+    def _template_recommendations(self, top_n: pd.DataFrame, metrics: List[str]) -> List[Dict[str, Any]]:
+        """Recommendation dicts for ranked template candidates."""
         ranked = []
         for idx, (_, row) in enumerate(top_n.iterrows()):
             # Collect only the metrics the user selected
@@ -12987,23 +13169,8 @@ class Analytics:
                 'emotional_load': row.get('emotional_load'),
             })
         
-        # Log recommendation generation
-        try:
-            from .recommendation_logger import recommendation_logger
-            metric_list = metrics if isinstance(metrics, list) else [metrics] if metrics else []
-            recommendation_logger.log_recommendation_generated(
-                mode='templates',
-                metrics=metric_list,
-                filters=filters,
-                recommendations=ranked
-            )
-        except Exception as e:
-            # Don't fail if logging fails
-            import warnings
-            warnings.warn(f"Failed to log recommendations: {e}")
-        
         return ranked
-
+    
     def recommendations_from_instances(self, metrics: Union[str, List[str]], filters: Optional[Dict[str, float]] = None, limit: int = 3, user_id: Optional[int] = None) -> List[Dict[str, str]]:
         """Generate recommendations from initialized (non-completed) task instances.
         
@@ -13018,8 +13185,6 @@ class Analytics:
         Returns:
             List of recommendation dicts with instance_id, task_name, score, and metric_values
         """
-        from .instance_manager import InstanceManager
-        
         filters = {**self.default_filters(), **(filters or {})}
         
         # Normalize metrics input
@@ -13029,20 +13194,62 @@ class Analytics:
             metrics = [metrics]
         metrics = [m for m in metrics if m] or ["relief_score"]
         
-        # Which metrics are better when low
-        low_is_good = {
-            "cognitive_load",
-            "emotional_load",
-            "net_load",
-            "duration_minutes",
-            "stress_level",
-            "physical_load",
-        }
-        
         # Get user_id if not provided
         if user_id is None:
             user_id = self._get_user_id(user_id)
         
+        # Task horizon and recommendation weights for urgency
+        try:
+            from .user_state import UserStateManager
+            _user_state = UserStateManager()
+            task_horizon_days = _user_state.get_task_horizon_days(str(user_id))
+            recommendation_weights = _user_state.get_recommendation_weights(str(user_id))
+        except Exception:
+            task_horizon_days = 14
+            recommendation_weights = {}
+        
+        # Cached result for this metric set, filters and settings, else rank the cached candidate pool.
+        # Urgency is time-dependent, so instance pools rely on the cache TTL to pick up its drift.
+        user_key = str(user_id) if user_id is not None else "default"
+        filters_key = self._recommendation_key(filters)
+        weights_key = self._recommendation_key(recommendation_weights)
+        cache_key = ('instances', tuple(sorted(metrics)), filters_key, limit, weights_key, task_horizon_days)
+        ranked = self._recommendations_cache.get(user_key, {}).get(cache_key)
+        if ranked is None:
+            pool = self._recommendation_pool(
+                user_key, ('instances', filters_key, task_horizon_days),
+                lambda: self._instance_pool(user_id, filters, task_horizon_days),
+            )
+            ranked = (
+                self._instance_recommendations(pool.rank(metrics, limit, weights=recommendation_weights), metrics)
+                if len(pool) else []
+            )
+            self._remember_recommendation_entry(self._recommendations_cache, user_key, cache_key, ranked)
+        if not ranked:
+            return []
+        ranked = self._copy_recommendations(ranked, metrics)
+        
+        # Log recommendation generation
+        try:
+            from .recommendation_logger import recommendation_logger
+            metric_list = metrics if isinstance(metrics, list) else [metrics] if metrics else []
+            recommendation_logger.log_recommendation_generated(
+                mode='instances',
+                metrics=metric_list,
+                filters=filters,
+                recommendations=ranked
+            )
+        except Exception as e:
+            # Don't fail if logging fails
+            import warnings
+            warnings.warn(f"Failed to log recommendations: {e}")
+        
+        return ranked
+
+    def _instance_pool(self, user_id: Optional[int], filters: Dict, task_horizon_days: int) -> recommendation_engine.CandidatePool:
+        """Active instances passing the filters, as a candidate pool for recommendations_from_instances."""
+        from .instance_manager import InstanceManager
+        
         # Get all active (non-completed) instances; optionally include completed/cancelled per filter
         instance_manager = InstanceManager()
         active_instances = instance_manager.list_active_instances(user_id=user_id)
@@ -13058,56 +13265,27 @@ class Analytics:
             except Exception:
                 pass
         if not active_instances:
-            return []
+            return recommendation_engine.CandidatePool(pd.DataFrame())
         
         # Load task templates to get task metadata
         from .task_manager import TaskManager
         task_manager = TaskManager()
         tasks_df = task_manager.get_all(user_id=user_id)
         
-        # Parse filters
-        max_duration_filter = None
-        if filters.get('max_duration'):
-            try:
-                max_duration_filter = float(filters['max_duration'])
-            except (ValueError, TypeError):
-                max_duration_filter = None
-        
-        min_duration_filter = None
-        if filters.get('min_duration'):
-            try:
-                min_duration_filter = float(filters['min_duration'])
-            except (ValueError, TypeError):
-                min_duration_filter = None
-        
-        task_type_filter = filters.get('task_type')
-        is_recurring_filter = filters.get('is_recurring')
-        categories_filter = filters.get('categories')
-        
-        # Task horizon and recommendation weights for urgency
-        try:
-            from .user_state import UserStateManager
-            _user_state = UserStateManager()
-            task_horizon_days = _user_state.get_task_horizon_days(str(user_id))
-            recommendation_weights = _user_state.get_recommendation_weights(str(user_id))
-        except Exception:
-            task_horizon_days = 14
-            recommendation_weights = {}
-        
-        # Load historical instance data to get averages for relief_score fallback
-        instances_df = self._load_instances(user_id=user_id)
-        completed = instances_df[instances_df['completed_at'].astype(str).str.len() > 0].copy() if not instances_df.empty else pd.DataFrame()
-        
-        # Calculate historical averages per task_id (for relief_score fallback)
-        task_stats = {}
-        if not completed.empty:
-            for task_id in completed['task_id'].unique():
-                task_completed = completed[completed['task_id'] == task_id]
-                if not task_completed.empty:
-                    relief_series = pd.to_numeric(task_completed['relief_score'], errors='coerce')
-                    task_stats[task_id] = {
-                        'avg_relief': relief_series.mean() if relief_series.notna().any() else None,
-                    }
+        # Template info per task_id; the task_type / is_recurring / categories filters apply to
+        # instances whose template is known, so they reduce to a set of excluded task_ids
+        task_infos = {}
+        excluded_task_ids = set()
+        if not tasks_df.empty:
+            templates = tasks_df.drop_duplicates('task_id')
+            task_infos = {info['task_id']: info for info in templates.to_dict('records')}
+            excluded_task_ids = set(templates['task_id'][~self._template_filter_mask(templates, filters)])
+        min_duration_filter, max_duration_filter = self._duration_filter_bounds(filters)
+        
+        # Historical averages per task_id (relief_score fallback) and efficiency, from the cached feature matrix
+        features = self._get_task_features(user_id)
+        avg_relief_by_task = features['avg_relief'].dropna().to_dict()
+        efficiency_by_task = features['historical_efficiency'].dropna().to_dict()
         
         # Build recommendation candidates from active instances
         candidates = []
@@ -13117,47 +13295,10 @@ class Analytics:
             task_id = instance.get('task_id')
             task_name = instance.get('task_name', '')
             
-            # Get task template info for filtering
-            task_info = None
-            if not tasks_df.empty and task_id:
-                task_rows = tasks_df[tasks_df['task_id'] == task_id]
-                if not task_rows.empty:
-                    task_info = task_rows.iloc[0].to_dict()
-            
-            # Apply task_type filter
-            if task_type_filter and task_info:
-                task_type = task_info.get('task_type', '')
-                if str(task_type).strip() != str(task_type_filter).strip():
-                    continue
-            
-            # Apply is_recurring filter
-            if is_recurring_filter and task_info:
-                is_recurring = task_info.get('is_recurring', 'False')
-                is_recurring_str = str(is_recurring).strip().lower()
-                filter_str = str(is_recurring_filter).strip().lower()
-                if filter_str == 'true' and is_recurring_str != 'true':
-                    continue
-                elif filter_str == 'false' and is_recurring_str == 'true':
-                    continue
-            
-            # Apply categories filter
-            if categories_filter and task_info:
-                categories_query = str(categories_filter).strip().lower()
-                if categories_query:
-                    try:
-                        import json
-                        categories_str = task_info.get('categories', '[]')
-                        categories_list = json.loads(categories_str) if categories_str else []
-                        if not isinstance(categories_list, list):
-                            categories_list = []
-                        categories_match = any(
-                            categories_query in str(cat).lower() 
-                            for cat in categories_list
-                        )
-                        if not categories_match:
-                            continue
-                    except (json.JSONDecodeError, Exception):
-                        pass
+            # Get task template info; apply template filters
+            task_info = task_infos.get(task_id) if task_id else None
+            if task_info and task_id in excluded_task_ids:
+                continue
             
             # Extract predicted data from instance (initialization values)
             predicted_str = instance.get('predicted', '{}')
@@ -13239,8 +13380,7 @@ class Analytics:
                 relief_score = expected_relief
             else:
                 # Try to get historical average for this task from completed instances
-                stats = task_stats.get(task_id, {}) if task_id else {}
-                avg_relief = stats.get('avg_relief')
+                avg_relief = avg_relief_by_task.get(task_id) if task_id else None
                 relief_score = avg_relief if avg_relief is not None else 50.0
             
             # Expected aversion (for stress calculation)
@@ -13276,8 +13416,7 @@ class Analytics:
             net_relief_proxy = relief_score - cognitive_load
             
             # Get historical efficiency if available
-            task_efficiency = self.get_task_efficiency_history()
-            historical_efficiency = task_efficiency.get(task_id, 0.0) if task_id else 0.0
+            historical_efficiency = efficiency_by_task.get(task_id, 0.0) if task_id else 0.0
             
             # Get initialization notes (description) from predicted field
             description = predicted.get('description', '') or ''
@@ -13321,50 +13460,13 @@ class Analytics:
             })
         
         if not candidates:
-            return []
+            return recommendation_engine.CandidatePool(pd.DataFrame())
         
         candidates_df = pd.DataFrame(candidates)
-        
-        # Scoring helper: high-good adds value; low-good adds (100 - value)
-        def metric_score(metric_name: str, value: float) -> float:
-            try:
-                v = float(value) if value is not None else 0.0
-            except (ValueError, TypeError):
-                v = 0.0
-            if metric_name in low_is_good:
-                return max(0.0, 100.0 - v)
-            return v
-        
-        # Compute score per instance (weighted: urgency_weight capped in user_state)
-        scores = []
-        for _, row in candidates_df.iterrows():
-            score_total = 0.0
-            for metric in metrics:
-                w = recommendation_weights.get(metric, 1.0)
-                score_total += w * metric_score(metric, row.get(metric))
-            scores.append(score_total)
-        candidates_df['score'] = scores
-        
-        # Normalize scores to 0-100 range
-        # Use absolute normalization based on max possible score, not relative to candidates
-        # This ensures meaningful scores even with only one candidate
-        if len(scores) > 0:
-            num_metrics = len(metrics) if metrics else 1
-            max_possible_score = num_metrics * 100.0  # Each metric can contribute up to 100
-            
-            if max_possible_score > 0:
-                # Normalize: (score / max_possible) * 100
-                candidates_df['score_normalized'] = (candidates_df['score'] / max_possible_score) * 100.0
-                # Clamp to 0-100 range
-                candidates_df['score_normalized'] = candidates_df['score_normalized'].clip(0.0, 100.0)
-            else:
-                candidates_df['score_normalized'] = 50.0
-        else:
-            candidates_df['score_normalized'] = 50.0
-        
-        # Sort by score descending and take top N
-        top_n = candidates_df.sort_values('score', ascending=False).head(limit)
-        
+        return recommendation_engine.CandidatePool(candidates_df)
+    
+    def _instance_recommendations(self, top_n: pd.DataFrame, metrics: List[str]) -> List[Dict[str, Any]]:
+        """Recommendation dicts for ranked instance candidates."""
         ranked = []
         for idx, (_, row) in enumerate(top_n.iterrows()):
             # Collect only the metrics the user selected
@@ -13409,23 +13511,8 @@ class Analytics:
                 'emotional_load': row.get('emotional_load'),
             })
         
-        # Log recommendation generation
-        try:
-            from .recommendation_logger import recommendation_logger
-            metric_list = metrics if isinstance(metrics, list) else [metrics] if metrics else []
-            recommendation_logger.log_recommendation_generated(
-                mode='instances',
-                metrics=metric_list,
-                filters=filters,
-                recommendations=ranked
-            )
-        except Exception as e:
-            # Don't fail if logging fails
-            import warnings
-            warnings.warn(f"Failed to log recommendations: {e}")
-        
         return ranked
-
+    
     def _row_to_recommendation(self, row_df: pd.DataFrame, label: str) -> Optional[Dict[str, str]]:
         """Legacy method for instance-based recommendations."""
         if row_df is None or row_df.empty:
@@ -13503,25 +13590,21 @@ class Analytics:
         user_id = self._get_user_id(user_id)
         
         # Check cache (cache is now user-specific, keyed by user_id)
-        cache_key = user_id if user_id is not None else "default"
-        current_time = time.time()
-        if (cache_key in self._trend_series_cache and 
-            cache_key in self._trend_series_cache_time and
-            (current_time - self._trend_series_cache_time[cache_key]) < self._cache_ttl_seconds):
+        cache_key = str(user_id) if user_id is not None else "default"
+        cached = self._trend_series_cache.get(cache_key)
+        if cached is not None:
             duration = (time.perf_counter() - start) * 1000
             print(f"[Analytics] trend_series (cached): {duration:.2f}ms")
-            return self._trend_series_cache[cache_key].copy()
+            return cached.copy()
         df = self._load_instances(user_id=user_id)
         if df.empty:
             result = pd.DataFrame(columns=['completed_at', 'daily_relief_score', 'cumulative_relief_score'])
             self._trend_series_cache[cache_key] = result.copy()
-            self._trend_series_cache_time[cache_key] = time.time()
             return result
         completed = df[df['completed_at'].astype(str).str.len() > 0]
         if completed.empty:
             result = pd.DataFrame(columns=['completed_at', 'daily_relief_score', 'cumulative_relief_score'])
-            self._trend_series_cache = result.copy()
-            self._trend_series_cache_time = time.time()
+            self._trend_series_cache[cache_key] = result.copy()
             return result
 
         # Ensure datetime and numeric relief
@@ -13532,8 +13615,7 @@ class Analytics:
 
         if completed.empty:
             result = pd.DataFrame(columns=['completed_at', 'daily_relief_score', 'cumulative_relief_score'])
-            self._trend_series_cache = result.copy()
-            self._trend_series_cache_time = time.time()
+            self._trend_series_cache[cache_key] = result.copy()
             return result
 
         # Aggregate relief per day, then compute cumulative total over time
@@ -13553,7 +13635,6 @@ class Analytics:
         
         # Store in cache
         self._trend_series_cache[cache_key] = result.copy()
-        self._trend_series_cache_time[cache_key] = time.time()
         
         duration = (time.perf_counter() - start) * 1000
         print(f"[Analytics] trend_series: {duration:.2f}ms")
@@ -13567,20 +13648,17 @@ class Analytics:
         
         # Check cache
         # Cache is now user-specific, keyed by user_id
-        cache_key = user_id if user_id is not None else "default"
-        current_time = time.time()
-        if (cache_key in self._attribute_distribution_cache and 
-            cache_key in self._attribute_distribution_cache_time and
-            (current_time - self._attribute_distribution_cache_time[cache_key]) < self._cache_ttl_seconds):
+        cache_key = str(user_id) if user_id is not None else "default"
+        cached = self._attribute_distribution_cache.get(cache_key)
+        if cached is not None:
             duration = (time.perf_counter() - start) * 1000
             print(f"[Analytics] attribute_distribution (cached): {duration:.2f}ms")
-            return self._attribute_distribution_cache[cache_key].copy()
+            return cached.copy()
         
         df = self._load_instances(user_id=user_id)
         if df.empty:
             result = pd.DataFrame(columns=['attribute', 'value'])
             self._attribute_distribution_cache[cache_key] = result.copy()
-            self._attribute_distribution_cache_time[cache_key] = time.time()
             return result
         melted_frames = []
         
@@ -13632,7 +13710,6 @@ class Analytics:
         if not melted_frames:
             result = pd.DataFrame(columns=['attribute', 'value'])
             self._attribute_distribution_cache[cache_key] = result.copy()
-            self._attribute_distribution_cache_time[cache_key] = time.time()
             duration = (time.perf_counter() - start) * 1000
             print(f"[Analytics] attribute_distribution: {duration:.2f}ms (no data)")
             return result
@@ -13641,7 +13718,6 @@ class Analytics:
         
         # Store in cache
         self._attribute_distribution_cache[cache_key] = result.copy()
-        self._attribute_distribution_cache_time[cache_key] = time.time()
         
         duration = (time.perf_counter() - start) * 1000
         print(f"[Analytics] attribute_distribution: {duration:.2f}ms")
@@ -13784,7 +13860,7 @@ class Analytics:
             )
             # Invalidate relief_summary cache since completion_efficiency_score calculation may have changed
             # This ensures monitored metrics get fresh data when viewing trends
-            Analytics._invalidate_relief_summary_cache()
+            Analytics._invalidate_relief_summary_cache(user_id)
         elif attribute_key == 'grit_score':
             # Calculate grit score for trend data
             # Count how many times each task has been completed
@@ -13794,9 +13870,18 @@ class Analytics:
                 for task_id, count in task_counts.items():
                     task_completion_counts[task_id] = int(count)
             
-            # Calculate grit score (pass df to avoid N+1 in persistence factor)
+            # Calculate grit score; persistence factors for all rows in one pass
+            persistence = pd.Series(
+                self.calculate_window_factors_batch(
+                    completed, task_completion_counts=task_completion_counts, instances_df=df
+                )['persistence_factor'],
+                index=completed.index
+            )
             completed['grit_score'] = completed.apply(
-                lambda row: self.calculate_grit_score(row, task_completion_counts, instances_df=df),
+                lambda row: self.calculate_grit_score(
+                    row, task_completion_counts, instances_df=df,
+                    persistence_factor=float(persistence.at[row.name])
+                ),
                 axis=1
             )
         elif attribute_key == 'execution_score':
@@ -14188,15 +14273,13 @@ class Analytics:
         user_id = self._get_user_id(user_id)
         
         # Check cache (cache is now user-specific, keyed by user_id)
-        cache_key = user_id if user_id is not None else "default"
-        current_time = time.time()
-        if (cache_key in self._stress_dimension_cache and 
-            cache_key in self._stress_dimension_cache_time and
-            (current_time - self._stress_dimension_cache_time[cache_key]) < self._cache_ttl_seconds):
+        cache_key = str(user_id) if user_id is not None else "default"
+        cached = self._stress_dimension_cache.get(cache_key)
+        if cached is not None:
             duration = (time.perf_counter() - start) * 1000
             print(f"[Analytics] get_stress_dimension_data (cached): {duration:.2f}ms")
             # Deep copy to prevent mutation
-            return copy.deepcopy(self._stress_dimension_cache[cache_key])
+            return copy.deepcopy(cached)
         
         df = self._load_instances(user_id=user_id)
         
@@ -14210,7 +14293,6 @@ class Analytics:
                 'physical': {'total': 0.0, 'avg_7d': 0.0, 'daily': []},
             }
             self._stress_dimension_cache[cache_key] = copy.deepcopy(result)
-            self._stress_dimension_cache_time[cache_key] = time.time()
             return result
         
         completed = df[df['completed_at'].astype(str).str.len() > 0].copy()
@@ -14222,7 +14304,6 @@ class Analytics:
                 'physical': {'total': 0.0, 'avg_7d': 0.0, 'daily': []},
             }
             self._stress_dimension_cache[cache_key] = copy.deepcopy(result)
-            self._stress_dimension_cache_time[cache_key] = time.time()
             return result
         
         # Convert to numeric and calculate dimensions
@@ -14297,7 +14378,6 @@ class Analytics:
         
         # Store in cache (deep copy to prevent mutation)
         self._stress_dimension_cache[cache_key] = copy.deepcopy(result)
-        self._stress_dimension_cache_time[cache_key] = time.time()
         
         duration = (time.perf_counter() - start) * 1000
         print(f"[Analytics] get_stress_dimension_data: {duration:.2f}ms")
@@ -14615,9 +14695,18 @@ class Analytics:
                 for task_id, count in task_counts.items():
                     task_completion_counts[task_id] = int(count)
             
-            # Calculate grit score (pass df to avoid N+1 in persistence factor)
+            # Calculate grit score; persistence factors for all rows in one pass
+            persistence = pd.Series(
+                self.calculate_window_factors_batch(
+                    completed, task_completion_counts=task_completion_counts, instances_df=df
+                )['persistence_factor'],
+                index=completed.index
+            )
             completed['grit_score'] = completed.apply(
-                lambda row: self.calculate_grit_score(row, task_completion_counts, instances_df=df),
+                lambda row: self.calculate_grit_score(
+                    row, task_completion_counts, instances_df=df,
+                    persistence_factor=float(persistence.at[row.name])
+                ),
                 axis=1
             )
         
@@ -15312,6 +15401,81 @@ class Analytics:
             return 0.0
 
 
+def _register_analytics_caches() -> None:
+    """Declare what each Analytics cache is derived from (see backend/cache_registry.py).
+
+    The instances frames are gap-filtered, so everything built on them also
+    depends on the gap preference. Products that read task templates (task_type,
+    categories) or productivity/target-hour settings declare those inputs.
+    """
+    A = Analytics
+    on_instances = (INSTANCES, GAP_PREFERENCE)
+    cache_registry.register(
+        'analytics.instances',
+        (A._instances_cache_all, A._instances_cache_completed),
+        on_instances,
+    )
+    cache_registry.register(
+        'analytics.dashboard_metrics',
+        (A._dashboard_metrics_cache,),
+        on_instances + (TASKS, PRODUCTIVITY_SETTINGS),
+    )
+    cache_registry.register(
+        'analytics.relief_summary',
+        (A._relief_summary_cache,),
+        on_instances + (TASKS, PRODUCTIVITY_SETTINGS),
+    )
+    cache_registry.register(
+        'analytics.life_balance',
+        (A._life_balance_cache,),
+        on_instances + (TASKS,),
+    )
+    cache_registry.register(
+        'analytics.composite_scores',
+        (A._composite_scores_cache,),
+        on_instances + (TASKS, PRODUCTIVITY_SETTINGS),
+    )
+    cache_registry.register(
+        'analytics.time_tracking',
+        (A._time_tracking_cache,),
+        on_instances + (TASKS,),
+    )
+    cache_registry.register(
+        'analytics.trend_series',
+        (A._trend_series_cache,),
+        on_instances,
+    )
+    cache_registry.register(
+        'analytics.attribute_distribution',
+        (A._attribute_distribution_cache,),
+        on_instances,
+    )
+    cache_registry.register(
+        'analytics.stress_dimension',
+        (A._stress_dimension_cache,),
+        on_instances,
+    )
+    cache_registry.register('analytics.rankings', (A._rankings_cache,), on_instances)
+    cache_registry.register(
+        'analytics.leaderboard',
+        (A._leaderboard_cache,),
+        on_instances,
+    )
+    cache_registry.register(
+        'analytics.task_features',
+        (A._task_features_cache,),
+        on_instances,
+    )
+    cache_registry.register(
+        'analytics.recommendations',
+        (A._recommendation_pools_cache, A._recommendations_cache),
+        on_instances + (TASKS,),
+    )
+
+
+_register_analytics_caches()
+
+
 # Library references for documentation / UI hints
 SUGGESTED_ANALYTICS_LIBRARIES = [
     "Plotly Express (interactive, declarative)",
@@ -0,0 +1,209 @@
+# backend/analytics_pool.py
+"""
+Process pool for CPU-heavy Analytics entry points.
+
+All analytics used to run in the NiceGUI/uvicorn process, so one cold
+get_analytics_page_data() held the GIL and stalled timers, websockets and page
+loads for every connected client. The entry points in OFFLOADED_METHODS run in
+worker processes instead and their (picklable) results come back through a
+concurrent.futures.Future:
+
+    data = await run_analytics('get_emotional_flow_data', user_id=uid)   # async handlers
+    data = run_analytics_sync('get_analytics_page_data', days=7, user_id=uid)  # background threads
+
+Each worker process keeps its own Analytics instance and caches. Writes in the
+server process invalidate caches through cache_registry; the pool listens and
+bumps a per-user epoch that is sent with every call, and a worker drops its
+cached products for the user when the epoch it last saw differs. The worker's
+user preferences cache (backend.user_state) is dropped with them: it is not a
+registered product, and settings feed many of the products.
+
+Pool size: ANALYTICS_PROCESSES (default min(2, cpu count)). 0 runs everything
+in-process (no pool). Calls without an explicit user_id also run in-process,
+since workers have no request context to resolve the current user. A broken
+pool (worker crashed) is replaced and the call falls back to in-process.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Dict, Optional, Tuple
+
+OFFLOADED_METHODS = frozenset({
+    'get_analytics_page_data',
+    'get_relief_summary',
+    'get_grit_breakdown_df',
+    'get_emotional_flow_data',
+})
+
+_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+_local_analytics = None
+# Cache epochs in the server process: bumped on every cache_registry invalidation
+_global_epoch = 0
+_user_epochs: Dict[str, int] = {}
+
+
+def _pool_size() -> int:
+    default = min(2, os.cpu_count() or 1)
+    try:
+        return max(0, int(os.getenv('ANALYTICS_PROCESSES', str(default))))
+    except ValueError:
+        return default
+
+
+def _on_invalidate(input_name: str, user_id: Optional[int]):
+    global _global_epoch
+    with _lock:
+        if user_id is None:
+            _global_epoch += 1
+        else:
+            key = str(user_id)
+            _user_epochs[key] = _user_epochs.get(key, 0) + 1
+
+
+def _epochs(user_id: Optional[int]) -> Tuple[int, int]:
+    with _lock:
+        return _global_epoch, _user_epochs.get(str(user_id), 0)
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            return _executor
+        size = _pool_size()
+        if size == 0:
+            return None
+        # spawn: workers must not inherit the server's threads, locks or DB connections
+        _executor = ProcessPoolExecutor(max_workers=size, mp_context=get_context('spawn'))
+    from backend.cache_registry import cache_registry
+    cache_registry.add_listener(_on_invalidate)
+    print(f"[AnalyticsPool] Started analytics process pool ({size} process(es))")
+    return _executor
+
+
+def _reset_executor(broken: ProcessPoolExecutor):
+    global _executor
+    with _lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_analytics_pool():
+    """Shut down the worker processes (server shutdown)."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_local(method: str, kwargs: Dict[str, Any]) -> Any:
+    global _local_analytics
+    if _local_analytics is None:
+        from backend.analytics import Analytics
+        _local_analytics = Analytics()
+    return getattr(_local_analytics, method)(**kwargs)
+
+
+# --- Worker process side ---
+
+_worker_analytics = None
+_worker_global_epoch = 0
+_worker_user_epochs: Dict[str, int] = {}
+
+
+def _run_in_worker(method: str, kwargs: Dict[str, Any], global_epoch: int, user_epoch: int) -> Any:
+    """Entry point executed in a worker process."""
+    global _worker_analytics, _worker_global_epoch
+    from backend.analytics import Analytics
+    from backend.cache_registry import INPUTS, cache_registry
+    from backend.user_state import invalidate_preferences_cache
+
+    if _worker_analytics is None:
+        _worker_analytics = Analytics()
+    if global_epoch != _worker_global_epoch:
+        for input_name in INPUTS:
+            cache_registry.invalidate(input_name, None)
+        invalidate_preferences_cache()
+        _worker_global_epoch = global_epoch
+        _worker_user_epochs.clear()
+    user_id = kwargs.get('user_id')
+    key = str(user_id)
+    if _worker_user_epochs.get(key, 0) != user_epoch:
+        for input_name in INPUTS:
+            cache_registry.invalidate(input_name, user_id)
+        if user_id is not None:
+            invalidate_preferences_cache(user_id)
+        _worker_user_epochs[key] = user_epoch
+    return getattr(_worker_analytics, method)(**kwargs)
+
+
+# --- Server process API ---
+
+def _submit_to_pool(method: str, kwargs: Dict[str, Any]) -> Tuple[Optional[ProcessPoolExecutor], Optional[Future]]:
+    if method not in OFFLOADED_METHODS:
+        raise ValueError(f"Analytics method not offloadable: {method}")
+    executor = _get_executor() if kwargs.get('user_id') is not None else None
+    if executor is None:
+        return None, None
+    try:
+        return executor, executor.submit(_run_in_worker, method, kwargs, *_epochs(kwargs['user_id']))
+    except (BrokenProcessPool, RuntimeError) as e:
+        print(f"[AnalyticsPool] Pool unavailable ({e}); running {method} in-process")
+        _reset_executor(executor)
+        return None, None
+
+
+def submit(method: str, **kwargs) -> Future:
+    """Run Analytics.<method>(**kwargs) in the process pool.
+
+    Returns:
+        Future with the method's result. When the call cannot use the pool it
+        runs in-process before returning and the Future is already done.
+
+    Raises:
+        ValueError: method is not in OFFLOADED_METHODS
+    """
+    _, future = _submit_to_pool(method, kwargs)
+    if future is not None:
+        return future
+    future = Future()
+    try:
+        future.set_result(_run_local(method, kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def run_analytics_sync(method: str, **kwargs) -> Any:
+    """Blocking variant of run_analytics() for background threads."""
+    executor, future = _submit_to_pool(method, kwargs)
+    if future is None:
+        return _run_local(method, kwargs)
+    try:
+        return future.result()
+    except BrokenProcessPool as e:
+        print(f"[AnalyticsPool] Worker process died ({e}); running {method} in-process")
+        _reset_executor(executor)
+        return _run_local(method, kwargs)
+
+
+async def run_analytics(method: str, **kwargs) -> Any:
+    """Run Analytics.<method>(**kwargs) in the process pool without blocking the event loop.
+
+    In-process fallbacks run in the loop's default thread pool.
+    """
+    loop = asyncio.get_running_loop()
+    executor, future = _submit_to_pool(method, kwargs)
+    if future is not None:
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool as e:
+            print(f"[AnalyticsPool] Worker process died ({e}); running {method} in-process")
+            _reset_executor(executor)
+    return await loop.run_in_executor(None, lambda: _run_local(method, kwargs))
@@ -73,6 +73,13 @@ def create_session(user_id: int, email: str) -> str:
         'created_at': datetime.utcnow().isoformat(),
         'expires_at': expires_at.isoformat()
     }
+
+    # Warm the user's dashboard / analytics payloads in the background
+    try:
+        from backend.precompute_worker import schedule_precompute
+        schedule_precompute(user_id, delay=0)
+    except Exception as e:
+        print(f"[Auth] Warning: could not schedule precompute for user {user_id}: {e}")
     
     return token
 
@@ -203,30 +210,10 @@ def clear_all_caches():
         # Clear Analytics class-level caches
         try:
             from backend.analytics import Analytics
-            # Clear all Analytics class-level cache variables (now user-specific dictionaries)
-            Analytics._relief_summary_cache.clear()
-            Analytics._relief_summary_cache_time.clear()
-            Analytics._composite_scores_cache.clear()
-            Analytics._composite_scores_cache_time.clear()
-            Analytics._instances_cache_all.clear()
-            Analytics._instances_cache_all_time.clear()
-            Analytics._instances_cache_completed.clear()
-            Analytics._instances_cache_completed_time.clear()
-            Analytics._dashboard_metrics_cache.clear()
-            Analytics._dashboard_metrics_cache_time.clear()
-            Analytics._time_tracking_cache.clear()
-            Analytics._time_tracking_cache_time.clear()
-            Analytics._time_tracking_cache_params.clear()
-            Analytics._trend_series_cache.clear()
-            Analytics._trend_series_cache_time.clear()
-            Analytics._attribute_distribution_cache.clear()
-            Analytics._attribute_distribution_cache_time.clear()
-            Analytics._stress_dimension_cache.clear()
-            Analytics._stress_dimension_cache_time.clear()
-            Analytics._rankings_cache.clear()
-            Analytics._leaderboard_cache.clear()
-            Analytics._leaderboard_cache_time.clear()
-            Analytics._leaderboard_cache_top_n.clear()
+            from backend.cache_registry import cache_registry
+            # Clear every registered Analytics cache (user-specific dictionaries) and the projected base frames
+            cache_registry.clear_all()
+            Analytics._instances_base_cache.clear()
             print("[Auth] Cleared Analytics caches")
         except Exception as e:
             print(f"[Auth] Error clearing Analytics caches: {e}")
@@ -234,11 +221,7 @@ def clear_all_caches():
         # Clear InstanceManager class-level caches
         try:
             from backend.instance_manager import InstanceManager
-            InstanceManager._shared_active_instances_cache = None
-            InstanceManager._shared_active_instances_cache_time = None
-            InstanceManager._shared_recent_completed_cache.clear()
-            if hasattr(InstanceManager, '_per_user_cache'):
-                InstanceManager._per_user_cache.clear()
+            InstanceManager._per_user_cache.clear()
             print("[Auth] Cleared InstanceManager caches")
         except Exception as e:
             print(f"[Auth] Error clearing InstanceManager caches: {e}")
@@ -0,0 +1,286 @@
+"""
+Bounded LRU + TTL cache shared by the managers and Analytics.
+
+Replaces the ad-hoc {user_id: value} / {user_id: timestamp} dict pairs that
+grew without limit with the number of users. Each cache is a named namespace
+with:
+- a maximum number of entries and (optionally) a byte budget; the least
+  recently used entries are evicted when either bound is exceeded
+- an optional TTL; expired entries count as misses and are dropped on access
+- hit / miss / expiration / eviction counters (see cache_stats())
+- an RLock so request threads and background jobs can share it
+
+The dict-style API (get, [], in, pop, clear) keeps existing call sites and the
+CacheRegistry (which pops str(user_id) keys) working unchanged.
+
+Byte sizes are estimates (see estimate_size): DataFrames use
+memory_usage(deep=False) plus a flat per-cell charge for object columns;
+containers are summed one level deep.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+_MISSING = object()
+
+# Flat per-cell charge for object (string) columns; avoids deep=True on every store
+_OBJECT_CELL_BYTES = 64
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a cached value in bytes."""
+    try:
+        import pandas as pd
+        if isinstance(value, pd.DataFrame):
+            size = int(value.memory_usage(index=True, deep=False).sum())
+            n_object = sum(1 for dtype in value.dtypes if dtype == object)
+            return size + n_object * len(value) * _OBJECT_CELL_BYTES
+        if isinstance(value, pd.Series):
+            size = int(value.memory_usage(index=True, deep=False))
+            if value.dtype == object:
+                size += len(value) * _OBJECT_CELL_BYTES
+            return size
+    except ImportError:
+        pass
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(k) + _shallow_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_shallow_size(v) for v in value)
+    return _shallow_size(value)
+
+
+def _shallow_size(value: Any) -> int:
+    if isinstance(value, (dict, list, tuple, set, frozenset)):
+        return sys.getsizeof(value)
+    try:
+        import pandas as pd
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return estimate_size(value)
+    except ImportError:
+        pass
+    return sys.getsizeof(value)
+
+
+class BoundedCache:
+    """Thread-safe LRU cache with optional TTL and byte budget.
+
+    Args:
+        namespace: Name used in stats and logs (e.g. 'analytics.relief_summary')
+        max_entries: Maximum number of entries before LRU eviction
+        max_bytes: Optional byte budget (estimated with sizeof) before LRU eviction
+        ttl_seconds: Optional time-to-live; None keeps entries until evicted/invalidated
+        sizeof: Size estimator used for the byte budget
+    """
+
+    def __init__(self, namespace: str, max_entries: int = 256, max_bytes: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None, sizeof: Callable[[Any], int] = estimate_size):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1 for cache {namespace}")
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        # key -> (value, stored_at, size_bytes)
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Read / write
+    # ------------------------------------------------------------------
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the fresh value for key (marking it most recently used), else default."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, stored_at, _ = entry
+            if self._expired(stored_at):
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting least recently used entries to stay in bounds."""
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Larger than the whole budget: storing it would only flush everything else
+                self.evictions += 1
+                return
+            self._data[key] = (value, time.time(), size)
+            self._bytes += size
+            self._evict()
+
+    def setdefault(self, key: Hashable, default: Any) -> Any:
+        """Return the fresh value for key, storing default first if there is none."""
+        with self._lock:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                self.set(key, default)
+                value = default
+            return value
+
+    def update(self, items: Dict[Hashable, Any]) -> None:
+        for key, value in items.items():
+            self.set(key, value)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            if key not in self._data:
+                raise KeyError(key)
+            self._remove(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """True if key holds a fresh entry. Does not touch LRU order or counters."""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry[1])
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            self._remove(key)
+            return entry[0]
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every key for which predicate(key) is true. Returns the number removed."""
+        with self._lock:
+            doomed = [key for key in self._data if predicate(key)]
+            for key in doomed:
+                self._remove(key)
+            return len(doomed)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.keys())
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._data)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and current occupancy for this namespace."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'namespace': self.namespace,
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.expirations = self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds the lock)
+    # ------------------------------------------------------------------
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds is not None and (time.time() - stored_at) >= self.ttl_seconds
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes and len(self._data) > 1
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def __repr__(self) -> str:
+        return (f"BoundedCache({self.namespace!r}, entries={len(self._data)}/{self.max_entries}, "
+                f"bytes={self._bytes}/{self.max_bytes}, ttl={self.ttl_seconds})")
+
+
+# ----------------------------------------------------------------------
+# Namespace registry
+# ----------------------------------------------------------------------
+_caches: Dict[str, BoundedCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace: str, max_entries: int = 256, max_bytes: Optional[int] = None,
+              ttl_seconds: Optional[float] = None) -> BoundedCache:
+    """Return the process-wide cache for namespace, creating it on first use.
+
+    Bounds are taken from the first call; later calls return the existing cache.
+    """
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            cache = BoundedCache(namespace, max_entries=max_entries, max_bytes=max_bytes,
+                                 ttl_seconds=ttl_seconds)
+            _caches[namespace] = cache
+        return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every registered namespace, keyed by namespace."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.namespace: cache.stats() for cache in caches}
+
+
+def clear_all_caches() -> None:
+    """Empty every registered namespace (counters are kept)."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
@@ -0,0 +1,134 @@
+"""
+Dependency registry for derived-data caches.
+
+Each cached product (e.g. Analytics relief_summary) registers the dicts that
+hold it and declares which inputs it is derived from. Writers then invalidate
+an input for one user, and only the products depending on that input lose
+that user's entry; other users keep their warm caches.
+
+Stores are mappings keyed by str(user_id) (the convention used across
+Analytics): plain dicts or BoundedCache namespaces (backend/bounded_cache.py).
+A product may own several stores; all are cleared together.
+
+Inputs:
+- INSTANCES: task instances of a user (InstanceManager writes)
+- TASKS: task templates of a user (TaskManager writes)
+- PRODUCTIVITY_SETTINGS: productivity / goal / target-hour settings
+- GAP_PREFERENCE: gap handling preference (filters the instances frame)
+
+Settings and the gap preference are currently stored globally, so their
+writers invalidate with user_id=None (all users).
+
+Listeners (add_listener) are called after every invalidate() with
+(input_name, user_id); the background precompute worker uses this to
+recompute a user's payloads after a write.
+"""
+import threading
+from typing import Callable, Dict, Iterable, List, MutableMapping, Optional, Tuple
+
+INSTANCES = 'instances'
+TASKS = 'tasks'
+PRODUCTIVITY_SETTINGS = 'productivity_settings'
+GAP_PREFERENCE = 'gap_preference'
+
+INPUTS = (INSTANCES, TASKS, PRODUCTIVITY_SETTINGS, GAP_PREFERENCE)
+
+
+class CacheRegistry:
+    """Maps inputs to the cached products derived from them."""
+
+    def __init__(self):
+        self._products: Dict[str, Tuple[Tuple[MutableMapping, ...], frozenset]] = {}
+        self._listeners: List[Callable[[str, Optional[int]], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, name: str, stores: Iterable[MutableMapping], inputs: Iterable[str]) -> None:
+        """Register a cached product.
+
+        Args:
+            name: Product name (e.g. 'analytics.relief_summary')
+            stores: Mappings holding the product, keyed by str(user_id)
+            inputs: Input names the product is derived from (see INPUTS)
+        """
+        inputs = frozenset(inputs)
+        unknown = inputs - set(INPUTS)
+        if unknown:
+            raise ValueError(f"Unknown cache inputs for {name}: {sorted(unknown)}")
+        with self._lock:
+            self._products[name] = (tuple(stores), inputs)
+
+    def add_listener(self, listener: Callable[[str, Optional[int]], None]) -> None:
+        """Call listener(input_name, user_id) after each invalidate()."""
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, Optional[int]], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def dependents(self, input_name: str) -> List[str]:
+        """Names of products derived from input_name."""
+        with self._lock:
+            return [name for name, (_, inputs) in self._products.items() if input_name in inputs]
+
+    def invalidate(self, input_name: str, user_id: Optional[int] = None) -> List[str]:
+        """Drop cached products that depend on input_name.
+
+        Args:
+            input_name: Input that changed (see INPUTS)
+            user_id: User whose input changed. None clears the products for all users.
+
+        Returns:
+            Names of the invalidated products
+        """
+        names = self.dependents(input_name)
+        for name in names:
+            self._clear(name, user_id)
+        try:
+            from backend.instrumentation import log_cache_invalidation
+            log_cache_invalidation('CacheRegistry', f'invalidate:{input_name}', user_id=user_id, products=names)
+        except ImportError:
+            pass
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(input_name, user_id)
+            except Exception as e:
+                print(f"[CacheRegistry] Listener failed for {input_name}: {e}")
+        return names
+
+    def invalidate_product(self, name: str, user_id: Optional[int] = None) -> None:
+        """Drop one product for a user (or all users when user_id is None)."""
+        self._clear(name, user_id)
+        try:
+            from backend.instrumentation import log_cache_invalidation
+            log_cache_invalidation('CacheRegistry', f'invalidate_product:{name}', user_id=user_id)
+        except ImportError:
+            pass
+
+    def clear_all(self) -> List[str]:
+        """Drop every registered product for all users (logout / full reset)."""
+        with self._lock:
+            names = list(self._products)
+        for name in names:
+            self._clear(name, None)
+        return names
+
+    def _clear(self, name: str, user_id: Optional[int]) -> None:
+        with self._lock:
+            entry = self._products.get(name)
+        if entry is None:
+            return
+        stores, _ = entry
+        for store in stores:
+            if user_id is None:
+                store.clear()
+            else:
+                store.pop(str(user_id), None)
+
+
+# Process-wide registry (caches are class-level/shared across manager instances)
+cache_registry = CacheRegistry()
@@ -16,6 +16,7 @@ from backend.database import (
     PopupTrigger, PopupResponse, Note, SurveyResponse,
     Job, JobTaskMapping
 )
+from backend.csv_journal import flush_csv_journal
 from backend.user_state import UserStateManager, PREFS_FILE
 
 
@@ -224,36 +225,30 @@ def export_all_data_to_csv(
             export_counts['survey_responses'] = 0
         exported_files.append(survey_responses_file)
         
-        # Export user preferences (CSV file, not database table) - always create if include_user_preferences is True
+        # Export user preferences: this user's row in the user_preferences.csv format
         if include_user_preferences:
-            prefs_file = PREFS_FILE
             dest_prefs_file = os.path.join(data_dir, 'user_preferences.csv')
-            if os.path.exists(prefs_file):
-                # Copy user_preferences.csv to data_dir if it's not already there
-                if os.path.dirname(prefs_file) != data_dir:
-                    import shutil
-                    shutil.copy2(prefs_file, dest_prefs_file)
-                else:
-                    # If it's already in data_dir, just use it
-                    dest_prefs_file = prefs_file
-                
-                # Count rows
+            if os.path.abspath(dest_prefs_file) == os.path.abspath(PREFS_FILE) and os.path.exists(PREFS_FILE):
+                # Exporting into the live data directory: keep the preferences file as it is
+                flush_csv_journal(PREFS_FILE)
                 try:
-                    prefs_df = pd.read_csv(prefs_file)
-                    export_counts['user_preferences'] = len(prefs_df)
+                    export_counts['user_preferences'] = len(pd.read_csv(PREFS_FILE))
                 except Exception:
                     export_counts['user_preferences'] = 0
-                exported_files.append(dest_prefs_file)
             else:
-                # Create empty user_preferences.csv with header (for completeness)
-                prefs_df = pd.DataFrame(columns=['user_id', 'tutorial_completed', 'tutorial_choice', 'tutorial_auto_show',
-                                                 'tooltip_mode_enabled', 'survey_completed', 'created_at', 'last_active',
-                                                 'gap_handling', 'persistent_emotion_values', 'productivity_history',
-                                                 'productivity_goal_settings', 'monitored_metrics_config',
-                                                 'execution_score_chunk_state', 'productivity_settings'])
+                prefs = UserStateManager().get_user_preferences(str(user_id))
+                if prefs:
+                    prefs_df = pd.DataFrame([prefs])
+                else:
+                    # Empty user_preferences.csv with header (for completeness)
+                    prefs_df = pd.DataFrame(columns=['user_id', 'tutorial_completed', 'tutorial_choice', 'tutorial_auto_show',
+                                                     'tooltip_mode_enabled', 'survey_completed', 'created_at', 'last_active',
+                                                     'gap_handling', 'persistent_emotion_values', 'productivity_history',
+                                                     'productivity_goal_settings', 'monitored_metrics_config',
+                                                     'execution_score_chunk_state', 'productivity_settings'])
                 prefs_df.to_csv(dest_prefs_file, index=False, encoding='utf-8')
-                export_counts['user_preferences'] = 0
-                exported_files.append(dest_prefs_file)
+                export_counts['user_preferences'] = len(prefs_df)
+            exported_files.append(dest_prefs_file)
         
     finally:
         session.close()
@@ -25,6 +25,8 @@ import os
 import json
 import zipfile
 import tempfile
+import shutil
+import time
 import pandas as pd
 import re
 from datetime import datetime
@@ -37,7 +39,7 @@ from backend.database import (
     Job, JobTaskMapping
 )
 from backend.user_state import UserStateManager, PREFS_FILE
-from sqlalchemy import inspect, text
+from sqlalchemy import func, inspect, text
 from sqlalchemy.exc import OperationalError, IntegrityError
 
 # ============================================================================
@@ -450,6 +452,148 @@ def safe_int(value, default=0):
         return default
 
 
+# ============================================================================
+# Streaming import pipeline
+# ============================================================================
+# The import_*_from_csv functions read their CSV in chunks of IMPORT_BATCH_SIZE
+# rows (iter_csv_chunks) instead of loading the whole file. Per chunk:
+#   - one IN query resolves which keys already exist and who owns them
+#     (existing_owners / existing_keys) - no per-row .first() lookups
+#   - new rows are built as plain dicts and inserted with one Core executemany
+#     (bulk_insert_rows; INSERT ... ON CONFLICT DO NOTHING on SQLite/PostgreSQL);
+#     rows the insert drops count as skipped, not imported
+#   - with skip_existing=False, the chunk's existing rows are loaded with one
+#     query and updated through the ORM
+# Each file is still committed once, so a failed file leaves nothing behind.
+# ============================================================================
+
+def iter_csv_chunks(csv_path: str, chunk_size: int = IMPORT_BATCH_SIZE):
+    """Yield the CSV as string DataFrames of up to chunk_size rows (missing values '').
+
+    Stops after MAX_ROWS_PER_CSV rows (abuse prevention), like the full reads did.
+    """
+    processed = 0
+    with pd.read_csv(csv_path, dtype=str, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            if processed + len(chunk) > MAX_ROWS_PER_CSV:
+                print(f"[Import] ABUSE PREVENTION: CSV has more than {MAX_ROWS_PER_CSV} rows. "
+                      f"Only processing first {MAX_ROWS_PER_CSV} rows.")
+                chunk = chunk.head(MAX_ROWS_PER_CSV - processed)
+                if len(chunk):
+                    yield chunk.fillna('')
+                return
+            processed += len(chunk)
+            yield chunk.fillna('')
+
+
+def chunk_keys(chunk: pd.DataFrame, column: str) -> set:
+    """Non-empty stripped values of a chunk column (empty set if the column is missing)."""
+    if column not in chunk.columns:
+        return set()
+    return {str(value).strip() for value in chunk[column] if str(value).strip()}
+
+
+def existing_keys(session, key_column, keys, *criteria) -> set:
+    """Subset of keys already stored in key_column (one IN query per IMPORT_BATCH_SIZE keys)."""
+    keys = list(keys)
+    found = set()
+    for start in range(0, len(keys), IMPORT_BATCH_SIZE):
+        part = keys[start:start + IMPORT_BATCH_SIZE]
+        found.update(row[0] for row in session.query(key_column).filter(key_column.in_(part), *criteria).all())
+    return found
+
+
+def existing_owners(session, key_column, owner_column, keys) -> Dict[str, object]:
+    """Map of stored key -> owner for the given primary keys (one IN query per IMPORT_BATCH_SIZE keys).
+
+    Primary keys are global, so a key stored for another user cannot be imported
+    for this one; callers skip those rows instead of failing the whole insert.
+    """
+    keys = list(keys)
+    owners = {}
+    for start in range(0, len(keys), IMPORT_BATCH_SIZE):
+        part = keys[start:start + IMPORT_BATCH_SIZE]
+        owners.update(session.query(key_column, owner_column).filter(key_column.in_(part)).all())
+    return owners
+
+
+def extra_column_values(row, extra_columns: Dict[str, str]) -> Dict[str, object]:
+    """Values of the extra columns added by handle_extra_columns (None when empty), converted by type."""
+    values = {}
+    for col_name, col_type in extra_columns.items():
+        value = safe_get(row, col_name, '') if col_name in row.index else ''
+        if not value:
+            values[col_name] = None
+        elif col_type == 'INTEGER':
+            values[col_name] = safe_int(value, 0)
+        elif col_type == 'REAL':
+            values[col_name] = safe_float(value, 0.0)
+        else:
+            values[col_name] = value
+    return values
+
+
+def import_target_table(session, model_class, extra_columns: Dict[str, str]):
+    """Table to bulk insert into: the model's table, or the reflected table when extra columns were added."""
+    if not extra_columns:
+        return model_class.__table__
+    from sqlalchemy import MetaData, Table
+    return Table(model_class.__tablename__, MetaData(), autoload_with=session.get_bind())
+
+
+def _apply_column_defaults(model_class, rows: List[dict], table):
+    """Fill missing or None values of columns that have a Python default, as ORM inserts do.
+
+    Needed for the reflected table (import_target_table), which does not carry
+    the model's defaults; columns the table lacks are left out.
+    """
+    for column in model_class.__table__.columns:
+        default = column.default
+        if default is None or column.key not in table.c or not (default.is_callable or default.is_scalar):
+            continue
+        for row in rows:
+            if row.get(column.key) is None:
+                row[column.key] = default.arg(None) if default.is_callable else default.arg
+
+
+def bulk_insert_rows(session, model_class, rows: List[dict], table=None) -> int:
+    """Insert rows (dicts with the same keys) with one Core executemany.
+
+    On SQLite and PostgreSQL rows that hit a unique constraint are skipped
+    (INSERT ... ON CONFLICT DO NOTHING); callers resolve existing keys first, so
+    that only covers rows written concurrently. Foreign key errors still raise.
+
+    Returns:
+        Number of rows inserted (the statement's rowcount; len(rows) if the
+        driver does not report it)
+    """
+    if not rows:
+        return 0
+    table = table if table is not None else model_class.__table__
+    _apply_column_defaults(model_class, rows, table)
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(table).on_conflict_do_nothing()
+    elif dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table).on_conflict_do_nothing()
+    else:
+        stmt = table.insert()
+    result = session.execute(stmt, rows)
+    return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(rows)
+
+
+def log_import_throughput(label: str, started: float, imported: int, skipped: int, errors: int) -> float:
+    """Print rows/s for one import and return the elapsed seconds."""
+    elapsed = time.perf_counter() - started
+    rows = imported + skipped + errors
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"[Import] {label}: {imported} imported, {skipped} skipped, {errors} errors "
+          f"in {elapsed:.2f}s ({rate:.0f} rows/s)")
+    return elapsed
+
+
 def import_tasks_from_csv(csv_path: str, session, skip_existing: bool = True, backup_dir: Optional[str] = None, user_id: Optional[int] = None) -> Tuple[int, int, int]:
     """
     Import tasks from CSV file into database.
@@ -486,220 +630,186 @@ def import_tasks_from_csv(csv_path: str, session, skip_existing: bool = True, ba
             print(f"[Import] {size_error}")
             return 0, 0, 1  # Return error count
         
+        started = time.perf_counter()
         # Handle extra columns - try to add them to database
         extra_columns, backup_csv = handle_extra_columns(
             csv_path, 'tasks', Task, session, backup_dir
         )
-        
-        df = pd.read_csv(csv_path, dtype=str).fillna('')
-        
-        # Abuse prevention: Limit number of rows
-        if len(df) > MAX_ROWS_PER_CSV:
-            print(f"[Import] ABUSE PREVENTION: CSV has {len(df)} rows. "
-                  f"Maximum allowed: {MAX_ROWS_PER_CSV}. "
-                  f"Only processing first {MAX_ROWS_PER_CSV} rows.")
-            df = df.head(MAX_ROWS_PER_CSV)
-        
-                # Get existing task IDs for this user only
-        existing_task_ids = set()
-        if skip_existing:
-            # CRITICAL: Only check for existing records for this user
-            existing_tasks = session.query(Task).filter(Task.user_id == user_id).all()
-            existing_task_ids = {task.task_id for task in existing_tasks}
-        
-        batch: List[Task] = []
-        for idx, row in df.iterrows():
-            # Critical field - must exist
-            task_id = str(safe_get(row, 'task_id', '')).strip()
-            if not task_id:
-                errors += 1
-                continue
-            
-            if skip_existing and task_id in existing_task_ids:
-                skipped += 1
-                continue
+        table = import_target_table(session, Task, extra_columns)
+        
+        seen_task_ids = set()
+        for chunk in iter_csv_chunks(csv_path):
+            # One query per chunk: which task_ids exist, and for which user
+            owners = existing_owners(session, Task.task_id, Task.user_id, chunk_keys(chunk, 'task_id') - seen_task_ids)
+            existing_by_id = {}
+            owned_ids = [task_id for task_id, owner in owners.items() if owner == user_id]
+            if owned_ids and not skip_existing:
+                existing_by_id = {
+                    task.task_id: task
+                    for task in session.query(Task).filter(Task.task_id.in_(owned_ids), Task.user_id == user_id)
+                }
             
-            try:
-                # Parse categories - use safe_get and handle missing column
-                categories_str = safe_get(row, 'categories', '[]')
-                try:
-                    categories = json.loads(categories_str) if isinstance(categories_str, str) else categories_str
-                except (json.JSONDecodeError, TypeError):
-                    categories = []
-                
-                # Parse routine_days_of_week - use safe_get
-                routine_days_str = safe_get(row, 'routine_days_of_week', '[]')
-                try:
-                    routine_days = json.loads(routine_days_str) if isinstance(routine_days_str, str) else routine_days_str
-                except (json.JSONDecodeError, TypeError):
-                    routine_days = []
-                
-                # Parse other fields with safe_get and defaults matching database model
-                name = str(safe_get(row, 'name', '')).strip()
-                if not name:  # Name is required
+            new_rows: List[dict] = []
+            for idx, row in chunk.iterrows():
+                # Critical field - must exist
+                task_id = str(safe_get(row, 'task_id', '')).strip()
+                if not task_id:
                     errors += 1
                     continue
                 
-                description = str(safe_get(row, 'description', '')).strip()
-                task_type = str(safe_get(row, 'type', 'one-time')).strip() or 'one-time'
-                version = safe_int(safe_get(row, 'version', '1'), 1)
-                is_recurring = str(safe_get(row, 'is_recurring', 'False')).lower() == 'true'
-                default_estimate = safe_int(safe_get(row, 'default_estimate_minutes', '0'), 0)
-                task_type_field = str(safe_get(row, 'task_type', 'Work')).strip() or 'Work'
-                default_aversion = str(safe_get(row, 'default_initial_aversion', '')).strip()
-                routine_frequency = str(safe_get(row, 'routine_frequency', 'none')).strip() or 'none'
-                routine_time = str(safe_get(row, 'routine_time', '00:00')).strip() or '00:00'
-                
-                # Handle optional integer fields
-                completion_window_hours = None
-                if safe_get(row, 'completion_window_hours', ''):
-                    completion_window_hours = safe_int(safe_get(row, 'completion_window_hours', ''), None)
-                    if completion_window_hours == 0:
-                        completion_window_hours = None
-                
-                completion_window_days = None
-                if safe_get(row, 'completion_window_days', ''):
-                    completion_window_days = safe_int(safe_get(row, 'completion_window_days', ''), None)
-                    if completion_window_days == 0:
-                        completion_window_days = None
-                
-                notes = str(safe_get(row, 'notes', '')).strip()
-                
-                # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
-                # Skip rows where user_id doesn't match to prevent cross-user data editing
-                csv_user_id = safe_int(safe_get(row, 'user_id', ''), None)
-                if csv_user_id is not None and csv_user_id != user_id:
-                    print(f"[Import] SECURITY: Skipping task {task_id} - CSV user_id ({csv_user_id}) does not match logged-in user_id ({user_id})")
+                if task_id in seen_task_ids or (skip_existing and owners.get(task_id) == user_id):
+                    skipped += 1
+                    continue
+                if task_id in owners and owners[task_id] != user_id:
+                    # task_id is the primary key: it already belongs to another user (or to legacy data)
+                    print(f"[Import] SECURITY: Skipping task {task_id} - task_id already exists for another user")
                     skipped += 1
                     continue
                 
-                # CRITICAL: Override any user_id from CSV with the provided user_id for security
-                # This ensures imported data always belongs to the importing user
-                
-                # Parse created_at - optional field
-                created_at = parse_datetime(safe_get(row, 'created_at', ''))
-                
-                # Create or update task (filter by both task_id and user_id for security)
-                existing_task = session.query(Task).filter(
-                    Task.task_id == task_id,
-                    Task.user_id == user_id
-                ).first()
-                if existing_task and not skip_existing:
-                    # Update existing - only update fields that exist in CSV
-                    existing_task.name = name
-                    if 'description' in row.index or not existing_task.description:
-                        existing_task.description = description
-                    if 'type' in row.index:
-                        existing_task.type = task_type
-                    if 'version' in row.index:
-                        existing_task.version = version
-                    if 'is_recurring' in row.index:
-                        existing_task.is_recurring = is_recurring
-                    if 'categories' in row.index:
-                        existing_task.categories = categories
-                    if 'default_estimate_minutes' in row.index:
-                        existing_task.default_estimate_minutes = default_estimate
-                    if 'task_type' in row.index:
-                        existing_task.task_type = task_type_field
-                    if 'default_initial_aversion' in row.index:
-                        existing_task.default_initial_aversion = default_aversion
-                    if 'routine_frequency' in row.index:
-                        existing_task.routine_frequency = routine_frequency
-                    if 'routine_days_of_week' in row.index:
-                        existing_task.routine_days_of_week = routine_days
-                    if 'routine_time' in row.index:
-                        existing_task.routine_time = routine_time
-                    if 'completion_window_hours' in row.index:
-                        existing_task.completion_window_hours = completion_window_hours
-                    if 'completion_window_days' in row.index:
-                        existing_task.completion_window_days = completion_window_days
-                    if 'notes' in row.index:
-                        existing_task.notes = notes
-                    # CRITICAL: Always set user_id to the provided user_id (override CSV value)
-                    existing_task.user_id = user_id
-                    if created_at:
-                        existing_task.created_at = created_at
+                try:
+                    # Parse categories - use safe_get and handle missing column
+                    categories_str = safe_get(row, 'categories', '[]')
+                    try:
+                        categories = json.loads(categories_str) if isinstance(categories_str, str) else categories_str
+                    except (json.JSONDecodeError, TypeError):
+                        categories = []
                     
-                    # Set extra columns that were added to database
-                    if extra_columns:
-                        for col_name in extra_columns:
-                            if col_name in row.index:
-                                value = safe_get(row, col_name, '')
-                                if value:
-                                    try:
-                                        # Convert value based on column type
-                                        col_type = extra_columns[col_name]
-                                        if col_type == 'INTEGER':
-                                            value = safe_int(value, 0)
-                                        elif col_type == 'REAL':
-                                            value = safe_float(value, 0.0)
-                                        
-                                        setattr(existing_task, col_name, value)
-                                    except Exception as e:
-                                        print(f"[Import] Could not set extra column {col_name} on task {task_id}: {e}")
+                    # Parse routine_days_of_week - use safe_get
+                    routine_days_str = safe_get(row, 'routine_days_of_week', '[]')
+                    try:
+                        routine_days = json.loads(routine_days_str) if isinstance(routine_days_str, str) else routine_days_str
+                    except (json.JSONDecodeError, TypeError):
+                        routine_days = []
                     
-                    imported += 1
-                elif not existing_task:
-                    # Create new - use defaults for missing fields
-                    task = Task(
-                        task_id=task_id,
-                        name=name,
-                        description=description,
-                        type=task_type,
-                        version=version,
-                        created_at=created_at,
-                        is_recurring=is_recurring,
-                        categories=categories,
-                        default_estimate_minutes=default_estimate,
-                        task_type=task_type_field,
-                        default_initial_aversion=default_aversion,
-                        routine_frequency=routine_frequency,
-                        routine_days_of_week=routine_days,
-                        routine_time=routine_time,
-                        completion_window_hours=completion_window_hours,
-                        completion_window_days=completion_window_days,
-                        notes=notes,
-                        user_id=user_id  # CRITICAL: Always use provided user_id (override CSV value)
-                    )
+                    # Parse other fields with safe_get and defaults matching database model
+                    name = str(safe_get(row, 'name', '')).strip()
+                    if not name:  # Name is required
+                        errors += 1
+                        continue
+                    
+                    description = str(safe_get(row, 'description', '')).strip()
+                    task_type = str(safe_get(row, 'type', 'one-time')).strip() or 'one-time'
+                    version = safe_int(safe_get(row, 'version', '1'), 1)
+                    is_recurring = str(safe_get(row, 'is_recurring', 'False')).lower() == 'true'
+                    default_estimate = safe_int(safe_get(row, 'default_estimate_minutes', '0'), 0)
+                    task_type_field = str(safe_get(row, 'task_type', 'Work')).strip() or 'Work'
+                    default_aversion = str(safe_get(row, 'default_initial_aversion', '')).strip()
+                    routine_frequency = str(safe_get(row, 'routine_frequency', 'none')).strip() or 'none'
+                    routine_time = str(safe_get(row, 'routine_time', '00:00')).strip() or '00:00'
+                    
+                    # Handle optional integer fields
+                    completion_window_hours = None
+                    if safe_get(row, 'completion_window_hours', ''):
+                        completion_window_hours = safe_int(safe_get(row, 'completion_window_hours', ''), None)
+                        if completion_window_hours == 0:
+                            completion_window_hours = None
+                    
+                    completion_window_days = None
+                    if safe_get(row, 'completion_window_days', ''):
+                        completion_window_days = safe_int(safe_get(row, 'completion_window_days', ''), None)
+                        if completion_window_days == 0:
+                            completion_window_days = None
+                    
+                    notes = str(safe_get(row, 'notes', '')).strip()
+                    
+                    # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
+                    # Skip rows where user_id doesn't match to prevent cross-user data editing
+                    csv_user_id = safe_int(safe_get(row, 'user_id', ''), None)
+                    if csv_user_id is not None and csv_user_id != user_id:
+                        print(f"[Import] SECURITY: Skipping task {task_id} - CSV user_id ({csv_user_id}) does not match logged-in user_id ({user_id})")
+                        skipped += 1
+                        continue
+                    
+                    # CRITICAL: Override any user_id from CSV with the provided user_id for security
+                    # This ensures imported data always belongs to the importing user
                     
-                    # Set extra columns that were added to database
-                    if extra_columns:
-                        for col_name in extra_columns:
-                            if col_name in row.index:
-                                value = safe_get(row, col_name, '')
-                                if value:
-                                    try:
-                                        # Convert value based on column type
-                                        col_type = extra_columns[col_name]
-                                        if col_type == 'INTEGER':
-                                            value = safe_int(value, 0)
-                                        elif col_type == 'REAL':
-                                            value = safe_float(value, 0.0)
-                                        # TEXT and others stay as string
-                                        
-                                        # Try to set the attribute dynamically
-                                        setattr(task, col_name, value)
-                                    except Exception as e:
-                                        print(f"[Import] Could not set extra column {col_name} on task {task_id}: {e}")
+                    # Parse created_at - optional field
+                    created_at = parse_datetime(safe_get(row, 'created_at', ''))
+                    extra_values = extra_column_values(row, extra_columns)
                     
-                    batch.append(task)
+                    # Update existing (loaded for this chunk, filtered by task_id and user_id for security)
+                    existing_task = existing_by_id.get(task_id)
+                    if existing_task is not None:
+                        # Update existing - only update fields that exist in CSV
+                        existing_task.name = name
+                        if 'description' in row.index or not existing_task.description:
+                            existing_task.description = description
+                        if 'type' in row.index:
+                            existing_task.type = task_type
+                        if 'version' in row.index:
+                            existing_task.version = version
+                        if 'is_recurring' in row.index:
+                            existing_task.is_recurring = is_recurring
+                        if 'categories' in row.index:
+                            existing_task.categories = categories
+                        if 'default_estimate_minutes' in row.index:
+                            existing_task.default_estimate_minutes = default_estimate
+                        if 'task_type' in row.index:
+                            existing_task.task_type = task_type_field
+                        if 'default_initial_aversion' in row.index:
+                            existing_task.default_initial_aversion = default_aversion
+                        if 'routine_frequency' in row.index:
+                            existing_task.routine_frequency = routine_frequency
+                        if 'routine_days_of_week' in row.index:
+                            existing_task.routine_days_of_week = routine_days
+                        if 'routine_time' in row.index:
+                            existing_task.routine_time = routine_time
+                        if 'completion_window_hours' in row.index:
+                            existing_task.completion_window_hours = completion_window_hours
+                        if 'completion_window_days' in row.index:
+                            existing_task.completion_window_days = completion_window_days
+                        if 'notes' in row.index:
+                            existing_task.notes = notes
+                        # CRITICAL: Always set user_id to the provided user_id (override CSV value)
+                        existing_task.user_id = user_id
+                        if created_at:
+                            existing_task.created_at = created_at
+                        
+                        # Set extra columns that were added to database
+                        for col_name, value in extra_values.items():
+                            if value is not None:
+                                setattr(existing_task, col_name, value)
+                    else:
+                        # Create new - use defaults for missing fields
+                        new_rows.append({
+                            'task_id': task_id,
+                            'name': name,
+                            'description': description,
+                            'type': task_type,
+                            'version': version,
+                            'created_at': created_at,
+                            'is_recurring': is_recurring,
+                            'categories': categories,
+                            'default_estimate_minutes': default_estimate,
+                            'task_type': task_type_field,
+                            'default_initial_aversion': default_aversion,
+                            'routine_frequency': routine_frequency,
+                            'routine_days_of_week': routine_days,
+                            'routine_time': routine_time,
+                            'completion_window_hours': completion_window_hours,
+                            'completion_window_days': completion_window_days,
+                            'notes': notes,
+                            'user_id': user_id,  # CRITICAL: Always use provided user_id (override CSV value)
+                            **extra_values,
+                        })
+                    seen_task_ids.add(task_id)
                     imported += 1
-                    if len(batch) >= IMPORT_BATCH_SIZE:
-                        session.add_all(batch)
-                        batch.clear()
-                else:
-                    skipped += 1
-                
-            except Exception as e:
-                print(f"[Import] Error importing task {task_id}: {e}")
-                import traceback
-                print(f"[Import] Traceback: {traceback.format_exc()}")
-                errors += 1
-                # Continue processing other rows
+                    
+                except Exception as e:
+                    print(f"[Import] Error importing task {task_id}: {e}")
+                    import traceback
+                    print(f"[Import] Traceback: {traceback.format_exc()}")
+                    errors += 1
+                    # Continue processing other rows
+            
+            dropped = len(new_rows) - bulk_insert_rows(session, Task, new_rows, table)
+            imported -= dropped
+            skipped += dropped
+            if existing_by_id:
+                session.flush()
         
-        if batch:
-            session.add_all(batch)
         session.commit()
+        log_import_throughput('tasks', started, imported, skipped, errors)
         
     except Exception as e:
         session.rollback()
@@ -758,257 +868,229 @@ def import_task_instances_from_csv(csv_path: str, session, skip_existing: bool =
             print(f"[Import] {size_error}")
             return 0, 0, 1  # Return error count
         
+        started = time.perf_counter()
         # Handle extra columns - try to add them to database
         extra_columns, backup_csv = handle_extra_columns(
             csv_path, 'task_instances', TaskInstance, session, backup_dir
         )
-        
-        df = pd.read_csv(csv_path, dtype=str).fillna('')
-        
-        # Abuse prevention: Limit number of rows
-        if len(df) > MAX_ROWS_PER_CSV:
-            print(f"[Import] ABUSE PREVENTION: CSV has {len(df)} rows. "
-                  f"Maximum allowed: {MAX_ROWS_PER_CSV}. "
-                  f"Only processing first {MAX_ROWS_PER_CSV} rows.")
-            df = df.head(MAX_ROWS_PER_CSV)
-        
-        # Pre-validate task_ids for PostgreSQL FK constraint (task_instances.task_id -> tasks.task_id)
-        # Skip instances whose task_id does not exist in tasks table to avoid IntegrityError on commit
-        existing_task_ids = set()
-        if DATABASE_URL.startswith('postgresql') and 'task_id' in df.columns:
-            unique_task_ids = {str(t).strip() for t in df['task_id'].dropna().unique() if str(t).strip()}
-            if unique_task_ids:
-                existing_tasks = session.query(Task.task_id).filter(Task.task_id.in_(unique_task_ids)).all()
-                existing_task_ids = {t[0] for t in existing_tasks}
+        table = import_target_table(session, TaskInstance, extra_columns)
+        check_task_fk = DATABASE_URL.startswith('postgresql')
+        
+        seen_instance_ids = set()
+        for chunk in iter_csv_chunks(csv_path):
+            # Pre-validate task_ids for PostgreSQL FK constraint (task_instances.task_id -> tasks.task_id)
+            # Skip instances whose task_id does not exist in tasks table to avoid IntegrityError on commit
+            existing_task_ids = set()
+            if check_task_fk:
+                unique_task_ids = chunk_keys(chunk, 'task_id')
+                existing_task_ids = existing_keys(session, Task.task_id, unique_task_ids)
                 missing_task_ids = unique_task_ids - existing_task_ids
                 if missing_task_ids:
                     print(f"[Import] WARNING: {len(missing_task_ids)} task_id(s) in instances CSV not found in tasks table: "
                           f"{list(missing_task_ids)[:5]}{'...' if len(missing_task_ids) > 5 else ''}")
                     print(f"[Import] These instances will be SKIPPED (PostgreSQL FK requires task_id to exist in tasks)")
-        
-        # Get existing instance IDs for this user only
-        existing_instance_ids = set()
-        if skip_existing:
-            # CRITICAL: Only check for existing records for this user
-            existing_instances = session.query(TaskInstance).filter(TaskInstance.user_id == user_id).all()
-            existing_instance_ids = {instance.instance_id for instance in existing_instances}
-        
-        batch: List[TaskInstance] = []
-        for idx, row in df.iterrows():
-            # Critical field - must exist
-            instance_id = str(safe_get(row, 'instance_id', '')).strip()
-            if not instance_id:
-                errors += 1
-                continue
             
-            if skip_existing and instance_id in existing_instance_ids:
-                skipped += 1
-                continue
+            # One query per chunk: which instance_ids exist, and for which user
+            owners = existing_owners(
+                session, TaskInstance.instance_id, TaskInstance.user_id,
+                chunk_keys(chunk, 'instance_id') - seen_instance_ids,
+            )
+            existing_by_id = {}
+            owned_ids = [instance_id for instance_id, owner in owners.items() if owner == user_id]
+            if owned_ids and not skip_existing:
+                existing_by_id = {
+                    instance.instance_id: instance
+                    for instance in session.query(TaskInstance).filter(
+                        TaskInstance.instance_id.in_(owned_ids), TaskInstance.user_id == user_id
+                    )
+                }
             
-            try:
-                # Parse JSON fields - use safe_get
-                predicted_str = safe_get(row, 'predicted', '{}')
-                try:
-                    predicted = json.loads(predicted_str) if isinstance(predicted_str, str) else predicted_str
-                except (json.JSONDecodeError, TypeError):
-                    predicted = {}
-                
-                actual_str = safe_get(row, 'actual', '{}')
-                try:
-                    actual = json.loads(actual_str) if isinstance(actual_str, str) else actual_str
-                except (json.JSONDecodeError, TypeError):
-                    actual = {}
-                
-                # Parse required fields
-                task_id = str(safe_get(row, 'task_id', '')).strip()
-                task_name = str(safe_get(row, 'task_name', '')).strip()
-                if not task_id or not task_name:  # Required fields
+            new_rows: List[dict] = []
+            for idx, row in chunk.iterrows():
+                # Critical field - must exist
+                instance_id = str(safe_get(row, 'instance_id', '')).strip()
+                if not instance_id:
                     errors += 1
                     continue
                 
-                # Skip if task_id does not exist in tasks (PostgreSQL FK constraint)
-                if DATABASE_URL.startswith('postgresql') and existing_task_ids and task_id not in existing_task_ids:
-                    print(f"[Import] Skipping instance {instance_id}: task_id '{task_id}' not found in tasks table")
-                    errors += 1
+                if instance_id in seen_instance_ids or (skip_existing and owners.get(instance_id) == user_id):
+                    skipped += 1
                     continue
-                
-                # Parse optional fields with defaults
-                task_version = safe_int(safe_get(row, 'task_version', '1'), 1)
-                is_completed = str(safe_get(row, 'is_completed', 'False')).lower() == 'true'
-                is_deleted = str(safe_get(row, 'is_deleted', 'False')).lower() == 'true'
-                status = str(safe_get(row, 'status', 'active')).strip() or 'active'
-                
-                # Parse numeric fields - use safe_float for all optional fields
-                procrastination_score = safe_float(safe_get(row, 'procrastination_score', ''), None)
-                proactive_score = safe_float(safe_get(row, 'proactive_score', ''), None)
-                behavioral_score = safe_float(safe_get(row, 'behavioral_score', ''), None)
-                net_relief = safe_float(safe_get(row, 'net_relief', ''), None)
-                behavioral_deviation = safe_float(safe_get(row, 'behavioral_deviation', ''), None)
-                duration_minutes = safe_float(safe_get(row, 'duration_minutes', ''), None)
-                delay_minutes = safe_float(safe_get(row, 'delay_minutes', ''), None)
-                relief_score = safe_float(safe_get(row, 'relief_score', ''), None)
-                cognitive_load = safe_float(safe_get(row, 'cognitive_load', ''), None)
-                mental_energy_needed = safe_float(safe_get(row, 'mental_energy_needed', ''), None)
-                task_difficulty = safe_float(safe_get(row, 'task_difficulty', ''), None)
-                emotional_load = safe_float(safe_get(row, 'emotional_load', ''), None)
-                environmental_effect = safe_float(safe_get(row, 'environmental_effect', ''), None)
-                serendipity_factor = safe_float(safe_get(row, 'serendipity_factor', ''), None)
-                disappointment_factor = safe_float(safe_get(row, 'disappointment_factor', ''), None)
-                
-                skills_improved = str(safe_get(row, 'skills_improved', '')).strip()
-                
-                # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
-                # Skip rows where user_id doesn't match to prevent cross-user data editing
-                csv_user_id = safe_int(safe_get(row, 'user_id', ''), None)
-                if csv_user_id is not None and csv_user_id != user_id:
-                    print(f"[Import] SECURITY: Skipping instance {instance_id} - CSV user_id ({csv_user_id}) does not match logged-in user_id ({user_id})")
+                if instance_id in owners and owners[instance_id] != user_id:
+                    # instance_id is the primary key: it already belongs to another user (or to legacy data)
+                    print(f"[Import] SECURITY: Skipping instance {instance_id} - instance_id already exists for another user")
                     skipped += 1
                     continue
                 
-                # CRITICAL: Override any user_id from CSV with the provided user_id for security
-                # This ensures imported data always belongs to the importing user
-                
-                # Parse datetime fields - use safe_get
-                created_at = parse_datetime(safe_get(row, 'created_at', ''))
-                initialized_at = parse_datetime(safe_get(row, 'initialized_at', ''))
-                started_at = parse_datetime(safe_get(row, 'started_at', ''))
-                completed_at = parse_datetime(safe_get(row, 'completed_at', ''))
-                cancelled_at = parse_datetime(safe_get(row, 'cancelled_at', ''))
-                
-                # Create or update instance (filter by both instance_id and user_id for security)
-                existing_instance = session.query(TaskInstance).filter(
-                    TaskInstance.instance_id == instance_id,
-                    TaskInstance.user_id == user_id
-                ).first()
-                if existing_instance and not skip_existing:
-                    # Update existing - only update fields that exist in CSV
-                    existing_instance.task_id = task_id
-                    existing_instance.task_name = task_name
-                    if 'task_version' in row.index:
-                        existing_instance.task_version = task_version
-                    if 'predicted' in row.index:
-                        existing_instance.predicted = predicted
-                    if 'actual' in row.index:
-                        existing_instance.actual = actual
-                    if 'is_completed' in row.index:
-                        existing_instance.is_completed = is_completed
-                    if 'is_deleted' in row.index:
-                        existing_instance.is_deleted = is_deleted
-                    if 'status' in row.index:
-                        existing_instance.status = status
-                    # Update numeric fields only if they exist in CSV
-                    for field in ['procrastination_score', 'proactive_score', 'behavioral_score', 'net_relief',
-                                'behavioral_deviation', 'duration_minutes', 'delay_minutes', 'relief_score',
-                                'cognitive_load', 'mental_energy_needed', 'task_difficulty', 'emotional_load',
-                                'environmental_effect', 'serendipity_factor', 'disappointment_factor']:
-                        if field in row.index:
-                            setattr(existing_instance, field, locals()[field])
-                    if 'skills_improved' in row.index:
-                        existing_instance.skills_improved = skills_improved
-                    # CRITICAL: Always set user_id to the provided user_id (override CSV value)
-                    existing_instance.user_id = user_id
-                    if created_at:
-                        existing_instance.created_at = created_at
-                    if initialized_at:
-                        existing_instance.initialized_at = initialized_at
-                    if started_at:
-                        existing_instance.started_at = started_at
-                    if completed_at:
-                        existing_instance.completed_at = completed_at
-                    if cancelled_at:
-                        existing_instance.cancelled_at = cancelled_at
+                try:
+                    # Parse JSON fields - use safe_get
+                    predicted_str = safe_get(row, 'predicted', '{}')
+                    try:
+                        predicted = json.loads(predicted_str) if isinstance(predicted_str, str) else predicted_str
+                    except (json.JSONDecodeError, TypeError):
+                        predicted = {}
+                    
+                    actual_str = safe_get(row, 'actual', '{}')
+                    try:
+                        actual = json.loads(actual_str) if isinstance(actual_str, str) else actual_str
+                    except (json.JSONDecodeError, TypeError):
+                        actual = {}
                     
-                    # Set extra columns that were added to database
-                    if extra_columns:
-                        for col_name in extra_columns:
-                            if col_name in row.index:
-                                value = safe_get(row, col_name, '')
-                                if value:
-                                    try:
-                                        # Convert value based on column type
-                                        col_type = extra_columns[col_name]
-                                        if col_type == 'INTEGER':
-                                            value = safe_int(value, 0)
-                                        elif col_type == 'REAL':
-                                            value = safe_float(value, 0.0)
-                                        
-                                        setattr(existing_instance, col_name, value)
-                                    except Exception as e:
-                                        print(f"[Import] Could not set extra column {col_name} on instance {instance_id}: {e}")
+                    # Parse required fields
+                    task_id = str(safe_get(row, 'task_id', '')).strip()
+                    task_name = str(safe_get(row, 'task_name', '')).strip()
+                    if not task_id or not task_name:  # Required fields
+                        errors += 1
+                        continue
                     
-                    imported += 1
-                elif not existing_instance:
-                    # Create new
-                    instance = TaskInstance(
-                        instance_id=instance_id,
-                        task_id=task_id,
-                        task_name=task_name,
-                        task_version=task_version,
-                        created_at=created_at,
-                        initialized_at=initialized_at,
-                        started_at=started_at,
-                        completed_at=completed_at,
-                        cancelled_at=cancelled_at,
-                        predicted=predicted,
-                        actual=actual,
-                        procrastination_score=procrastination_score,
-                        proactive_score=proactive_score,
-                        behavioral_score=behavioral_score,
-                        net_relief=net_relief,
-                        behavioral_deviation=behavioral_deviation,
-                        is_completed=is_completed,
-                        is_deleted=is_deleted,
-                        status=status,
-                        duration_minutes=duration_minutes,
-                        delay_minutes=delay_minutes,
-                        relief_score=relief_score,
-                        cognitive_load=cognitive_load,
-                        mental_energy_needed=mental_energy_needed,
-                        task_difficulty=task_difficulty,
-                        emotional_load=emotional_load,
-                        environmental_effect=environmental_effect,
-                        skills_improved=skills_improved,
-                        serendipity_factor=serendipity_factor,
-                        disappointment_factor=disappointment_factor,
-                        user_id=user_id  # CRITICAL: Always use provided user_id (override CSV value)
-                    )
+                    # Skip if task_id does not exist in tasks (PostgreSQL FK constraint)
+                    if check_task_fk and task_id not in existing_task_ids:
+                        print(f"[Import] Skipping instance {instance_id}: task_id '{task_id}' not found in tasks table")
+                        errors += 1
+                        continue
+                    
+                    # Parse optional fields with defaults
+                    task_version = safe_int(safe_get(row, 'task_version', '1'), 1)
+                    is_completed = str(safe_get(row, 'is_completed', 'False')).lower() == 'true'
+                    is_deleted = str(safe_get(row, 'is_deleted', 'False')).lower() == 'true'
+                    status = str(safe_get(row, 'status', 'active')).strip() or 'active'
+                    
+                    # Parse numeric fields - use safe_float for all optional fields
+                    procrastination_score = safe_float(safe_get(row, 'procrastination_score', ''), None)
+                    proactive_score = safe_float(safe_get(row, 'proactive_score', ''), None)
+                    behavioral_score = safe_float(safe_get(row, 'behavioral_score', ''), None)
+                    net_relief = safe_float(safe_get(row, 'net_relief', ''), None)
+                    behavioral_deviation = safe_float(safe_get(row, 'behavioral_deviation', ''), None)
+                    duration_minutes = safe_float(safe_get(row, 'duration_minutes', ''), None)
+                    delay_minutes = safe_float(safe_get(row, 'delay_minutes', ''), None)
+                    relief_score = safe_float(safe_get(row, 'relief_score', ''), None)
+                    cognitive_load = safe_float(safe_get(row, 'cognitive_load', ''), None)
+                    mental_energy_needed = safe_float(safe_get(row, 'mental_energy_needed', ''), None)
+                    task_difficulty = safe_float(safe_get(row, 'task_difficulty', ''), None)
+                    emotional_load = safe_float(safe_get(row, 'emotional_load', ''), None)
+                    environmental_effect = safe_float(safe_get(row, 'environmental_effect', ''), None)
+                    serendipity_factor = safe_float(safe_get(row, 'serendipity_factor', ''), None)
+                    disappointment_factor = safe_float(safe_get(row, 'disappointment_factor', ''), None)
+                    
+                    skills_improved = str(safe_get(row, 'skills_improved', '')).strip()
                     
-                    # Set extra columns that were added to database
-                    if extra_columns:
-                        for col_name in extra_columns:
-                            if col_name in row.index:
-                                value = safe_get(row, col_name, '')
-                                if value:
-                                    try:
-                                        # Convert value based on column type
-                                        col_type = extra_columns[col_name]
-                                        if col_type == 'INTEGER':
-                                            value = safe_int(value, 0)
-                                        elif col_type == 'REAL':
-                                            value = safe_float(value, 0.0)
-                                        
-                                        setattr(instance, col_name, value)
-                                    except Exception as e:
-                                        print(f"[Import] Could not set extra column {col_name} on instance {instance_id}: {e}")
+                    # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
+                    # Skip rows where user_id doesn't match to prevent cross-user data editing
+                    csv_user_id = safe_int(safe_get(row, 'user_id', ''), None)
+                    if csv_user_id is not None and csv_user_id != user_id:
+                        print(f"[Import] SECURITY: Skipping instance {instance_id} - CSV user_id ({csv_user_id}) does not match logged-in user_id ({user_id})")
+                        skipped += 1
+                        continue
                     
-                    batch.append(instance)
+                    # CRITICAL: Override any user_id from CSV with the provided user_id for security
+                    # This ensures imported data always belongs to the importing user
+                    
+                    # Parse datetime fields - use safe_get
+                    created_at = parse_datetime(safe_get(row, 'created_at', ''))
+                    initialized_at = parse_datetime(safe_get(row, 'initialized_at', ''))
+                    started_at = parse_datetime(safe_get(row, 'started_at', ''))
+                    completed_at = parse_datetime(safe_get(row, 'completed_at', ''))
+                    cancelled_at = parse_datetime(safe_get(row, 'cancelled_at', ''))
+                    extra_values = extra_column_values(row, extra_columns)
+                    
+                    # Update existing (loaded for this chunk, filtered by instance_id and user_id for security)
+                    existing_instance = existing_by_id.get(instance_id)
+                    if existing_instance is not None:
+                        # Update existing - only update fields that exist in CSV
+                        existing_instance.task_id = task_id
+                        existing_instance.task_name = task_name
+                        if 'task_version' in row.index:
+                            existing_instance.task_version = task_version
+                        if 'predicted' in row.index:
+                            existing_instance.predicted = predicted
+                        if 'actual' in row.index:
+                            existing_instance.actual = actual
+                        if 'is_completed' in row.index:
+                            existing_instance.is_completed = is_completed
+                        if 'is_deleted' in row.index:
+                            existing_instance.is_deleted = is_deleted
+                        if 'status' in row.index:
+                            existing_instance.status = status
+                        # Update numeric fields only if they exist in CSV
+                        for field in ['procrastination_score', 'proactive_score', 'behavioral_score', 'net_relief',
+                                    'behavioral_deviation', 'duration_minutes', 'delay_minutes', 'relief_score',
+                                    'cognitive_load', 'mental_energy_needed', 'task_difficulty', 'emotional_load',
+                                    'environmental_effect', 'serendipity_factor', 'disappointment_factor']:
+                            if field in row.index:
+                                setattr(existing_instance, field, locals()[field])
+                        if 'skills_improved' in row.index:
+                            existing_instance.skills_improved = skills_improved
+                        # CRITICAL: Always set user_id to the provided user_id (override CSV value)
+                        existing_instance.user_id = user_id
+                        if created_at:
+                            existing_instance.created_at = created_at
+                        if initialized_at:
+                            existing_instance.initialized_at = initialized_at
+                        if started_at:
+                            existing_instance.started_at = started_at
+                        if completed_at:
+                            existing_instance.completed_at = completed_at
+                        if cancelled_at:
+                            existing_instance.cancelled_at = cancelled_at
+                        
+                        # Set extra columns that were added to database
+                        for col_name, value in extra_values.items():
+                            if value is not None:
+                                setattr(existing_instance, col_name, value)
+                    else:
+                        # Create new
+                        new_rows.append({
+                            'instance_id': instance_id,
+                            'task_id': task_id,
+                            'task_name': task_name,
+                            'task_version': task_version,
+                            'created_at': created_at,
+                            'initialized_at': initialized_at,
+                            'started_at': started_at,
+                            'completed_at': completed_at,
+                            'cancelled_at': cancelled_at,
+                            'predicted': predicted,
+                            'actual': actual,
+                            'procrastination_score': procrastination_score,
+                            'proactive_score': proactive_score,
+                            'behavioral_score': behavioral_score,
+                            'net_relief': net_relief,
+                            'behavioral_deviation': behavioral_deviation,
+                            'is_completed': is_completed,
+                            'is_deleted': is_deleted,
+                            'status': status,
+                            'duration_minutes': duration_minutes,
+                            'delay_minutes': delay_minutes,
+                            'relief_score': relief_score,
+                            'cognitive_load': cognitive_load,
+                            'mental_energy_needed': mental_energy_needed,
+                            'task_difficulty': task_difficulty,
+                            'emotional_load': emotional_load,
+                            'environmental_effect': environmental_effect,
+                            'skills_improved': skills_improved,
+                            'serendipity_factor': serendipity_factor,
+                            'disappointment_factor': disappointment_factor,
+                            'user_id': user_id,  # CRITICAL: Always use provided user_id (override CSV value)
+                            **extra_values,
+                        })
+                    seen_instance_ids.add(instance_id)
                     imported += 1
-                    if len(batch) >= IMPORT_BATCH_SIZE:
-                        session.add_all(batch)
-                        batch.clear()
-                else:
-                    skipped += 1
-                
-            except Exception as e:
-                print(f"[Import] Error importing instance {instance_id}: {e}")
-                import traceback
-                print(f"[Import] Traceback: {traceback.format_exc()}")
-                errors += 1
-                # Continue processing other rows
+                    
+                except Exception as e:
+                    print(f"[Import] Error importing instance {instance_id}: {e}")
+                    import traceback
+                    print(f"[Import] Traceback: {traceback.format_exc()}")
+                    errors += 1
+                    # Continue processing other rows
+            
+            dropped = len(new_rows) - bulk_insert_rows(session, TaskInstance, new_rows, table)
+            imported -= dropped
+            skipped += dropped
+            if existing_by_id:
+                session.flush()
         
-        if batch:
-            session.add_all(batch)
         session.commit()
+        log_import_throughput('task_instances', started, imported, skipped, errors)
         
     except IntegrityError as e:
         session.rollback()
@@ -1055,79 +1137,58 @@ def import_emotions_from_csv(
             print(f"[Import] {size_error}")
             return 0, 0, 1  # Return error count
         
+        started = time.perf_counter()
         # Handle extra columns - try to add them to database
         extra_columns, backup_csv = handle_extra_columns(
             csv_path, 'emotions', Emotion, session, backup_dir
         )
-        
-        df = pd.read_csv(csv_path, dtype=str).fillna('')
-        
-        # Abuse prevention: Limit number of rows
-        if len(df) > MAX_ROWS_PER_CSV:
-            print(f"[Import] ABUSE PREVENTION: CSV has {len(df)} rows. "
-                  f"Maximum allowed: {MAX_ROWS_PER_CSV}. "
-                  f"Only processing first {MAX_ROWS_PER_CSV} rows.")
-            df = df.head(MAX_ROWS_PER_CSV)
-        
-        existing_emotions: set = set()
-        if skip_existing and user_id is not None:
-            existing = session.query(Emotion).filter(Emotion.user_id == user_id).all()
-            existing_emotions = {e.emotion.lower() for e in existing}
-        
-        batch: List[Emotion] = []
-        for idx, row in df.iterrows():
-            emotion_name = str(safe_get(row, 'emotion', '')).strip()
-            if not emotion_name:
-                errors += 1
-                continue
-            
-            if skip_existing and emotion_name.lower() in existing_emotions:
-                skipped += 1
-                continue
+        table = import_target_table(session, Emotion, extra_columns)
+        
+        seen_emotions: set = set()
+        for chunk in iter_csv_chunks(csv_path):
+            # One query per chunk (emotions are unique per user, compared case-insensitively)
+            chunk_emotions = {name.lower() for name in chunk_keys(chunk, 'emotion')} - seen_emotions
+            existing_emotions = set()
+            if chunk_emotions:
+                existing_emotions = {
+                    row[0].lower() for row in session.query(Emotion.emotion).filter(
+                        Emotion.user_id == user_id, func.lower(Emotion.emotion).in_(chunk_emotions)
+                    ).all()
+                }
             
-            try:
-                existing_emotion = session.query(Emotion).filter(
-                    Emotion.user_id == user_id,
-                    Emotion.emotion == emotion_name
-                ).first()
-                if not existing_emotion:
-                    emotion = Emotion(emotion=emotion_name, user_id=user_id)
-                    
-                    # Set extra columns that were added to database
-                    if extra_columns:
-                        for col_name in extra_columns:
-                            if col_name in row.index:
-                                value = safe_get(row, col_name, '')
-                                if value:
-                                    try:
-                                        # Convert value based on column type
-                                        col_type = extra_columns[col_name]
-                                        if col_type == 'INTEGER':
-                                            value = safe_int(value, 0)
-                                        elif col_type == 'REAL':
-                                            value = safe_float(value, 0.0)
-                                        
-                                        setattr(emotion, col_name, value)
-                                    except Exception as e:
-                                        print(f"[Import] Could not set extra column {col_name} on emotion {emotion_name}: {e}")
-                    
-                    batch.append(emotion)
-                    imported += 1
-                    if len(batch) >= IMPORT_BATCH_SIZE:
-                        session.add_all(batch)
-                        batch.clear()
-                else:
+            new_rows: List[dict] = []
+            for idx, row in chunk.iterrows():
+                emotion_name = str(safe_get(row, 'emotion', '')).strip()
+                if not emotion_name:
+                    errors += 1
+                    continue
+                
+                # Existing emotions are never duplicated (unique per user), even with skip_existing=False
+                if emotion_name.lower() in existing_emotions or emotion_name.lower() in seen_emotions:
                     skipped += 1
-            except Exception as e:
-                print(f"[Import] Error importing emotion {emotion_name}: {e}")
-                import traceback
-                print(f"[Import] Traceback: {traceback.format_exc()}")
-                errors += 1
-                # Continue processing other rows
+                    continue
+                
+                try:
+                    new_rows.append({
+                        'emotion': emotion_name,
+                        'user_id': user_id,
+                        **extra_column_values(row, extra_columns),
+                    })
+                    seen_emotions.add(emotion_name.lower())
+                    imported += 1
+                except Exception as e:
+                    print(f"[Import] Error importing emotion {emotion_name}: {e}")
+                    import traceback
+                    print(f"[Import] Traceback: {traceback.format_exc()}")
+                    errors += 1
+                    # Continue processing other rows
+            
+            dropped = len(new_rows) - bulk_insert_rows(session, Emotion, new_rows, table)
+            imported -= dropped
+            skipped += dropped
         
-        if batch:
-            session.add_all(batch)
         session.commit()
+        log_import_throughput('emotions', started, imported, skipped, errors)
         
     except Exception as e:
         session.rollback()
@@ -1173,80 +1234,68 @@ def import_notes_from_csv(csv_path: str, session, skip_existing: bool = True, us
             print(f"[Import] {size_error}")
             return 0, 0, 1  # Return error count
         
-        df = pd.read_csv(csv_path, dtype=str).fillna('')
-        
-        # Abuse prevention: Limit number of rows
-        if len(df) > MAX_ROWS_PER_CSV:
-            print(f"[Import] ABUSE PREVENTION: CSV has {len(df)} rows. "
-                  f"Maximum allowed: {MAX_ROWS_PER_CSV}. "
-                  f"Only processing first {MAX_ROWS_PER_CSV} rows.")
-            df = df.head(MAX_ROWS_PER_CSV)
-        
-        existing_note_ids = set()
-        if skip_existing:
-            # CRITICAL: Only check for existing records for this user
-            existing_notes = session.query(Note).filter(Note.user_id == user_id).all()
-            existing_note_ids = {note.note_id for note in existing_notes}
-        
-        batch: List[Note] = []
-        for idx, row in df.iterrows():
-            note_id = str(safe_get(row, 'note_id', '')).strip()
-            if not note_id:
-                errors += 1
-                continue
-            
-            if skip_existing and note_id in existing_note_ids:
-                skipped += 1
-                continue
+        started = time.perf_counter()
+        seen_note_ids = set()
+        for chunk in iter_csv_chunks(csv_path):
+            # One query per chunk: which note_ids exist, and for which user
+            owners = existing_owners(session, Note.note_id, Note.user_id, chunk_keys(chunk, 'note_id') - seen_note_ids)
             
-            try:
-                content = str(safe_get(row, 'content', '')).strip()
-                if not content:
+            new_rows: List[dict] = []
+            for idx, row in chunk.iterrows():
+                note_id = str(safe_get(row, 'note_id', '')).strip()
+                if not note_id:
                     errors += 1
                     continue
                 
-                timestamp = parse_datetime(safe_get(row, 'timestamp', '')) or datetime.utcnow()
-                
-                # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
-                # Skip rows where user_id doesn't match to prevent cross-user data editing
-                csv_user_id = safe_int(safe_get(row, 'user_id', ''), None)
-                if csv_user_id is not None and csv_user_id != user_id:
-                    print(f"[Import] SECURITY: Skipping note {note_id} - CSV user_id ({csv_user_id}) does not match logged-in user_id ({user_id})")
+                # Existing notes are never overwritten (as before, also with skip_existing=False)
+                if note_id in seen_note_ids or owners.get(note_id) == user_id:
                     skipped += 1
                     continue
-                
-                # CRITICAL: Override any user_id from CSV with the provided user_id for security
-                # This ensures imported data always belongs to the importing user
-                
-                existing_note = session.query(Note).filter(
-                    Note.note_id == note_id,
-                    Note.user_id == user_id
-                ).first()
-                if not existing_note:
-                    note = Note(
-                        note_id=note_id,
-                        content=content,
-                        timestamp=timestamp,
-                        user_id=user_id  # CRITICAL: Always use provided user_id (override CSV value)
-                    )
-                    batch.append(note)
-                    imported += 1
-                    if len(batch) >= IMPORT_BATCH_SIZE:
-                        session.add_all(batch)
-                        batch.clear()
-                else:
+                if note_id in owners:
+                    print(f"[Import] SECURITY: Skipping note {note_id} - note_id already exists for another user")
                     skipped += 1
+                    continue
                 
-            except Exception as e:
-                print(f"[Import] Error importing note {note_id}: {e}")
-                import traceback
-                print(f"[Import] Traceback: {traceback.format_exc()}")
-                errors += 1
-                # Continue processing other rows
+                try:
+                    content = str(safe_get(row, 'content', '')).strip()
+                    if not content:
+                        errors += 1
+                        continue
+                    
+                    timestamp = parse_datetime(safe_get(row, 'timestamp', '')) or datetime.utcnow()
+                    
+                    # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
+                    # Skip rows where user_id doesn't match to prevent cross-user data editing
+                    csv_user_id = safe_int(safe_get(row, 'user_id', ''), None)
+                    if csv_user_id is not None and csv_user_id != user_id:
+                        print(f"[Import] SECURITY: Skipping note {note_id} - CSV user_id ({csv_user_id}) does not match logged-in user_id ({user_id})")
+                        skipped += 1
+                        continue
+                    
+                    # CRITICAL: Override any user_id from CSV with the provided user_id for security
+                    # This ensures imported data always belongs to the importing user
+                    new_rows.append({
+                        'note_id': note_id,
+                        'content': content,
+                        'timestamp': timestamp,
+                        'user_id': user_id,  # CRITICAL: Always use provided user_id (override CSV value)
+                    })
+                    seen_note_ids.add(note_id)
+                    imported += 1
+                    
+                except Exception as e:
+                    print(f"[Import] Error importing note {note_id}: {e}")
+                    import traceback
+                    print(f"[Import] Traceback: {traceback.format_exc()}")
+                    errors += 1
+                    # Continue processing other rows
+            
+            dropped = len(new_rows) - bulk_insert_rows(session, Note, new_rows)
+            imported -= dropped
+            skipped += dropped
         
-        if batch:
-            session.add_all(batch)
         session.commit()
+        log_import_throughput('notes', started, imported, skipped, errors)
         
     except Exception as e:
         session.rollback()
@@ -1292,106 +1341,108 @@ def import_popup_triggers_from_csv(csv_path: str, session, skip_existing: bool =
             print(f"[Import] {size_error}")
             return 0, 0, 1  # Return error count
         
-        df = pd.read_csv(csv_path, dtype=str).fillna('')
-        
-        # Abuse prevention: Limit number of rows
-        if len(df) > MAX_ROWS_PER_CSV:
-            print(f"[Import] ABUSE PREVENTION: CSV has {len(df)} rows. "
-                  f"Maximum allowed: {MAX_ROWS_PER_CSV}. "
-                  f"Only processing first {MAX_ROWS_PER_CSV} rows.")
-            df = df.head(MAX_ROWS_PER_CSV)
-        
-        batch: List[PopupTrigger] = []
-        for idx, row in df.iterrows():
-            trigger_id = str(safe_get(row, 'trigger_id', '')).strip()
-            
-            # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
-            # Skip rows where user_id doesn't match to prevent cross-user data editing
-            csv_user_id_str = str(safe_get(row, 'user_id', '')).strip()
-            csv_user_id_int = safe_int(csv_user_id_str, None)
-            if csv_user_id_int is not None and csv_user_id_int != user_id:
-                print(f"[Import] SECURITY: Skipping popup trigger {trigger_id} - CSV user_id ({csv_user_id_int}) does not match logged-in user_id ({user_id})")
-                skipped += 1
-                continue
-            
-            # CRITICAL: Override any user_id from CSV with the provided user_id for security
-            # Convert integer user_id to string for PopupTrigger (which uses string user_id)
-            user_id_str = str(user_id)
-            if not trigger_id:
-                errors += 1
-                continue
+        started = time.perf_counter()
+        # Convert integer user_id to string for PopupTrigger (which uses string user_id)
+        user_id_str = str(user_id)
+        seen_trigger_ids = set()
+        for chunk in iter_csv_chunks(csv_path):
+            # One query per chunk for the user's existing triggers (keys only, or rows to update)
+            chunk_trigger_ids = chunk_keys(chunk, 'trigger_id') - seen_trigger_ids
+            existing_by_id = {}
+            if chunk_trigger_ids:
+                if skip_existing:
+                    existing_by_id = dict.fromkeys(existing_keys(
+                        session, PopupTrigger.trigger_id, chunk_trigger_ids, PopupTrigger.user_id == user_id_str
+                    ), True)
+                else:
+                    for trigger in session.query(PopupTrigger).filter(
+                        PopupTrigger.trigger_id.in_(chunk_trigger_ids), PopupTrigger.user_id == user_id_str
+                    ).order_by(PopupTrigger.id):
+                        existing_by_id.setdefault(trigger.trigger_id, trigger)
             
-            try:
-                # Check if exists (by trigger_id and user_id)
-                existing = session.query(PopupTrigger).filter(
-                    PopupTrigger.trigger_id == trigger_id,
-                    PopupTrigger.user_id == user_id_str
-                ).first()
+            new_rows: List[dict] = []
+            for idx, row in chunk.iterrows():
+                trigger_id = str(safe_get(row, 'trigger_id', '')).strip()
                 
-                if skip_existing and existing:
+                # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
+                # Skip rows where user_id doesn't match to prevent cross-user data editing
+                csv_user_id_str = str(safe_get(row, 'user_id', '')).strip()
+                csv_user_id_int = safe_int(csv_user_id_str, None)
+                if csv_user_id_int is not None and csv_user_id_int != user_id:
+                    print(f"[Import] SECURITY: Skipping popup trigger {trigger_id} - CSV user_id ({csv_user_id_int}) does not match logged-in user_id ({user_id})")
                     skipped += 1
                     continue
                 
-                count = safe_int(safe_get(row, 'count', '0'), 0)
-                task_id = str(safe_get(row, 'task_id', '')).strip() or None
-                last_shown_at = parse_datetime(safe_get(row, 'last_shown_at', ''))
-                helpful = None
-                if safe_get(row, 'helpful', ''):
-                    helpful = str(safe_get(row, 'helpful', '')).lower() == 'true'
-                last_response = str(safe_get(row, 'last_response', '')).strip() or None
-                last_comment = str(safe_get(row, 'last_comment', '')).strip() or None
-                created_at = parse_datetime(safe_get(row, 'created_at', '')) or datetime.utcnow()
-                updated_at = parse_datetime(safe_get(row, 'updated_at', '')) or datetime.utcnow()
+                # CRITICAL: Override any user_id from CSV with the provided user_id for security
+                if not trigger_id:
+                    errors += 1
+                    continue
                 
-                if existing and not skip_existing:
-                    # Update - only update fields that exist in CSV
-                    if 'count' in row.index:
-                        existing.count = count
-                    if 'task_id' in row.index:
-                        existing.task_id = task_id
-                    if 'last_shown_at' in row.index:
-                        existing.last_shown_at = last_shown_at
-                    if 'helpful' in row.index:
-                        existing.helpful = helpful
-                    if 'last_response' in row.index:
-                        existing.last_response = last_response
-                    if 'last_comment' in row.index:
-                        existing.last_comment = last_comment
-                    if 'updated_at' in row.index:
-                        existing.updated_at = updated_at
-                    imported += 1
-                elif not existing:
-                    # Create
-                    trigger = PopupTrigger(
-                        user_id=user_id_str,  # CRITICAL: Always use provided user_id (override CSV value)
-                        trigger_id=trigger_id,
-                        task_id=task_id,
-                        count=count,
-                        last_shown_at=last_shown_at,
-                        helpful=helpful,
-                        last_response=last_response,
-                        last_comment=last_comment,
-                        created_at=created_at,
-                        updated_at=updated_at
-                    )
-                    batch.append(trigger)
-                    imported += 1
-                    if len(batch) >= IMPORT_BATCH_SIZE:
-                        session.add_all(batch)
-                        batch.clear()
-                else:
+                existing = existing_by_id.get(trigger_id)
+                if trigger_id in seen_trigger_ids or (skip_existing and existing):
                     skipped += 1
+                    continue
                 
-            except Exception as e:
-                print(f"[Import] Error importing popup trigger {trigger_id}: {e}")
-                import traceback
-                print(f"[Import] Traceback: {traceback.format_exc()}")
-                errors += 1
-                # Continue processing other rows
+                try:
+                    count = safe_int(safe_get(row, 'count', '0'), 0)
+                    task_id = str(safe_get(row, 'task_id', '')).strip() or None
+                    last_shown_at = parse_datetime(safe_get(row, 'last_shown_at', ''))
+                    helpful = None
+                    if safe_get(row, 'helpful', ''):
+                        helpful = str(safe_get(row, 'helpful', '')).lower() == 'true'
+                    last_response = str(safe_get(row, 'last_response', '')).strip() or None
+                    last_comment = str(safe_get(row, 'last_comment', '')).strip() or None
+                    created_at = parse_datetime(safe_get(row, 'created_at', '')) or datetime.utcnow()
+                    updated_at = parse_datetime(safe_get(row, 'updated_at', '')) or datetime.utcnow()
+                    
+                    if existing is not None:
+                        # Update - only update fields that exist in CSV
+                        if 'count' in row.index:
+                            existing.count = count
+                        if 'task_id' in row.index:
+                            existing.task_id = task_id
+                        if 'last_shown_at' in row.index:
+                            existing.last_shown_at = last_shown_at
+                        if 'helpful' in row.index:
+                            existing.helpful = helpful
+                        if 'last_response' in row.index:
+                            existing.last_response = last_response
+                        if 'last_comment' in row.index:
+                            existing.last_comment = last_comment
+                        if 'updated_at' in row.index:
+                            existing.updated_at = updated_at
+                    else:
+                        # Create
+                        new_rows.append({
+                            'user_id': user_id_str,  # CRITICAL: Always use provided user_id (override CSV value)
+                            'trigger_id': trigger_id,
+                            'task_id': task_id,
+                            'count': count,
+                            'last_shown_at': last_shown_at,
+                            'helpful': helpful,
+                            'last_response': last_response,
+                            'last_comment': last_comment,
+                            'created_at': created_at,
+                            'updated_at': updated_at,
+                        })
+                    seen_trigger_ids.add(trigger_id)
+                    imported += 1
+                    
+                except Exception as e:
+                    print(f"[Import] Error importing popup trigger {trigger_id}: {e}")
+                    import traceback
+                    print(f"[Import] Traceback: {traceback.format_exc()}")
+                    errors += 1
+                    # Continue processing other rows
+            
+            dropped = len(new_rows) - bulk_insert_rows(session, PopupTrigger, new_rows)
+            imported -= dropped
+            skipped += dropped
+            if existing_by_id and not skip_existing:
+                session.flush()
         
-        if batch:
-            session.add_all(batch)
         session.commit()
+        log_import_throughput('popup_triggers', started, imported, skipped, errors)
         
     except Exception as e:
         session.rollback()
@@ -1437,79 +1488,71 @@ def import_popup_responses_from_csv(csv_path: str, session, skip_existing: bool
             print(f"[Import] {size_error}")
             return 0, 0, 1  # Return error count
         
-        df = pd.read_csv(csv_path, dtype=str).fillna('')
-        
-        # Abuse prevention: Limit number of rows
-        if len(df) > MAX_ROWS_PER_CSV:
-            print(f"[Import] ABUSE PREVENTION: CSV has {len(df)} rows. "
-                  f"Maximum allowed: {MAX_ROWS_PER_CSV}. "
-                  f"Only processing first {MAX_ROWS_PER_CSV} rows.")
-            df = df.head(MAX_ROWS_PER_CSV)
-        
-        batch: List[PopupResponse] = []
-        for idx, row in df.iterrows():
-            try:
-                # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
-                # Skip rows where user_id doesn't match to prevent cross-user data editing
-                csv_user_id_str = str(safe_get(row, 'user_id', '')).strip()
-                csv_user_id_int = safe_int(csv_user_id_str, None)
-                if csv_user_id_int is not None and csv_user_id_int != user_id:
-                    print(f"[Import] SECURITY: Skipping popup response - CSV user_id ({csv_user_id_int}) does not match logged-in user_id ({user_id})")
-                    skipped += 1
-                    continue
-                
-                # CRITICAL: Override any user_id from CSV with the provided user_id for security
-                # Convert integer user_id to string for PopupResponse (which uses string user_id)
-                user_id_str = str(user_id)
-                trigger_id = str(safe_get(row, 'trigger_id', '')).strip()
-                if not trigger_id:
-                    errors += 1
-                    continue
-                
-                task_id = str(safe_get(row, 'task_id', '')).strip() or None
-                instance_id = str(safe_get(row, 'instance_id', '')).strip() or None
-                response_value = str(safe_get(row, 'response_value', '')).strip() or None
-                helpful = None
-                if safe_get(row, 'helpful', ''):
-                    helpful = str(safe_get(row, 'helpful', '')).lower() == 'true'
-                comment = str(safe_get(row, 'comment', '')).strip() or None
-                
-                context_str = safe_get(row, 'context', '{}')
+        started = time.perf_counter()
+        # Convert integer user_id to string for PopupResponse (which uses string user_id)
+        user_id_str = str(user_id)
+        for chunk in iter_csv_chunks(csv_path):
+            new_rows: List[dict] = []
+            for idx, row in chunk.iterrows():
                 try:
-                    context = json.loads(context_str) if isinstance(context_str, str) else context_str
-                except (json.JSONDecodeError, TypeError):
-                    context = {}
-                
-                created_at = parse_datetime(safe_get(row, 'created_at', '')) or datetime.utcnow()
-                
-                # Popup responses can have duplicates, so we don't skip based on existence
-                response = PopupResponse(
-                    user_id=user_id_str,  # CRITICAL: Always use provided user_id (override CSV value)
-                    trigger_id=trigger_id,
-                    task_id=task_id,
-                    instance_id=instance_id,
-                    response_value=response_value,
-                    helpful=helpful,
-                    comment=comment,
-                    context=context,
-                    created_at=created_at
-                )
-                batch.append(response)
-                imported += 1
-                if len(batch) >= IMPORT_BATCH_SIZE:
-                    session.add_all(batch)
-                    batch.clear()
-                
-            except Exception as e:
-                print(f"[Import] Error importing popup response: {e}")
-                import traceback
-                print(f"[Import] Traceback: {traceback.format_exc()}")
-                errors += 1
-                # Continue processing other rows
+                    # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
+                    # Skip rows where user_id doesn't match to prevent cross-user data editing
+                    csv_user_id_str = str(safe_get(row, 'user_id', '')).strip()
+                    csv_user_id_int = safe_int(csv_user_id_str, None)
+                    if csv_user_id_int is not None and csv_user_id_int != user_id:
+                        print(f"[Import] SECURITY: Skipping popup response - CSV user_id ({csv_user_id_int}) does not match logged-in user_id ({user_id})")
+                        skipped += 1
+                        continue
+                    
+                    # CRITICAL: Override any user_id from CSV with the provided user_id for security
+                    trigger_id = str(safe_get(row, 'trigger_id', '')).strip()
+                    if not trigger_id:
+                        errors += 1
+                        continue
+                    
+                    task_id = str(safe_get(row, 'task_id', '')).strip() or None
+                    instance_id = str(safe_get(row, 'instance_id', '')).strip() or None
+                    response_value = str(safe_get(row, 'response_value', '')).strip() or None
+                    helpful = None
+                    if safe_get(row, 'helpful', ''):
+                        helpful = str(safe_get(row, 'helpful', '')).lower() == 'true'
+                    comment = str(safe_get(row, 'comment', '')).strip() or None
+                    
+                    context_str = safe_get(row, 'context', '{}')
+                    try:
+                        context = json.loads(context_str) if isinstance(context_str, str) else context_str
+                    except (json.JSONDecodeError, TypeError):
+                        context = {}
+                    
+                    created_at = parse_datetime(safe_get(row, 'created_at', '')) or datetime.utcnow()
+                    
+                    # Popup responses can have duplicates, so we don't skip based on existence
+                    new_rows.append({
+                        'user_id': user_id_str,  # CRITICAL: Always use provided user_id (override CSV value)
+                        'trigger_id': trigger_id,
+                        'task_id': task_id,
+                        'instance_id': instance_id,
+                        'response_value': response_value,
+                        'helpful': helpful,
+                        'comment': comment,
+                        'context': context,
+                        'created_at': created_at,
+                    })
+                    imported += 1
+                    
+                except Exception as e:
+                    print(f"[Import] Error importing popup response: {e}")
+                    import traceback
+                    print(f"[Import] Traceback: {traceback.format_exc()}")
+                    errors += 1
+                    # Continue processing other rows
+            
+            dropped = len(new_rows) - bulk_insert_rows(session, PopupResponse, new_rows)
+            imported -= dropped
+            skipped += dropped
         
-        if batch:
-            session.add_all(batch)
         session.commit()
+        log_import_throughput('popup_responses', started, imported, skipped, errors)
         
     except Exception as e:
         session.rollback()
@@ -1555,89 +1598,80 @@ def import_survey_responses_from_csv(csv_path: str, session, skip_existing: bool
             print(f"[Import] {size_error}")
             return 0, 0, 1  # Return error count
         
-        df = pd.read_csv(csv_path, dtype=str).fillna('')
-        
-        # Abuse prevention: Limit number of rows
-        if len(df) > MAX_ROWS_PER_CSV:
-            print(f"[Import] ABUSE PREVENTION: CSV has {len(df)} rows. "
-                  f"Maximum allowed: {MAX_ROWS_PER_CSV}. "
-                  f"Only processing first {MAX_ROWS_PER_CSV} rows.")
-            df = df.head(MAX_ROWS_PER_CSV)
-        
-        existing_response_ids = set()
-        if skip_existing:
-            # CRITICAL: Only check for existing records for this user
-            # Convert integer user_id to string for SurveyResponse (which uses string user_id)
-            existing_responses = session.query(SurveyResponse).filter(SurveyResponse.user_id == str(user_id)).all()
-            existing_response_ids = {response.response_id for response in existing_responses}
-        
-        batch: List[SurveyResponse] = []
-        for idx, row in df.iterrows():
-            response_id = str(safe_get(row, 'response_id', '')).strip()
-            if not response_id:
-                errors += 1
-                continue
-            
-            if skip_existing and response_id in existing_response_ids:
-                skipped += 1
-                continue
+        started = time.perf_counter()
+        # Convert integer user_id to string for SurveyResponse (which uses string user_id)
+        user_id_str = str(user_id)
+        seen_response_ids = set()
+        for chunk in iter_csv_chunks(csv_path):
+            # One query per chunk: which response_ids exist, and for which user
+            owners = existing_owners(
+                session, SurveyResponse.response_id, SurveyResponse.user_id,
+                chunk_keys(chunk, 'response_id') - seen_response_ids,
+            )
             
-            try:
-                # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
-                # Skip rows where user_id doesn't match to prevent cross-user data editing
-                csv_user_id_str = str(safe_get(row, 'user_id', '')).strip()
-                csv_user_id_int = safe_int(csv_user_id_str, None)
-                if csv_user_id_int is not None and csv_user_id_int != user_id:
-                    print(f"[Import] SECURITY: Skipping survey response {response_id} - CSV user_id ({csv_user_id_int}) does not match logged-in user_id ({user_id})")
-                    skipped += 1
-                    continue
-                
-                # CRITICAL: Override any user_id from CSV with the provided user_id for security
-                # Convert integer user_id to string for SurveyResponse (which uses string user_id)
-                user_id_str = str(user_id)
-                question_category = str(safe_get(row, 'question_category', '')).strip()
-                question_id = str(safe_get(row, 'question_id', '')).strip()
-                
-                if not question_category or not question_id:
+            new_rows: List[dict] = []
+            for idx, row in chunk.iterrows():
+                response_id = str(safe_get(row, 'response_id', '')).strip()
+                if not response_id:
                     errors += 1
                     continue
                 
-                response_value = str(safe_get(row, 'response_value', '')).strip() or None
-                response_text = str(safe_get(row, 'response_text', '')).strip() or None
-                timestamp = parse_datetime(safe_get(row, 'timestamp', '')) or datetime.utcnow()
-                
-                existing_response = session.query(SurveyResponse).filter(
-                    SurveyResponse.response_id == response_id,
-                    SurveyResponse.user_id == user_id_str
-                ).first()
-                if not existing_response:
-                    response = SurveyResponse(
-                        response_id=response_id,
-                        user_id=user_id_str,  # CRITICAL: Always use provided user_id (override CSV value)
-                        question_category=question_category,
-                        question_id=question_id,
-                        response_value=response_value,
-                        response_text=response_text,
-                        timestamp=timestamp
-                    )
-                    batch.append(response)
-                    imported += 1
-                    if len(batch) >= IMPORT_BATCH_SIZE:
-                        session.add_all(batch)
-                        batch.clear()
-                else:
+                # Existing responses are never overwritten (as before, also with skip_existing=False)
+                if response_id in seen_response_ids or owners.get(response_id) == user_id_str:
                     skipped += 1
+                    continue
+                if response_id in owners:
+                    print(f"[Import] SECURITY: Skipping survey response {response_id} - response_id already exists for another user")
+                    skipped += 1
+                    continue
                 
-            except Exception as e:
-                print(f"[Import] Error importing survey response {response_id}: {e}")
-                import traceback
-                print(f"[Import] Traceback: {traceback.format_exc()}")
-                errors += 1
-                # Continue processing other rows
+                try:
+                    # CRITICAL SECURITY CHECK: Validate CSV user_id matches logged-in user_id
+                    # Skip rows where user_id doesn't match to prevent cross-user data editing
+                    csv_user_id_str = str(safe_get(row, 'user_id', '')).strip()
+                    csv_user_id_int = safe_int(csv_user_id_str, None)
+                    if csv_user_id_int is not None and csv_user_id_int != user_id:
+                        print(f"[Import] SECURITY: Skipping survey response {response_id} - CSV user_id ({csv_user_id_int}) does not match logged-in user_id ({user_id})")
+                        skipped += 1
+                        continue
+                    
+                    # CRITICAL: Override any user_id from CSV with the provided user_id for security
+                    question_category = str(safe_get(row, 'question_category', '')).strip()
+                    question_id = str(safe_get(row, 'question_id', '')).strip()
+                    
+                    if not question_category or not question_id:
+                        errors += 1
+                        continue
+                    
+                    response_value = str(safe_get(row, 'response_value', '')).strip() or None
+                    response_text = str(safe_get(row, 'response_text', '')).strip() or None
+                    timestamp = parse_datetime(safe_get(row, 'timestamp', '')) or datetime.utcnow()
+                    
+                    new_rows.append({
+                        'response_id': response_id,
+                        'user_id': user_id_str,  # CRITICAL: Always use provided user_id (override CSV value)
+                        'question_category': question_category,
+                        'question_id': question_id,
+                        'response_value': response_value,
+                        'response_text': response_text,
+                        'timestamp': timestamp,
+                    })
+                    seen_response_ids.add(response_id)
+                    imported += 1
+                    
+                except Exception as e:
+                    print(f"[Import] Error importing survey response {response_id}: {e}")
+                    import traceback
+                    print(f"[Import] Traceback: {traceback.format_exc()}")
+                    errors += 1
+                    # Continue processing other rows
+            
+            dropped = len(new_rows) - bulk_insert_rows(session, SurveyResponse, new_rows)
+            imported -= dropped
+            skipped += dropped
         
-        if batch:
-            session.add_all(batch)
         session.commit()
+        log_import_throughput('survey_responses', started, imported, skipped, errors)
         
     except Exception as e:
         session.rollback()
@@ -1811,16 +1845,15 @@ def import_user_preferences_from_csv(csv_path: str) -> Tuple[int, int]:
                 if not user_id:
                     continue
                 
-                # Update all preferences from row - only process columns that exist
+                # Update all preferences from row in one write - only columns that exist
+                values = {}
                 for key in row.index:
                     if key and key != 'user_id':  # Skip user_id itself
                         value = safe_get(row, key, '')
                         if value:
-                            try:
-                                user_state.update_preference(user_id, key, value)
-                            except Exception as e:
-                                print(f"[Import] Error updating preference {key} for user {user_id}: {e}")
-                                # Continue with other preferences
+                            values[key] = value
+                if values:
+                    user_state.update_preferences(user_id, values)
                 
                 imported += 1
                 
@@ -1918,7 +1951,9 @@ def import_from_zip(zip_path: str, skip_existing: bool = True, user_id: Optional
             'user_preferences.csv': ('user_preferences', None)  # Handled separately
         }
         
-        # Extract ZIP to temp directory
+        started = time.perf_counter()
+        # Read the ZIP member by member (no extractall): each CSV is streamed to a temp
+        # file, imported in chunks and deleted before the next one is decompressed
         with zipfile.ZipFile(zip_path, 'r') as zipf:
             # Abuse prevention: Check number of files in ZIP
             file_list = zipf.namelist()
@@ -1933,7 +1968,9 @@ def import_from_zip(zip_path: str, skip_existing: bool = True, user_id: Optional
             # Reject ZIP if it contains any unexpected files
             # This prevents malicious ZIP files with additional files
             unexpected_files = []
-            for file_name in file_list:
+            members = {}
+            for info in zipf.infolist():
+                file_name = info.filename
                 # Skip directories (they end with '/' in ZIP file lists)
                 if file_name.endswith('/'):
                     continue
@@ -1950,6 +1987,11 @@ def import_from_zip(zip_path: str, skip_existing: bool = True, user_id: Optional
                 # Reject any file that's not in our whitelist
                 if base_name not in ALLOWED_FILES:
                     unexpected_files.append(base_name)
+                else:
+                    # Prefer the top-level copy when a name appears more than once
+                    current = members.get(base_name)
+                    if current is None or file_name.count('/') < current.filename.count('/'):
+                        members[base_name] = info
             
             if unexpected_files:
                 results['_error'] = {
@@ -1959,32 +2001,43 @@ def import_from_zip(zip_path: str, skip_existing: bool = True, user_id: Optional
                 }
                 return results
             
-            zipf.extractall(temp_dir)
-        
-        # Initialize database
-        init_db()
-        session = get_session()
-        
-        try:
-            # Helper function to find file in extracted directory (handles subdirectories)
-            def find_file_in_dir(directory, filename):
-                """Find file in directory, searching recursively if needed."""
-                # Try direct path first (most common case)
-                direct_path = os.path.join(directory, filename)
-                if os.path.exists(direct_path) and os.path.isfile(direct_path):
-                    return direct_path
-                
-                # Search recursively (for ZIPs that preserve directory structure)
-                for root, dirs, files in os.walk(directory):
-                    if filename in files:
-                        return os.path.join(root, filename)
-                return None
+            # Initialize database
+            init_db()
+            session = get_session()
             
-            # Import each expected CSV file (allow missing files for old version compatibility)
-            for filename, (table_name, import_func) in ALLOWED_FILES.items():
-                csv_path = find_file_in_dir(temp_dir, filename)
-                if csv_path and os.path.exists(csv_path):
+            try:
+                # Import each expected CSV file (allow missing files for old version compatibility)
+                total_rows = 0
+                for filename, (table_name, import_func) in ALLOWED_FILES.items():
+                    info = members.get(filename)
+                    if info is None:
+                        # File missing - this is OK for old version compatibility
+                        # Missing columns will be handled by imputing empty values in import functions
+                        results[table_name] = {
+                            'imported': 0,
+                            'skipped': 0,
+                            'errors': 0,
+                            'note': 'File not found in ZIP (old version compatibility - will use defaults)'
+                        }
+                        continue
+                    
+                    # Abuse prevention: check the uncompressed size before decompressing
+                    if info.file_size > MAX_FILE_SIZE_MB * 1024 * 1024:
+                        results[table_name] = {
+                            'imported': 0,
+                            'skipped': 0,
+                            'errors': 1,
+                            'error': f"File size ({info.file_size / (1024 * 1024):.2f} MB) exceeds maximum allowed ({MAX_FILE_SIZE_MB} MB)",
+                            'note': 'Import rejected due to file size limit'
+                        }
+                        continue
+                    
+                    csv_path = os.path.join(temp_dir, filename)
+                    file_started = time.perf_counter()
                     try:
+                        with zipf.open(info) as src, open(csv_path, 'wb') as dst:
+                            shutil.copyfileobj(src, dst, 1024 * 1024)
+                        
                         if import_func:
                             # CRITICAL: Pass user_id to all import functions for data isolation
                             # Check function signature to determine which parameters it needs
@@ -2007,20 +2060,18 @@ def import_from_zip(zip_path: str, skip_existing: bool = True, user_id: Optional
                             # Call function with appropriate arguments
                             result = import_func(**{k: v for k, v in kwargs.items() if k in params})
                             imported, skipped, errors = result
-                            results[table_name] = {
-                                'imported': imported,
-                                'skipped': skipped,
-                                'errors': errors
-                            }
-                        elif table_name == 'user_preferences':
+                        else:
                             # user_preferences import doesn't need user_id (it reads from CSV)
                             # but we should still filter by user_id for security
                             imported, errors = import_user_preferences_from_csv(csv_path)
-                            results[table_name] = {
-                                'imported': imported,
-                                'skipped': 0,
-                                'errors': errors
-                            }
+                            skipped = 0
+                        results[table_name] = {
+                            'imported': imported,
+                            'skipped': skipped,
+                            'errors': errors,
+                            'seconds': round(time.perf_counter() - file_started, 3)
+                        }
+                        total_rows += imported + skipped + errors
                     except Exception as e:
                         print(f"[Import] Error processing {filename}: {e}")
                         import traceback
@@ -2032,44 +2083,48 @@ def import_from_zip(zip_path: str, skip_existing: bool = True, user_id: Optional
                             'error': str(e),
                             'note': 'Failed to import file'
                         }
-                else:
-                    # File missing - this is OK for old version compatibility
-                    # Missing columns will be handled by imputing empty values in import functions
-                    results[table_name] = {
-                        'imported': 0,
-                        'skipped': 0,
-                        'errors': 0,
-                        'note': 'File not found in ZIP (old version compatibility - will use defaults)'
-                    }
-            
-            # Check if backup files were created and move to permanent location
-            if os.path.exists(backup_dir) and os.listdir(backup_dir):
-                backup_files = os.listdir(backup_dir)
-                # Move backup files to data directory for permanent storage
-                data_dir = os.path.join(Path(__file__).resolve().parent.parent, "data")
-                permanent_backup_dir = os.path.join(data_dir, 'import_backups')
-                os.makedirs(permanent_backup_dir, exist_ok=True)
+                    finally:
+                        try:
+                            os.remove(csv_path)
+                        except OSError:
+                            pass
                 
-                moved_files = []
-                for backup_file in backup_files:
-                    src = os.path.join(backup_dir, backup_file)
-                    dst = os.path.join(permanent_backup_dir, backup_file)
-                    try:
-                        import shutil
-                        shutil.copy2(src, dst)  # Copy instead of move to keep temp copy
-                        moved_files.append(dst)
-                    except Exception as e:
-                        print(f"[Import] Could not copy backup file {backup_file}: {e}")
+                elapsed = time.perf_counter() - started
+                results['_throughput'] = {
+                    'rows': total_rows,
+                    'seconds': round(elapsed, 3),
+                    'rows_per_sec': round(total_rows / elapsed, 1) if elapsed > 0 else 0.0
+                }
+                print(f"[Import] ZIP import: {total_rows} rows in {elapsed:.2f}s "
+                      f"({results['_throughput']['rows_per_sec']:.0f} rows/s)")
                 
-                if moved_files:
-                    results['_backup_info'] = {
-                        'backup_dir': permanent_backup_dir,
-                        'backup_files': [os.path.basename(f) for f in moved_files],
-                        'note': f'Extra columns data saved to {len(moved_files)} backup file(s) in {permanent_backup_dir}'
-                    }
-        
-        finally:
-            session.close()
+                # Check if backup files were created and move to permanent location
+                if os.path.exists(backup_dir) and os.listdir(backup_dir):
+                    backup_files = os.listdir(backup_dir)
+                    # Move backup files to data directory for permanent storage
+                    data_dir = os.path.join(Path(__file__).resolve().parent.parent, "data")
+                    permanent_backup_dir = os.path.join(data_dir, 'import_backups')
+                    os.makedirs(permanent_backup_dir, exist_ok=True)
+                    
+                    moved_files = []
+                    for backup_file in backup_files:
+                        src = os.path.join(backup_dir, backup_file)
+                        dst = os.path.join(permanent_backup_dir, backup_file)
+                        try:
+                            shutil.copy2(src, dst)  # Copy instead of move to keep temp copy
+                            moved_files.append(dst)
+                        except Exception as e:
+                            print(f"[Import] Could not copy backup file {backup_file}: {e}")
+                    
+                    if moved_files:
+                        results['_backup_info'] = {
+                            'backup_dir': permanent_backup_dir,
+                            'backup_files': [os.path.basename(f) for f in moved_files],
+                            'note': f'Extra columns data saved to {len(moved_files)} backup file(s) in {permanent_backup_dir}'
+                        }
+            
+            finally:
+                session.close()
     
     finally:
         # Note: We don't delete temp_dir immediately - backup files might be needed
@@ -0,0 +1,422 @@
+# backend/csv_journal.py
+"""
+Append-only journal storage for the CSV backend.
+
+In CSV mode the managers used to rewrite their whole file (df.to_csv) on every
+write and re-read it (pd.read_csv(dtype=str)) before every operation, so write
+latency grew with the length of the user's history. CsvJournal keeps the
+canonical CSV file and adds, next to it, an append-only journal
+(<file>.journal) of JSON-line change records:
+
+    {"put": {"instance_id": "i1", "status": "active", ...}}   full row (string values)
+    {"del": [["i1"], ...]}                                       primary keys removed
+
+- read(): returns the current table (canonical CSV + journal replayed) as a
+  string frame. The table is kept in memory per file and process; a read only
+  stats the two files and replays journal records appended since (by any
+  writer), so an unchanged table costs two os.stat calls.
+- write(base, current): diffs the caller's frame against the frame it read
+  (vectorized, by primary key) and appends only the changed / new / deleted
+  rows to the journal. The file I/O of a write is proportional to the rows it
+  changed, not to the table.
+- Compaction folds the journal into the canonical CSV (temp file + os.replace,
+  then truncate the journal). It runs in a background thread once
+  COMPACT_RECORDS records have accumulated, on first load of a file with a
+  journal, and at interpreter exit. External tools reading the CSV directly
+  see journaled changes after the next compaction.
+
+Readers that need typed columns (datetimes, scores) call parsed(column): each
+column listed in TYPED_COLUMNS is parsed once per table version and shared.
+When the canonical CSV is rewritten, an Arrow snapshot with those typed columns
+is written next to it (see csv_snapshot) and used by the next process to load
+the table.
+
+Tables without a usable primary key (missing key column, duplicate keys) fall
+back to rewriting the canonical file, i.e. the previous behaviour. Set
+CSV_JOURNAL_ENABLED=0 to always read and write the canonical file directly.
+A single writer process is assumed (the app); other processes may read.
+"""
+import atexit
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend import csv_snapshot
+
+try:
+    from pandas._libs.parsers import STR_NA_VALUES as _NA_VALUES
+except ImportError:  # pragma: no cover - private pandas module moved
+    _NA_VALUES = frozenset({
+        '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+        '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+    })
+
+COMPACT_RECORDS = int(os.getenv('CSV_JOURNAL_COMPACT_RECORDS', '200'))
+
+# Columns readers parse, per table file: kept typed in memory (one parse per table version,
+# shared by all readers) and in the Arrow snapshot (see csv_snapshot)
+_INSTANCE_DATETIMES = ('created_at', 'initialized_at', 'started_at', 'completed_at', 'cancelled_at', 'due_at')
+_INSTANCE_NUMBERS = (
+    'duration_minutes', 'delay_minutes', 'relief_score', 'cognitive_load', 'mental_energy_needed',
+    'task_difficulty', 'emotional_load', 'environmental_effect', 'behavioral_score', 'net_relief',
+    'procrastination_score', 'proactive_score',
+)
+TYPED_COLUMNS = {
+    'task_instances.csv': {**{c: 'datetime' for c in _INSTANCE_DATETIMES}, **{c: 'number' for c in _INSTANCE_NUMBERS}},
+    'tasks.csv': {'created_at': 'datetime', 'default_estimate_minutes': 'number', 'default_initial_aversion': 'number'},
+}
+
+
+def journal_enabled() -> bool:
+    return os.getenv('CSV_JOURNAL_ENABLED', '1').lower() in ('1', 'true', 'yes')
+
+
+def _stringify(df: pd.DataFrame) -> pd.DataFrame:
+    """Frame as it reads back from CSV with dtype=str + fillna('') (NaN/None/NA strings -> '')."""
+    values = df.to_numpy(dtype=object, na_value='')
+    cells = [['' if (text := str(value)) in _NA_VALUES else text for value in row] for row in values]
+    return pd.DataFrame(cells, columns=df.columns, dtype=object)
+
+
+def _file_sig(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class CsvJournal:
+    """Canonical CSV + append-only journal for one file (use get_csv_journal())."""
+
+    def __init__(self, path: str, key_columns: Sequence[str], typed_columns: Optional[Dict[str, str]] = None):
+        self.path = path
+        self.journal_path = path + '.journal'
+        self.key_columns = tuple(key_columns)
+        self.typed_columns = dict(typed_columns or {})
+        self._typed = (None, {})                      # (frame, {column: parsed series}) for the current frame
+        self._lock = threading.RLock()
+        self._frame: Optional[pd.DataFrame] = None   # current table; replaced, never mutated
+        self._canonical_sig = None
+        self._journal_offset = 0
+        self._pending_records = 0                     # journal records since last compaction
+        self._compacting = False
+
+    # -----------------------------
+    # Reading
+    # -----------------------------
+    def read(self) -> pd.DataFrame:
+        """Current table as a string frame. Shared: callers must copy before mutating."""
+        if not journal_enabled():
+            return pd.read_csv(self.path, dtype=str).fillna('')
+        with self._lock:
+            self._sync()
+            return self._frame
+
+    def parsed(self, column: str, frame: Optional[pd.DataFrame] = None) -> pd.Series:
+        """Typed version of a column listed in typed_columns, aligned with read() (or with frame).
+
+        Parsed once per table version and shared by all callers; loaded from the Arrow
+        snapshot without parsing when the table came from one.
+        """
+        kind = self.typed_columns[column]
+        with self._lock:
+            if frame is None:
+                self._sync()
+                frame = self._frame
+            cached_frame, typed = self._typed
+            if cached_frame is not frame:
+                if frame is not self._frame:
+                    return csv_snapshot.parse_column(frame[column], kind) if column in frame.columns else \
+                        pd.Series(np.nan, index=frame.index, dtype='float64')
+                typed = {}
+                self._typed = (frame, typed)
+            if column not in typed:
+                typed[column] = csv_snapshot.parse_column(frame[column], kind) if column in frame.columns else \
+                    pd.Series(np.nan, index=frame.index, dtype='float64')
+            return typed[column]
+
+    def _sync(self):
+        """Bring the in-memory table up to date with the files (caller holds the lock)."""
+        canonical_sig = _file_sig(self.path)
+        if self._frame is None or canonical_sig != self._canonical_sig:
+            self._full_load()
+            return
+        journal_size = (_file_sig(self.journal_path) or (0, 0))[1]
+        if journal_size < self._journal_offset:
+            self._full_load()
+        elif journal_size > self._journal_offset:
+            records, self._journal_offset = self._read_journal(self._journal_offset)
+            self._frame = self._apply(self._frame, records)
+            self._pending_records += len(records)
+
+    def _full_load(self):
+        # Retry if a compaction replaced the canonical file between reading it and the journal
+        for _ in range(3):
+            canonical_sig = _file_sig(self.path)
+            snapshot = None
+            if self.typed_columns and csv_snapshot.snapshot_enabled():
+                snapshot = csv_snapshot.read_snapshot(self.path, canonical_sig)
+            if snapshot is not None:
+                frame, typed = snapshot
+            else:
+                # object columns (as pandas < 3 returned for dtype=str): cheaper to diff and patch
+                frame, typed = pd.read_csv(self.path, dtype=str).fillna('').astype(object), {}
+            records, offset = self._read_journal(0)
+            if _file_sig(self.path) == canonical_sig:
+                break
+        self._frame = self._apply(frame, records)
+        self._typed = (self._frame, typed) if self._frame is frame else (None, {})
+        self._canonical_sig = canonical_sig
+        self._journal_offset = offset
+        self._pending_records = len(records)
+        if records:
+            self._schedule_compaction()
+
+    def _read_journal(self, offset: int) -> Tuple[List[dict], int]:
+        records = []
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return records, 0
+        end = offset
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                break  # partially written record: picked up by the next read
+            end += len(line)
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"[CsvJournal] Skipping unreadable record in {self.journal_path}")
+        return records, end
+
+    # -----------------------------
+    # Writing
+    # -----------------------------
+    def write(self, base: Optional[pd.DataFrame], current: pd.DataFrame) -> pd.DataFrame:
+        """Persist current, given the frame base it was derived from (the caller's last read()).
+
+        Returns:
+            the table after the write (shared, like read()); use it as the next base
+        """
+        if not journal_enabled():
+            current = _stringify(current)
+            current.to_csv(self.path, index=False)
+            return current
+        records = self._diff(base, current)
+        with self._lock:
+            self._sync()
+            if records is None or not self._keys_unique(self._frame):
+                self._rewrite(_stringify(current))
+                return self._frame
+            if records:
+                self._append(records)
+                self._frame = self._apply(self._frame, records)
+                self._pending_records += len(records)
+                if self._pending_records >= COMPACT_RECORDS:
+                    self._schedule_compaction()
+            return self._frame
+
+    def _keys(self, df: pd.DataFrame) -> pd.Index:
+        # object (not str/Arrow) indexes: hash lookups like isin stay vectorized
+        arrays = [pd.Index(df[k].to_numpy(dtype=object), dtype=object) for k in self.key_columns]
+        if len(arrays) == 1:
+            return arrays[0]
+        return pd.MultiIndex.from_arrays(arrays, names=list(self.key_columns))
+
+    def _keys_unique(self, df: pd.DataFrame) -> bool:
+        return all(k in df.columns for k in self.key_columns) and not self._keys(df).has_duplicates
+
+    def _diff(self, base: Optional[pd.DataFrame], current: pd.DataFrame) -> Optional[List[dict]]:
+        """Journal records turning base into current, or None if keys do not allow it.
+
+        Only rows that differ from base are converted to strings, so an unchanged row costs
+        one vectorized comparison rather than a re-serialization.
+        """
+        if not all(k in current.columns for k in self.key_columns):
+            return None
+        current = current.reset_index(drop=True)
+        current_keys = self._keys(current[list(self.key_columns)].fillna('').astype(str))
+        if current_keys.has_duplicates:
+            return None
+        if base is None or base.empty:
+            return [{'put': row} for row in _stringify(current).to_dict('records')]
+        if not self._keys_unique(base) or not set(base.columns) <= set(current.columns):
+            return None
+        base_keys = self._keys(base)
+        aligned = base.reindex(columns=current.columns, fill_value='')
+        if base_keys.equals(current_keys):
+            candidates = np.zeros(len(current), dtype=bool)
+        else:
+            aligned = aligned.set_axis(base_keys).reindex(current_keys, fill_value='')
+            candidates = ~current_keys.isin(base_keys)
+        aligned_values = aligned.to_numpy(dtype=object)
+        # Cheap candidate pass; rows that only differ in type (1 vs '1', NaN vs '') are re-checked below
+        differs = current.to_numpy(dtype=object) != aligned_values
+        if differs.dtype != bool:  # pd.NA comparisons yield NA: treat as candidates
+            differs = np.array([[cell is not False for cell in row] for row in differs], dtype=bool)
+        candidates |= differs.any(axis=1)
+        changed = _stringify(current[candidates])
+        if len(changed):
+            new_rows = ~current_keys[candidates].isin(base_keys)
+            differs = (changed.to_numpy(dtype=object) != aligned_values[candidates]).any(axis=1)
+            changed = changed[new_rows | differs]
+        records = [{'put': row} for row in changed.to_dict('records')]
+        removed = base_keys.difference(current_keys)
+        if len(removed):
+            records.append({'del': [list(k) if isinstance(k, tuple) else [k] for k in removed]})
+        return records
+
+    def _apply(self, frame: pd.DataFrame, records: List[dict]) -> pd.DataFrame:
+        """New frame with records applied (puts replace or append rows by key, dels drop them)."""
+        if not records:
+            return frame
+        latest: Dict[tuple, Optional[dict]] = {}
+        for record in records:
+            if 'put' in record:
+                row = record['put']
+                latest[tuple(str(row.get(k, '')) for k in self.key_columns)] = row
+            for key in record.get('del', ()):
+                latest[tuple(str(k) for k in key)] = None
+        columns = list(frame.columns)
+        columns += dict.fromkeys(c for row in latest.values() if row for c in row if c not in frame.columns)
+        if all(k in frame.columns for k in self.key_columns):
+            frame_keys = self._keys(frame)
+        else:
+            frame_keys = pd.Index([None] * len(frame))
+        if len(self.key_columns) == 1:
+            lookup = [k[0] for k in latest]
+        else:
+            lookup = pd.MultiIndex.from_tuples(list(latest), names=list(self.key_columns))
+        if frame_keys.has_duplicates:
+            last = {key: i for i, key in enumerate(frame_keys)}  # last occurrence wins
+            found = [last.get(k, -1) for k in lookup]
+        else:
+            found = frame_keys.get_indexer(lookup).tolist()
+        position = {key: pos for key, pos in zip(latest, found) if pos >= 0}
+
+        # Column arrays are copied, so frames handed out by read() are never modified
+        data = {
+            c: frame[c].to_numpy(dtype=object, copy=True) if c in frame.columns
+            else np.full(len(frame), '', dtype=object)
+            for c in columns
+        }
+        for key, row in latest.items():
+            if row is not None and key in position:
+                for c in columns:
+                    data[c][position[key]] = str(row.get(c, ''))
+        frame = pd.DataFrame(data, columns=columns, dtype=object)
+        dropped = [position[k] for k, row in latest.items() if row is None and k in position]
+        if dropped:
+            frame = frame.drop(index=frame.index[dropped])
+        added = [row for k, row in latest.items() if row is not None and k not in position]
+        if added:
+            added_frame = pd.DataFrame(added, dtype=object).reindex(columns=columns, fill_value='').fillna('')
+            frame = pd.concat([frame, added_frame], ignore_index=True)
+        return frame.reset_index(drop=True)
+
+    def _append(self, records: List[dict]):
+        payload = ''.join(json.dumps(r, ensure_ascii=False, default=str) + '\n' for r in records)
+        with open(self.journal_path, 'a', encoding='utf-8', newline='\n') as f:
+            f.write(payload)
+            f.flush()
+        self._journal_offset = (_file_sig(self.journal_path) or (0, 0))[1]
+
+    def _rewrite(self, frame: pd.DataFrame):
+        """Write frame as the canonical file and clear the journal (caller holds the lock)."""
+        tmp_path = self.path + '.tmp'
+        frame.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.journal_path):
+            open(self.journal_path, 'w').close()
+        self._frame = frame
+        self._canonical_sig = _file_sig(self.path)
+        self._journal_offset = 0
+        self._pending_records = 0
+        if self.typed_columns and csv_snapshot.snapshot_enabled():
+            try:
+                typed = {c: self.parsed(c) for c in self.typed_columns}
+                csv_snapshot.write_snapshot(self.path, frame, typed, self._canonical_sig)
+            except Exception as e:
+                # The CSV is authoritative; a missing/stale snapshot only means parsing on next load
+                print(f"[CsvJournal] Could not write snapshot for {self.path}: {e}")
+
+    # -----------------------------
+    # Compaction
+    # -----------------------------
+    def compact(self) -> bool:
+        """Fold the journal into the canonical CSV. Returns True if anything was compacted."""
+        if not journal_enabled():
+            return False
+        with self._lock:
+            self._sync()
+            if not self._journal_offset:
+                return False
+            try:
+                self._rewrite(self._frame)
+            except PermissionError as e:
+                # e.g. the CSV is open in Excel on Windows; the journal keeps the changes
+                print(f"[CsvJournal] Could not compact {self.path}: {e}")
+                return False
+        return True
+
+    def _schedule_compaction(self):
+        if self._compacting:
+            return
+        self._compacting = True
+
+        def run():
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"[CsvJournal] Compaction of {self.path} failed: {e}")
+            finally:
+                self._compacting = False
+
+        threading.Thread(target=run, daemon=True, name='csv-journal-compact').start()
+
+
+_journals: Dict[str, CsvJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_csv_journal(path: str, key_columns: Sequence[str]) -> CsvJournal:
+    """Process-wide CsvJournal for a CSV file (shared by all manager instances and readers)."""
+    abspath = os.path.abspath(path)
+    with _journals_lock:
+        journal = _journals.get(abspath)
+        if journal is None:
+            journal = CsvJournal(abspath, key_columns, TYPED_COLUMNS.get(os.path.basename(abspath)))
+            _journals[abspath] = journal
+        return journal
+
+
+def flush_csv_journal(path: str) -> bool:
+    """Compact the journal of path (if open in this process) so the canonical CSV is current.
+
+    Call before reading or rewriting the CSV file directly (archival, gap detection);
+    a direct rewrite with records still in the journal would have them replayed on top.
+    """
+    with _journals_lock:
+        journal = _journals.get(os.path.abspath(path))
+    if journal is None:
+        return False
+    return journal.compact()
+
+
+@atexit.register
+def compact_all():
+    """Compact every journal opened in this process (runs at exit)."""
+    with _journals_lock:
+        journals = list(_journals.values())
+    for journal in journals:
+        try:
+            journal.compact()
+        except Exception as e:
+            print(f"[CsvJournal] Compaction of {journal.path} failed: {e}")
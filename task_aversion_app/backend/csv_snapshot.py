@@ -0,0 +1,85 @@
+# backend/csv_snapshot.py
+"""
+Typed Arrow snapshots of the CSV tables.
+
+The CSV files are text: every process that opens them (the app, the analytics
+worker processes, archival / gap detection) used to re-parse them as strings and
+then parse the datetime and numeric columns again. When a canonical CSV is
+(re)written, CsvJournal also writes <file>.arrow: an uncompressed Arrow IPC file
+holding the string table plus the typed columns (datetime64 / float64) that
+readers ask for. A process loading the table memory-maps the snapshot instead of
+parsing the CSV, provided the snapshot was written for the current CSV file
+(same mtime and size, recorded in the schema metadata); typed columns are then
+used without any parsing.
+
+pyarrow is optional: without it (or with CSV_SNAPSHOT_ENABLED=0) no snapshots
+are written and the CSV is parsed as before.
+"""
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # optional dependency
+    pa = None
+
+_TYPED_PREFIX = '__typed__.'
+_SIGNATURE_KEY = b'csv_signature'
+
+
+def snapshot_enabled() -> bool:
+    return pa is not None and os.getenv('CSV_SNAPSHOT_ENABLED', '1').lower() in ('1', 'true', 'yes')
+
+
+def snapshot_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + '.arrow'
+
+
+def parse_column(values: pd.Series, kind: str) -> pd.Series:
+    """Parse a string column: kind 'datetime' -> datetime64 (NaT if invalid), 'number' -> float64 (NaN)."""
+    if kind == 'datetime':
+        return pd.to_datetime(values, errors='coerce')
+    return pd.to_numeric(values, errors='coerce').astype('float64')
+
+
+def write_snapshot(csv_path: str, frame: pd.DataFrame, typed: Dict[str, pd.Series], signature: Tuple[int, int]):
+    """Write the Arrow snapshot of frame (the table stored in csv_path, whose file signature is given)."""
+    columns = {col: frame[col].astype(str) for col in frame.columns}
+    for col, series in typed.items():
+        columns[_TYPED_PREFIX + col] = series.reset_index(drop=True)
+    table = pa.Table.from_pandas(pd.DataFrame(columns), preserve_index=False)
+    table = table.replace_schema_metadata({_SIGNATURE_KEY: json.dumps(list(signature)).encode()})
+    path = snapshot_path(csv_path)
+    tmp_path = path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(csv_path: str, signature: Tuple[int, int]) -> Optional[Tuple[pd.DataFrame, Dict[str, pd.Series]]]:
+    """(string frame, typed columns) from the snapshot if it matches the CSV signature, else None."""
+    path = snapshot_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        source = pa.memory_map(path, 'r')
+        reader = pa.ipc.open_file(source)
+        metadata = reader.schema.metadata or {}
+        if json.loads(metadata.get(_SIGNATURE_KEY, b'null')) != list(signature):
+            source.close()
+            return None
+        table = reader.read_all()
+    except Exception as e:
+        print(f"[CsvSnapshot] Could not read {path}: {e}")
+        return None
+    # Numeric / datetime columns can map the file's buffers directly; strings become Python objects
+    data = table.to_pandas(split_blocks=True)
+    typed_names = [c for c in data.columns if c.startswith(_TYPED_PREFIX)]
+    typed = {c[len(_TYPED_PREFIX):]: data[c] for c in typed_names}
+    frame = data.drop(columns=typed_names).astype(object)
+    return frame, typed
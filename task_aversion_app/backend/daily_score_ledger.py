@@ -0,0 +1,209 @@
+"""
+Per-user ledger of finalized daily scores.
+
+calculate_daily_scores() recomputes a day from the whole instances frame.
+get_historical_daily_scores() did that for every day with completions to find
+the top N, check_score_milestones() repeated it for each score type, and
+calculate_weekly_progress_summary() once per day of the week. A closed day's
+scores only change when its completions do, so they are stored in daily_scores
+as one row per (user_id, date, score_type, formula_version) and read back with
+indexed queries: top N is ORDER BY score DESC LIMIT n, a week is a date range.
+
+Rows are written lazily: sync_days() finds the closed days (before today) whose
+rows are missing or stale and computes them with a caller-supplied function
+(Analytics computes from the instances frame). This is also the backfill for
+existing databases. Each row records how many instances were completed that day
+and their latest task_instances.updated_at; one grouped query over
+task_instances compares those per day, so an edited, added, moved or deleted
+completion makes its day be recomputed. Bumping a formula version makes every
+day be recomputed on next use; rows of other versions are ignored and replaced
+as their days are recomputed. Scores also depend on user settings (cancellation
+penalties, productivity curve), so callers tag the versions with a fingerprint
+of those settings (with_settings): changing a setting works like a version bump.
+
+Today is never stored: its scores still change.
+"""
+import hashlib
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+# Per day: (completed instances, latest task_instances.updated_at, latest completed_at)
+DaySource = Tuple[int, Optional[datetime], Optional[datetime]]
+
+
+def with_settings(versions: Mapping[str, str], settings: Mapping[str, Any]) -> Dict[str, str]:
+    """versions with a fingerprint of the settings the scores are computed with (e.g. '1.2+3f9a0c1b2d')."""
+    digest = hashlib.sha1(json.dumps(settings, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:10]
+    return {score_type: f'{version}+{digest}' for score_type, version in versions.items()}
+
+
+def _as_date(value: Any) -> date:
+    """func.date() result as a date (PostgreSQL returns a date, SQLite a 'YYYY-MM-DD' string)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _day_bounds(start: Optional[date], end: Optional[date]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    lower = datetime.combine(start, datetime.min.time()) if start else None
+    upper = datetime.combine(end, datetime.min.time()) + timedelta(days=1) if end else None
+    return lower, upper
+
+
+def day_sources(session, user_id: int, start: Optional[date] = None, end: Optional[date] = None) -> Dict[date, DaySource]:
+    """Completions per day for a user (start <= date <= end), from one grouped query."""
+    from sqlalchemy import func
+    from .database import TaskInstance
+
+    day = func.date(TaskInstance.completed_at)
+    query = session.query(
+        day, func.count(TaskInstance.instance_id), func.max(TaskInstance.updated_at), func.max(TaskInstance.completed_at)
+    ).filter(
+        TaskInstance.user_id == user_id,
+        TaskInstance.completed_at.isnot(None),
+    )
+    lower, upper = _day_bounds(start, end)
+    if lower is not None:
+        query = query.filter(TaskInstance.completed_at >= lower)
+    if upper is not None:
+        query = query.filter(TaskInstance.completed_at < upper)
+    return {
+        _as_date(value): (int(count or 0), updated, completed)
+        for value, count, updated, completed in query.group_by(day).all()
+    }
+
+
+def _ledger_rows(session, user_id: int, score_types, start: Optional[date], end: Optional[date]):
+    from .database import DailyScore
+
+    query = session.query(DailyScore).filter(
+        DailyScore.user_id == user_id,
+        DailyScore.score_type.in_(list(score_types)),
+    )
+    if start is not None:
+        query = query.filter(DailyScore.date >= start)
+    if end is not None:
+        query = query.filter(DailyScore.date <= end)
+    return query.all()
+
+
+def stale_days(session, user_id: int, versions: Mapping[str, str],
+               start: Optional[date] = None, end: Optional[date] = None) -> Tuple[Dict[date, DaySource], List[date]]:
+    """Closed days in [start, end] whose ledger rows are missing or out of date.
+
+    Returns:
+        (sources, stale) - day_sources() for the range (to store with the new rows)
+        and the sorted days to recompute, including days with rows but no
+        completions left (their rows are dropped)
+    """
+    yesterday = date.today() - timedelta(days=1)
+    end = min(end, yesterday) if end is not None else yesterday
+    if start is not None and start > end:
+        return {}, []
+    sources = day_sources(session, user_id, start, end)
+
+    stored: Dict[date, Dict[str, Tuple[int, Optional[datetime]]]] = {}
+    for row in _ledger_rows(session, user_id, versions, start, end):
+        if row.formula_version == versions.get(row.score_type):
+            stored.setdefault(row.date, {})[row.score_type] = (row.task_count, row.source_updated_at)
+
+    stale = set(day for day in stored if day not in sources)
+    for day, (count, updated, _) in sources.items():
+        rows = stored.get(day, {})
+        if any(rows.get(score_type) != (count, updated) for score_type in versions):
+            stale.add(day)
+    return sources, sorted(stale)
+
+
+def sync_days(session_factory: Callable[[], Any], user_id: int, versions: Mapping[str, str],
+              compute_day: Callable[[date], Mapping[str, float]],
+              start: Optional[date] = None, end: Optional[date] = None) -> int:
+    """Compute and store the missing or stale closed days in [start, end].
+
+    No session is held while compute_day runs (it loads instances with its own
+    session; SQLite shares one connection between sessions).
+
+    Args:
+        session_factory: Returns a new session (e.g. database.get_session)
+        versions: score_type -> formula version of the rows to keep
+        compute_day: day -> {score_type: score} (must cover every key of versions)
+
+    Returns:
+        Number of days recomputed
+    """
+    from .database import DailyScore
+
+    if user_id is None:
+        return 0
+    with session_factory() as session:
+        sources, stale = stale_days(session, user_id, versions, start, end)
+    if not stale:
+        return 0
+
+    stamp = datetime.utcnow()
+    rows = []
+    refreshed = []
+    for day in stale:
+        if day in sources:
+            try:
+                scores = compute_day(day)
+            except Exception as e:
+                print(f"[DailyScoreLedger] Could not compute {day} for user {user_id}: {e}")
+                continue
+            count, updated, last_completed = sources[day]
+            rows.extend({
+                'user_id': user_id,
+                'date': day,
+                'score_type': score_type,
+                'formula_version': version,
+                'score': float(scores.get(score_type, 0.0) or 0.0),
+                'task_count': count,
+                'source_updated_at': updated,
+                'last_completed_at': last_completed,
+                'computed_at': stamp,
+            } for score_type, version in versions.items())
+        refreshed.append(day)
+
+    if not refreshed:
+        return 0
+    with session_factory() as session:
+        session.query(DailyScore).filter(
+            DailyScore.user_id == user_id,
+            DailyScore.date.in_(refreshed),
+        ).delete(synchronize_session=False)
+        if rows:
+            session.bulk_insert_mappings(DailyScore, rows)
+        session.commit()
+    return len(refreshed)
+
+
+def load_day_scores(session, user_id: int, versions: Mapping[str, str],
+                    start: Optional[date] = None, end: Optional[date] = None) -> Dict[date, Dict[str, Any]]:
+    """Stored days in [start, end] with their scores.
+
+    Returns:
+        Dict of date -> {score_type: score, ..., 'task_count': int, 'last_completed_at': datetime}
+    """
+    days: Dict[date, Dict[str, Any]] = {}
+    for row in _ledger_rows(session, user_id, versions, start, end):
+        if row.formula_version != versions.get(row.score_type):
+            continue
+        entry = days.setdefault(row.date, {'task_count': row.task_count, 'last_completed_at': row.last_completed_at})
+        entry[row.score_type] = row.score
+    return days
+
+
+def load_top_scores(session, user_id: int, score_type: str, version: str, top_n: int) -> List[Dict[str, Any]]:
+    """The top_n stored days by score (score > 0), best first; ties keep date order."""
+    from .database import DailyScore
+
+    rows = session.query(DailyScore.date, DailyScore.score).filter(
+        DailyScore.user_id == user_id,
+        DailyScore.score_type == score_type,
+        DailyScore.formula_version == version,
+        DailyScore.score > 0,
+    ).order_by(DailyScore.score.desc(), DailyScore.date.asc()).limit(top_n).all()
+    return [{'date': day, 'score': score} for day, score in rows]
@@ -11,6 +11,7 @@ from datetime import datetime
 from typing import Dict, List, Optional
 
 from .gap_detector import GapDetector
+from .csv_journal import flush_csv_journal, get_csv_journal
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 ARCHIVE_DIR = os.path.join(DATA_DIR, 'archived')
@@ -38,9 +39,11 @@ class DataArchival:
         if not os.path.exists(instances_file):
             return pd.DataFrame()
         
-        df = pd.read_csv(instances_file, dtype=str, low_memory=False)
+        # Shared in-memory table (CSV + journal); created_at is parsed once per table version
+        journal = get_csv_journal(instances_file, ['instance_id'])
+        df = journal.read().copy()
         if 'created_at' in df.columns:
-            df['created_at_parsed'] = pd.to_datetime(df['created_at'], errors='coerce')
+            df['created_at_parsed'] = journal.parsed('created_at')
         return df
     
     def load_tasks(self) -> pd.DataFrame:
@@ -48,7 +51,7 @@ class DataArchival:
         tasks_file = os.path.join(self.data_dir, 'tasks.csv')
         if not os.path.exists(tasks_file):
             return pd.DataFrame()
-        return pd.read_csv(tasks_file, dtype=str, low_memory=False)
+        return get_csv_journal(tasks_file, ['task_id']).read().copy()
     
     def calculate_pre_gap_averages(self, instances: pd.DataFrame, gap_date: datetime) -> Dict:
         """Calculate averages from pre-gap data."""
@@ -235,6 +238,8 @@ class DataArchival:
         
         # Update active instances file (keep only post-gap)
         instances_file = os.path.join(self.data_dir, 'task_instances.csv')
+        # Fold pending journal records into the CSV first; they would be replayed over the rewrite
+        flush_csv_journal(instances_file)
         if not post_gap_instances.empty:
             # Remove parsed column before saving
             if 'created_at_parsed' in post_gap_instances.columns:
@@ -8,7 +8,7 @@ import json
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import create_engine, Column, String, Integer, Boolean, DateTime, JSON, Text, Float, ForeignKey, Index, UniqueConstraint, text
+from sqlalchemy import event, create_engine, Column, String, Integer, Boolean, Date, DateTime, JSON, Text, Float, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship
 from sqlalchemy.exc import OperationalError, IntegrityError
 from sqlalchemy.pool import StaticPool
@@ -64,7 +64,7 @@ else:
 # Session factory
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
-# Track if database has been initialized (to avoid duplicate print messages)
+# Track if database has been initialized (later init_db() calls return immediately)
 _db_initialized = False
 
 # Set up query logging (lightweight, can be disabled via env var)
@@ -81,9 +81,78 @@ def get_session():
     return SessionLocal()
 
 
-def init_db():
-    """Initialize database by creating all tables. Idempotent - safe to call multiple times."""
+# Async engine (optional): AsyncSession over aiosqlite (SQLite) or asyncpg (PostgreSQL)
+# for UI callbacks that await reads instead of blocking the event loop. Created on
+# first use; when the driver (or greenlet) is not installed, async_db_available()
+# is False and the managers' *_async methods run their sync path in a thread.
+_async_engine = None
+_AsyncSessionLocal = None
+_async_db_checked = False
+
+
+def get_async_database_url(url: Optional[str] = None) -> Optional[str]:
+    """Map DATABASE_URL to its asyncio driver URL, or None if there is no async driver for it."""
+    url = url or DATABASE_URL
+    if url.startswith('sqlite+aiosqlite') or url.startswith('postgresql+asyncpg'):
+        return url
+    if url.startswith('sqlite:'):
+        return 'sqlite+aiosqlite:' + url[len('sqlite:'):]
+    for prefix in ('postgresql+psycopg2://', 'postgresql://', 'postgres://'):
+        if url.startswith(prefix):
+            # asyncpg takes ssl=... instead of libpq's sslmode=...
+            return 'postgresql+asyncpg://' + url[len(prefix):].replace('sslmode=', 'ssl=')
+    return None
+
+
+def async_db_available() -> bool:
+    """True if an async engine could be created for DATABASE_URL (checked once per process)."""
+    global _async_engine, _AsyncSessionLocal, _async_db_checked
+    if _async_db_checked:
+        return _async_engine is not None
+    _async_db_checked = True
+    async_url = get_async_database_url()
+    if async_url is None:
+        return False
+    try:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        if async_url.startswith('sqlite'):
+            _async_engine = create_async_engine(async_url, echo=False)
+        else:
+            _async_engine = create_async_engine(
+                async_url,
+                echo=False,
+                pool_pre_ping=True,
+                pool_size=5,
+                max_overflow=10
+            )
+        _AsyncSessionLocal = async_sessionmaker(bind=_async_engine, autoflush=False, expire_on_commit=False)
+    except Exception as e:
+        _async_engine = None
+        print(f"[Database] Async engine unavailable ({e}); async reads will run in threads")
+    return _async_engine is not None
+
+
+def get_async_session():
+    """Get an AsyncSession. Use as `async with get_async_session() as session:`.
+
+    Raises:
+        RuntimeError: If no async driver is available (see async_db_available())
+    """
+    if not async_db_available():
+        raise RuntimeError("Async database access is not available (install aiosqlite / asyncpg)")
+    return _AsyncSessionLocal()
+
+
+def init_db(force: bool = False):
+    """Initialize database by creating all tables. Idempotent - safe to call multiple times.
+
+    Managers call this from their constructors, and pages construct managers ad hoc,
+    so only the first call per process does the work (create_all plus a PRAGMA per
+    table on SQLite). Pass force=True after dropping tables.
+    """
     global _db_initialized
+    if _db_initialized and not force:
+        return
     
     # Ensure data directory exists for SQLite
     if DATABASE_URL.startswith('sqlite'):
@@ -250,6 +319,8 @@ class TaskInstance(Base):
     completed_at = Column(DateTime, default=None, nullable=True, index=True)  # Indexed for completed-only queries
     cancelled_at = Column(DateTime, default=None, nullable=True)
     due_at = Column(DateTime, default=None, nullable=True)  # Optional deadline; overdue when now > due_at (urgency system)
+    # Last write; high-water mark for Analytics delta refresh (NULL for rows untouched since migration 019)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
 
     # JSON data (raw data storage)
     # Use JSONB for PostgreSQL (better performance, supports GIN indexes) or JSON for SQLite
@@ -269,6 +340,10 @@ class TaskInstance(Base):
     # Emotional factors (calculated from net_relief)
     serendipity_factor = Column(Float, default=None, nullable=True)  # Positive net_relief (pleasant surprise)
     disappointment_factor = Column(Float, default=None, nullable=True)  # Negative net_relief (disappointment)
+
+    # Execution score stored at completion (backend/execution_score.py); recomputed when the version differs
+    execution_score = Column(Float, default=None, nullable=True)
+    execution_score_version = Column(String, default=None, nullable=True)
     
     # Status flags
     is_completed = Column(Boolean, default=False, index=True)
@@ -339,8 +414,251 @@ class TaskInstance(Base):
         Index('idx_taskinstance_status_completed', 'status', 'is_completed', 'is_deleted'),
         # Index for task_id + completion status (common when getting instances for a task)
         Index('idx_taskinstance_task_completed', 'task_id', 'is_completed'),
+        # Index for per-user "changed since" scans (Analytics delta refresh)
+        Index('idx_taskinstance_user_updated', 'user_id', 'updated_at'),
+    )
+
+
+@event.listens_for(TaskInstance, 'before_update')
+def _clear_stale_execution_score(mapper, connection, target):
+    """Drop the stored execution score's version when a write changes its inputs.
+
+    Covers every ORM write (task editing, CSV re-import, scripts), not only the
+    completion paths that store a new score: recent_execution_score() and
+    recompute_execution_scores() re-score rows whose version is not current.
+    """
+    from sqlalchemy import inspect as sa_inspect
+    from .execution_score import INPUT_COLUMNS
+
+    attrs = sa_inspect(target).attrs
+    if attrs.execution_score_version.history.has_changes():
+        return  # scored in this write
+    if any(getattr(attrs, column).history.has_changes() for column in INPUT_COLUMNS):
+        target.execution_score_version = None
+
+
+class TaskInstanceProjection(Base):
+    """
+    Typed columnar projection of task_instances for analytics.
+    One row per instance holding the attribute values already resolved from the
+    predicted/actual JSON (see backend/instance_projection.py for the fallback chain).
+    Written by InstanceManager on every mutation so Analytics can select plain
+    float columns instead of unpacking JSON per row.
+    """
+    __tablename__ = 'task_instance_projection'
+
+    # Primary key (one projection row per instance)
+    instance_id = Column(String, ForeignKey('task_instances.instance_id', ondelete='CASCADE'), primary_key=True)
+
+    # User association (mirrors task_instances.user_id for user-scoped scans)
+    user_id = Column(Integer, ForeignKey('users.user_id', ondelete='CASCADE'), nullable=True, index=True)
+
+    # Bumped when the resolution rules change; stale rows are re-resolved on load
+    projection_version = Column(Integer, default=1, nullable=False)
+
+    # Resolved TASK_ATTRIBUTES values (NULL = no value, default applied at load time)
+    duration_minutes = Column(Float, default=None, nullable=True)
+    relief_score = Column(Float, default=None, nullable=True)
+    mental_energy_needed = Column(Float, default=None, nullable=True)
+    task_difficulty = Column(Float, default=None, nullable=True)
+    emotional_load = Column(Float, default=None, nullable=True)
+    environmental_effect = Column(Float, default=None, nullable=True)
+    behavioral_score = Column(Float, default=None, nullable=True)
+    skills_improved = Column(Text, default=None, nullable=True)
+
+    # Values only present in the JSON payloads
+    physical_load = Column(Float, default=None, nullable=True)
+    expected_aversion = Column(Float, default=None, nullable=True)
+    expected_relief = Column(Float, default=None, nullable=True)
+    expected_emotional_load = Column(Float, default=None, nullable=True)
+    actual_stress = Column(Float, default=None, nullable=True)
+
+    # Timestamps (updated_at = task_instances.updated_at the row was resolved from; older = stale)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TaskInstanceProjection(instance_id='{self.instance_id}', version={self.projection_version})>"
+
+
+class DailyMetricRollup(Base):
+    """
+    Per-user, per-day aggregates of per-instance analytics metrics.
+    One row per (user_id, date, metric_key) holding sum/count/min/max over the
+    user's instances completed that day (date = completed_at, local time).
+    Maintained by InstanceManager on every write to a completed instance (the
+    affected days are re-aggregated in the same transaction), so metric history
+    charts read one indexed range instead of the whole instances frame.
+    See backend/metric_rollup.py for the metric definitions.
+    """
+    __tablename__ = 'daily_metric_rollup'
+
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # User association (required; rollups are always per user)
+    user_id = Column(Integer, ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
+
+    # Day the instances were completed on
+    date = Column(Date, nullable=False)
+
+    # Metric name as used by Analytics.get_generic_metric_history (e.g. 'stress_level')
+    metric_key = Column(String, nullable=False)
+
+    # Aggregates over the day's non-missing values
+    sum = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
+    min = Column(Float, nullable=True)
+    max = Column(Float, nullable=True)
+
+    # When the day was last re-aggregated (compared with task_instances.updated_at to detect stale rollups)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # One row per user/day/metric; also serves the (user_id, metric_key, date) range scans
+        UniqueConstraint('user_id', 'date', 'metric_key', name='uq_daily_metric_rollup_user_date_metric'),
+        Index('idx_daily_metric_rollup_user_metric_date', 'user_id', 'metric_key', 'date'),
     )
 
+    def __repr__(self):
+        return f"<DailyMetricRollup(user_id={self.user_id}, date={self.date}, metric_key='{self.metric_key}')>"
+
+
+class TaskStats(Base):
+    """
+    Per-user, per-task statistics over the task's instances.
+    One row per (user_id, task_id) holding the values the initialize/recommend
+    paths used to compute by loading every instance of the task: averages of
+    the predicted and actual payloads, the baseline aversions, the initial
+    aversion and the latest values. Maintained by InstanceManager on every
+    instance write (the task's row is recomputed in the same transaction).
+    See backend/task_stats.py for the definitions.
+    """
+    __tablename__ = 'task_stats'
+
+    # Composite primary key
+    user_id = Column(Integer, ForeignKey('users.user_id', ondelete='CASCADE'), primary_key=True)
+    task_id = Column(String, primary_key=True)
+
+    # Instance counts (instance_count covers every instance; used to detect stale rows)
+    instance_count = Column(Integer, nullable=False, default=0)
+    initialized_count = Column(Integer, nullable=False, default=0)
+    completed_count = Column(Integer, nullable=False, default=0)
+
+    # Rounded 0-100 means of the predicted (initialized instances) and actual (completed) payloads
+    json_type = get_json_type()
+    predicted_averages = Column(json_type, default=dict)  # JSONB for PostgreSQL, JSON for SQLite
+    actual_averages = Column(json_type, default=dict)  # JSONB for PostgreSQL, JSON for SQLite
+    avg_time_estimate = Column(Float, nullable=True)
+
+    # Aversion baselines (0-100, rounded): first initialized instance, median, IQR-trimmed mean
+    initial_aversion = Column(Integer, nullable=True)
+    baseline_aversion_robust = Column(Integer, nullable=True)
+    baseline_aversion_sensitive = Column(Integer, nullable=True)
+
+    # Latest values
+    last_initialized_at = Column(DateTime, nullable=True)
+    last_completed_at = Column(DateTime, nullable=True)
+    last_expected_aversion = Column(Float, nullable=True)
+    last_actual_relief = Column(Float, nullable=True)
+
+    # Latest task_instances.updated_at the row was computed from (older than the instances = stale)
+    source_updated_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TaskStats(user_id={self.user_id}, task_id='{self.task_id}', instances={self.instance_count})>"
+
+
+class TaskMetricSketch(Base):
+    """
+    Per-user, per-task, per-month quantile sketches of instance metrics.
+    One row per (user_id, task_id, metric_key, month) holding a mergeable KLL
+    sketch (backend/quantile_sketch.py) of the metric over the task's instances
+    in that month. Merging a task's monthly rows answers medians, quartiles and
+    percentile ranks for any month-aligned window without loading instances.
+    Maintained by InstanceManager on every instance write (the affected months
+    are re-sketched in the same transaction). See backend/metric_sketch.py.
+    """
+    __tablename__ = 'task_metric_sketch'
+
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # User association (required; sketches are always per user)
+    user_id = Column(Integer, ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
+
+    task_id = Column(String, nullable=False)
+
+    # Metric name (see metric_sketch.SKETCH_METRICS, e.g. 'expected_aversion')
+    metric_key = Column(String, nullable=False)
+
+    # First day of the month the instances fall in (by the metric's timestamp column)
+    month = Column(Date, nullable=False)
+
+    # Instances in the month (with or without a value; used to detect stale sketches)
+    instance_count = Column(Integer, nullable=False, default=0)
+
+    json_type = get_json_type()
+    sketch = Column(json_type, default=dict)  # QuantileSketch.to_dict(); JSONB for PostgreSQL
+
+    # When the month was last re-sketched (compared with task_instances.updated_at to detect stale rows)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # One row per user/task/metric/month; also serves the (user_id, task_id, metric_key, month) range scans
+        UniqueConstraint('user_id', 'task_id', 'metric_key', 'month', name='uq_task_metric_sketch_user_task_metric_month'),
+    )
+
+    def __repr__(self):
+        return f"<TaskMetricSketch(user_id={self.user_id}, task_id='{self.task_id}', metric_key='{self.metric_key}', month={self.month})>"
+
+
+class DailyScore(Base):
+    """
+    Per-user ledger of finalized daily scores.
+    One row per (user_id, date, score_type, formula_version) holding a closed
+    day's score (completion efficiency, execution, grit, composite, ...) so top-N
+    days, milestones and weekly summaries read indexed rows instead of
+    recomputing every day from the instances frame. Rows are written lazily the
+    first time a closed day is needed and recomputed when the day's completions
+    change. See backend/daily_score_ledger.py.
+    """
+    __tablename__ = 'daily_scores'
+
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # User association (required; scores are always per user)
+    user_id = Column(Integer, ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
+
+    # Day the instances were completed on
+    date = Column(Date, nullable=False)
+
+    # Score name (e.g. 'execution_score') and the formula version it was computed with
+    score_type = Column(String, nullable=False)
+    formula_version = Column(String, nullable=False)
+
+    score = Column(Float, nullable=False, default=0.0)
+
+    # Completions of the day when computed, their latest task_instances.updated_at and
+    # completed_at (count or updated_at differing from task_instances = stale row)
+    task_count = Column(Integer, nullable=False, default=0)
+    source_updated_at = Column(DateTime, nullable=True)
+    last_completed_at = Column(DateTime, nullable=True)
+
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # One row per user/day/score/version; also serves the (user_id, date) range scans
+        UniqueConstraint('user_id', 'date', 'score_type', 'formula_version', name='uq_daily_scores_user_date_type_version'),
+        # Top-N days per score
+        Index('idx_daily_scores_user_type_version_score', 'user_id', 'score_type', 'formula_version', 'score'),
+    )
+
+    def __repr__(self):
+        return f"<DailyScore(user_id={self.user_id}, date={self.date}, score_type='{self.score_type}', score={self.score})>"
+
 
 class Emotion(Base):
     """
@@ -552,9 +870,9 @@ class UserPreferences(Base):
     execution_score_chunk_state = Column(json_type, default=None, nullable=True)  # JSONB for PostgreSQL, JSON for SQLite
     productivity_settings = Column(json_type, default=dict)  # JSONB for PostgreSQL, JSON for SQLite
     
-    # Additional JSON fields that may be dynamically added (stored as JSON)
-    # Note: The CSV may have additional fields that are stored as JSON strings
-    # These will be handled dynamically by the migration script
+    # Preference keys without a column of their own (task_horizon_days, recommendation_weights,
+    # milestones, ...): key -> value in the CSV string format. Written by UserStateManager.
+    extra_preferences = Column(json_type, default=dict)  # JSONB for PostgreSQL, JSON for SQLite
     
     def to_dict(self) -> dict:
         """Convert model instance to dictionary (compatible with CSV format)."""
@@ -581,6 +899,8 @@ class UserPreferences(Base):
             'monitored_metrics_config': json.dumps(self.monitored_metrics_config) if isinstance(self.monitored_metrics_config, dict) else (self.monitored_metrics_config or '{}'),
             'execution_score_chunk_state': json.dumps(self.execution_score_chunk_state) if isinstance(self.execution_score_chunk_state, dict) else (self.execution_score_chunk_state or ''),
             'productivity_settings': json.dumps(self.productivity_settings) if isinstance(self.productivity_settings, dict) else (self.productivity_settings or '{}'),
+            **{key: '' if value is None else str(value)
+               for key, value in (self.extra_preferences if isinstance(self.extra_preferences, dict) else {}).items()},
         }
     
     def __repr__(self):
@@ -8,6 +8,8 @@ from typing import List, Dict, Optional, Union
 
 import pandas as pd
 
+from backend.csv_journal import get_csv_journal
+
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 DEFAULT_USER_ID_STR = "default"
 
@@ -36,6 +38,7 @@ class EmotionManager:
             self.file = os.path.join(DATA_DIR, 'emotions.csv')
             if not os.path.exists(self.file):
                 pd.DataFrame(columns=['emotion', 'user_id']).to_csv(self.file, index=False)
+            self._journal = get_csv_journal(self.file, ['user_id', 'emotion'])
             self._reload_csv()
         else:
             self.use_db = True
@@ -51,11 +54,13 @@ class EmotionManager:
                 self.file = os.path.join(DATA_DIR, 'emotions.csv')
                 if not os.path.exists(self.file):
                     pd.DataFrame(columns=['emotion', 'user_id']).to_csv(self.file, index=False)
+                self._journal = get_csv_journal(self.file, ['user_id', 'emotion'])
                 self._reload_csv()
 
     def _reload_csv(self) -> None:
         """Reload CSV into dataframe."""
-        self.df = pd.read_csv(self.file, dtype=str).fillna('') if os.path.exists(self.file) else pd.DataFrame()
+        self._csv_base = self._journal.read() if os.path.exists(self.file) else None
+        self.df = self._csv_base.copy() if self._csv_base is not None else pd.DataFrame()
         if 'emotion' not in self.df.columns:
             self.df['emotion'] = ''
         if 'user_id' not in self.df.columns:
@@ -64,8 +69,8 @@ class EmotionManager:
         self.df['user_id'] = self.df['user_id'].astype(str)
 
     def _save_csv(self) -> None:
-        """Save dataframe to CSV."""
-        self.df.to_csv(self.file, index=False)
+        """Save dataframe to CSV (changed rows are appended to the journal, see csv_journal)."""
+        self._csv_base = self._journal.write(self._csv_base, self.df)
         self._reload_csv()
 
     @staticmethod
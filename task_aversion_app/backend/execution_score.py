@@ -0,0 +1,252 @@
+"""
+Stored execution scores on task_instances.
+
+Analytics.calculate_execution_score() only reads the instance's own payloads and
+timestamps, so a completed instance's score never changes until the formula
+does. The dashboard still recomputed it for the 50 most recent completions on
+every load, five per UI tick, persisting its progress in user preferences
+between ticks (get_execution_score_chunked).
+
+The score is now computed once when an instance is completed and stored in
+task_instances.execution_score, with the formula version in
+execution_score_version. compute_execution_scores() is the array form of
+calculate_execution_score() for a frame of instances (the only per-row step left
+is reading the JSON payloads). Rows without a score for EXECUTION_SCORE_VERSION
+(completed before the column existed, or before a formula bump) are filled in:
+
+- recent_execution_score() recomputes the stale rows among the ones it
+  averages and writes them back
+- recompute_execution_scores() walks every stale completed row of a user (or
+  all users) in chunks with one executemany UPDATE each; the version column is
+  its own checkpoint, so an interrupted run just continues with the rows left
+
+Any other ORM write that changes an input column of a scored row clears its
+execution_score_version (database._clear_stale_execution_score), so the row is
+re-scored like a row from before a formula bump.
+
+Writing a score does not touch updated_at: no other stored value derives from
+it (the daily score ledger computes from the payloads).
+
+Bump EXECUTION_SCORE_VERSION when calculate_execution_score() changes, and keep
+compute_execution_scores() in step with it.
+"""
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .factor_engine import payload_floats
+
+# Execution Score Formula Version
+EXECUTION_SCORE_VERSION = '1.2'
+
+# Columns compute_execution_scores() reads
+INPUT_COLUMNS = ('predicted', 'actual', 'started_at', 'completed_at', 'due_at')
+
+# Average reported when there are no completed instances
+NEUTRAL_EXECUTION_SCORE = 50.0
+
+
+def _timestamps(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, errors='coerce')
+
+
+def difficulty_bonus(predicted: Sequence[Any], actual: Sequence[Any]) -> np.ndarray:
+    """Analytics.calculate_difficulty_bonus() over payload arrays (0.0-1.0)."""
+    aversion = payload_floats(predicted, 'initial_aversion', 'aversion')
+    stress = payload_floats(actual, 'stress_level')
+    mental = payload_floats(predicted, 'mental_energy_needed', 'cognitive_load')
+    difficulty = payload_floats(predicted, 'task_difficulty')
+
+    fallback_load = (np.clip(np.nan_to_num(mental, nan=50.0), 0.0, 100.0)
+                     + np.clip(np.nan_to_num(difficulty, nan=50.0), 0.0, 100.0)) / 2.0
+    load = np.where(
+        ~np.isnan(stress),
+        np.clip(np.nan_to_num(stress), 0.0, 100.0),
+        np.where(~np.isnan(mental) | ~np.isnan(difficulty), fallback_load, 0.0),
+    )
+    combined = 0.7 * np.clip(np.nan_to_num(aversion), 0.0, 100.0) + 0.3 * load
+    bonus = np.clip(1.0 - np.exp(-combined / 50.0), 0.0, 1.0)
+    return np.where(np.isnan(aversion), 0.0, bonus)
+
+
+def _speed_factor(predicted: Sequence[Any], actual: Sequence[Any]) -> np.ndarray:
+    time_actual = np.nan_to_num(payload_floats(actual, 'time_actual_minutes'))
+    time_estimate = np.nan_to_num(payload_floats(predicted, 'time_estimate_minutes', 'estimate'))
+    timed = (time_estimate > 0) & (time_actual > 0)
+    ratio = np.divide(time_actual, time_estimate, out=np.ones_like(time_actual), where=timed)
+    speed = np.where(ratio <= 0.5, 1.0, np.where(ratio <= 1.0, 1.0 - (ratio - 0.5), 0.5 / ratio))
+    return np.where(timed, speed, 0.5)
+
+
+def _start_speed_factor(frame: pd.DataFrame) -> np.ndarray:
+    """Overdue-only start penalty (due_at -> started_at); 0.5 without a due date or when on time."""
+    due = _timestamps(frame['due_at'])
+    started = _timestamps(frame['started_at'])
+    completed = _timestamps(frame['completed_at'])
+    delay = ((started - due).dt.total_seconds() / 60.0).to_numpy(dtype=float)
+    started_late = np.nan_to_num(delay) > 0
+    overdue = (completed > due).to_numpy() | started_late
+    has_due = (due.notna() & completed.notna()).to_numpy()
+
+    excess = np.maximum(np.nan_to_num(delay) - 120.0, 0.0)
+    penalty = np.where(
+        delay <= 30, 1.0 - (delay / 30.0) * 0.3,
+        np.where(delay <= 120, 0.7 - ((delay - 30) / 90.0) * 0.3, np.maximum(0.1, 0.4 * np.exp(-excess / 240.0))),
+    )
+    return np.where(has_due & started_late, penalty, np.where(has_due & overdue, 1.0, 0.5))
+
+
+def _completion_factor(actual: Sequence[Any]) -> np.ndarray:
+    pct = payload_floats(actual, 'completion_percent')
+    pct = np.where(np.isnan(pct) | (pct == 0), 100.0, pct)  # `or 100` in the per-row code
+    return np.where(
+        pct >= 100.0, 1.0,
+        np.where(pct >= 90.0, 0.9 + (pct - 90.0) / 10.0 * 0.1,
+                 np.where(pct >= 50.0, 0.5 + (pct - 50.0) / 40.0 * 0.4, pct / 50.0 * 0.5)),
+    )
+
+
+def compute_execution_scores(frame: pd.DataFrame) -> np.ndarray:
+    """Execution score (0-100) per row, matching Analytics.calculate_execution_score().
+
+    Args:
+        frame: INPUT_COLUMNS of task_instances rows; payloads as dicts or JSON
+            strings, timestamps as datetimes or strings ('' = missing)
+    """
+    if frame.empty:
+        return np.zeros(0)
+    predicted = frame['predicted'].tolist()
+    actual = frame['actual'].tolist()
+    score = 50.0 * (
+        (1.0 + difficulty_bonus(predicted, actual))
+        * (0.5 + _speed_factor(predicted, actual) * 0.5)
+        * (0.5 + _start_speed_factor(frame) * 0.5)
+        * _completion_factor(actual)
+    )
+    return np.clip(score, 0.0, 100.0)
+
+
+def _write_scores(session, table, instance_ids: List[str], scores: np.ndarray) -> None:
+    from sqlalchemy import bindparam
+
+    update_stmt = table.update().where(table.c.instance_id == bindparam('b_instance_id')).values(
+        execution_score=bindparam('b_execution_score'),
+        execution_score_version=EXECUTION_SCORE_VERSION,
+        updated_at=table.c.updated_at,  # keep the row's updated_at (no onupdate stamp)
+    )
+    session.execute(update_stmt, [
+        {'b_instance_id': instance_id, 'b_execution_score': float(score)}
+        for instance_id, score in zip(instance_ids, scores)
+    ])
+
+
+def _score_rows(session, table, instance_ids: List[str]) -> np.ndarray:
+    from sqlalchemy import select
+
+    rows = session.execute(
+        select(table.c.instance_id, *[table.c[name] for name in INPUT_COLUMNS]).where(table.c.instance_id.in_(instance_ids))
+    ).all()
+    frame = pd.DataFrame(rows, columns=['instance_id'] + list(INPUT_COLUMNS)).set_index('instance_id')
+    return compute_execution_scores(frame.loc[instance_ids])
+
+
+def recent_execution_score(session_factory: Callable[[], Any], user_id: int, limit: int = 50) -> Optional[float]:
+    """Average stored execution score of a user's `limit` most recently completed instances.
+
+    Stale rows among them are computed and stored first.
+
+    Returns:
+        The average, or None when the user has no completed instances
+    """
+    from sqlalchemy import select
+    from .database import TaskInstance
+
+    table = TaskInstance.__table__
+    with session_factory() as session:
+        rows = session.execute(
+            select(table.c.instance_id, table.c.execution_score, table.c.execution_score_version)
+            .where(table.c.user_id == user_id, table.c.completed_at.isnot(None))
+            .order_by(table.c.completed_at.desc())
+            .limit(limit)
+        ).all()
+        if not rows:
+            return None
+        scores = {instance_id: score for instance_id, score, version in rows
+                  if score is not None and version == EXECUTION_SCORE_VERSION}
+        stale = [instance_id for instance_id, _, _ in rows if instance_id not in scores]
+        if stale:
+            computed = _score_rows(session, table, stale)
+            _write_scores(session, table, stale, computed)
+            session.commit()
+            scores.update(zip(stale, computed.tolist()))
+    return float(np.mean(list(scores.values())))
+
+
+def _print_progress(user_id, processed: int, total: int, elapsed: float):
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"[ExecutionScore] user {user_id}: {processed}/{total} rows ({rate:.0f} rows/s)")
+
+
+def recompute_execution_scores(
+    session_factory: Callable[[], Any],
+    user_id: Optional[int] = None,
+    chunk_size: int = 2000,
+    progress: Optional[Callable[[Any, int, int, float], None]] = _print_progress,
+) -> Dict[Any, int]:
+    """Store execution scores for completed instances without a score for EXECUTION_SCORE_VERSION.
+
+    Args:
+        session_factory: Returns a new session (backend.database.get_session)
+        user_id: User to recompute; None walks every user_id in task_instances
+        chunk_size: Rows per select / UPDATE / commit
+        progress: Called after every chunk with (user_id, processed, total, elapsed seconds)
+
+    Returns:
+        Dict of user_id -> rows updated
+    """
+    from sqlalchemy import func, or_, select
+    from .database import TaskInstance
+
+    table = TaskInstance.__table__
+    stale_filter = [
+        table.c.completed_at.isnot(None),
+        or_(table.c.execution_score_version.is_(None),
+            table.c.execution_score_version != EXECUTION_SCORE_VERSION,
+            table.c.execution_score.is_(None)),
+    ]
+    with session_factory() as session:
+        if user_id is None:
+            user_ids = [row[0] for row in session.execute(select(table.c.user_id).where(*stale_filter).distinct())]
+        else:
+            user_ids = [user_id]
+    user_ids = sorted(user_ids, key=lambda value: (value is None, str(value)))
+
+    updated_by_user: Dict[Any, int] = {}
+    for uid in user_ids:
+        user_filter = table.c.user_id.is_(None) if uid is None else table.c.user_id == uid
+        started = time.perf_counter()
+        processed = 0
+        with session_factory() as session:
+            total = session.execute(
+                select(func.count()).select_from(table).where(user_filter, *stale_filter)
+            ).scalar() or 0
+            last_id = None
+            while True:
+                query = (select(table.c.instance_id, *[table.c[name] for name in INPUT_COLUMNS])
+                         .where(user_filter, *stale_filter).order_by(table.c.instance_id).limit(chunk_size))
+                if last_id is not None:
+                    query = query.where(table.c.instance_id > last_id)
+                rows = session.execute(query).all()
+                if not rows:
+                    break
+                frame = pd.DataFrame(rows, columns=['instance_id'] + list(INPUT_COLUMNS))
+                _write_scores(session, table, frame['instance_id'].tolist(), compute_execution_scores(frame))
+                session.commit()
+                processed += len(frame)
+                last_id = frame['instance_id'].iloc[-1]
+                if progress is not None:
+                    progress(uid, processed, total, time.perf_counter() - started)
+        updated_by_user[uid] = processed
+    return updated_by_user
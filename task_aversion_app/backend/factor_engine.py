@@ -0,0 +1,311 @@
+"""
+Bulk recomputation of the stored factor columns on task_instances.
+
+procrastination_score, proactive_score, behavioral_score, net_relief,
+net_emotional, serendipity_factor and disappointment_factor are written by
+InstanceManager when an instance is completed (_apply_complete_db and
+_calculate_and_store_factors_db). When a formula changes, every stored value has
+to be recomputed. Scripts used to do that by loading ORM objects and updating
+them row by row.
+
+compute_factor_columns() computes all seven columns for a frame of instances
+with array math. The only per-row step left is reading the JSON payloads.
+recompute_factors() runs it over a user (or every user) in chunks of
+instance_id order:
+
+- rows are selected with Core (no ORM objects)
+- only rows whose values change are written back, with one executemany
+  UPDATE per chunk
+- every chunk is committed and then checkpointed to a JSON file, so an
+  interrupted run resumes after the last committed chunk
+
+Changed rows get a new updated_at. The projection, task_stats and metric
+rollup freshness checks then treat them as stale and re-resolve them on the
+next read.
+
+The rules match the per-row code for rows written by the current code:
+
+- procrastination/proactive: completed instances only, from the delay between
+  created_at and started_at (else initialized_at, else created_at) against
+  the time estimate
+- net_relief: actual['net_relief'] if given, else actual_relief -
+  expected_relief, else the stored value
+- serendipity/disappointment: positive/negative part of actual_relief -
+  expected_relief
+- net_emotional: actual_emotional - expected_emotional_load
+- behavioral_score: actual['behavioral_score'] if given, else the stored value
+
+Bump FACTOR_VERSION when a rule changes. A checkpoint written for another
+version is ignored.
+"""
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+FACTOR_VERSION = 1
+
+FACTOR_COLUMNS = (
+    'procrastination_score',
+    'proactive_score',
+    'behavioral_score',
+    'net_relief',
+    'net_emotional',
+    'serendipity_factor',
+    'disappointment_factor',
+)
+
+# Input columns read from task_instances (besides the stored factor columns)
+_INPUT_COLUMNS = ('instance_id', 'status', 'created_at', 'initialized_at', 'started_at', 'predicted', 'actual')
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'factor_recompute_checkpoint.json')
+
+
+def _payload(value: Any) -> Mapping[str, Any]:
+    if isinstance(value, Mapping):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            parsed = json.loads(value)
+        except (json.JSONDecodeError, ValueError):
+            return {}
+        return parsed if isinstance(parsed, Mapping) else {}
+    return {}
+
+
+def payload_floats(payloads: Sequence[Any], *keys: str) -> np.ndarray:
+    """Float array of the first truthy key per payload (`a or b` chain), NaN when missing or not numeric.
+
+    A single key keeps 0 (plain .get()), like the per-row code.
+    """
+    out = np.full(len(payloads), np.nan)
+    for i, payload in enumerate(payloads):
+        payload = _payload(payload)
+        value = None
+        for key in keys:
+            value = value or payload.get(key)
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        try:
+            out[i] = float(value)
+        except (ValueError, TypeError):
+            pass
+    return out
+
+
+def emotional_factors(predicted: Sequence[Any], actual: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """Relief and emotional factors as arrays (NaN = None).
+
+    Returns:
+        Dict with net_relief (computed actual - expected), serendipity_factor,
+        disappointment_factor and net_emotional
+    """
+    net_relief = payload_floats(actual, 'actual_relief') - payload_floats(predicted, 'expected_relief')
+    net_emotional = (payload_floats(actual, 'actual_emotional', 'emotional_load')
+                     - payload_floats(predicted, 'expected_emotional_load', 'expected_emotional'))
+    return {
+        'net_relief': net_relief,
+        'serendipity_factor': np.maximum(0.0, net_relief),
+        'disappointment_factor': np.maximum(0.0, -net_relief),
+        'net_emotional': net_emotional,
+    }
+
+
+def _minutes_between(later: pd.Series, earlier: pd.Series) -> np.ndarray:
+    later = pd.to_datetime(later, errors='coerce')
+    earlier = pd.to_datetime(earlier, errors='coerce')
+    return ((later - earlier).dt.total_seconds() / 60.0).to_numpy(dtype=float)
+
+
+def compute_factor_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Compute FACTOR_COLUMNS for a frame of task_instances rows.
+
+    Args:
+        frame: Columns of _INPUT_COLUMNS plus the stored net_relief and
+            behavioral_score (used when the payloads do not provide them)
+
+    Returns:
+        Frame indexed like the input with one float64 column per factor (NaN = NULL)
+    """
+    predicted = frame['predicted'].tolist()
+    actual = frame['actual'].tolist()
+    result = pd.DataFrame(index=frame.index)
+
+    # Procrastination / proactive (completed instances only)
+    started = frame['started_at'].where(frame['started_at'].notna(), frame['initialized_at'])
+    started = started.where(started.notna(), frame['created_at'])
+    delay = _minutes_between(started, frame['created_at'])
+    estimate = payload_floats(predicted, 'time_estimate_minutes', 'estimate')
+    estimate = np.where(np.isnan(estimate) | (estimate == 0), 1.0, estimate)
+    procrast = delay / np.maximum(estimate, 1.0)
+    proactive = np.maximum(0.0, 1.0 - delay / np.maximum(estimate * 2.0, 1.0))
+    completed = (frame['status'] == 'completed').to_numpy()
+    result['procrastination_score'] = np.where(completed, np.round(np.minimum(procrast, 10.0), 3), np.nan)
+    result['proactive_score'] = np.where(
+        completed, np.round(np.minimum(np.maximum(proactive * 10.0, 0.0), 10.0), 3), np.nan
+    )
+
+    factors = emotional_factors(predicted, actual)
+    stored_net_relief = pd.to_numeric(frame['net_relief'], errors='coerce').to_numpy(dtype=float)
+    payload_net_relief = payload_floats(actual, 'net_relief')
+    net_relief = np.where(np.isnan(payload_net_relief), factors['net_relief'], payload_net_relief)
+    result['net_relief'] = np.where(np.isnan(net_relief), stored_net_relief, net_relief)
+    result['net_emotional'] = factors['net_emotional']
+    result['serendipity_factor'] = factors['serendipity_factor']
+    result['disappointment_factor'] = factors['disappointment_factor']
+
+    stored_behavioral = pd.to_numeric(frame['behavioral_score'], errors='coerce').to_numpy(dtype=float)
+    payload_behavioral = payload_floats(actual, 'behavioral_score')
+    result['behavioral_score'] = np.where(np.isnan(payload_behavioral), stored_behavioral, payload_behavioral)
+    return result[list(FACTOR_COLUMNS)]
+
+
+def _changed_rows(frame: pd.DataFrame, computed: pd.DataFrame) -> pd.Series:
+    """Boolean mask of rows whose computed factors differ from the stored ones."""
+    changed = pd.Series(False, index=frame.index)
+    for column in FACTOR_COLUMNS:
+        stored = pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=float)
+        new = computed[column].to_numpy(dtype=float)
+        same = (np.isnan(stored) & np.isnan(new)) | np.isclose(stored, new, rtol=0.0, atol=1e-9, equal_nan=False)
+        changed |= ~same
+    return changed
+
+
+def _update_params(frame: pd.DataFrame, computed: pd.DataFrame, mask: pd.Series, stamp: datetime) -> List[Dict[str, Any]]:
+    rows = computed[mask]
+    params = []
+    for instance_id, values in zip(frame.loc[mask, 'instance_id'], rows.itertuples(index=False)):
+        row = {'b_instance_id': instance_id, 'b_updated_at': stamp}
+        for column, value in zip(FACTOR_COLUMNS, values):
+            row[f'b_{column}'] = None if np.isnan(value) else float(value)
+        params.append(row)
+    return params
+
+
+def _load_checkpoint(path: str, scope: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if checkpoint.get('version') != FACTOR_VERSION or checkpoint.get('scope') != scope:
+        return {}
+    return checkpoint
+
+
+def _save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def _print_progress(user_id, processed: int, total: int, updated: int, elapsed: float):
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"[FactorEngine] user {user_id}: {processed}/{total} rows, {updated} updated ({rate:.0f} rows/s)")
+
+
+def recompute_factors(
+    session_factory: Callable[[], Any],
+    user_id: Optional[int] = None,
+    chunk_size: int = 2000,
+    resume: bool = True,
+    checkpoint_path: Optional[str] = None,
+    progress: Optional[Callable[[Any, int, int, int, float], None]] = _print_progress,
+    on_user_done: Optional[Callable[[Any, int], None]] = None,
+) -> Dict[Any, int]:
+    """Recompute FACTOR_COLUMNS for a user's instances (every user's when user_id is None).
+
+    Args:
+        session_factory: Returns a new session (backend.database.get_session)
+        user_id: User to recompute; None walks every user_id in task_instances
+        chunk_size: Rows per select / UPDATE / commit
+        resume: Continue after the last committed chunk of an interrupted run
+            with the same FACTOR_VERSION and scope
+        checkpoint_path: Checkpoint file (default data/factor_recompute_checkpoint.json)
+        progress: Called after every chunk with (user_id, processed, total, updated, elapsed seconds)
+        on_user_done: Called with (user_id, rows updated) after a user's last chunk
+            (InstanceManager invalidates that user's caches here)
+
+    Returns:
+        Dict of user_id -> rows updated in this run
+    """
+    from sqlalchemy import bindparam, func, select
+    from backend.database import TaskInstance
+
+    table = TaskInstance.__table__
+    checkpoint_path = checkpoint_path or DEFAULT_CHECKPOINT_PATH
+    scope = 'all' if user_id is None else str(user_id)
+    checkpoint = _load_checkpoint(checkpoint_path, scope) if resume else {}
+    done_users = set(checkpoint.get('done_users', []))
+
+    with session_factory() as session:
+        if user_id is None:
+            user_ids = [row[0] for row in session.execute(select(table.c.user_id).distinct())]
+        else:
+            user_ids = [user_id]
+    user_ids = sorted(user_ids, key=lambda value: (value is None, str(value)))
+
+    update_stmt = table.update().where(table.c.instance_id == bindparam('b_instance_id')).values(
+        updated_at=bindparam('b_updated_at'),
+        **{column: bindparam(f'b_{column}') for column in FACTOR_COLUMNS},
+    )
+    selected = [table.c[name] for name in _INPUT_COLUMNS] + [table.c[name] for name in FACTOR_COLUMNS]
+    updated_by_user: Dict[Any, int] = {}
+
+    for uid in user_ids:
+        key = 'null' if uid is None else str(uid)
+        if key in done_users:
+            continue
+        user_filter = table.c.user_id.is_(None) if uid is None else table.c.user_id == uid
+        last_id = checkpoint.get('last_instance_id') if checkpoint.get('user_id') == key else None
+        started = time.perf_counter()
+        updated = 0
+        with session_factory() as session:
+            total = session.execute(select(func.count()).select_from(table).where(user_filter)).scalar() or 0
+            processed = 0
+            if last_id is not None:
+                processed = session.execute(
+                    select(func.count()).select_from(table).where(user_filter, table.c.instance_id <= last_id)
+                ).scalar() or 0
+            while True:
+                query = select(*selected).where(user_filter).order_by(table.c.instance_id).limit(chunk_size)
+                if last_id is not None:
+                    query = query.where(table.c.instance_id > last_id)
+                rows = session.execute(query).all()
+                if not rows:
+                    break
+                frame = pd.DataFrame(rows, columns=list(_INPUT_COLUMNS) + list(FACTOR_COLUMNS))
+                computed = compute_factor_columns(frame)
+                mask = _changed_rows(frame, computed)
+                if mask.any():
+                    session.execute(update_stmt, _update_params(frame, computed, mask, datetime.utcnow()))
+                session.commit()
+                updated += int(mask.sum())
+                processed += len(frame)
+                last_id = frame['instance_id'].iloc[-1]
+                _save_checkpoint(checkpoint_path, {
+                    'version': FACTOR_VERSION, 'scope': scope, 'done_users': sorted(done_users),
+                    'user_id': key, 'last_instance_id': last_id,
+                })
+                if progress is not None:
+                    progress(uid, processed, total, updated, time.perf_counter() - started)
+        done_users.add(key)
+        updated_by_user[uid] = updated
+        _save_checkpoint(checkpoint_path, {
+            'version': FACTOR_VERSION, 'scope': scope, 'done_users': sorted(done_users),
+            'user_id': None, 'last_instance_id': None,
+        })
+        if on_user_done is not None:
+            on_user_done(uid, updated)
+
+    try:
+        os.remove(checkpoint_path)
+    except OSError:
+        pass
+    return updated_by_user
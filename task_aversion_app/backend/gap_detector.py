@@ -10,6 +10,9 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
+from .cache_registry import cache_registry, GAP_PREFERENCE
+from .csv_journal import flush_csv_journal, get_csv_journal
+
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 PREFERENCES_FILE = os.path.join(DATA_DIR, 'user_preferences.csv')
 
@@ -33,9 +36,11 @@ class GapDetector:
         if not os.path.exists(self.instances_file):
             return pd.DataFrame()
         
-        df = pd.read_csv(self.instances_file, dtype=str, low_memory=False)
+        # Shared in-memory table (CSV + journal); created_at is parsed once per table version
+        journal = get_csv_journal(self.instances_file, ['instance_id'])
+        df = journal.read().copy()
         if 'created_at' in df.columns:
-            df['created_at_parsed'] = pd.to_datetime(df['created_at'], errors='coerce')
+            df['created_at_parsed'] = journal.parsed('created_at')
         return df
     
     def detect_gaps(self, instances: Optional[pd.DataFrame] = None) -> List[Dict]:
@@ -107,6 +112,7 @@ class GapDetector:
             return None
         
         try:
+            flush_csv_journal(self.preferences_file)
             prefs_df = pd.read_csv(self.preferences_file, dtype=str)
             if 'gap_handling' in prefs_df.columns and len(prefs_df) > 0:
                 return prefs_df.iloc[0]['gap_handling']
@@ -128,6 +134,7 @@ class GapDetector:
         # Load or create preferences
         if os.path.exists(self.preferences_file):
             try:
+                flush_csv_journal(self.preferences_file)
                 prefs_df = pd.read_csv(self.preferences_file, dtype=str)
             except Exception:
                 prefs_df = pd.DataFrame()
@@ -147,6 +154,9 @@ class GapDetector:
         # Save
         os.makedirs(os.path.dirname(self.preferences_file), exist_ok=True)
         prefs_df.to_csv(self.preferences_file, index=False)
+        
+        # The preference filters every Analytics instances frame (stored globally, so all users)
+        cache_registry.invalidate(GAP_PREFERENCE)
     
     def needs_gap_decision(self) -> bool:
         """Check if user needs to make a gap handling decision."""
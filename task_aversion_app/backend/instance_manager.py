@@ -1,21 +1,32 @@
 # backend/instance_manager.py
+import asyncio
 import os
 import pandas as pd
 from datetime import datetime
 from typing import Optional, List, Dict
 import json
+import threading
 import time
 
+from backend.bounded_cache import get_cache
 from backend.performance_logger import get_perf_logger
+from backend.csv_journal import get_csv_journal
+from backend.running_sessions import running_sessions
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 perf_logger = get_perf_logger()
+_batch_id_lock = threading.Lock()
 class InstanceManager:
-    # Class-level cache shared across all instances
-    _shared_active_instances_cache = None
-    _shared_active_instances_cache_time = None
-    _shared_recent_completed_cache = {}  # Per-limit cache: {limit: (result, timestamp)}
-    _per_user_cache = {}  # Per-user cache for data isolation: {cache_key: result, cache_key_time: timestamp}
+    # Class-level cache shared across all instances (2 minutes; active instances change frequently)
+    _cache_ttl_seconds = 120
+    # Per-user cache for data isolation: {(user_id, kind, ...): result}
+    _per_user_cache = get_cache('instances.per_user', max_entries=512, ttl_seconds=_cache_ttl_seconds)
+    # Users whose task_stats rows were checked against task_instances (re-checked after the TTL)
+    _task_stats_checked = get_cache('instances.task_stats_checked', max_entries=512, ttl_seconds=_cache_ttl_seconds)
+    # Users whose task_metric_sketch rows were checked against task_instances (re-checked after the TTL)
+    _metric_sketch_checked = get_cache('instances.metric_sketch_checked', max_entries=512, ttl_seconds=_cache_ttl_seconds)
+    # Last number handed out by _batch_instance_ids (guarded by _batch_id_lock)
+    _last_batch_id = 0
     
     def __init__(self):
         # Default to database (SQLite) unless USE_CSV is explicitly set
@@ -39,9 +50,10 @@ class InstanceManager:
         if self.use_db:
             # Database backend
             try:
-                from backend.database import get_session, TaskInstance, init_db
+                from backend.database import get_session, TaskInstance, TaskInstanceProjection, init_db
                 self.db_session = get_session
                 self.TaskInstance = TaskInstance
+                self.TaskInstanceProjection = TaskInstanceProjection
                 # Initialize database if tables don't exist
                 init_db()
                 if not getattr(InstanceManager, '_printed_backend', False):
@@ -71,33 +83,42 @@ class InstanceManager:
                 )
             self._init_csv()
             print("[InstanceManager] Using CSV backend")
-        
-        # Cache TTL (shared across all instances)
-        self._cache_ttl_seconds = 120  # 2 minutes (shorter for active instances since they change frequently)
+
     
-    def _invalidate_instance_caches(self):
+    def _invalidate_instance_caches(self, user_id: Optional[int] = None):
         """Invalidate all instance caches (shared across all InstanceManager instances).
-        Call this when instances are created/updated/deleted."""
+        Call this when instances are created/updated/deleted.
+        
+        Args:
+            user_id: Owner of the changed instances. Analytics products derived from
+                instances are dropped for this user only; None drops them for all users.
+        """
         try:
             from backend.instrumentation import log_cache_invalidation
-            log_cache_invalidation('InstanceManager', '_invalidate_instance_caches')
+            log_cache_invalidation('InstanceManager', '_invalidate_instance_caches', user_id=user_id)
         except ImportError:
             pass
-        InstanceManager._shared_active_instances_cache = None
-        InstanceManager._shared_active_instances_cache_time = None
-        InstanceManager._shared_recent_completed_cache.clear()
-        # Clear per-user cache for data isolation
-        if hasattr(InstanceManager, '_per_user_cache'):
-            InstanceManager._per_user_cache.clear()
-        # Also invalidate Analytics caches since they depend on instances
+        self._clear_instance_lists(user_id)
+        # Also invalidate Analytics caches that depend on instances (registered by backend.analytics)
         try:
-            from backend.analytics import Analytics
-            # Get the singleton instance if it exists, or create a new one
-            analytics = Analytics()
-            analytics._invalidate_instances_cache()
+            from backend.cache_registry import cache_registry, INSTANCES
+            cache_registry.invalidate(INSTANCES, user_id)
         except Exception:
-            pass  # Analytics may not be imported yet
+            pass
     
+    def _clear_instance_lists(self, user_id: Optional[int] = None):
+        """Drop the cached instance lists of a user (all users when None).
+
+        Local only: no cache_registry invalidation, so Analytics products and
+        precomputed page payloads are kept. Pages call this on render to re-read
+        instances after a write made elsewhere; writes use _invalidate_instance_caches.
+        """
+        if user_id is None:
+            InstanceManager._per_user_cache.clear()
+        else:
+            owner = str(user_id)
+            InstanceManager._per_user_cache.discard(lambda key: key[0] == owner)
+
     def _init_csv(self):
         """Initialize CSV backend."""
         os.makedirs(DATA_DIR, exist_ok=True)
@@ -110,6 +131,8 @@ class InstanceManager:
                 'completed_at','cancelled_at','due_at','predicted','actual','procrastination_score','proactive_score',
                 'is_completed','is_deleted','status','delay_minutes'
             ]).to_csv(self.file, index=False)
+        self._journal = get_csv_journal(self.file, ['instance_id'])
+        self._csv_base = None
         self._reload()
 
     def _reload(self, max_retries=5, initial_delay=0.1):
@@ -126,7 +149,9 @@ class InstanceManager:
             last_error = None
             for attempt in range(max_retries):
                 try:
-                    self.df = pd.read_csv(self.file, dtype=str).fillna('')
+                    # Journal-backed read: canonical CSV + appended change records (see csv_journal)
+                    self._csv_base = self._journal.read()
+                    self.df = self._csv_base.copy()
                     # Success - break out of retry loop
                     break
                 except PermissionError as e:
@@ -212,7 +237,8 @@ class InstanceManager:
             last_error = None
             for attempt in range(max_retries):
                 try:
-                    self.df.to_csv(self.file, index=False)
+                    # Appends only the rows changed since the last read/save to the journal
+                    self._csv_base = self._journal.write(self._csv_base, self.df)
                     # Success - no need to reload since DataFrame is already in memory
                     break
                 except PermissionError as e:
@@ -356,20 +382,22 @@ class InstanceManager:
             # Don't fail, but log warning - some old code might not pass user_id yet
         
         # Invalidate caches before creating
-        self._invalidate_instance_caches()
+        self._invalidate_instance_caches(user_id)
         if self.use_db:
             return self._create_instance_db(task_id, task_name, task_version, predicted, user_id=user_id)
         else:
             return self._create_instance_csv(task_id, task_name, task_version, predicted, user_id=user_id)
     
-    def _create_instance_csv(self, task_id, task_name, task_version=1, predicted: dict = None, user_id: Optional[int] = None):
+    def _create_instance_csv(self, task_id, task_name, task_version=1, predicted: dict = None, user_id: Optional[int] = None,
+                             instance_id: Optional[str] = None):
         """CSV-specific create_instance.
         
         Args:
             user_id: User ID (required for data isolation)
+            instance_id: ID to use instead of the timestamp-based default (batch creates)
         """
         self._reload()
-        instance_id = f"i{int(datetime.now().timestamp())}"
+        instance_id = instance_id or f"i{int(datetime.now().timestamp())}"
         row = {
             'instance_id': instance_id,
             'task_id': task_id,
@@ -420,41 +448,11 @@ class InstanceManager:
         
         try:
             instance_id = f"i{int(datetime.now().timestamp())}"
-            created_at = datetime.now()
 
             with self.db_session() as session:
-                instance = self.TaskInstance(
-                    instance_id=instance_id,
-                    task_id=task_id,
-                    task_name=task_name,
-                    task_version=int(task_version) if task_version else 1,
-                    created_at=created_at,
-                    initialized_at=None,
-                    started_at=None,
-                    completed_at=None,
-                    cancelled_at=None,
-                    due_at=None,
-                    predicted=predicted or {},
-                    actual={},
-                    procrastination_score=None,
-                    proactive_score=None,
-                    behavioral_score=None,
-                    net_relief=None,
-                    is_completed=False,
-                    is_deleted=False,
-                    status='draft',  # Only show in Initialized Tasks after user saves the initialization form
-                    duration_minutes=None,
-                    delay_minutes=None,
-                    relief_score=None,
-                    cognitive_load=None,
-                    mental_energy_needed=None,
-                    user_id=user_id,  # CRITICAL: Set user_id for data isolation
-                    task_difficulty=None,
-                    emotional_load=None,
-                    environmental_effect=None,
-                    skills_improved=''
-                )
+                instance = self._new_instance_db(instance_id, task_id, task_name, task_version, predicted, user_id)
                 session.add(instance)
+                self._refresh_projection_db(session, instance)
                 session.commit()
                 return instance_id
         except Exception as e:
@@ -464,6 +462,41 @@ class InstanceManager:
             self.use_db = False
             return self._create_instance_csv(task_id, task_name, task_version, predicted, user_id=user_id)
 
+    def _new_instance_db(self, instance_id, task_id, task_name, task_version=1, predicted: dict = None,
+                         user_id: Optional[int] = None, created_at: Optional[datetime] = None):
+        """Build a new draft TaskInstance row (not added to a session)."""
+        return self.TaskInstance(
+            instance_id=instance_id,
+            task_id=task_id,
+            task_name=task_name,
+            task_version=int(task_version) if task_version else 1,
+            created_at=created_at or datetime.now(),
+            initialized_at=None,
+            started_at=None,
+            completed_at=None,
+            cancelled_at=None,
+            due_at=None,
+            predicted=predicted or {},
+            actual={},
+            procrastination_score=None,
+            proactive_score=None,
+            behavioral_score=None,
+            net_relief=None,
+            is_completed=False,
+            is_deleted=False,
+            status='draft',  # Only show in Initialized Tasks after user saves the initialization form
+            duration_minutes=None,
+            delay_minutes=None,
+            relief_score=None,
+            cognitive_load=None,
+            mental_energy_needed=None,
+            user_id=user_id,  # CRITICAL: Set user_id for data isolation
+            task_difficulty=None,
+            emotional_load=None,
+            environmental_effect=None,
+            skills_improved=''
+        )
+
     def pause_instance(self, instance_id: str, reason: Optional[str] = None, completion_percentage: float = 0.0, user_id: Optional[int] = None):
         """Pause an active instance and move it back to initialized state. Works with both CSV and database.
         
@@ -474,9 +507,12 @@ class InstanceManager:
             user_id: User ID to verify ownership (required for data isolation)
         """
         if self.use_db:
-            return self._pause_instance_db(instance_id, reason, completion_percentage, user_id)
+            result = self._pause_instance_db(instance_id, reason, completion_percentage, user_id)
         else:
-            return self._pause_instance_csv(instance_id, reason, completion_percentage)
+            result = self._pause_instance_csv(instance_id, reason, completion_percentage)
+        if result is not False:
+            running_sessions.mark_stopped(instance_id)
+        return result
     
     def _pause_instance_csv(self, instance_id: str, reason: Optional[str] = None, completion_percentage: float = 0.0):
         """CSV-specific pause_instance."""
@@ -647,115 +683,13 @@ class InstanceManager:
                 if not instance:
                     raise ValueError(f"Instance {instance_id} not found or does not belong to user {user_id}")
                 
-                # Get existing actual data first to preserve time_spent_before_pause if resuming after multiple pauses
-                actual_data = instance.actual or {}
-                if not isinstance(actual_data, dict):
-                    actual_data = {}
-                sys.stderr.write(f"[PAUSE DEBUG] Existing actual_data from database: {actual_data}\n")
-                sys.stderr.flush()
-                
-                # Calculate elapsed time from current session (if task is currently started)
-                # Use resume_started_at from actual_data if available (more precise), otherwise fall back to started_at
-                time_spent_this_session = 0.0
-                resume_started_at = None
-                
-                # Try to get precise resume timestamp from actual_data first
-                if 'resume_started_at' in actual_data:
-                    try:
-                        resume_started_at_str = actual_data['resume_started_at']
-                        resume_started_at = datetime.fromisoformat(resume_started_at_str)
-                        sys.stderr.write(f"[PAUSE DEBUG] Found resume_started_at in actual_data: {resume_started_at_str}\n")
-                        sys.stderr.write(f"[PAUSE DEBUG] Parsed resume_started_at: {resume_started_at}\n")
-                        sys.stderr.flush()
-                    except (ValueError, TypeError) as e:
-                        sys.stderr.write(f"[PAUSE DEBUG] Error parsing resume_started_at: {e}\n")
-                        sys.stderr.flush()
-                
-                # Fall back to instance.started_at if resume_started_at not available
-                if resume_started_at is None:
-                    sys.stderr.write(f"[PAUSE DEBUG] No resume_started_at, using instance.started_at: {instance.started_at}\n")
-                    sys.stderr.flush()
-                    resume_started_at = instance.started_at
-                
-                # Calculate elapsed time if we have a start time
-                if resume_started_at:
-                    try:
-                        now = datetime.now()
-                        sys.stderr.write(f"[PAUSE DEBUG] Current time: {now}\n")
-                        sys.stderr.flush()
-                        elapsed_seconds = (now - resume_started_at).total_seconds()
-                        sys.stderr.write(f"[PAUSE DEBUG] Elapsed seconds: {elapsed_seconds}\n")
-                        sys.stderr.flush()
-                        if elapsed_seconds > 0:
-                            time_spent_this_session = elapsed_seconds / 60.0  # Convert to minutes
-                            sys.stderr.write(f"[PAUSE DEBUG] Time spent this session: {time_spent_this_session:.2f} minutes\n")
-                            sys.stderr.flush()
-                        else:
-                            sys.stderr.write(f"[PAUSE DEBUG] Elapsed seconds <= 0, not counting this session\n")
-                            sys.stderr.flush()
-                    except Exception as e:
-                        sys.stderr.write(f"[InstanceManager] Error calculating elapsed time on pause: {e}\n")
-                        sys.stderr.flush()
-                else:
-                    sys.stderr.write(f"[PAUSE DEBUG] No start time available (resume_started_at or started_at)\n")
-                    sys.stderr.flush()
-                
-                # Accumulate time spent (in case task was paused and resumed multiple times)
-                existing_time = actual_data.get('time_spent_before_pause', 0.0)
-                sys.stderr.write(f"[PAUSE DEBUG] Existing time_spent_before_pause from actual_data: {existing_time} (type: {type(existing_time)})\n")
+                sys.stderr.write(f"[PAUSE DEBUG] Existing actual_data from database: {instance.actual or {}}\n")
                 sys.stderr.flush()
-                if not isinstance(existing_time, (int, float)):
-                    try:
-                        existing_time = float(existing_time)
-                        sys.stderr.write(f"[PAUSE DEBUG] Converted existing_time to float: {existing_time}\n")
-                        sys.stderr.flush()
-                    except (ValueError, TypeError):
-                        existing_time = 0.0
-                        sys.stderr.write(f"[PAUSE DEBUG] Could not convert existing_time, using 0.0\n")
-                        sys.stderr.flush()
-                
-                # Add current session time to existing accumulated time
-                total_time_spent = existing_time + time_spent_this_session
-                sys.stderr.write(f"[PAUSE DEBUG] Total time calculation: {existing_time:.2f} (existing) + {time_spent_this_session:.2f} (this session) = {total_time_spent:.2f} minutes\n")
+                time_spent_this_session = self._apply_pause_db(instance, reason, completion_percentage, datetime.now())
+                sys.stderr.write(f"[PAUSE DEBUG] Time spent this session: {time_spent_this_session:.2f} minutes\n")
+                sys.stderr.write(f"[PAUSE DEBUG] Final actual_data before saving: {instance.actual}\n")
                 sys.stderr.flush()
-                actual_data['time_spent_before_pause'] = total_time_spent
-                sys.stderr.write(f"[PAUSE DEBUG] Updated actual_data['time_spent_before_pause'] = {total_time_spent:.2f}\n")
-                sys.stderr.flush()
-                
-                # Store completion percentage (ensure it's between 0 and 100)
-                if not isinstance(completion_percentage, (int, float)):
-                    try:
-                        completion_percentage = float(completion_percentage)
-                    except (ValueError, TypeError):
-                        completion_percentage = 0.0
-                completion_percentage = max(0.0, min(100.0, float(completion_percentage)))
-                actual_data['pause_completion_percentage'] = completion_percentage
-                
-                # Reset timing/status so task returns to initialized state
-                instance.started_at = None
-                instance.status = 'initialized'
-                instance.is_completed = False
-                instance.completed_at = None
-                instance.cancelled_at = None
-                instance.procrastination_score = None
-                instance.proactive_score = None
-                
-                # Clear resume_started_at since we're pausing
-                if 'resume_started_at' in actual_data:
-                    del actual_data['resume_started_at']
-                
-                # Persist pause reason in actual payload (always overwrite, never append)
-                if reason:
-                    actual_data['pause_reason'] = reason
-                elif 'pause_reason' in actual_data:
-                    del actual_data['pause_reason']
-                actual_data['paused'] = True
-                sys.stderr.write(f"[PAUSE DEBUG] Final actual_data before saving: {actual_data}\n")
-                sys.stderr.flush()
-                # Assign a new dict and force SQLAlchemy to flush the JSON column (assign + flag_modified)
-                instance.actual = dict(actual_data)
-                from sqlalchemy.orm.attributes import flag_modified
-                flag_modified(instance, "actual")
+                self._refresh_projection_db(session, instance)
 
                 session.commit()
                 sys.stderr.write(f"[PAUSE DEBUG] Database commit completed\n")
@@ -779,7 +713,77 @@ class InstanceManager:
             return self._pause_instance_csv(instance_id, reason, completion_percentage)
         # Invalidate caches AFTER pausing to ensure fresh data on next read
         # Do this outside the session context to ensure it always runs
-        self._invalidate_instance_caches()
+        self._invalidate_instance_caches(user_id)
+
+    def _apply_pause_db(self, instance, reason: Optional[str], completion_percentage, now: datetime) -> float:
+        """Move a started instance back to initialized (Database version, no commit).
+
+        Adds the running session (since resume_started_at, else started_at) to
+        actual['time_spent_before_pause'] so pause/resume cycles accumulate.
+
+        Returns:
+            Minutes added by the running session
+        """
+        actual_data = dict(instance.actual) if isinstance(instance.actual, dict) else {}
+
+        # Use resume_started_at from actual_data if available (more precise), otherwise fall back to started_at
+        session_start = None
+        if 'resume_started_at' in actual_data:
+            try:
+                session_start = datetime.fromisoformat(actual_data['resume_started_at'])
+            except (ValueError, TypeError):
+                pass
+        if session_start is None:
+            session_start = instance.started_at
+
+        time_spent_this_session = 0.0
+        if session_start:
+            try:
+                elapsed_seconds = (now - session_start).total_seconds()
+                if elapsed_seconds > 0:
+                    time_spent_this_session = elapsed_seconds / 60.0
+            except Exception as e:
+                print(f"[InstanceManager] Error calculating elapsed time on pause: {e}")
+
+        # Accumulate time spent (in case task was paused and resumed multiple times)
+        existing_time = actual_data.get('time_spent_before_pause', 0.0)
+        if not isinstance(existing_time, (int, float)):
+            try:
+                existing_time = float(existing_time)
+            except (ValueError, TypeError):
+                existing_time = 0.0
+        actual_data['time_spent_before_pause'] = existing_time + time_spent_this_session
+
+        # Store completion percentage (ensure it's between 0 and 100)
+        if not isinstance(completion_percentage, (int, float)):
+            try:
+                completion_percentage = float(completion_percentage)
+            except (ValueError, TypeError):
+                completion_percentage = 0.0
+        actual_data['pause_completion_percentage'] = max(0.0, min(100.0, float(completion_percentage)))
+
+        # Reset timing/status so task returns to initialized state
+        instance.started_at = None
+        instance.status = 'initialized'
+        instance.is_completed = False
+        instance.completed_at = None
+        instance.cancelled_at = None
+        instance.procrastination_score = None
+        instance.proactive_score = None
+
+        # Clear resume_started_at since we're pausing
+        actual_data.pop('resume_started_at', None)
+        # Persist pause reason in actual payload (always overwrite, never append)
+        if reason:
+            actual_data['pause_reason'] = reason
+        else:
+            actual_data.pop('pause_reason', None)
+        actual_data['paused'] = True
+        # Assign a new dict and force SQLAlchemy to flush the JSON column (assign + flag_modified)
+        instance.actual = actual_data
+        from sqlalchemy.orm.attributes import flag_modified
+        flag_modified(instance, "actual")
+        return time_spent_this_session
 
     def list_active_instances(self, user_id: Optional[int] = None):
         """List active task instances. Works with both CSV and database.
@@ -798,13 +802,9 @@ class InstanceManager:
             return []
         
         # Check per-user cache first (cache key includes user_id)
-        cache_key = f"active_instances_user_{user_id}"
-        current_time = time.time()
-        if (hasattr(InstanceManager, '_per_user_cache') and 
-            InstanceManager._per_user_cache.get(cache_key) is not None and
-            InstanceManager._per_user_cache.get(f"{cache_key}_time") is not None and
-            (current_time - InstanceManager._per_user_cache[f"{cache_key}_time"]) < self._cache_ttl_seconds):
-            cached_result = InstanceManager._per_user_cache[cache_key]
+        cache_key = (str(user_id), 'active_instances')
+        cached_result = InstanceManager._per_user_cache.get(cache_key)
+        if cached_result is not None:
             return cached_result.copy() if isinstance(cached_result, list) else cached_result
         
         # Cache miss - load from database/CSV
@@ -814,10 +814,7 @@ class InstanceManager:
             result = self._list_active_instances_csv(user_id=user_id)
         
         # Store in per-user cache
-        if not hasattr(InstanceManager, '_per_user_cache'):
-            InstanceManager._per_user_cache = {}
         InstanceManager._per_user_cache[cache_key] = result.copy() if isinstance(result, list) else result
-        InstanceManager._per_user_cache[f"{cache_key}_time"] = time.time()
         
         return result
     
@@ -1126,6 +1123,58 @@ class InstanceManager:
             self.use_db = False
             return self._get_instances_bulk_csv(instance_ids, user_id)
 
+    # Async reads for UI callbacks (ui.timer, async handlers): await instead of blocking
+    # the event loop. Use AsyncSession when an async driver is installed (see
+    # database.async_db_available), otherwise run the sync method in a worker thread.
+
+    async def get_instance_async(self, instance_id, user_id: Optional[int] = None):
+        """Async get_instance(). Same arguments and return value."""
+        if self.use_db and user_id is not None and self._async_db_available():
+            try:
+                from sqlalchemy import select
+                from backend.database import get_async_session
+                async with get_async_session() as session:
+                    result = await session.execute(
+                        select(self.TaskInstance).where(
+                            self.TaskInstance.instance_id == instance_id,
+                            self.TaskInstance.user_id == user_id,
+                        ).limit(1)
+                    )
+                    instance = result.scalars().first()
+                    return instance.to_dict() if instance else None
+            except Exception as e:
+                if self.strict_mode:
+                    raise RuntimeError(f"Database error in get_instance_async: {e}") from e
+                print(f"[InstanceManager] Async database error in get_instance: {e}, using sync read")
+        return await asyncio.to_thread(self.get_instance, instance_id, user_id)
+
+    async def get_instances_bulk_async(self, instance_ids: List[str], user_id: Optional[int] = None) -> Dict[str, dict]:
+        """Async get_instances_bulk(). Same arguments and return value."""
+        if not instance_ids:
+            return {}
+        if self.use_db and user_id is not None and self._async_db_available():
+            try:
+                from sqlalchemy import select
+                from backend.database import get_async_session
+                async with get_async_session() as session:
+                    result = await session.execute(
+                        select(self.TaskInstance).where(
+                            self.TaskInstance.instance_id.in_(instance_ids),
+                            self.TaskInstance.user_id == user_id,
+                        )
+                    )
+                    return {i.instance_id: i.to_dict() for i in result.scalars()}
+            except Exception as e:
+                if self.strict_mode:
+                    raise RuntimeError(f"Database error in get_instances_bulk_async: {e}") from e
+                print(f"[InstanceManager] Async database error in get_instances_bulk: {e}, using sync read")
+        return await asyncio.to_thread(self.get_instances_bulk, instance_ids, user_id)
+
+    @staticmethod
+    def _async_db_available() -> bool:
+        from backend.database import async_db_available
+        return async_db_available()
+
     def start_instance(self, instance_id, user_id: Optional[int] = None):
         """Start a task instance (first time, not resuming). Works with both CSV and database.
         
@@ -1182,6 +1231,11 @@ class InstanceManager:
         sys.stderr.write(f"[START DEBUG] Setting status to: 'active'\n")
         sys.stderr.flush()
         self._save()
+        try:
+            start_actual = json.loads(self.df.at[idx, 'actual'] or '{}')
+        except (json.JSONDecodeError, TypeError):
+            start_actual = {}
+        running_sessions.mark_running(instance_id, now, start_actual.get('time_spent_before_pause', 0.0))
         
         # Verify what was saved
         self._reload()
@@ -1247,6 +1301,7 @@ class InstanceManager:
         sys.stderr.write(f"[RESUME DEBUG] Setting status to: 'active'\n")
         sys.stderr.flush()
         self._save()
+        running_sessions.mark_running(instance_id, now, actual_data.get('time_spent_before_pause', 0.0))
         
         # Verify what was saved
         self._reload()
@@ -1312,6 +1367,7 @@ class InstanceManager:
                 instance.status = 'active'
                 sys.stderr.write(f"[START DEBUG] Setting status to: 'active'\n")
                 sys.stderr.flush()
+                self._refresh_projection_db(session, instance)
                 session.commit()
                 
                 # Verify what was saved
@@ -1324,8 +1380,12 @@ class InstanceManager:
                 sys.stderr.flush()
                 sys.stderr.write(f"[START DEBUG] Start completed\n\n")
                 sys.stderr.flush()
+                start_actual = instance.actual if isinstance(instance.actual, dict) else {}
+                running_sessions.mark_running(
+                    instance_id, now, start_actual.get('time_spent_before_pause', 0.0), user_id=user_id
+                )
                 # Invalidate caches AFTER starting to ensure fresh data on next read
-                self._invalidate_instance_caches()
+                self._invalidate_instance_caches(user_id)
         except Exception as e:
             if self.strict_mode:
                 raise RuntimeError(f"Database error in start_instance and CSV fallback is disabled: {e}") from e
@@ -1400,6 +1460,7 @@ class InstanceManager:
                 instance.status = 'active'
                 sys.stderr.write(f"[RESUME DEBUG] Setting status to: 'active'\n")
                 sys.stderr.flush()
+                self._refresh_projection_db(session, instance)
                 session.commit()
                 
                 # Verify what was saved
@@ -1415,8 +1476,11 @@ class InstanceManager:
                 sys.stderr.flush()
                 sys.stderr.write(f"[RESUME DEBUG] Resume completed\n\n")
                 sys.stderr.flush()
+                running_sessions.mark_running(
+                    instance_id, now, actual_data.get('time_spent_before_pause', 0.0), user_id=user_id
+                )
                 # Invalidate caches AFTER resuming to ensure fresh data on next read
-                self._invalidate_instance_caches()
+                self._invalidate_instance_caches(user_id)
         except Exception as e:
             if self.strict_mode:
                 raise RuntimeError(f"Database error in resume_instance and CSV fallback is disabled: {e}") from e
@@ -1442,9 +1506,11 @@ class InstanceManager:
         
         # Note: Cache invalidation happens AFTER completion in _complete_instance_db/_complete_instance_csv
         if self.use_db:
-            return self._complete_instance_db(instance_id, actual, user_id=user_id)
+            result = self._complete_instance_db(instance_id, actual, user_id=user_id)
         else:
-            return self._complete_instance_csv(instance_id, actual, user_id=user_id)
+            result = self._complete_instance_csv(instance_id, actual, user_id=user_id)
+        running_sessions.mark_stopped(instance_id)
+        return result
     
     def _complete_instance_csv(self, instance_id, actual: dict, user_id: Optional[int] = None):
         """CSV-specific complete_instance.
@@ -1553,7 +1619,7 @@ class InstanceManager:
         self._update_attributes_from_payload(idx, actual)
         self._save()
         # Invalidate caches AFTER completing to ensure fresh data on next read
-        self._invalidate_instance_caches()
+        self._invalidate_instance_caches(user_id)
         
         # Log recommendation outcome if this was a recommended task
         try:
@@ -1614,123 +1680,18 @@ class InstanceManager:
                 if not instance:
                     raise ValueError(f"Instance {instance_id} not found or does not belong to user {user_id}")
                 
-                # Set actual JSON
-                instance.actual = actual or {}
-                instance.completed_at = completed_at
-                instance.is_completed = True
-                instance.status = 'completed'
-                instance.cancelled_at = None
-                
-                # Calculate duration and delay
-                try:
-                    initialized_at = instance.initialized_at
-                    started_at = instance.started_at
-                    
-                    # Get duration from actual dict, or calculate from start time
-                    duration_minutes = actual.get('time_actual_minutes') if actual else None
-                    if duration_minutes is None or duration_minutes == '':
-                        # If start button was used, calculate duration from start to completion
-                        if started_at:
-                            current_session_minutes = (completed_at - started_at).total_seconds() / 60.0
-                            # Add time spent before pause (if task was paused and resumed)
-                            time_spent_before_pause = actual.get('time_spent_before_pause', 0.0) if actual else 0.0
-                            if not isinstance(time_spent_before_pause, (int, float)):
-                                try:
-                                    time_spent_before_pause = float(time_spent_before_pause)
-                                except (ValueError, TypeError):
-                                    time_spent_before_pause = 0.0
-                            duration_minutes = current_session_minutes + time_spent_before_pause
-                        else:
-                            # Check if there's time_spent_before_pause even if not currently started
-                            time_spent_before_pause = actual.get('time_spent_before_pause', 0.0) if actual else 0.0
-                            if not isinstance(time_spent_before_pause, (int, float)):
-                                try:
-                                    time_spent_before_pause = float(time_spent_before_pause)
-                                except (ValueError, TypeError):
-                                    time_spent_before_pause = 0.0
-                            
-                            if time_spent_before_pause > 0:
-                                duration_minutes = time_spent_before_pause
-                            else:
-                                # Default to expected duration
-                                predicted = instance.predicted or {}
-                                duration_minutes = float(predicted.get('time_estimate_minutes') or predicted.get('estimate') or 0)
-                    
-                    # Store duration
-                    if duration_minutes is not None and duration_minutes != '':
-                        instance.duration_minutes = float(duration_minutes)
-                        # Also update in actual dict if not already set
-                        if actual and ('time_actual_minutes' not in actual or actual.get('time_actual_minutes') == ''):
-                            actual['time_actual_minutes'] = duration_minutes
-                            instance.actual = actual
-                    
-                    # Calculate delay: time from initialization to start (if started) or to completion minus duration (if not started)
-                    if initialized_at:
-                        if started_at:
-                            # Delay = start time - initialization time
-                            delay_minutes = (started_at - initialized_at).total_seconds() / 60.0
-                        else:
-                            # Delay = completion time - duration - initialization time
-                            if duration_minutes:
-                                delay_minutes = (completed_at - initialized_at).total_seconds() / 60.0 - float(duration_minutes)
-                            else:
-                                delay_minutes = (completed_at - initialized_at).total_seconds() / 60.0
-                        instance.delay_minutes = round(delay_minutes, 2)
-                except Exception as e:
-                    print(f"[InstanceManager] Error calculating duration/delay: {e}")
-                
-                # Compute simple procrastination/proactive metrics
-                try:
-                    created = instance.created_at
-                    started = instance.started_at if instance.started_at else (instance.initialized_at if instance.initialized_at else created)
-                    predicted = instance.predicted or {}
-                    estimate = float(predicted.get('time_estimate_minutes') or predicted.get('estimate') or 0) or 1.0
-                    delay = (started - created).total_seconds() / 60.0
-                    procrast = delay / max(estimate, 1.0)
-                    proactive = max(0.0, 1.0 - (delay / max(estimate*2.0,1.0)))
-                    instance.procrastination_score = round(min(procrast, 10.0), 3)
-                    instance.proactive_score = round(min(max(proactive*10.0,0.0), 10.0), 3)
-                except Exception as e:
-                    print(f"[InstanceManager] Error calculating procrastination/proactive scores: {e}")
-                    instance.procrastination_score = None
-                    instance.proactive_score = None
-                
-                # Extract attributes from payload
-                self._update_attributes_from_payload_db(instance, actual or {})
+                self._apply_complete_db(instance, actual, completed_at)
                 
                 # Calculate and store emotional factors (serendipity and disappointment)
                 self._calculate_and_store_factors_db(instance)
+                self._store_execution_scores_db([instance])
+                self._refresh_projection_db(session, instance)
+                outcome = self._completion_outcome_db(instance, actual)
                 
                 session.commit()
                 
                 # Log recommendation outcome if this was a recommended task
-                try:
-                    from backend.recommendation_logger import recommendation_logger
-                    task_id = instance.task_id
-                    task_name = instance.task_name
-                    
-                    # Get predicted and actual relief for accuracy tracking
-                    predicted = instance.predicted or {}
-                    predicted_relief = predicted.get('expected_relief') or predicted.get('relief_score')
-                    actual_relief = actual.get('actual_relief') if actual else None
-                    if actual_relief is None:
-                        actual_relief = instance.relief_score
-                    
-                    # Get duration
-                    duration_minutes = instance.duration_minutes
-                    
-                    recommendation_logger.log_recommendation_outcome(
-                        task_id=task_id,
-                        instance_id=instance_id,
-                        task_name=task_name,
-                        outcome='completed',
-                        completion_time_minutes=float(duration_minutes) if duration_minutes is not None else None,
-                        actual_relief=float(actual_relief) if actual_relief is not None else None,
-                        predicted_relief=float(predicted_relief) if predicted_relief is not None else None
-                    )
-                except Exception:
-                    # Don't fail if logging fails
-                    pass
+                self._log_completion_outcome(outcome)
         except Exception as e:
             if self.strict_mode:
                 raise RuntimeError(f"Database error in complete_instance and CSV fallback is disabled: {e}") from e
@@ -1739,7 +1700,127 @@ class InstanceManager:
             return self._complete_instance_csv(instance_id, actual)
         # Invalidate caches AFTER completing to ensure fresh data on next read
         # Do this outside the session context to ensure it always runs
-        self._invalidate_instance_caches()
+        self._invalidate_instance_caches(user_id)
+
+    def _apply_complete_db(self, instance, actual: dict, completed_at: datetime):
+        """Mark an instance completed and derive duration, delay and procrastination/proactive
+        scores (Database version, no commit; factors are computed by the caller)."""
+        # Set actual JSON
+        instance.actual = actual or {}
+        instance.completed_at = completed_at
+        instance.is_completed = True
+        instance.status = 'completed'
+        instance.cancelled_at = None
+        
+        # Calculate duration and delay
+        try:
+            initialized_at = instance.initialized_at
+            started_at = instance.started_at
+            
+            # Get duration from actual dict, or calculate from start time
+            duration_minutes = actual.get('time_actual_minutes') if actual else None
+            if duration_minutes is None or duration_minutes == '':
+                # If start button was used, calculate duration from start to completion
+                if started_at:
+                    current_session_minutes = (completed_at - started_at).total_seconds() / 60.0
+                    # Add time spent before pause (if task was paused and resumed)
+                    time_spent_before_pause = actual.get('time_spent_before_pause', 0.0) if actual else 0.0
+                    if not isinstance(time_spent_before_pause, (int, float)):
+                        try:
+                            time_spent_before_pause = float(time_spent_before_pause)
+                        except (ValueError, TypeError):
+                            time_spent_before_pause = 0.0
+                    duration_minutes = current_session_minutes + time_spent_before_pause
+                else:
+                    # Check if there's time_spent_before_pause even if not currently started
+                    time_spent_before_pause = actual.get('time_spent_before_pause', 0.0) if actual else 0.0
+                    if not isinstance(time_spent_before_pause, (int, float)):
+                        try:
+                            time_spent_before_pause = float(time_spent_before_pause)
+                        except (ValueError, TypeError):
+                            time_spent_before_pause = 0.0
+                    
+                    if time_spent_before_pause > 0:
+                        duration_minutes = time_spent_before_pause
+                    else:
+                        # Default to expected duration
+                        predicted = instance.predicted or {}
+                        duration_minutes = float(predicted.get('time_estimate_minutes') or predicted.get('estimate') or 0)
+            
+            # Store duration
+            if duration_minutes is not None and duration_minutes != '':
+                instance.duration_minutes = float(duration_minutes)
+                # Also update in actual dict if not already set
+                if actual and ('time_actual_minutes' not in actual or actual.get('time_actual_minutes') == ''):
+                    actual['time_actual_minutes'] = duration_minutes
+                    instance.actual = actual
+            
+            # Calculate delay: time from initialization to start (if started) or to completion minus duration (if not started)
+            if initialized_at:
+                if started_at:
+                    # Delay = start time - initialization time
+                    delay_minutes = (started_at - initialized_at).total_seconds() / 60.0
+                else:
+                    # Delay = completion time - duration - initialization time
+                    if duration_minutes:
+                        delay_minutes = (completed_at - initialized_at).total_seconds() / 60.0 - float(duration_minutes)
+                    else:
+                        delay_minutes = (completed_at - initialized_at).total_seconds() / 60.0
+                instance.delay_minutes = round(delay_minutes, 2)
+        except Exception as e:
+            print(f"[InstanceManager] Error calculating duration/delay: {e}")
+        
+        # Compute simple procrastination/proactive metrics
+        try:
+            created = instance.created_at
+            started = instance.started_at if instance.started_at else (instance.initialized_at if instance.initialized_at else created)
+            predicted = instance.predicted or {}
+            estimate = float(predicted.get('time_estimate_minutes') or predicted.get('estimate') or 0) or 1.0
+            delay = (started - created).total_seconds() / 60.0
+            procrast = delay / max(estimate, 1.0)
+            proactive = max(0.0, 1.0 - (delay / max(estimate*2.0,1.0)))
+            instance.procrastination_score = round(min(procrast, 10.0), 3)
+            instance.proactive_score = round(min(max(proactive*10.0,0.0), 10.0), 3)
+        except Exception as e:
+            print(f"[InstanceManager] Error calculating procrastination/proactive scores: {e}")
+            instance.procrastination_score = None
+            instance.proactive_score = None
+        
+        # Extract attributes from payload
+        self._update_attributes_from_payload_db(instance, actual or {})
+
+    def _completion_outcome_db(self, instance, actual: dict) -> Optional[dict]:
+        """Recommendation-outcome fields of a completed instance, read before commit."""
+        try:
+            predicted = instance.predicted or {}
+            predicted_relief = predicted.get('expected_relief') or predicted.get('relief_score')
+            actual_relief = actual.get('actual_relief') if actual else None
+            if actual_relief is None:
+                actual_relief = instance.relief_score
+            duration_minutes = instance.duration_minutes
+            return {
+                'task_id': instance.task_id,
+                'instance_id': instance.instance_id,
+                'task_name': instance.task_name,
+                'outcome': 'completed',
+                'completion_time_minutes': float(duration_minutes) if duration_minutes is not None else None,
+                'actual_relief': float(actual_relief) if actual_relief is not None else None,
+                'predicted_relief': float(predicted_relief) if predicted_relief is not None else None,
+            }
+        except Exception:
+            return None
+
+    @staticmethod
+    def _log_completion_outcome(outcome: Optional[dict]):
+        """Log a recommendation outcome; never fails the write."""
+        if not outcome:
+            return
+        try:
+            from backend.recommendation_logger import recommendation_logger
+            recommendation_logger.log_recommendation_outcome(**outcome)
+        except Exception:
+            # Don't fail if logging fails
+            pass
 
     def append_instance_notes(self, instance_id: str, note: str):
         """Append a note to the task template (shared across all instances). Works with both CSV and database.
@@ -1786,9 +1867,11 @@ class InstanceManager:
         
         # Note: Cache invalidation happens AFTER cancelling in _cancel_instance_db/_cancel_instance_csv
         if self.use_db:
-            return self._cancel_instance_db(instance_id, actual, user_id=user_id)
+            result = self._cancel_instance_db(instance_id, actual, user_id=user_id)
         else:
-            return self._cancel_instance_csv(instance_id, actual, user_id=user_id)
+            result = self._cancel_instance_csv(instance_id, actual, user_id=user_id)
+        running_sessions.mark_stopped(instance_id)
+        return result
     
     def _cancel_instance_csv(self, instance_id, actual: dict):
         """CSV-specific cancel_instance."""
@@ -1830,16 +1913,8 @@ class InstanceManager:
                 if not instance:
                     raise ValueError(f"Instance {instance_id} not found or does not belong to user {user_id}")
                 
-                instance.actual = actual or {}
-                instance.cancelled_at = datetime.now()
-                instance.status = 'cancelled'
-                instance.is_completed = True
-                instance.completed_at = None
-                instance.procrastination_score = None
-                instance.proactive_score = None
-                
-                # Extract attributes from payload
-                self._update_attributes_from_payload_db(instance, actual or {})
+                self._apply_cancel_db(instance, actual, datetime.now())
+                self._refresh_projection_db(session, instance)
                 
                 session.commit()
         except Exception as e:
@@ -1850,7 +1925,19 @@ class InstanceManager:
             return self._cancel_instance_csv(instance_id, actual)
         # Invalidate caches AFTER cancelling to ensure fresh data on next read
         # Do this outside the session context to ensure it always runs
-        self._invalidate_instance_caches()
+        self._invalidate_instance_caches(user_id)
+
+    def _apply_cancel_db(self, instance, actual: dict, cancelled_at: datetime):
+        """Mark an instance cancelled (Database version, no commit)."""
+        instance.actual = actual or {}
+        instance.cancelled_at = cancelled_at
+        instance.status = 'cancelled'
+        instance.is_completed = True
+        instance.completed_at = None
+        instance.procrastination_score = None
+        instance.proactive_score = None
+        # Extract attributes from payload
+        self._update_attributes_from_payload_db(instance, actual or {})
 
     def postpone_instance(self, instance_id: str, actual: dict, user_id: Optional[int] = None):
         """Record a postpone (capture reason). Instance stays active; feeds into urgency/procrastination.
@@ -1870,7 +1957,7 @@ class InstanceManager:
             self._postpone_instance_db(instance_id, actual, user_id=user_id)
         else:
             self._postpone_instance_csv(instance_id, actual)
-        self._invalidate_instance_caches()
+        self._invalidate_instance_caches(user_id)
 
     def _postpone_instance_csv(self, instance_id: str, actual: dict):
         """CSV-specific postpone: append to postpone_history, merge actual."""
@@ -1908,17 +1995,8 @@ class InstanceManager:
                 instance = query.first()
                 if not instance:
                     raise ValueError(f"Instance {instance_id} not found or does not belong to user {user_id}")
-                if instance.is_completed:
-                    raise ValueError(f"Instance {instance_id} is already completed or cancelled")
-                existing = instance.actual or {}
-                history = existing.get('postpone_history') or []
-                if not isinstance(history, list):
-                    history = []
-                reason = actual.get('postpone_reason') or actual.get('reason') or ''
-                history.append({'reason': reason, 'at': datetime.now().strftime("%Y-%m-%d %H:%M")})
-                existing['postpone_history'] = history
-                existing['postpone_reason'] = reason
-                instance.actual = existing
+                self._apply_postpone_db(instance, actual, datetime.now())
+                self._refresh_projection_db(session, instance)
                 session.commit()
         except ValueError:
             raise
@@ -1929,6 +2007,24 @@ class InstanceManager:
             self.use_db = False
             self._postpone_instance_csv(instance_id, actual)
 
+    def _apply_postpone_db(self, instance, actual: dict, now: datetime):
+        """Append a postpone to actual['postpone_history'] (Database version, no commit).
+
+        Raises:
+            ValueError: If the instance is already completed or cancelled
+        """
+        if instance.is_completed:
+            raise ValueError(f"Instance {instance.instance_id} is already completed or cancelled")
+        existing = dict(instance.actual or {})
+        history = existing.get('postpone_history') or []
+        if not isinstance(history, list):
+            history = []
+        reason = actual.get('postpone_reason') or actual.get('reason') or ''
+        history = history + [{'reason': reason, 'at': now.strftime("%Y-%m-%d %H:%M")}]
+        existing['postpone_history'] = history
+        existing['postpone_reason'] = reason
+        instance.actual = existing
+
     def update_cancelled_instance(self, instance_id, cancellation_data: dict, user_id: Optional[int] = None):
         """Update cancellation data for an already-cancelled instance. Works with both CSV and database.
         
@@ -2002,6 +2098,7 @@ class InstanceManager:
                 updated_actual['cancelled'] = True
                 
                 instance.actual = updated_actual
+                self._refresh_projection_db(session, instance)
                 session.commit()
         except Exception as e:
             if self.strict_mode:
@@ -2090,8 +2187,9 @@ class InstanceManager:
                 instance.actual = dict(actual_data)
                 from sqlalchemy.orm.attributes import flag_modified
                 flag_modified(instance, "actual")
+                self._refresh_projection_db(session, instance)
                 session.commit()
-            self._invalidate_instance_caches()
+            self._invalidate_instance_caches(user_id)
             return True
         except Exception as e:
             print(f"[InstanceManager] update_instance_pause_notes DB error: {e}")
@@ -2171,23 +2269,11 @@ class InstanceManager:
                     if not instance:
                         raise ValueError(f"Instance {instance_id} not found or does not belong to user {user_id}")
 
-                    instance.predicted = predicted or {}
-
-                    if not instance.initialized_at:
-                        instance.initialized_at = datetime.now()
-
-                    if due_at is not None:
-                        instance.due_at = due_at
-                    else:
-                        instance.due_at = None
-
-                    # Move from draft to initialized so task appears in Initialized Tasks list
-                    instance.status = 'initialized'
-
-                    self._update_attributes_from_payload_db(instance, predicted)
+                    self._apply_prediction_db(instance, predicted, due_at, datetime.now())
+                    self._refresh_projection_db(session, instance)
 
                     session.commit()
-            self._invalidate_instance_caches()
+            self._invalidate_instance_caches(user_id)
         except Exception as e:
             if self.strict_mode:
                 raise RuntimeError(f"Database error in add_prediction_to_instance and CSV fallback is disabled: {e}") from e
@@ -2195,12 +2281,324 @@ class InstanceManager:
             self.use_db = False
             return self._add_prediction_to_instance_csv(instance_id, predicted, due_at=due_at)
 
+    def _apply_prediction_db(self, instance, predicted: dict, due_at: Optional[datetime], now: datetime):
+        """Store the initialization form and move a draft to initialized (Database version, no commit)."""
+        instance.predicted = predicted or {}
+        if not instance.initialized_at:
+            instance.initialized_at = now
+        instance.due_at = due_at
+        # Move from draft to initialized so task appears in Initialized Tasks list
+        instance.status = 'initialized'
+        self._update_attributes_from_payload_db(instance, predicted)
+
     def ensure_instance_for_task(self, task_id, task_name, predicted: dict = None, user_id: Optional[int] = None):
         # create an instance and return id
         return self.create_instance(task_id, task_name, task_version=1, predicted=predicted, user_id=user_id)
 
 
 
+    # Ops accepted by apply_transitions()
+    TRANSITION_OPS = (
+        'create', 'add_prediction', 'update_predicted', 'start', 'resume',
+        'pause', 'postpone', 'complete', 'cancel',
+    )
+    # Ops that start or end a running session (kept in backend.running_sessions)
+    _SESSION_OPS = ('start', 'resume', 'pause', 'complete', 'cancel')
+
+    def apply_transitions(self, transitions: List[dict], user_id: Optional[int] = None) -> List[str]:
+        """Apply many instance state transitions at once. Works with both CSV and database.
+
+        Each transition is a dict with 'op' and the arguments of the matching
+        single-row method:
+
+        - {'op': 'create', 'task_id', 'task_name', 'task_version'?, 'predicted'?}
+        - {'op': 'add_prediction', 'instance_id', 'predicted', 'due_at'?}
+        - {'op': 'update_predicted', 'instance_id', 'predicted'} (merged into the stored predicted)
+        - {'op': 'start' | 'resume', 'instance_id'}
+        - {'op': 'pause', 'instance_id', 'reason'?, 'completion_percentage'?}
+        - {'op': 'postpone' | 'complete' | 'cancel', 'instance_id', 'actual'}
+
+        Database backend: everything runs in one transaction (all or nothing) with one
+        query for the touched rows, vectorized factor computation, one projection /
+        rollup / task_stats / sketch refresh per touched day, task and month, and one
+        cache invalidation per user. CSV backend: applied one by one through the
+        single-row methods.
+
+        Args:
+            transitions: Transitions in the order to apply them (several may touch one instance)
+            user_id: Owner of the instances (required for data isolation). None matches any
+                user's instances, like complete_instance() without user_id; meant for scripts,
+                which then pass 'user_id' in each 'create' transition.
+
+        Returns:
+            instance_id of each transition, in order (the new ID for 'create')
+
+        Raises:
+            ValueError: On an unknown op, or an instance that is missing or not owned by user_id
+        """
+        unknown = sorted({str(t.get('op')) for t in transitions if t.get('op') not in self.TRANSITION_OPS})
+        if unknown:
+            raise ValueError(f"Unknown transition op(s): {', '.join(unknown)}")
+        if not transitions:
+            return []
+        if user_id is None:
+            print("[InstanceManager] WARNING: apply_transitions() called without user_id - not filtering by owner")
+        if self.use_db:
+            return self._apply_transitions_db(transitions, user_id)
+        return self._apply_transitions_csv(transitions, user_id)
+
+    @staticmethod
+    def _batch_instance_ids(count: int, now: datetime) -> List[str]:
+        """IDs for instances created in one batch: 'i' + microsecond timestamp.
+
+        Numbers are strictly increasing within the process, so back-to-back
+        batches (RoutineScheduler runs one per user in the same tick) never
+        reuse an ID. Still 'i' followed by digits, like create_instance's IDs.
+        """
+        with _batch_id_lock:
+            first = max(int(now.timestamp() * 1_000_000), InstanceManager._last_batch_id + 1)
+            InstanceManager._last_batch_id = first + count - 1
+        return [f"i{first + n}" for n in range(count)]
+
+    def _apply_transitions_db(self, transitions: List[dict], user_id: Optional[int] = None) -> List[str]:
+        """Database-specific apply_transitions."""
+        now = datetime.now()
+        created_ids = iter(self._batch_instance_ids(sum(t['op'] == 'create' for t in transitions), now))
+        existing_ids = list(dict.fromkeys(str(t['instance_id']) for t in transitions if t['op'] != 'create'))
+        results = []
+        try:
+            with perf_logger.operation("_apply_transitions_db", transitions=len(transitions)):
+                with self.db_session() as session:
+                    instances = {}
+                    for start in range(0, len(existing_ids), 500):
+                        query = session.query(self.TaskInstance).filter(
+                            self.TaskInstance.instance_id.in_(existing_ids[start:start + 500])
+                        )
+                        if user_id is not None:
+                            # CRITICAL: Filter by user_id for data isolation
+                            query = query.filter(self.TaskInstance.user_id == user_id)
+                        instances.update((instance.instance_id, instance) for instance in query)
+                    missing = [instance_id for instance_id in existing_ids if instance_id not in instances]
+                    if missing:
+                        raise ValueError(
+                            f"Instance(s) {', '.join(missing[:10])} not found or do not belong to user {user_id}"
+                        )
+
+                    touched = {}
+                    completed_ids = []
+                    session_ids = []
+                    with session.no_autoflush:
+                        for transition in transitions:
+                            op = transition['op']
+                            if op == 'create':
+                                owner = user_id if user_id is not None else transition.get('user_id')
+                                if owner is None:
+                                    raise ValueError("user_id is required for database operations. User must be authenticated.")
+                                instance_id = next(created_ids)
+                                instance = self._new_instance_db(
+                                    instance_id, transition['task_id'], transition.get('task_name'),
+                                    transition.get('task_version') or 1, transition.get('predicted'), owner, now,
+                                )
+                                session.add(instance)
+                                instances[instance_id] = instance
+                            else:
+                                instance_id = str(transition['instance_id'])
+                                instance = instances[instance_id]
+                                self._apply_transition_db(instance, transition, now)
+                                if op == 'complete':
+                                    completed_ids.append(instance_id)
+                                if op in self._SESSION_OPS:
+                                    session_ids.append(instance_id)
+                            touched[instance_id] = instance
+                            results.append(instance_id)
+                        # Before anything flushes (see _timestamp_history)
+                        timestamps = {instance_id: self._timestamp_history(instance) for instance_id, instance in touched.items()}
+                        stats_changed = {instance_id: self._task_stats_inputs_changed(instance)
+                                         for instance_id, instance in touched.items()}
+
+                    completed = [touched[instance_id] for instance_id in dict.fromkeys(completed_ids)]
+                    self._calculate_and_store_factors_batch_db(completed)
+                    self._store_execution_scores_db(completed)
+                    self._refresh_projections_bulk_db(session, list(touched.values()), timestamps, stats_changed)
+                    outcomes = [self._completion_outcome_db(instance, instance.actual) for instance in completed]
+                    sessions = []
+                    for instance_id in dict.fromkeys(session_ids):
+                        instance = touched[instance_id]
+                        actual = instance.actual if isinstance(instance.actual, dict) else {}
+                        if instance.status == 'active' and instance.started_at:
+                            sessions.append((instance_id, now, actual.get('time_spent_before_pause', 0.0), instance.user_id))
+                        else:
+                            sessions.append((instance_id, None, None, None))
+                    owners = {instance.user_id for instance in touched.values()}
+
+                    session.commit()
+        except ValueError:
+            raise
+        except Exception as e:
+            if self.strict_mode:
+                raise RuntimeError(f"Database error in apply_transitions and CSV fallback is disabled: {e}") from e
+            print(f"[InstanceManager] Database error in apply_transitions: {e}, falling back to CSV")
+            self.use_db = False
+            return self._apply_transitions_csv(transitions, user_id)
+
+        for instance_id, session_start, time_before, owner in sessions:
+            if session_start is None:
+                running_sessions.mark_stopped(instance_id)
+            else:
+                running_sessions.mark_running(instance_id, session_start, time_before, user_id=owner)
+        for outcome in outcomes:
+            self._log_completion_outcome(outcome)
+        # Invalidate caches once per owner AFTER the commit
+        for owner in ([user_id] if user_id is not None else owners):
+            self._invalidate_instance_caches(owner)
+        return results
+
+    def _apply_transition_db(self, instance, transition: dict, now: datetime):
+        """Apply one non-create transition to a loaded instance (Database version, no commit)."""
+        op = transition['op']
+        if op == 'add_prediction':
+            self._apply_prediction_db(instance, transition.get('predicted') or {}, transition.get('due_at'), now)
+        elif op == 'update_predicted':
+            predicted = dict(instance.predicted or {})
+            predicted.update(transition.get('predicted') or {})
+            instance.predicted = predicted
+            self._update_attributes_from_payload_db(instance, predicted)
+            if instance.is_completed:
+                self._store_execution_scores_db([instance])
+        elif op == 'start':
+            instance.started_at = now
+            instance.status = 'active'
+        elif op == 'resume':
+            actual = dict(instance.actual or {})
+            actual['resume_started_at'] = now.isoformat()
+            actual.pop('paused', None)
+            instance.actual = actual
+            instance.started_at = now
+            instance.status = 'active'
+        elif op == 'pause':
+            self._apply_pause_db(instance, transition.get('reason'), transition.get('completion_percentage', 0.0), now)
+        elif op == 'postpone':
+            self._apply_postpone_db(instance, transition.get('actual') or {}, now)
+        elif op == 'complete':
+            self._apply_complete_db(instance, transition.get('actual') or {}, now)
+        elif op == 'cancel':
+            self._apply_cancel_db(instance, transition.get('actual') or {}, now)
+
+    def _apply_transitions_csv(self, transitions: List[dict], user_id: Optional[int] = None) -> List[str]:
+        """CSV-specific apply_transitions (one single-row write per transition)."""
+        created_ids = iter(self._batch_instance_ids(sum(t['op'] == 'create' for t in transitions), datetime.now()))
+        results = []
+        for transition in transitions:
+            op = transition['op']
+            if op == 'create':
+                instance_id = self._create_instance_csv(
+                    transition['task_id'], transition.get('task_name'), transition.get('task_version') or 1,
+                    transition.get('predicted'),
+                    user_id=user_id if user_id is not None else transition.get('user_id'),
+                    instance_id=next(created_ids),
+                )
+            else:
+                instance_id = str(transition['instance_id'])
+                if op == 'add_prediction':
+                    self._add_prediction_to_instance_csv(instance_id, transition.get('predicted') or {}, due_at=transition.get('due_at'))
+                elif op == 'update_predicted':
+                    self._update_predicted_csv(instance_id, transition.get('predicted') or {})
+                elif op == 'start':
+                    self._start_instance_csv(instance_id)
+                elif op == 'resume':
+                    self._resume_instance_csv(instance_id)
+                elif op == 'pause':
+                    self._pause_instance_csv(instance_id, transition.get('reason'), transition.get('completion_percentage', 0.0))
+                elif op == 'postpone':
+                    self._postpone_instance_csv(instance_id, transition.get('actual') or {})
+                elif op == 'complete':
+                    self._complete_instance_csv(instance_id, transition.get('actual') or {}, user_id=user_id)
+                elif op == 'cancel':
+                    self._cancel_instance_csv(instance_id, transition.get('actual') or {})
+                if op in ('pause', 'complete', 'cancel'):
+                    running_sessions.mark_stopped(instance_id)
+            results.append(instance_id)
+        self._invalidate_instance_caches(user_id)
+        return results
+
+    def _update_predicted_csv(self, instance_id: str, predicted: dict):
+        """CSV-specific update_predicted transition: merge keys into the stored predicted JSON."""
+        self._reload()
+        matches = self.df.index[self.df['instance_id'] == instance_id]
+        if len(matches) == 0:
+            raise ValueError(f"Instance {instance_id} not found")
+        idx = matches[0]
+        try:
+            existing = json.loads(self.df.at[idx, 'predicted'] or '{}')
+        except (json.JSONDecodeError, TypeError):
+            existing = {}
+        existing.update(predicted)
+        self.df.at[idx, 'predicted'] = json.dumps(existing)
+        self._update_attributes_from_payload(idx, existing)
+        self._save()
+
+    def recompute_factors(self, user_id: Optional[int] = None, chunk_size: int = 2000,
+                          resume: bool = True, progress=None) -> Dict[Optional[int], int]:
+        """Recompute the stored factor columns in bulk (database only).
+
+        Runs backend.factor_engine.recompute_factors: chunked, vectorized, executemany
+        UPDATE of changed rows only, resumable from a checkpoint. Each user's caches
+        are invalidated once that user is done.
+
+        Args:
+            user_id: User to recompute; None recomputes every user (scripts only)
+            chunk_size: Rows per chunk (one select, one UPDATE and one commit each)
+            resume: Continue an interrupted run with the same FACTOR_VERSION
+            progress: Optional callback(user_id, processed, total, updated, elapsed_seconds);
+                defaults to printing one line per chunk
+
+        Returns:
+            Dict of user_id -> rows updated
+        """
+        if not self.use_db:
+            print("[InstanceManager] recompute_factors() requires the database backend - skipping")
+            return {}
+        from backend import factor_engine
+
+        kwargs = {'progress': progress} if progress is not None else {}
+        return factor_engine.recompute_factors(
+            self.db_session,
+            user_id=user_id,
+            chunk_size=chunk_size,
+            resume=resume,
+            on_user_done=lambda uid, updated: self._invalidate_instance_caches(uid) if updated else None,
+            **kwargs,
+        )
+
+    def recompute_execution_scores(self, user_id: Optional[int] = None, chunk_size: int = 2000,
+                                   progress=None) -> Dict[Optional[int], int]:
+        """Store execution scores for completed instances scored with another formula version (database only).
+
+        Runs backend.execution_score.recompute_execution_scores after an
+        EXECUTION_SCORE_VERSION bump (or to backfill rows completed before the
+        column existed): chunked, vectorized, one executemany UPDATE per chunk.
+        Only rows still out of date are selected, so an interrupted run resumes
+        where it stopped.
+
+        Args:
+            user_id: User to recompute; None recomputes every user (scripts only)
+            chunk_size: Rows per chunk (one select, one UPDATE and one commit each)
+            progress: Optional callback(user_id, processed, total, elapsed_seconds);
+                defaults to printing one line per chunk
+
+        Returns:
+            Dict of user_id -> rows updated
+        """
+        if not self.use_db:
+            print("[InstanceManager] recompute_execution_scores() requires the database backend - skipping")
+            return {}
+        from backend import execution_score
+
+        kwargs = {'progress': progress} if progress is not None else {}
+        return execution_score.recompute_execution_scores(
+            self.db_session, user_id=user_id, chunk_size=chunk_size, **kwargs,
+        )
+
     def delete_instance(self, instance_id, user_id: Optional[int] = None):
         """Delete a task instance. Works with both CSV and database.
         
@@ -2210,9 +2608,12 @@ class InstanceManager:
         """
         # Note: Cache invalidation happens AFTER deleting in _delete_instance_db/_delete_instance_csv
         if self.use_db:
-            return self._delete_instance_db(instance_id, user_id)
+            result = self._delete_instance_db(instance_id, user_id)
         else:
-            return self._delete_instance_csv(instance_id)
+            result = self._delete_instance_csv(instance_id)
+        if result:
+            running_sessions.mark_stopped(instance_id)
+        return result
     
     def _delete_instance_csv(self, instance_id):
         """CSV-specific delete_instance."""
@@ -2254,11 +2655,19 @@ class InstanceManager:
                     print(f"[InstanceManager] No matching instance to delete (instance_id={instance_id}, user_id={user_id}).")
                     return False
                 
+                # Remove the projection row explicitly (SQLite does not enforce ON DELETE CASCADE by default)
+                session.query(self.TaskInstanceProjection).filter(
+                    self.TaskInstanceProjection.instance_id == instance.instance_id
+                ).delete(synchronize_session=False)
+                timestamps = self._timestamp_history(instance)
                 session.delete(instance)
+                self._refresh_metric_rollup_db(session, instance, timestamps)
+                self._refresh_task_stats_db(session, instance)
+                self._refresh_metric_sketches_db(session, instance, timestamps)
                 session.commit()
                 print("[InstanceManager] Instance deleted.")
             # Invalidate caches AFTER deleting so next list_recent_tasks / list_active_instances is fresh
-            self._invalidate_instance_caches()
+            self._invalidate_instance_caches(user_id)
             return True
         except Exception as e:
             if self.strict_mode:
@@ -2323,6 +2732,234 @@ class InstanceManager:
                     if current_value == '' or pd.isna(current_value):
                         self.df.at[idx, csv_column] = value
     
+    def _refresh_projection_db(self, session, instance):
+        """Re-resolve the typed analytics projection for an instance (Database version).
+
+        Call before session.commit() on every write that changes predicted/actual
+        or the attribute columns, so Analytics._load_instances() reads resolved
+        floats instead of unpacking JSON. Stamps instance.updated_at explicitly so
+        the projection carries the same timestamp (equal = fresh) and the Analytics
+        delta refresh picks the row up. A failure here is not fatal: stale rows
+        are re-resolved on the next analytics load.
+        """
+        timestamps = self._timestamp_history(instance)
+        stats_changed = self._task_stats_inputs_changed(instance)
+        try:
+            from backend.instance_projection import projection_values
+            instance.updated_at = datetime.utcnow()
+            session.merge(self.TaskInstanceProjection(**projection_values(instance)))
+        except Exception as e:
+            print(f"[InstanceManager] WARNING: Could not refresh projection for {getattr(instance, 'instance_id', '?')}: {e}")
+        self._refresh_metric_rollup_db(session, instance, timestamps)
+        self._refresh_task_stats_db(session, instance, stats_changed)
+        self._refresh_metric_sketches_db(session, instance, timestamps, stats_changed)
+
+    @staticmethod
+    def _timestamp_history(instance) -> Dict[str, list]:
+        """initialized_at / completed_at datetimes of an instance before and after the pending write.
+
+        Read before anything flushes the session: a flush (autoflush, SAVEPOINT)
+        resets the attribute history and the previous values would be lost.
+        """
+        from sqlalchemy import inspect as sa_inspect
+        attrs = sa_inspect(instance).attrs
+        timestamps = {}
+        for column in ('initialized_at', 'completed_at'):
+            history = getattr(attrs, column).history
+            values = list(history.added or ()) + list(history.deleted or ()) + list(history.unchanged or ())
+            timestamps[column] = [value for value in values if isinstance(value, datetime)]
+        return timestamps
+
+    @staticmethod
+    def _task_stats_inputs_changed(instance) -> bool:
+        """True if the pending write changes a value task_stats or task_metric_sketch aggregates.
+
+        task_stats reads the task, owner, initialized_at / completed_at, the
+        predicted payload of initialized instances and the actual payload of
+        completed ones (see backend/task_stats.py); the sketches also read the
+        relief_score / duration_minutes columns of completed ones. Start, pause,
+        resume and postpone change none of these. Read before anything flushes
+        the session (see _timestamp_history).
+        """
+        from sqlalchemy import inspect as sa_inspect
+        state = sa_inspect(instance)
+        if not state.persistent:
+            return True
+        attrs = state.attrs
+
+        def changed(column: str) -> bool:
+            return getattr(attrs, column).history.has_changes()
+
+        if any(changed(column) for column in ('task_id', 'user_id', 'initialized_at', 'completed_at')):
+            return True
+        if changed('predicted') and instance.initialized_at is not None:
+            return True
+        return instance.completed_at is not None and any(
+            changed(column) for column in ('actual', 'relief_score', 'duration_minutes')
+        )
+
+    def _refresh_metric_rollup_db(self, session, instance, timestamps: Optional[Dict[str, list]] = None):
+        """Re-aggregate daily_metric_rollup for the days a completed instance touches (Database version).
+
+        Covers the completion day before and after the write (completed_at may be
+        set, moved or cleared). Runs in a SAVEPOINT inside the caller's transaction;
+        a failure only drops the rollup change, and Analytics rebuilds a stale
+        rollup on its next read (see backend/metric_rollup.py).
+        """
+        try:
+            from backend.metric_rollup import refresh_days
+            timestamps = timestamps or self._timestamp_history(instance)
+            days = {value.date() for value in timestamps['completed_at']}
+            if not days or instance.user_id is None:
+                return
+            with session.begin_nested():
+                refresh_days(session, instance.user_id, days)
+        except Exception as e:
+            print(f"[InstanceManager] WARNING: Could not refresh metric rollup for {getattr(instance, 'instance_id', '?')}: {e}")
+
+    def _refresh_task_stats_db(self, session, instance, inputs_changed: bool = True):
+        """Recompute the task_stats row of the instance's task (Database version).
+
+        When the write changes no aggregated value (inputs_changed False, see
+        _task_stats_inputs_changed) the row only takes the new updated_at instead
+        of being recomputed from the task's whole history. Runs in a SAVEPOINT
+        inside the caller's transaction; a failure only drops the stats change,
+        and the next stats read rebuilds stale rows (see backend/task_stats.py).
+        """
+        try:
+            from backend.task_stats import refresh_tasks, touch_task
+            if instance.user_id is None or not instance.task_id:
+                return
+            with session.begin_nested():
+                if inputs_changed or not touch_task(session, instance.user_id, instance.task_id, instance.updated_at):
+                    refresh_tasks(session, instance.user_id, [instance.task_id])
+        except Exception as e:
+            print(f"[InstanceManager] WARNING: Could not refresh task stats for {getattr(instance, 'instance_id', '?')}: {e}")
+
+    def _refresh_metric_sketches_db(self, session, instance, timestamps: Optional[Dict[str, list]] = None,
+                                    inputs_changed: bool = True):
+        """Re-sketch task_metric_sketch for the months an instance touches (Database version).
+
+        Covers the initialized_at and completed_at months before and after the
+        write. Writes that change no sketched value (inputs_changed False, see
+        _task_stats_inputs_changed) only stamp the task's sketch rows. Runs in a
+        SAVEPOINT inside the caller's transaction; a failure only drops the sketch
+        change, and the next sketch read rebuilds stale sketches (see
+        backend/metric_sketch.py).
+        """
+        try:
+            from backend.metric_sketch import month_of, refresh_months, touch_task
+            if instance.user_id is None or not instance.task_id:
+                return
+            timestamps = timestamps or self._timestamp_history(instance)
+            months = {month_of(value) for values in timestamps.values() for value in values}
+            if not months:
+                return
+            with session.begin_nested():
+                if inputs_changed or not touch_task(session, instance.user_id, instance.task_id, instance.updated_at):
+                    refresh_months(session, instance.user_id, instance.task_id, months)
+        except Exception as e:
+            print(f"[InstanceManager] WARNING: Could not refresh metric sketches for {getattr(instance, 'instance_id', '?')}: {e}")
+
+    def _refresh_projections_bulk_db(self, session, instances: list, timestamps: Dict[str, Dict[str, list]],
+                                     stats_changed: Optional[Dict[str, bool]] = None):
+        """_refresh_projection_db for many instances written in one transaction.
+
+        Merges every projection row, then refreshes each touched rollup day,
+        task_stats task and sketch month once instead of once per instance.
+        timestamps maps instance_id -> _timestamp_history() and stats_changed
+        instance_id -> _task_stats_inputs_changed(), both captured before any flush
+        (missing entries count as changed).
+        """
+        from backend.instance_projection import projection_values
+        updated_at = datetime.utcnow()
+        stats_changed = stats_changed or {}
+        days_by_user: Dict[int, set] = {}
+        tasks_by_user: Dict[int, set] = {}
+        touched_tasks: Dict[tuple, datetime] = {}
+        months_by_task: Dict[tuple, set] = {}
+        touched_months: Dict[tuple, set] = {}
+        for instance in instances:
+            try:
+                instance.updated_at = updated_at
+                session.merge(self.TaskInstanceProjection(**projection_values(instance)))
+            except Exception as e:
+                print(f"[InstanceManager] WARNING: Could not refresh projection for {getattr(instance, 'instance_id', '?')}: {e}")
+            if instance.user_id is None:
+                continue
+            history = timestamps.get(instance.instance_id) or {'initialized_at': [], 'completed_at': []}
+            days_by_user.setdefault(instance.user_id, set()).update(value.date() for value in history['completed_at'])
+            if instance.task_id:
+                key = (instance.user_id, instance.task_id)
+                months = {value for values in history.values() for value in values}
+                if stats_changed.get(instance.instance_id, True):
+                    tasks_by_user.setdefault(instance.user_id, set()).add(instance.task_id)
+                    months_by_task.setdefault(key, set()).update(months)
+                else:
+                    touched_tasks[key] = updated_at
+                    if months:
+                        touched_months.setdefault(key, set()).update(months)
+        try:
+            from backend.metric_rollup import refresh_days
+            for user_id, days in days_by_user.items():
+                if days:
+                    with session.begin_nested():
+                        refresh_days(session, user_id, days)
+        except Exception as e:
+            print(f"[InstanceManager] WARNING: Could not refresh metric rollup for batch: {e}")
+        try:
+            from backend.task_stats import refresh_tasks, touch_task
+            for (user_id, task_id), stamp in touched_tasks.items():
+                if task_id in tasks_by_user.get(user_id, ()):
+                    continue
+                with session.begin_nested():
+                    if not touch_task(session, user_id, task_id, stamp):
+                        tasks_by_user.setdefault(user_id, set()).add(task_id)
+            for user_id, task_ids in tasks_by_user.items():
+                with session.begin_nested():
+                    refresh_tasks(session, user_id, task_ids)
+        except Exception as e:
+            print(f"[InstanceManager] WARNING: Could not refresh task stats for batch: {e}")
+        try:
+            from backend.metric_sketch import month_of, refresh_months, touch_task as touch_sketches
+            for (user_id, task_id), values in touched_months.items():
+                if (user_id, task_id) in months_by_task:
+                    months_by_task[(user_id, task_id)].update(values)
+                    continue
+                with session.begin_nested():
+                    if not touch_sketches(session, user_id, task_id, updated_at):
+                        months_by_task[(user_id, task_id)] = values
+            for (user_id, task_id), values in months_by_task.items():
+                months = {month_of(value) for value in values}
+                if months:
+                    with session.begin_nested():
+                        refresh_months(session, user_id, task_id, months)
+        except Exception as e:
+            print(f"[InstanceManager] WARNING: Could not refresh metric sketches for batch: {e}")
+
+    def _load_task_stats_db(self, task_ids: List[str], user_id: Optional[int] = None) -> Optional[Dict[str, dict]]:
+        """task_stats rows for task_ids (Database version).
+
+        Checks once per user and cache TTL that the rows cover every instance
+        (writes through this class keep them current; others trigger a rebuild).
+
+        Returns:
+            Dict of task_id -> stats (see backend/task_stats.py), or None without a
+            user_id or if the table cannot be read (callers then query the instances)
+        """
+        if user_id is None:
+            return None
+        try:
+            from backend.task_stats import ensure_fresh, load_task_stats
+            with self.db_session() as session:
+                if user_id not in InstanceManager._task_stats_checked:
+                    ensure_fresh(session, user_id)
+                    InstanceManager._task_stats_checked[user_id] = True
+                return load_task_stats(session, user_id, task_ids)
+        except Exception as e:
+            print(f"[InstanceManager] WARNING: task_stats read failed, computing from instances: {e}")
+            return None
+
     def _update_attributes_from_payload_db(self, instance, payload: dict):
         """Persist wellbeing attributes if caller provided them (Database version).
         Maps both direct keys and common aliases from JSON payloads."""
@@ -2425,6 +3062,50 @@ class InstanceManager:
             instance.disappointment_factor = None
             instance.net_emotional = None
 
+    def _calculate_and_store_factors_batch_db(self, instances: list):
+        """Vectorized _calculate_and_store_factors_db over many instances (same rules)."""
+        if not instances:
+            return
+        import numpy as np
+        from backend.factor_engine import emotional_factors
+
+        factors = emotional_factors(
+            [instance.predicted for instance in instances],
+            [instance.actual for instance in instances],
+        )
+        net_relief = factors['net_relief']
+        serendipity = factors['serendipity_factor']
+        disappointment = factors['disappointment_factor']
+        net_emotional = factors['net_emotional']
+
+        def scalar(array, i):
+            return None if np.isnan(array[i]) else float(array[i])
+
+        for i, instance in enumerate(instances):
+            if instance.net_relief is None and not np.isnan(net_relief[i]):
+                instance.net_relief = float(net_relief[i])
+            instance.serendipity_factor = scalar(serendipity, i)
+            instance.disappointment_factor = scalar(disappointment, i)
+            instance.net_emotional = scalar(net_emotional, i)
+
+    def _store_execution_scores_db(self, instances: list):
+        """Store execution_score (and its formula version) on completed instances, in one vectorized pass."""
+        if not instances:
+            return
+        try:
+            from sqlalchemy.orm.attributes import flag_modified
+            from backend.execution_score import EXECUTION_SCORE_VERSION, INPUT_COLUMNS, compute_execution_scores
+
+            frame = pd.DataFrame([{column: getattr(instance, column) for column in INPUT_COLUMNS} for instance in instances])
+            for instance, score in zip(instances, compute_execution_scores(frame)):
+                instance.execution_score = float(score)
+                instance.execution_score_version = EXECUTION_SCORE_VERSION
+                # Counts as a change even when the version is unchanged (see database._clear_stale_execution_score)
+                flag_modified(instance, 'execution_score_version')
+        except Exception as e:
+            # Left NULL; scored on first read (backend.execution_score.recent_execution_score)
+            print(f"[InstanceManager] Error calculating execution score: {e}")
+
     def list_recent_completed(self, limit=20, user_id: Optional[int] = None):
         """List recently completed instances. Works with both CSV and database.
 
@@ -2443,16 +3124,10 @@ class InstanceManager:
             return []
 
         # Check per-user cache first (cache key includes user_id)
-        cache_key = f"recent_completed_user_{user_id}_limit_{limit}"
-        current_time = time.time()
-        if (hasattr(InstanceManager, '_per_user_cache') and
-            InstanceManager._per_user_cache.get(cache_key) is not None and
-            InstanceManager._per_user_cache.get(f"{cache_key}_time") is not None and
-            (current_time - InstanceManager._per_user_cache[f"{cache_key}_time"]) < self._cache_ttl_seconds):
-            cached_result = InstanceManager._per_user_cache[cache_key]
+        cache_key = (str(user_id), 'recent_completed', limit)
+        cached_result = InstanceManager._per_user_cache.get(cache_key)
+        if cached_result is not None:
             return cached_result.copy() if isinstance(cached_result, list) else cached_result
-            if (current_time - cache_time) < self._cache_ttl_seconds:
-                return cached_result.copy() if isinstance(cached_result, list) else cached_result
         
         # Cache miss - load from database/CSV
         if self.use_db:
@@ -2461,10 +3136,7 @@ class InstanceManager:
             result = self._list_recent_completed_csv(limit, user_id=user_id)
 
         # Store in per-user cache
-        if not hasattr(InstanceManager, '_per_user_cache'):
-            InstanceManager._per_user_cache = {}
         InstanceManager._per_user_cache[cache_key] = result.copy() if isinstance(result, list) else result
-        InstanceManager._per_user_cache[f"{cache_key}_time"] = current_time
 
         return result
     
@@ -2824,6 +3496,7 @@ class InstanceManager:
                                                 pass
                     
                     if row_updated:
+                        self._refresh_projection_db(session, instance)
                         updated_count += 1
                 
                 if updated_count > 0:
@@ -2846,6 +3519,9 @@ class InstanceManager:
         expected_physical_load, expected_emotional_load, motivation, expected_aversion.
         Values are scaled to 0-100 range."""
         if self.use_db:
+            stats = self._load_task_stats_db([task_id], user_id)
+            if stats is not None:
+                return dict(stats[task_id]['predicted_averages'])
             return self._get_previous_task_averages_db(task_id, user_id=user_id)
         else:
             return self._get_previous_task_averages_csv(task_id, user_id=user_id)
@@ -3078,6 +3754,12 @@ class InstanceManager:
         if not task_ids or user_id is None:
             return {}
         if self.use_db:
+            stats = self._load_task_stats_db(task_ids, user_id)
+            if stats is not None:
+                return {
+                    tid: {**stats[tid]['predicted_averages'], 'avg_time_estimate': stats[tid]['avg_time_estimate']}
+                    for tid in task_ids
+                }
             return self._get_previous_task_averages_bulk_db(task_ids, user_id)
         return self._get_previous_task_averages_bulk_csv(task_ids, user_id)
 
@@ -3086,88 +3768,8 @@ class InstanceManager:
     ) -> tuple:
         """From a list of instances (ORM or dict with 'predicted'), compute averages dict and
         avg_time_estimate. Returns (result_dict, avg_time_estimate)."""
-        import json as _json
-        relief_values = []
-        mental_energy_values = []
-        difficulty_values = []
-        cognitive_values = []
-        physical_values = []
-        emotional_values = []
-        motivation_values = []
-        aversion_values = []
-        stress_values = []  # Direct expected_stress (not derived stress_level)
-        time_values = []
-        for inst in instances:
-            if isinstance(inst, dict):
-                raw = inst.get('predicted') or '{}'
-                try:
-                    pred = _json.loads(raw) if isinstance(raw, str) else (raw or {})
-                except (_json.JSONDecodeError, TypeError):
-                    pred = {}
-            else:
-                pred = getattr(inst, 'predicted', None) or {}
-            if not isinstance(pred, dict):
-                pred = {}
-            # scales and value lists (same as _get_previous_task_averages_db)
-            for key, value_list in [
-                ('expected_relief', relief_values),
-                ('expected_mental_energy', mental_energy_values),
-                ('expected_difficulty', difficulty_values),
-                ('expected_cognitive_load', cognitive_values),
-                ('expected_physical_load', physical_values),
-                ('expected_emotional_load', emotional_values),
-                ('motivation', motivation_values),
-                ('expected_aversion', aversion_values),
-                ('expected_stress', stress_values),  # Direct user-reported stress only
-            ]:
-                val = pred.get(key)
-                if val is not None:
-                    try:
-                        num_val = float(val)
-                        if num_val <= 10 and num_val >= 0:
-                            num_val = num_val * 10
-                        value_list.append(num_val)
-                    except (ValueError, TypeError):
-                        pass
-            if 'expected_mental_energy' not in pred and 'expected_difficulty' not in pred:
-                old_cog = pred.get('expected_cognitive_load')
-                if old_cog is not None:
-                    try:
-                        num_val = float(old_cog)
-                        if num_val <= 10 and num_val >= 0:
-                            num_val = num_val * 10
-                        mental_energy_values.append(num_val)
-                        difficulty_values.append(num_val)
-                    except (ValueError, TypeError):
-                        pass
-            # time
-            t = pred.get('time_estimate_minutes') or pred.get('estimate')
-            if t is not None:
-                try:
-                    time_values.append(float(t))
-                except (ValueError, TypeError):
-                    pass
-        result = {}
-        if relief_values:
-            result['expected_relief'] = round(sum(relief_values) / len(relief_values))
-        if mental_energy_values:
-            result['expected_mental_energy'] = round(sum(mental_energy_values) / len(mental_energy_values))
-        if difficulty_values:
-            result['expected_difficulty'] = round(sum(difficulty_values) / len(difficulty_values))
-        if cognitive_values:
-            result['expected_cognitive_load'] = round(sum(cognitive_values) / len(cognitive_values))
-        if physical_values:
-            result['expected_physical_load'] = round(sum(physical_values) / len(physical_values))
-        if emotional_values:
-            result['expected_emotional_load'] = round(sum(emotional_values) / len(emotional_values))
-        if motivation_values:
-            result['motivation'] = round(sum(motivation_values) / len(motivation_values))
-        if aversion_values:
-            result['expected_aversion'] = round(sum(aversion_values) / len(aversion_values))
-        if stress_values:
-            result['expected_stress'] = round(sum(stress_values) / len(stress_values))
-        avg_time = (sum(time_values) / len(time_values)) if time_values else None
-        return result, avg_time
+        from backend.task_stats import predicted_averages
+        return predicted_averages(instances)
 
     def _get_previous_task_averages_bulk_db(
         self, task_ids: List[str], user_id: int
@@ -3230,6 +3832,9 @@ class InstanceManager:
             user_id: User ID to filter by (required for data isolation)
         """
         if self.use_db:
+            stats = self._load_task_stats_db([task_id], user_id)
+            if stats is not None:
+                return dict(stats[task_id]['actual_averages'])
             return self._get_previous_actual_averages_db(task_id, user_id)
         else:
             return self._get_previous_actual_averages_csv(task_id, user_id)
@@ -3381,6 +3986,9 @@ class InstanceManager:
             user_id: User ID to filter by (required for data isolation)
         """
         if self.use_db:
+            stats = self._load_task_stats_db([task_id], user_id)
+            if stats is not None:
+                return stats[task_id]['initial_aversion']
             return self._get_initial_aversion_db(task_id, user_id)
         else:
             return self._get_initial_aversion_csv(task_id, user_id)
@@ -3567,12 +4175,20 @@ class InstanceManager:
             self.use_db = False
             return self._has_completed_task_csv(task_id, user_id)
 
-    def get_previous_aversion_average(self, task_id: str) -> Optional[float]:
+    def get_previous_aversion_average(self, task_id: str, user_id: Optional[int] = None) -> Optional[float]:
         """Get average aversion from previous initialized instances of the same task.
         Returns None if no previous instances exist.
-        Values are scaled to 0-100 range."""
+        Values are scaled to 0-100 range.
+
+        Args:
+            task_id: Task ID to get average for
+            user_id: User ID to filter by (required in database mode for data isolation)
+        """
         if self.use_db:
-            return self._get_previous_aversion_average_db(task_id)
+            stats = self._load_task_stats_db([task_id], user_id)
+            if stats is not None:
+                return stats[task_id]['predicted_averages'].get('expected_aversion')
+            return self._get_previous_aversion_average_db(task_id, user_id)
         else:
             return self._get_previous_aversion_average_csv(task_id)
     
@@ -3668,7 +4284,8 @@ class InstanceManager:
             self.use_db = False
             return self._get_previous_aversion_average_csv(task_id)
 
-    def get_baseline_aversion_robust(self, task_id: str, user_id: Optional[int] = None) -> Optional[float]:
+    def get_baseline_aversion_robust(self, task_id: str, user_id: Optional[int] = None,
+                                     since: Optional[datetime] = None) -> Optional[float]:
         """Get robust baseline aversion using median (less sensitive to outliers).
         Returns None if no previous instances exist.
         Values are scaled to 0-100 range.
@@ -3676,8 +4293,16 @@ class InstanceManager:
         Args:
             task_id: Task ID to get baseline for
             user_id: User ID to filter by (required for data isolation)
+            since: Only instances initialized in or after the month of since (from the
+                monthly sketches, see get_task_metric_quantiles); None = whole history
         """
+        if since is not None:
+            median = self.get_task_metric_quantiles(task_id, [0.5], user_id=user_id, since=since)[0.5]
+            return round(median) if median is not None else None
         if self.use_db:
+            stats = self._load_task_stats_db([task_id], user_id)
+            if stats is not None:
+                return stats[task_id]['baseline_aversion_robust']
             return self._get_baseline_aversion_robust_db(task_id, user_id)
         else:
             return self._get_baseline_aversion_robust_csv(task_id, user_id)
@@ -3804,6 +4429,9 @@ class InstanceManager:
             user_id: User ID to filter by (required for data isolation)
         """
         if self.use_db:
+            stats = self._load_task_stats_db([task_id], user_id)
+            if stats is not None:
+                return stats[task_id]['baseline_aversion_sensitive']
             return self._get_baseline_aversion_sensitive_db(task_id, user_id)
         else:
             return self._get_baseline_aversion_sensitive_csv(task_id, user_id)
@@ -3819,10 +4447,93 @@ class InstanceManager:
             Dict mapping task_id to {'robust': float or None, 'sensitive': float or None}
         """
         if self.use_db:
+            stats = self._load_task_stats_db(task_ids, user_id)
+            if stats is not None:
+                return {
+                    tid: {'robust': stats[tid]['baseline_aversion_robust'],
+                          'sensitive': stats[tid]['baseline_aversion_sensitive']}
+                    for tid in task_ids
+                }
             return self._get_batch_baseline_aversions_db(task_ids, user_id)
         else:
             return self._get_batch_baseline_aversions_csv(task_ids, user_id)
     
+    def get_task_metric_quantiles(self, task_id: str, quantiles: List[float], user_id: Optional[int] = None,
+                                  metric_key: str = 'expected_aversion', since: Optional[datetime] = None,
+                                  until: Optional[datetime] = None) -> Dict[float, Optional[float]]:
+        """Quantiles of a per-instance metric over a task's history, without loading the instances.
+
+        Merges the task's monthly sketches (backend/metric_sketch.py); exact while the
+        window holds fewer than ~200 values, within ~1% rank error beyond.
+
+        Args:
+            task_id: Task ID
+            quantiles: Quantiles to return (0-1, e.g. [0.25, 0.5, 0.75])
+            user_id: User ID to filter by (required for data isolation)
+            metric_key: One of metric_sketch.SKETCH_METRICS ('expected_aversion' is 0-100 scaled)
+            since / until: Window, month-aligned (the months containing them are included)
+
+        Returns:
+            Dict of quantile -> value (None if the window has no values)
+        """
+        sketch = self._get_task_metric_sketch(task_id, metric_key, user_id, since, until)
+        return sketch.quantiles(quantiles)
+
+    def get_task_metric_rank(self, task_id: str, value: float, user_id: Optional[int] = None,
+                             metric_key: str = 'expected_aversion', since: Optional[datetime] = None,
+                             until: Optional[datetime] = None) -> Optional[float]:
+        """Fraction (0-1) of the task's metric values <= value (percentile rank); None without values.
+
+        Same arguments as get_task_metric_quantiles.
+        """
+        sketch = self._get_task_metric_sketch(task_id, metric_key, user_id, since, until)
+        return sketch.rank(value)
+
+    def _get_task_metric_sketch(self, task_id: str, metric_key: str, user_id: Optional[int],
+                                since: Optional[datetime], until: Optional[datetime]):
+        from backend.metric_sketch import SKETCH_METRICS
+        from backend.quantile_sketch import QuantileSketch
+        if metric_key not in SKETCH_METRICS:
+            raise ValueError(f"No sketch for metric '{metric_key}' (available: {sorted(SKETCH_METRICS)})")
+        if user_id is None:
+            print("[InstanceManager] WARNING: task metric sketch requested without user_id - returning empty for security")
+            return QuantileSketch()
+        if self.use_db:
+            try:
+                from backend.metric_sketch import ensure_fresh, load_sketches
+                with self.db_session() as session:
+                    if user_id not in InstanceManager._metric_sketch_checked:
+                        ensure_fresh(session, user_id)
+                        InstanceManager._metric_sketch_checked[user_id] = True
+                    return load_sketches(session, user_id, [task_id], metric_key, since, until)[task_id]
+            except Exception as e:
+                if self.strict_mode:
+                    raise RuntimeError(f"Database error in task metric sketch and CSV fallback is disabled: {e}") from e
+                print(f"[InstanceManager] Database error in task metric sketch: {e}, falling back to CSV")
+                self.use_db = False
+        return self._get_task_metric_sketch_csv(task_id, metric_key, user_id, since, until)
+
+    def _get_task_metric_sketch_csv(self, task_id: str, metric_key: str, user_id: int,
+                                    since: Optional[datetime], until: Optional[datetime]):
+        """CSV-specific task metric sketch: built from the task's rows (same month-aligned window)."""
+        from backend.metric_sketch import SKETCH_METRICS, month_of
+        from backend.quantile_sketch import QuantileSketch
+        time_column, value = SKETCH_METRICS[metric_key]
+        self._reload()
+        rows = self.df[
+            (self.df['task_id'] == task_id) & (self.df['user_id'].astype(str) == str(user_id))
+        ].copy()
+        for column in ('initialized_at', 'completed_at'):
+            rows[column] = pd.to_datetime(rows[column], errors='coerce')
+        months = rows[time_column].map(lambda t: month_of(t) if pd.notna(t) else None)
+        keep = months.notna()
+        if since is not None:
+            keep &= months.map(lambda m: m is not None and m >= month_of(since))
+        if until is not None:
+            keep &= months.map(lambda m: m is not None and m <= month_of(until))
+        values = (value(row) for row in rows[keep].itertuples(index=False))
+        return QuantileSketch.from_values(v for v in values if v is not None)
+
     def _get_batch_baseline_aversions_db(self, task_ids: List[str], user_id: Optional[int] = None) -> Dict[str, Dict[str, Optional[float]]]:
         """Database-specific batch baseline aversion loader.
         
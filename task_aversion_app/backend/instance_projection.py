@@ -0,0 +1,370 @@
+"""
+Typed columnar projection of task_instances for analytics.
+
+The predicted/actual JSON payloads hold most per-instance attributes, and
+Analytics used to unpack them with one .apply() pass per attribute on every
+cold _load_instances(). This module resolves those values once, when
+InstanceManager writes an instance, and stores them as plain float columns in
+the task_instance_projection table. _load_instances() then selects the
+projection alongside task_instances and builds the frame column-wise.
+
+The fallback chain in resolve_projection() mirrors the one in
+Analytics._load_instances() (stored column -> actual JSON -> predicted JSON ->
+aliases). Missing values are stored as NULL; attribute defaults are applied
+at load time so a default change does not require a rebuild. Bump
+PROJECTION_VERSION when the chain changes; stale rows are re-resolved (and
+written back) the next time they are loaded.
+
+A projection row is also stale when task_instances.updated_at is newer than
+the projection's updated_at (the instance was written by code that does not
+refresh the projection, e.g. the CSV importer or the task editor).
+"""
+import json
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .task_schema import TASK_ATTRIBUTES
+
+PROJECTION_VERSION = 1
+
+# Numeric columns stored on task_instance_projection (besides skills_improved)
+NUMERIC_PROJECTION_COLUMNS = (
+    'duration_minutes',
+    'relief_score',
+    'mental_energy_needed',
+    'task_difficulty',
+    'emotional_load',
+    'environmental_effect',
+    'behavioral_score',
+    'physical_load',
+    'expected_aversion',
+    'expected_relief',
+    'expected_emotional_load',
+    'actual_stress',
+)
+PROJECTION_COLUMNS = NUMERIC_PROJECTION_COLUMNS + ('skills_improved',)
+
+# task_instances columns selected for the analytics frame (order = frame order)
+INSTANCE_FRAME_COLUMNS = (
+    'instance_id', 'task_id', 'task_name', 'task_version',
+    'created_at', 'initialized_at', 'started_at', 'completed_at', 'cancelled_at', 'due_at',
+    'predicted', 'actual',
+    'procrastination_score', 'proactive_score', 'behavioral_score', 'net_relief', 'net_emotional',
+    'behavioral_deviation', 'is_completed', 'is_deleted', 'status',
+    'duration_minutes', 'delay_minutes', 'relief_score', 'cognitive_load', 'mental_energy_needed',
+    'task_difficulty', 'emotional_load', 'environmental_effect', 'skills_improved',
+    'serendipity_factor', 'disappointment_factor', 'user_id',
+)
+
+_DATETIME_COLUMNS = ('created_at', 'initialized_at', 'started_at', 'completed_at', 'cancelled_at', 'due_at')
+_FLOAT_STRING_COLUMNS = (
+    'procrastination_score', 'proactive_score', 'net_relief', 'net_emotional', 'behavioral_deviation',
+    'delay_minutes', 'cognitive_load', 'serendipity_factor', 'disappointment_factor',
+)
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+
+_PROJ_PREFIX = 'proj_'
+
+
+def _is_missing(value: Any) -> bool:
+    """Match pandas fillna semantics: None and NaN are missing, '' is not."""
+    if value is None or value is pd.NA:
+        return True
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Coerce like pd.to_numeric(errors='coerce'); None when not numeric."""
+    if _is_missing(value) or isinstance(value, (dict, list)):
+        return None
+    try:
+        result = float(value)
+    except (ValueError, TypeError):
+        return None
+    return None if math.isnan(result) else result
+
+
+def _first_present(*values: Any) -> Any:
+    """Return the first value that is not None/NaN (chained fillna)."""
+    for value in values:
+        if not _is_missing(value):
+            return value
+    return None
+
+
+def _stored(stored: Mapping[str, Any], key: str) -> Any:
+    """Stored task_instances column value, with '' treated as missing."""
+    value = stored.get(key)
+    if isinstance(value, str) and value == '':
+        return None
+    return value
+
+
+def as_dict(value: Any) -> Dict[str, Any]:
+    """Parse a predicted/actual payload (dict or JSON string) into a dict."""
+    if isinstance(value, dict):
+        return value
+    if not value:
+        return {}
+    try:
+        parsed = json.loads(value)
+    except Exception:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def resolve_projection(
+    predicted: Mapping[str, Any],
+    actual: Mapping[str, Any],
+    stored: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Resolve projected attribute values for one instance.
+
+    Args:
+        predicted: Parsed predicted JSON
+        actual: Parsed actual JSON
+        stored: Stored task_instances column values (duration_minutes, relief_score, ...)
+
+    Returns:
+        Dict keyed by PROJECTION_COLUMNS. Numeric values are float or None
+        (None = use the attribute default at load time).
+    """
+    predicted = predicted if isinstance(predicted, Mapping) else {}
+    actual = actual if isinstance(actual, Mapping) else {}
+    stored = stored or {}
+
+    resolved: Dict[str, Any] = {}
+    for attr in TASK_ATTRIBUTES:
+        key = attr.key
+        chain = [_stored(stored, key), actual.get(key), predicted.get(key)]
+        # Alias fallbacks; `or` chains are intentional (0 falls through, as in _load_instances)
+        if key == 'relief_score':
+            # relief_score only ever comes from actual values, never expected_relief
+            chain.append(actual.get('actual_relief'))
+        elif key == 'mental_energy_needed':
+            chain.append(actual.get('actual_mental_energy') or actual.get('actual_cognitive'))
+            chain.append(predicted.get('expected_mental_energy') or predicted.get('expected_cognitive_load')
+                         or predicted.get('expected_cognitive'))
+        elif key == 'task_difficulty':
+            chain.append(actual.get('actual_difficulty') or actual.get('actual_cognitive'))
+            chain.append(predicted.get('expected_difficulty') or predicted.get('expected_cognitive_load')
+                         or predicted.get('expected_cognitive'))
+        elif key == 'emotional_load':
+            chain.append(actual.get('actual_emotional'))
+            chain.append(predicted.get('expected_emotional_load') or predicted.get('expected_emotional'))
+        elif key == 'duration_minutes':
+            chain.append(actual.get('time_actual_minutes'))
+            chain.append(predicted.get('time_estimate_minutes'))
+
+        value = _first_present(*chain)
+        if attr.dtype == 'numeric':
+            resolved[key] = _to_float(value)
+        elif value is None:
+            resolved[key] = None
+        else:
+            resolved[key] = value if isinstance(value, str) else json.dumps(value)
+
+    resolved['physical_load'] = _to_float(_first_present(
+        actual.get('actual_physical'), predicted.get('expected_physical_load')
+    ))
+    resolved['expected_aversion'] = _to_float(predicted.get('expected_aversion'))
+    resolved['expected_relief'] = _to_float(predicted.get('expected_relief'))
+    resolved['expected_emotional_load'] = _to_float(
+        predicted.get('expected_emotional_load') or predicted.get('expected_emotional')
+    )
+    resolved['actual_stress'] = _to_float(actual.get('actual_stress'))
+    return resolved
+
+
+def projection_values(instance: Any) -> Dict[str, Any]:
+    """Build a task_instance_projection row from a TaskInstance (or a selected row).
+
+    Works with ORM instances and SQLAlchemy rows alike (attribute access).
+    updated_at is stamped with the instance's updated_at so later writes to the
+    instance mark the projection stale.
+    """
+    stored = {attr.key: getattr(instance, attr.key, None) for attr in TASK_ATTRIBUTES}
+    values = resolve_projection(
+        as_dict(getattr(instance, 'predicted', None)),
+        as_dict(getattr(instance, 'actual', None)),
+        stored,
+    )
+    values['instance_id'] = instance.instance_id
+    values['user_id'] = getattr(instance, 'user_id', None)
+    values['projection_version'] = PROJECTION_VERSION
+    values['updated_at'] = getattr(instance, 'updated_at', None) or datetime.utcnow()
+    return values
+
+
+def _float_strings(series: pd.Series) -> np.ndarray:
+    """Format a nullable float column the way TaskInstance.to_dict() does (str or '')."""
+    numeric = pd.to_numeric(series, errors='coerce')
+    return np.where(numeric.isna(), '', numeric.astype(str))
+
+
+def load_projected_instances(
+    session,
+    user_id: int,
+    completed_only: bool = False,
+    changed_since: Optional[datetime] = None,
+    completed_between: Optional[Tuple[datetime, datetime]] = None,
+    write_back: bool = True,
+) -> pd.DataFrame:
+    """Load a user's instances with resolved attribute columns, without per-row JSON unpacking.
+
+    Returns a frame with the same string columns TaskInstance.to_dict() produces
+    (for existing consumers), plus predicted_dict/actual_dict, the resolved
+    projection columns as float64 (NaN where missing, defaults NOT applied), and
+    completed_at_dt/created_at_dt as datetime64. Rows whose projection is missing
+    or outdated are resolved here and written back.
+
+    Args:
+        session: Open database session
+        user_id: User ID to filter by (required for data isolation)
+        completed_only: If True, only completed instances
+        changed_since: If set, only instances whose updated_at is at or after this
+            (naive UTC) time - the delta for patch_projected_frame()
+        completed_between: If set, only instances completed in [start, end)
+            (used by the daily metric rollup to re-aggregate single days)
+        write_back: If False, re-resolved stale projections are used but not stored
+            (callers inside another write transaction must not commit it early)
+    """
+    from .database import TaskInstance, TaskInstanceProjection
+
+    selected = [getattr(TaskInstance, name) for name in INSTANCE_FRAME_COLUMNS]
+    selected.append(TaskInstance.updated_at)
+    selected.append(TaskInstanceProjection.projection_version.label(_PROJ_PREFIX + 'projection_version'))
+    selected.append(TaskInstanceProjection.updated_at.label(_PROJ_PREFIX + 'updated_at'))
+    selected.extend(
+        getattr(TaskInstanceProjection, name).label(_PROJ_PREFIX + name) for name in PROJECTION_COLUMNS
+    )
+    query = session.query(*selected).outerjoin(
+        TaskInstanceProjection, TaskInstanceProjection.instance_id == TaskInstance.instance_id
+    ).filter(TaskInstance.user_id == user_id)
+    if completed_only:
+        query = query.filter(TaskInstance.completed_at.isnot(None))
+    if changed_since is not None:
+        query = query.filter(TaskInstance.updated_at >= changed_since)
+    if completed_between is not None:
+        start, end = completed_between
+        query = query.filter(TaskInstance.completed_at >= start, TaskInstance.completed_at < end)
+    rows = query.all()
+    if not rows:
+        return pd.DataFrame(columns=['completed_at'])
+
+    names = list(INSTANCE_FRAME_COLUMNS) + [
+        'updated_at', _PROJ_PREFIX + 'projection_version', _PROJ_PREFIX + 'updated_at'
+    ] + [_PROJ_PREFIX + name for name in PROJECTION_COLUMNS]
+    raw = pd.DataFrame.from_records(rows, columns=names)
+
+    # Re-resolve rows without a current projection (legacy rows, or rows written outside InstanceManager)
+    source_updated = pd.to_datetime(raw['updated_at'], errors='coerce')
+    projection_updated = pd.to_datetime(raw[_PROJ_PREFIX + 'updated_at'], errors='coerce')
+    stale_mask = raw[_PROJ_PREFIX + 'projection_version'].ne(PROJECTION_VERSION) | (
+        source_updated.notna() & (projection_updated.isna() | (source_updated > projection_updated))
+    )
+    if stale_mask.any():
+        missing_rows: List[Dict[str, Any]] = []
+        outdated_rows: List[Dict[str, Any]] = []
+        for pos in np.flatnonzero(stale_mask.to_numpy()):
+            row = rows[pos]
+            values = projection_values(row)
+            for name in PROJECTION_COLUMNS:
+                raw.iat[pos, raw.columns.get_loc(_PROJ_PREFIX + name)] = values[name]
+            if pd.isna(raw.iat[pos, raw.columns.get_loc(_PROJ_PREFIX + 'projection_version')]):
+                missing_rows.append(values)
+            else:
+                outdated_rows.append(values)
+    if stale_mask.any() and write_back:
+        try:
+            if missing_rows:
+                session.bulk_insert_mappings(TaskInstanceProjection, missing_rows)
+            if outdated_rows:
+                session.bulk_update_mappings(TaskInstanceProjection, outdated_rows)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"[InstanceProjection] Could not write back {int(stale_mask.sum())} projection rows: {e}")
+
+    df = pd.DataFrame(index=raw.index)
+    df['instance_id'] = raw['instance_id']
+    df['task_id'] = raw['task_id']
+    df['task_name'] = raw['task_name']
+    df['task_version'] = pd.to_numeric(raw['task_version'], errors='coerce').astype('Int64').astype(str).replace('<NA>', '')
+    for col in _DATETIME_COLUMNS:
+        parsed = pd.to_datetime(raw[col], errors='coerce')
+        df[col] = parsed.dt.strftime(_DATETIME_FORMAT).fillna('')
+        if col in ('created_at', 'completed_at'):
+            df[col + '_dt'] = parsed
+
+    predicted_dicts = [as_dict(v) for v in raw['predicted']]
+    actual_dicts = [as_dict(v) for v in raw['actual']]
+    df['predicted'] = [json.dumps(v) if isinstance(v, dict) else (v or '{}') for v in raw['predicted']]
+    df['actual'] = [json.dumps(v) if isinstance(v, dict) else (v or '{}') for v in raw['actual']]
+
+    for col in _FLOAT_STRING_COLUMNS:
+        df[col] = _float_strings(raw[col])
+    df['is_completed'] = np.where(raw['is_completed'].fillna(False).astype(bool), 'True', 'False')
+    df['is_deleted'] = np.where(raw['is_deleted'].fillna(False).astype(bool), 'True', 'False')
+    df['status'] = raw['status'].fillna('').replace('', 'active')
+    df['user_id'] = pd.to_numeric(raw['user_id'], errors='coerce').astype('Int64').astype(str).replace('<NA>', '')
+
+    # Resolved attribute columns (float64, NaN = missing)
+    for name in NUMERIC_PROJECTION_COLUMNS:
+        df[name] = pd.to_numeric(raw[_PROJ_PREFIX + name], errors='coerce').astype('float64')
+    df['skills_improved'] = raw[_PROJ_PREFIX + 'skills_improved'].where(
+        raw[_PROJ_PREFIX + 'skills_improved'].notna(), None
+    )
+
+    df['predicted_dict'] = pd.Series(predicted_dicts, index=df.index, dtype=object)
+    df['actual_dict'] = pd.Series(actual_dicts, index=df.index, dtype=object)
+    return df
+
+
+def load_instance_ids(session, user_id: int, completed_only: bool = False) -> set:
+    """Return the set of instance_ids currently stored for a user (detects deletions for delta refresh)."""
+    from .database import TaskInstance
+
+    query = session.query(TaskInstance.instance_id).filter(TaskInstance.user_id == user_id)
+    if completed_only:
+        query = query.filter(TaskInstance.completed_at.isnot(None))
+    return {row[0] for row in query.all()}
+
+
+def patch_projected_frame(base: pd.DataFrame, delta: pd.DataFrame, live_ids: Iterable[str]) -> pd.DataFrame:
+    """Apply a changed-rows frame to a cached load_projected_instances() frame.
+
+    Rows in delta replace base rows with the same instance_id (keeping their
+    position); new rows are appended; base rows whose instance_id is not in
+    live_ids (deleted, or no longer completed) are dropped.
+
+    Args:
+        base: Previously loaded frame
+        delta: load_projected_instances(..., changed_since=mark) result
+        live_ids: load_instance_ids() result for the same user/filter
+    """
+    live_ids = set(live_ids)
+    if base.empty or 'instance_id' not in base.columns:
+        base = delta.iloc[0:0] if not delta.empty else base
+    if delta.empty or 'instance_id' not in delta.columns:
+        kept = base[base['instance_id'].isin(live_ids)] if 'instance_id' in base.columns else base
+        return kept.reset_index(drop=True)
+
+    changed_ids = set(delta['instance_id'])
+    kept = base[base['instance_id'].isin(live_ids) & ~base['instance_id'].isin(changed_ids)]
+    delta = delta[delta['instance_id'].isin(live_ids)]
+
+    # Keep existing rows in their original order; new rows go last
+    position = pd.Series(np.arange(len(base)), index=base['instance_id'].to_numpy())
+    position = position[~position.index.duplicated()]
+    order = pd.concat([
+        kept['instance_id'].map(position),
+        delta['instance_id'].map(position).fillna(len(base)),
+    ], ignore_index=True)
+    patched = pd.concat([kept, delta], ignore_index=True)
+    patched = patched.iloc[np.argsort(order.to_numpy(), kind='stable')]
+    return patched.reset_index(drop=True)
@@ -0,0 +1,280 @@
+"""
+Daily per-user rollup of per-instance analytics metrics.
+
+Analytics.get_generic_metric_history() used to load the whole instances frame
+and group it by day on every dashboard render. For metrics whose value is a
+function of one instance (stress_level, relief_score, net_wellbeing, ...) the
+daily aggregates are stored instead in daily_metric_rollup as
+(user_id, date, metric_key, sum, count, min, max), and a history is one
+indexed range query.
+
+Maintenance is incremental: InstanceManager calls refresh_days() inside the
+write transaction of any completed instance, re-aggregating only the affected
+days (its completion day before and after the write). Re-aggregating a day
+rather than adding/subtracting deltas keeps min/max exact on edits and deletes.
+
+Rows written by code that bypasses InstanceManager (CSV importer, scripts) are
+caught by ensure_fresh(): if the number of completed instances or their latest
+updated_at disagrees with the rollup, the user's rollup is rebuilt. This also
+serves as the lazy backfill for existing databases.
+
+Metrics that depend on other instances (execution/grit/sleep scores, the
+min-max normalized stress_efficiency, correlations) or on task templates
+(work_time / play_time use the task type, which changes when a task is edited)
+are not rolled up and keep their frame-based history methods.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .task_schema import TASK_ATTRIBUTES
+
+# Rolled-up metric keys (as used by get_generic_metric_history)
+ROLLUP_METRICS = (
+    'stress_level',
+    'net_wellbeing',
+    'net_wellbeing_normalized',
+    'relief_score',
+    'behavioral_score',
+    'expected_relief',
+    'net_relief',
+    'duration',
+    'mental_energy_needed',
+    'task_difficulty',
+    'emotional_load',
+    'environmental_fit',
+)
+
+# Alternative names accepted by get_generic_metric_history
+METRIC_ALIASES = {
+    'time_actual_minutes': 'duration',
+    'environmental_effect': 'environmental_fit',
+}
+
+# Metric with a value for every completed instance; its total count equals the
+# number of completed instances when the rollup is complete (see ensure_fresh)
+COVERAGE_METRIC = 'relief_score'
+
+
+def rollup_metric_key(metric_key: str) -> Optional[str]:
+    """Return the rollup metric for a history metric key, or None if it is not rolled up."""
+    key = METRIC_ALIASES.get(metric_key, metric_key)
+    return key if key in ROLLUP_METRICS else None
+
+
+def instance_metric_values(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-instance metric values for a load_projected_instances() frame.
+
+    Mirrors the derived columns Analytics._load_instances() computes (attribute
+    defaults, stress_level, net_wellbeing, net_relief fallback) and the column
+    each history method reads. NaN = no value for that metric.
+
+    Returns:
+        Frame with one float column per ROLLUP_METRICS key, same index as df
+    """
+    defaults = {attr.key: attr.default for attr in TASK_ATTRIBUTES}
+
+    def filled(column: str, default: Any) -> pd.Series:
+        return pd.to_numeric(df[column], errors='coerce').fillna(default).astype('float64')
+
+    relief = filled('relief_score', defaults['relief_score'])
+    mental = filled('mental_energy_needed', defaults['mental_energy_needed'])
+    difficulty = filled('task_difficulty', defaults['task_difficulty'])
+    emotional = filled('emotional_load', defaults['emotional_load'])
+    physical = filled('physical_load', 0.0)
+    expected_aversion = filled('expected_aversion', 0.0)
+    stress = (mental * 0.5 + difficulty * 0.5 + emotional + physical + expected_aversion * 2.0) / 5.0
+    net_wellbeing = relief - stress
+    expected_relief = pd.to_numeric(df['expected_relief'], errors='coerce').astype('float64')
+    net_relief = pd.to_numeric(df['net_relief'], errors='coerce').astype('float64')
+    net_relief = net_relief.fillna(relief - expected_relief)
+    duration = pd.to_numeric(
+        pd.Series([d.get('time_actual_minutes') if isinstance(d, dict) else None for d in df['actual_dict']],
+                  index=df.index, dtype=object),
+        errors='coerce',
+    ).astype('float64')
+
+    return pd.DataFrame({
+        'stress_level': stress,
+        'net_wellbeing': net_wellbeing,
+        'net_wellbeing_normalized': 50.0 + (net_wellbeing / 2.0),
+        'relief_score': relief,
+        'behavioral_score': filled('behavioral_score', defaults['behavioral_score']),
+        'expected_relief': expected_relief,
+        'net_relief': net_relief,
+        'duration': duration,
+        'mental_energy_needed': mental,
+        'task_difficulty': difficulty,
+        'emotional_load': emotional,
+        'environmental_fit': filled('environmental_effect', defaults['environmental_effect']),
+    }, index=df.index)
+
+
+def aggregate_daily(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate a load_projected_instances() frame into rollup rows.
+
+    Returns:
+        Frame with columns date, metric_key, sum, count, min, max (one row per
+        day and metric with at least one value)
+    """
+    columns = ['date', 'metric_key', 'sum', 'count', 'min', 'max']
+    if df.empty or 'completed_at_dt' not in df.columns:
+        return pd.DataFrame(columns=columns)
+    completed_at = pd.to_datetime(df['completed_at_dt'], errors='coerce')
+    df = df[completed_at.notna()]
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+
+    values = instance_metric_values(df)
+    values['date'] = completed_at[completed_at.notna()].dt.date
+    long = values.melt(id_vars='date', var_name='metric_key', value_name='value').dropna(subset=['value'])
+    if long.empty:
+        return pd.DataFrame(columns=columns)
+    daily = long.groupby(['date', 'metric_key'], sort=True)['value'].agg(['sum', 'count', 'min', 'max'])
+    return daily.reset_index()[columns]
+
+
+def _write_rows(session, user_id: int, daily: pd.DataFrame, stamp: datetime) -> None:
+    from .database import DailyMetricRollup
+
+    if daily.empty:
+        return
+    rows = [
+        {
+            'user_id': user_id,
+            'date': day,
+            'metric_key': metric_key,
+            'sum': float(total),
+            'count': int(count),
+            'min': float(low),
+            'max': float(high),
+            'updated_at': stamp,
+        }
+        for day, metric_key, total, count, low, high in daily.itertuples(index=False, name=None)
+    ]
+    session.bulk_insert_mappings(DailyMetricRollup, rows)
+
+
+def refresh_days(session, user_id: int, days: Iterable[date]) -> None:
+    """Re-aggregate the given completion days for a user (caller commits).
+
+    Reads the session's pending state, so call it after the instance change
+    (flushes first). Does not commit; InstanceManager runs it inside its write
+    transaction so the instance and its rollup change together.
+    """
+    from .database import DailyMetricRollup
+    from .instance_projection import load_projected_instances
+
+    days = sorted({d for d in days if d is not None})
+    if user_id is None or not days:
+        return
+    session.flush()
+    start = datetime.combine(days[0], datetime.min.time())
+    end = datetime.combine(days[-1], datetime.min.time()) + timedelta(days=1)
+    df = load_projected_instances(
+        session, user_id, completed_only=True, completed_between=(start, end), write_back=False
+    )
+    daily = aggregate_daily(df)
+    if not daily.empty:
+        daily = daily[daily['date'].isin(days)]
+
+    stamp = datetime.utcnow()
+    session.query(DailyMetricRollup).filter(
+        DailyMetricRollup.user_id == user_id,
+        DailyMetricRollup.date.in_(days),
+    ).delete(synchronize_session=False)
+    _write_rows(session, user_id, daily, stamp)
+
+
+def rebuild_user(session, user_id: int) -> int:
+    """Rebuild a user's whole rollup from task_instances and commit. Returns rows written."""
+    from .database import DailyMetricRollup
+    from .instance_projection import load_projected_instances
+
+    df = load_projected_instances(session, user_id, completed_only=True)
+    daily = aggregate_daily(df)
+    session.query(DailyMetricRollup).filter(
+        DailyMetricRollup.user_id == user_id
+    ).delete(synchronize_session=False)
+    _write_rows(session, user_id, daily, datetime.utcnow())
+    session.commit()
+    return len(daily)
+
+
+def is_fresh(session, user_id: int) -> bool:
+    """True if the user's rollup covers every completed instance and every write to them."""
+    from sqlalchemy import func
+    from .database import DailyMetricRollup, TaskInstance
+
+    instance_count, instance_updated = session.query(
+        func.count(TaskInstance.instance_id), func.max(TaskInstance.updated_at)
+    ).filter(
+        TaskInstance.user_id == user_id,
+        TaskInstance.completed_at.isnot(None),
+    ).one()
+    rollup_count, rollup_updated = session.query(
+        func.sum(DailyMetricRollup.count), func.max(DailyMetricRollup.updated_at)
+    ).filter(
+        DailyMetricRollup.user_id == user_id,
+        DailyMetricRollup.metric_key == COVERAGE_METRIC,
+    ).one()
+    if int(instance_count or 0) != int(rollup_count or 0):
+        return False
+    if instance_updated is not None and (rollup_updated is None or instance_updated > rollup_updated):
+        return False
+    return True
+
+
+def ensure_fresh(session, user_id: int) -> None:
+    """Rebuild the user's rollup if is_fresh() says it missed instances or writes."""
+    if not is_fresh(session, user_id):
+        written = rebuild_user(session, user_id)
+        print(f"[MetricRollup] Rebuilt daily_metric_rollup for user {user_id} ({written} rows)")
+
+
+def load_daily_histories(session, user_id: int, metric_keys: Iterable[str], since: date) -> Dict[str, List[Dict[str, Any]]]:
+    """Read several metrics' daily means for a user in one range query (date >= since, ascending).
+
+    Returns:
+        Dict of metric_key -> list of {'date': date, 'value': float} (empty list if no rows)
+    """
+    from .database import DailyMetricRollup
+
+    metric_keys = list(metric_keys)
+    histories: Dict[str, List[Dict[str, Any]]] = {key: [] for key in metric_keys}
+    if not metric_keys:
+        return histories
+    rows = session.query(
+        DailyMetricRollup.metric_key, DailyMetricRollup.date, DailyMetricRollup.sum, DailyMetricRollup.count
+    ).filter(
+        DailyMetricRollup.user_id == user_id,
+        DailyMetricRollup.metric_key.in_(metric_keys),
+        DailyMetricRollup.date >= since,
+    ).order_by(DailyMetricRollup.metric_key, DailyMetricRollup.date).all()
+    for metric_key, day, total, count in rows:
+        histories[metric_key].append({'date': day, 'value': float(total) / count})
+    return histories
+
+
+def load_daily_history(session, user_id: int, metric_key: str, since: date, aggregation: str = 'mean') -> List[Dict[str, Any]]:
+    """Read one metric's daily values for a user from the rollup (date >= since, ascending).
+
+    Args:
+        aggregation: 'mean' (sum / count) or 'sum'
+
+    Returns:
+        List of {'date': date, 'value': float}
+    """
+    from .database import DailyMetricRollup
+
+    rows = session.query(
+        DailyMetricRollup.date, DailyMetricRollup.sum, DailyMetricRollup.count
+    ).filter(
+        DailyMetricRollup.user_id == user_id,
+        DailyMetricRollup.metric_key == metric_key,
+        DailyMetricRollup.date >= since,
+    ).order_by(DailyMetricRollup.date).all()
+    if aggregation == 'sum':
+        return [{'date': day, 'value': float(total)} for day, total, _ in rows]
+    return [{'date': day, 'value': float(total) / count} for day, total, count in rows]
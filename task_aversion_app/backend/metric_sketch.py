@@ -0,0 +1,241 @@
+"""
+Per-task monthly quantile sketches of instance metrics.
+
+Robust baselines (medians, quartiles) and percentile ranks over a task's history
+used to need every instance of the task loaded. task_metric_sketch stores,
+per (user_id, task_id, metric_key, month), a mergeable KLL sketch of the metric
+(see quantile_sketch); a window query merges the window's monthly rows, so its
+cost depends on the number of months, not of instances. Windows are
+month-aligned: since/until select whole months.
+
+Maintenance follows daily_metric_rollup: InstanceManager calls refresh_months()
+inside the write transaction of any instance, re-sketching the task's months
+the instance touches (its initialized_at / completed_at month before and after
+the write). Re-sketching a month rather than inserting the new value keeps the
+sketch correct on edits and deletes. Writes that change no sketched value
+(start, pause, resume, postpone) only stamp the task's rows (touch_task).
+
+Rows written by code that bypasses InstanceManager (CSV importer, scripts) are
+caught by ensure_fresh(): if the instance counts or the latest updated_at
+disagree with the sketches, the user's sketches are rebuilt. This also serves
+as the lazy backfill for existing databases.
+"""
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .quantile_sketch import QuantileSketch
+from .task_stats import payload_dict, scaled
+
+
+def _expected_aversion(row: Any) -> Optional[float]:
+    return scaled(payload_dict(row, 'predicted').get('expected_aversion'))
+
+
+def _column(name: str) -> Callable[[Any], Optional[float]]:
+    def value(row: Any) -> Optional[float]:
+        raw = getattr(row, name, None)
+        try:
+            return float(raw) if raw is not None else None
+        except (TypeError, ValueError):
+            return None
+    return value
+
+
+# metric_key -> (timestamp column that places an instance in a month, value of an instance row)
+SKETCH_METRICS: Dict[str, Tuple[str, Callable[[Any], Optional[float]]]] = {
+    # 0-100 scale as in the baseline aversions (initialized instances)
+    'expected_aversion': ('initialized_at', _expected_aversion),
+    'relief_score': ('completed_at', _column('relief_score')),
+    'duration_minutes': ('completed_at', _column('duration_minutes')),
+}
+
+# Metric whose instance counts cover each timestamp column (see is_fresh)
+_COVERAGE_METRICS = {'initialized_at': 'expected_aversion', 'completed_at': 'relief_score'}
+
+_INSTANCE_COLUMNS = (
+    'task_id', 'predicted', 'relief_score', 'duration_minutes', 'initialized_at', 'completed_at', 'updated_at',
+)
+
+
+def month_of(value: Any) -> Optional[date]:
+    """First day of the month of a datetime/date (None for anything else)."""
+    if isinstance(value, (datetime, date)):
+        return date(value.year, value.month, 1)
+    return None
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+
+
+def sketch_rows(instances: List[Any]) -> List[Dict[str, Any]]:
+    """task_metric_sketch values (metric_key, month, instance_count, sketch) for one task's instances."""
+    groups: Dict[Tuple[str, date], List[Optional[float]]] = {}
+    for metric_key, (time_column, value) in SKETCH_METRICS.items():
+        for row in instances:
+            month = month_of(getattr(row, time_column, None))
+            if month is not None:
+                groups.setdefault((metric_key, month), []).append(value(row))
+    return [
+        {
+            'metric_key': metric_key,
+            'month': month,
+            'instance_count': len(values),
+            'sketch': QuantileSketch.from_values(v for v in values if v is not None).to_dict(),
+        }
+        for (metric_key, month), values in sorted(groups.items())
+    ]
+
+
+def _instance_rows(session, user_id: int, task_id: Optional[str] = None, months: Optional[List[date]] = None):
+    from sqlalchemy import and_, or_
+    from .database import TaskInstance
+
+    query = session.query(*[getattr(TaskInstance, c) for c in _INSTANCE_COLUMNS]).filter(
+        TaskInstance.user_id == user_id,
+        TaskInstance.task_id.isnot(None),
+    )
+    if task_id is not None:
+        query = query.filter(TaskInstance.task_id == task_id)
+    if months:
+        start = datetime.combine(months[0], datetime.min.time())
+        end = datetime.combine(_next_month(months[-1]), datetime.min.time())
+        query = query.filter(or_(
+            and_(TaskInstance.initialized_at >= start, TaskInstance.initialized_at < end),
+            and_(TaskInstance.completed_at >= start, TaskInstance.completed_at < end),
+        ))
+    return query.all()
+
+
+def _write_rows(session, user_id: int, task_id: str, rows: List[Dict[str, Any]], stamp: datetime) -> None:
+    from .database import TaskMetricSketch
+
+    if rows:
+        session.bulk_insert_mappings(TaskMetricSketch, [
+            {'user_id': user_id, 'task_id': task_id, 'updated_at': stamp, **row} for row in rows
+        ])
+
+
+def refresh_months(session, user_id: int, task_id: str, months: Iterable[date]) -> None:
+    """Re-sketch the given months of a user's task (caller commits).
+
+    Reads the session's pending state, so call it after the instance change
+    (flushes first). Does not commit; InstanceManager runs it inside its write
+    transaction so the instance and its sketches change together.
+    """
+    from .database import TaskMetricSketch
+
+    months = sorted({m for m in months if m is not None})
+    if user_id is None or not task_id or not months:
+        return
+    session.flush()
+    rows = [
+        row for row in sketch_rows(_instance_rows(session, user_id, task_id, months))
+        if row['month'] in months
+    ]
+    session.query(TaskMetricSketch).filter(
+        TaskMetricSketch.user_id == user_id,
+        TaskMetricSketch.task_id == task_id,
+        TaskMetricSketch.month.in_(months),
+    ).delete(synchronize_session=False)
+    _write_rows(session, user_id, task_id, rows, datetime.utcnow())
+
+
+def touch_task(session, user_id: int, task_id: str, updated_at: Optional[datetime]) -> bool:
+    """Record a write that changes no sketched value of a task (caller commits).
+
+    Stamps the task's sketch rows with the instance's new updated_at so
+    is_fresh() stays true, without re-sketching (cf. task_stats.touch_task).
+
+    Returns:
+        False if the task has no sketch rows yet (the caller then uses refresh_months)
+    """
+    from .database import TaskMetricSketch
+
+    rows = session.query(TaskMetricSketch).filter(
+        TaskMetricSketch.user_id == user_id, TaskMetricSketch.task_id == task_id
+    )
+    if updated_at is None:
+        return rows.first() is not None
+    return rows.update({TaskMetricSketch.updated_at: updated_at}, synchronize_session=False) > 0
+
+
+def rebuild_user(session, user_id: int) -> int:
+    """Rebuild all of a user's sketches from task_instances and commit. Returns rows written."""
+    from .database import TaskMetricSketch
+
+    groups: Dict[str, List[Any]] = {}
+    for row in _instance_rows(session, user_id):
+        groups.setdefault(row.task_id, []).append(row)
+    session.query(TaskMetricSketch).filter(TaskMetricSketch.user_id == user_id).delete(synchronize_session=False)
+    stamp = datetime.utcnow()
+    written = 0
+    for task_id, instances in groups.items():
+        rows = sketch_rows(instances)
+        _write_rows(session, user_id, task_id, rows, stamp)
+        written += len(rows)
+    session.commit()
+    return written
+
+
+def is_fresh(session, user_id: int) -> bool:
+    """True if the user's sketches cover every dated instance and every write to them."""
+    from sqlalchemy import func, or_
+    from .database import TaskInstance, TaskMetricSketch
+
+    base = session.query(TaskInstance).filter(TaskInstance.user_id == user_id, TaskInstance.task_id.isnot(None))
+    for time_column, metric_key in _COVERAGE_METRICS.items():
+        instance_count = base.filter(getattr(TaskInstance, time_column).isnot(None)).count()
+        sketch_count = session.query(func.sum(TaskMetricSketch.instance_count)).filter(
+            TaskMetricSketch.user_id == user_id,
+            TaskMetricSketch.metric_key == metric_key,
+        ).scalar()
+        if int(instance_count or 0) != int(sketch_count or 0):
+            return False
+    instance_updated = session.query(func.max(TaskInstance.updated_at)).filter(
+        TaskInstance.user_id == user_id,
+        TaskInstance.task_id.isnot(None),
+        or_(TaskInstance.initialized_at.isnot(None), TaskInstance.completed_at.isnot(None)),
+    ).scalar()
+    sketch_updated = session.query(func.max(TaskMetricSketch.updated_at)).filter(
+        TaskMetricSketch.user_id == user_id,
+    ).scalar()
+    if instance_updated is not None and (sketch_updated is None or instance_updated > sketch_updated):
+        return False
+    return True
+
+
+def ensure_fresh(session, user_id: int) -> None:
+    """Rebuild the user's sketches if is_fresh() says they missed instances or writes."""
+    if not is_fresh(session, user_id):
+        written = rebuild_user(session, user_id)
+        print(f"[MetricSketch] Rebuilt task_metric_sketch for user {user_id} ({written} rows)")
+
+
+def load_sketches(session, user_id: int, task_ids: Iterable[str], metric_key: str,
+                  since: Optional[date] = None, until: Optional[date] = None) -> Dict[str, QuantileSketch]:
+    """Merge each task's monthly sketches of metric_key over a window in one query.
+
+    since/until select the months containing them (inclusive); None = unbounded.
+
+    Returns:
+        Dict of task_id -> merged QuantileSketch (empty sketch for tasks without rows)
+    """
+    from .database import TaskMetricSketch
+
+    task_ids = list(dict.fromkeys(task_ids))
+    sketches = {task_id: QuantileSketch() for task_id in task_ids}
+    if not task_ids:
+        return sketches
+    query = session.query(TaskMetricSketch.task_id, TaskMetricSketch.sketch).filter(
+        TaskMetricSketch.user_id == user_id,
+        TaskMetricSketch.task_id.in_(task_ids),
+        TaskMetricSketch.metric_key == metric_key,
+    )
+    if since is not None:
+        query = query.filter(TaskMetricSketch.month >= month_of(since))
+    if until is not None:
+        query = query.filter(TaskMetricSketch.month <= month_of(until))
+    for task_id, data in query.order_by(TaskMetricSketch.month).all():
+        sketches[task_id].merge(QuantileSketch.from_dict(data))
+    return sketches
@@ -121,6 +121,11 @@ def get_migration_status() -> MigrationStatus:
             if not _check_column_exists(inspector, "task_instances", col):
                 failures.append(f"task_instances.{col} missing")
                 break
+        # Migration 019: every write and staleness check (projection, rollup, task_stats, ledger) uses it
+        if not _check_column_exists(inspector, "task_instances", "updated_at"):
+            failures.append("task_instances.updated_at missing (migration 019)")
+        if not _check_column_exists(inspector, "task_instances", "execution_score_version"):
+            failures.append("task_instances.execution_score_version missing (migration 025)")
         if is_postgres:
             required_indexes = [
                 "idx_task_instances_task_status",
@@ -141,6 +146,8 @@ def get_migration_status() -> MigrationStatus:
             if not _check_column_exists(inspector, "user_preferences", col):
                 failures.append(f"user_preferences.{col} missing (migration 016)")
                 break
+        if not _check_column_exists(inspector, "user_preferences", "extra_preferences"):
+            failures.append("user_preferences.extra_preferences missing (migration 023)")
 
     # User ID on main tables (010)
     for table in ("tasks", "task_instances", "survey_responses", "popup_triggers"):
@@ -4,6 +4,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+from backend.csv_journal import get_csv_journal
+
 
 DATA_DIR = os.path.join(Path(__file__).resolve().parent.parent, "data")
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -69,6 +71,8 @@ class NotesManager:
         """Initialize CSV backend."""
         os.makedirs(DATA_DIR, exist_ok=True)
         self._ensure_file()
+        self._journal = get_csv_journal(self.file, ["note_id"])
+        self._csv_base = None
         self._reload_csv()
 
     def _ensure_file(self):
@@ -82,7 +86,8 @@ class NotesManager:
         """CSV-specific reload."""
         self._ensure_file()
         try:
-            self.df = pd.read_csv(self.file, dtype=str).fillna("")
+            self._csv_base = self._journal.read()
+            self.df = self._csv_base.copy()
         except Exception:
             self.df = pd.DataFrame(
                 columns=[
@@ -93,8 +98,8 @@ class NotesManager:
             )
 
     def _save_csv(self):
-        """CSV-specific save."""
-        self.df.to_csv(self.file, index=False)
+        """CSV-specific save: appends the changed rows to the journal."""
+        self._csv_base = self._journal.write(self._csv_base, self.df)
         self._reload_csv()
 
     def _next_id(self) -> str:
@@ -8,6 +8,7 @@ from typing import Optional, Dict, Any
 from sqlalchemy.exc import OperationalError, IntegrityError
 
 from backend.database import get_session, PopupTrigger, PopupResponse
+from backend.request_context import POPUPS, discard as discard_request_data, memo as request_memo
 
 
 class PopupStateManager:
@@ -52,7 +53,10 @@ class PopupStateManager:
             trigger = query.first()
             return trigger.to_dict() if trigger else None
         
-        return self._safe_db_operation(op, fallback_value=None)
+        # Memoized per page render (see backend/request_context); writes below discard it
+        state = request_memo(POPUPS, user_id, ('trigger', trigger_id, task_id),
+                             lambda: self._safe_db_operation(op, fallback_value=None))
+        return dict(state) if state else None
     
     def increment_trigger_count(self, trigger_id: str, user_id: str = 'default', task_id: Optional[str] = None) -> int:
         """Increment trigger count and update last_shown_at. Returns new count."""
@@ -87,7 +91,9 @@ class PopupStateManager:
             
             return count
         
-        return self._safe_db_operation(op, fallback_value=0)
+        count = self._safe_db_operation(op, fallback_value=0)
+        discard_request_data(POPUPS, user_id)
+        return count
     
     def update_trigger_feedback(self, trigger_id: str, helpful: Optional[bool] = None, 
                                 response: Optional[str] = None, comment: Optional[str] = None,
@@ -114,6 +120,7 @@ class PopupStateManager:
                 trigger.updated_at = datetime.utcnow()
         
         self._safe_db_operation(op)
+        discard_request_data(POPUPS, user_id)
     
     def check_cooldown(self, trigger_id: str, cooldown_hours: int = 24, 
                       user_id: str = 'default', task_id: Optional[str] = None) -> bool:
@@ -150,7 +157,8 @@ class PopupStateManager:
             
             return count
         
-        return self._safe_db_operation(op, fallback_value=0)
+        return request_memo(POPUPS, user_id, ('daily_count', date.date()),
+                            lambda: self._safe_db_operation(op, fallback_value=0))
     
     def log_popup_response(self, trigger_id: str, response_value: Optional[str] = None,
                            helpful: Optional[bool] = None, comment: Optional[str] = None,
@@ -172,6 +180,7 @@ class PopupStateManager:
             session.add(response)
         
         self._safe_db_operation(op)
+        discard_request_data(POPUPS, user_id)
     
     def get_trigger_tier(self, trigger_id: str, user_id: str = 'default', task_id: Optional[str] = None) -> int:
         """
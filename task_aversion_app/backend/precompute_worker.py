@@ -0,0 +1,248 @@
+# backend/precompute_worker.py
+"""
+Background precompute of the dashboard / analytics payloads.
+
+The dashboard and /analytics used to compute their heavy payloads
+(get_analytics_page_data: dashboard metrics, relief summary, time tracking,
+composite components; get_chart_data; get_rankings_data) inside the request
+that first needed them. PrecomputeWorker computes them per user in background
+threads instead:
+
+- after a write: the worker listens to cache_registry invalidations and
+  schedules the user's recompute after DEBOUNCE seconds, so a burst of writes
+  (complete task, notes, edits) costs one recompute
+- on login (auth.create_session)
+
+Results are stored with their compute time. Every invalidation bumps the
+user's generation, so a snapshot computed before a write (or by a compute that
+was running while the write happened) is never returned; get() then returns
+None and the page computes synchronously, as before.
+
+Concurrency is bounded by a ThreadPoolExecutor (PRECOMPUTE_WORKERS, default 1)
+and at most one compute per user runs at a time. Set PRECOMPUTE_ENABLED=0 to
+disable the worker.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.cache_registry import cache_registry
+
+
+def _analytics_page_data(analytics, user_id: int):
+    # Heaviest payload: computed in the analytics process pool (backend/analytics_pool.py)
+    from backend.analytics_pool import run_analytics_sync
+    return run_analytics_sync('get_analytics_page_data', days=7, user_id=user_id)
+
+
+# Payload name -> fn(analytics, user_id). Arguments match what the pages request.
+PAYLOADS: Dict[str, Callable[[Any, int], Any]] = {
+    'analytics_page_data': _analytics_page_data,
+    'chart_data': lambda analytics, user_id: analytics.get_chart_data(user_id=user_id),
+    'rankings_data': lambda analytics, user_id: analytics.get_rankings_data(top_n=5, leaderboard_n=10, user_id=user_id),
+}
+
+
+class PrecomputeWorker:
+    """
+    Recomputes per-user page payloads in background threads.
+
+    Pages read results with get(user_id, name); schedule(user_id) queues a
+    (debounced) recompute.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        debounce_seconds: Optional[float] = None,
+        payloads: Optional[Dict[str, Callable[[Any, int], Any]]] = None,
+        analytics_factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.max_workers = max_workers or int(os.getenv('PRECOMPUTE_WORKERS', '1'))
+        if debounce_seconds is None:
+            debounce_seconds = float(os.getenv('PRECOMPUTE_DEBOUNCE_SECONDS', '2.0'))
+        self.debounce_seconds = debounce_seconds
+        self.payloads = payloads if payloads is not None else PAYLOADS
+        self._analytics_factory = analytics_factory
+        self._analytics = None
+        self._lock = threading.Lock()
+        # str(user_id) -> payload name -> (value, computed_at, generation)
+        self._results: Dict[str, Dict[str, Tuple[Any, datetime, int]]] = {}
+        self._generations: Dict[str, int] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._in_progress = set()
+        self._rerun = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.running = False
+
+    def start(self):
+        """Start the thread pool and listen for cache invalidations."""
+        if self.running:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='precompute')
+        cache_registry.add_listener(self._on_invalidate)
+        self.running = True
+        print(f"[PrecomputeWorker] Started precompute worker ({self.max_workers} thread(s))")
+
+    def stop(self):
+        """Stop listening, cancel pending recomputes and shut down the pool."""
+        if not self.running:
+            return
+        self.running = False
+        cache_registry.remove_listener(self._on_invalidate)
+        with self._lock:
+            timers = list(self._timers.values())
+            self._timers.clear()
+        for timer in timers:
+            timer.cancel()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        print("[PrecomputeWorker] Stopped precompute worker")
+
+    def schedule(self, user_id: Optional[int], delay: Optional[float] = None):
+        """Queue a recompute of the user's payloads after delay seconds (debounced).
+
+        A later schedule() for the same user restarts the delay. No-op when the
+        worker is not running or user_id is None.
+        """
+        if not self.running or user_id is None:
+            return
+        key = str(user_id)
+        delay = self.debounce_seconds if delay is None else delay
+        timer = threading.Timer(delay, self._submit, args=(key,))
+        timer.daemon = True
+        with self._lock:
+            previous = self._timers.pop(key, None)
+            self._timers[key] = timer
+        if previous is not None:
+            previous.cancel()
+        timer.start()
+
+    def invalidate(self, user_id: Optional[int] = None):
+        """Mark the user's stored payloads (all users when None) as outdated."""
+        with self._lock:
+            keys = self._known_users() if user_id is None else [str(user_id)]
+            for key in keys:
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def get(self, user_id: Optional[int], name: str) -> Optional[Tuple[Any, datetime]]:
+        """Return (payload, computed_at) if a current payload exists, else None."""
+        if user_id is None:
+            return None
+        key = str(user_id)
+        with self._lock:
+            entry = self._results.get(key, {}).get(name)
+            if entry is None or entry[2] != self._generations.get(key, 0):
+                return None
+            return entry[0], entry[1]
+
+    def _on_invalidate(self, input_name: str, user_id: Optional[int]):
+        self.invalidate(user_id)
+        if user_id is not None:
+            self.schedule(user_id)
+            return
+        with self._lock:
+            keys = self._known_users()
+        for key in keys:
+            self.schedule(key)
+
+    def _known_users(self):
+        # Caller holds self._lock
+        return list(set(self._results) | self._in_progress | set(self._timers))
+
+    def _get_analytics(self):
+        if self._analytics is None:
+            if self._analytics_factory is not None:
+                self._analytics = self._analytics_factory()
+            else:
+                from backend.analytics import Analytics
+                self._analytics = Analytics()
+        return self._analytics
+
+    def _submit(self, key: str):
+        with self._lock:
+            self._timers.pop(key, None)
+            if not self.running or self._executor is None:
+                return
+            if key in self._in_progress:
+                # Recompute once the running one finishes (it may have read pre-write data)
+                self._rerun.add(key)
+                return
+            self._in_progress.add(key)
+            executor = self._executor
+        try:
+            executor.submit(self._compute, key)
+        except RuntimeError:
+            # Pool shut down between the check and submit
+            with self._lock:
+                self._in_progress.discard(key)
+
+    def _compute(self, key: str):
+        try:
+            with self._lock:
+                generation = self._generations.get(key, 0)
+            analytics = self._get_analytics()
+            user_id = int(key)
+            for name, compute in self.payloads.items():
+                with self._lock:
+                    if self._generations.get(key, 0) != generation:
+                        break
+                try:
+                    value = compute(analytics, user_id)
+                except Exception as e:
+                    print(f"[PrecomputeWorker] Error computing {name} for user {key}: {e}")
+                    continue
+                with self._lock:
+                    if self._generations.get(key, 0) == generation:
+                        self._results.setdefault(key, {})[name] = (value, datetime.now(), generation)
+        except Exception as e:
+            print(f"[PrecomputeWorker] Error precomputing payloads for user {key}: {e}")
+        finally:
+            with self._lock:
+                self._in_progress.discard(key)
+                rerun = key in self._rerun
+                self._rerun.discard(key)
+            if rerun:
+                self.schedule(key)
+
+
+# Global worker instance
+_worker_instance: Optional[PrecomputeWorker] = None
+
+
+def get_precompute_worker() -> PrecomputeWorker:
+    """Get or create the global precompute worker."""
+    global _worker_instance
+    if _worker_instance is None:
+        _worker_instance = PrecomputeWorker()
+    return _worker_instance
+
+
+def start_precompute_worker():
+    """Start the global precompute worker (unless PRECOMPUTE_ENABLED=0)."""
+    if os.getenv('PRECOMPUTE_ENABLED', '1').lower() not in ('1', 'true', 'yes'):
+        print("[PrecomputeWorker] Disabled (PRECOMPUTE_ENABLED=0)")
+        return
+    get_precompute_worker().start()
+
+
+def stop_precompute_worker():
+    """Stop the global precompute worker."""
+    if _worker_instance:
+        _worker_instance.stop()
+
+
+def get_precomputed(user_id: Optional[int], name: str) -> Optional[Tuple[Any, datetime]]:
+    """Current (payload, computed_at) for a user from the global worker, or None."""
+    if _worker_instance is None:
+        return None
+    return _worker_instance.get(user_id, name)
+
+
+def schedule_precompute(user_id: Optional[int], delay: Optional[float] = None):
+    """Queue a recompute of the user's payloads on the global worker (no-op if not running)."""
+    if _worker_instance is not None:
+        _worker_instance.schedule(user_id, delay)
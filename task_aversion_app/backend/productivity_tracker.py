@@ -120,7 +120,7 @@ class ProductivityTracker:
             }
         
         # Filter by date range and productive task types
-        instances_df['completed_at_dt'] = pd.to_datetime(instances_df['completed_at'], errors='coerce')
+        instances_df['completed_at_dt'] = self._completed_at_datetimes(instances_df)
         instances_df['completed_date'] = instances_df['completed_at_dt'].dt.date
         
         range_instances = instances_df[
@@ -280,6 +280,13 @@ class ProductivityTracker:
             'on_pace': on_pace
         }
     
+    @staticmethod
+    def _completed_at_datetimes(instances_df: pd.DataFrame) -> pd.Series:
+        """completed_at as datetimes, reusing the column pre-parsed by the CSV path when present."""
+        if 'completed_at_dt' in instances_df.columns:
+            return instances_df['completed_at_dt']
+        return pd.to_datetime(instances_df['completed_at'], errors='coerce')
+
     def _get_completed_instances(self, user_id: str) -> pd.DataFrame:
         """Get all completed task instances as DataFrame.
         
@@ -381,6 +388,11 @@ class ProductivityTracker:
                 (self.instance_manager.df['status'] == 'completed') &
                 (self.instance_manager.df['completed_at'].notna())
             ].copy()
+            # completed_at parsed once per table version and shared with other CSV readers
+            completed_at_dt = self.instance_manager._journal.parsed(
+                'completed_at', frame=self.instance_manager._csv_base
+            )
+            completed['completed_at_dt'] = completed_at_dt.loc[completed.index]
             
             # CRITICAL: Filter by user_id for data isolation
             if user_id_int is not None and 'user_id' in completed.columns:
@@ -412,7 +424,7 @@ class ProductivityTracker:
         if instances_df.empty:
             return None
         
-        instances_df['completed_at_dt'] = pd.to_datetime(instances_df['completed_at'], errors='coerce')
+        instances_df['completed_at_dt'] = self._completed_at_datetimes(instances_df)
         instances_df = instances_df[instances_df['completed_at_dt'].notna()]
         
         if instances_df.empty:
@@ -645,7 +657,7 @@ class ProductivityTracker:
             }
         
         # Parse dates
-        productive_instances['completed_at_dt'] = pd.to_datetime(productive_instances['completed_at'], errors='coerce')
+        productive_instances['completed_at_dt'] = self._completed_at_datetimes(productive_instances)
         productive_instances = productive_instances[productive_instances['completed_at_dt'].notna()]
         productive_instances['completed_date'] = productive_instances['completed_at_dt'].dt.date
         
@@ -774,7 +786,7 @@ class ProductivityTracker:
             productivity_points = 0.0
         else:
             # Parse dates
-            instances_df['completed_at_dt'] = pd.to_datetime(instances_df['completed_at'], errors='coerce')
+            instances_df['completed_at_dt'] = self._completed_at_datetimes(instances_df)
             instances_df = instances_df[instances_df['completed_at_dt'].notna()]
             instances_df['completed_date'] = instances_df['completed_at_dt'].dt.date
             
@@ -905,7 +917,7 @@ class ProductivityTracker:
             return []
         
         # Filter by date range
-        instances_df['completed_at_dt'] = pd.to_datetime(instances_df['completed_at'], errors='coerce')
+        instances_df['completed_at_dt'] = self._completed_at_datetimes(instances_df)
         instances_df = instances_df[instances_df['completed_at_dt'].notna()]
         instances_df['completed_date'] = instances_df['completed_at_dt'].dt.date
         
@@ -0,0 +1,139 @@
+"""
+Mergeable quantile sketch (KLL).
+
+A sketch answers quantile and rank queries over a stream of floats in bounded
+space. Values enter level 0; when the sketch is full, the first over-capacity
+level is sorted and every other item is promoted to the next level with twice
+the weight. Two sketches merge by concatenating their levels and compacting, so
+per-period sketches (see metric_sketch) combine into any window.
+
+While no level has been compacted (fewer than ~k values in total) the sketch
+holds every value and quantile() matches numpy.percentile exactly. Beyond that
+the rank error is about 1.7 / k (k=200: under 1% of the count).
+Serializes to a JSON-friendly dict (to_dict / from_dict).
+"""
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_K = 200
+
+
+class QuantileSketch:
+    """KLL quantile sketch over floats (deterministic alternating compaction)."""
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.k = k
+        self.n = 0
+        self.levels: List[List[float]] = [[]]
+        self._flips: List[int] = [0]  # per-level compaction parity
+
+    @classmethod
+    def from_values(cls, values: Iterable[float], k: int = DEFAULT_K) -> 'QuantileSketch':
+        sketch = cls(k)
+        for value in values:
+            sketch.update(value)
+        return sketch
+
+    # -----------------------------
+    # Building
+    # -----------------------------
+    def update(self, value: float) -> None:
+        value = float(value)
+        if math.isnan(value):
+            return
+        self.levels[0].append(value)
+        self.n += 1
+        if self._size() > self._max_size():
+            self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Fold other into this sketch (in place) and return self."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+            self._flips.append(0)
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.n += other.n
+        while self._size() > self._max_size():
+            self._compress()
+        return self
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - 1 - h
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _size(self) -> int:
+        return sum(len(items) for items in self.levels)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _compress(self) -> None:
+        for h in range(len(self.levels)):
+            if len(self.levels[h]) >= self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                    self._flips.append(0)
+                items = sorted(self.levels[h])
+                # An odd item out stays at this level so total weight is preserved
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = self._flips[h]
+                self._flips[h] ^= 1
+                self.levels[h + 1].extend(items[offset::2])
+                self.levels[h] = keep
+                return
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    @property
+    def exact(self) -> bool:
+        """True while the sketch still holds every value (no compaction yet)."""
+        return all(not items for items in self.levels[1:])
+
+    def _weighted(self):
+        pairs = sorted((value, 1 << h) for h, items in enumerate(self.levels) for value in items)
+        values = np.array([v for v, _ in pairs], dtype=float)
+        cumulative = np.cumsum([w for _, w in pairs], dtype=float)
+        return values, cumulative
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q (0-1); None if the sketch is empty."""
+        if self.n == 0:
+            return None
+        if self.exact:
+            return float(np.percentile(self.levels[0], q * 100))
+        values, cumulative = self._weighted()
+        index = int(np.searchsorted(cumulative, q * cumulative[-1], side='left'))
+        return float(values[min(index, len(values) - 1)])
+
+    def quantiles(self, qs: Iterable[float]) -> Dict[float, Optional[float]]:
+        return {q: self.quantile(q) for q in qs}
+
+    def rank(self, value: float) -> Optional[float]:
+        """Fraction of values <= value (0-1); None if the sketch is empty."""
+        if self.n == 0:
+            return None
+        values, cumulative = self._weighted()
+        index = int(np.searchsorted(values, float(value), side='right'))
+        return float(cumulative[index - 1] / cumulative[-1]) if index else 0.0
+
+    # -----------------------------
+    # Serialization
+    # -----------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        return {'k': self.k, 'n': self.n, 'levels': self.levels, 'flips': self._flips}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'QuantileSketch':
+        data = data or {}
+        sketch = cls(int(data.get('k', DEFAULT_K)))
+        sketch.n = int(data.get('n', 0))
+        sketch.levels = [list(map(float, items)) for items in data.get('levels') or [[]]]
+        sketch._flips = list(data.get('flips') or [0] * len(sketch.levels))
+        return sketch
+
+    def __repr__(self):
+        return f"<QuantileSketch(n={self.n}, k={self.k}, items={self._size()})>"
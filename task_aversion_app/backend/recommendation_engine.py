@@ -0,0 +1,184 @@
+"""
+Vectorized scoring for Analytics recommendations.
+
+Recommendations rank candidates (task templates or active instances) by a
+user-selected set of metrics. Candidates are held as a frame with one float
+column per metric; a ranking is one weighted matrix product over the selected
+columns and an argpartition for the top k, so re-ranking on every search
+keystroke or filter change does not touch the instance history.
+
+The per-task history features (mean relief, loads, duration, stress,
+behavioral score, efficiency) come from one groupby over completed instances
+(task_feature_matrix) and are cached by Analytics per user until the user's
+instances change.
+
+CandidatePool holds the filtered candidates of one (mode, filters) with each
+metric's contribution column and single-metric order computed once; Analytics
+caches pools and ranked results per user, so toggling metrics or modes only
+re-merges stored columns.
+
+Scoring rule (unchanged): each metric adds its value; metrics in LOW_IS_GOOD
+add max(0, 100 - value). Missing or non-numeric values count as 0.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Metrics that are better when low
+LOW_IS_GOOD = frozenset({
+    'cognitive_load',
+    'emotional_load',
+    'net_load',
+    'duration_minutes',
+    'stress_level',
+    'physical_load',
+})
+
+# Per-task means over completed instances (instance column -> feature column)
+TASK_FEATURES = {
+    'relief_score': 'avg_relief',
+    'cognitive_load': 'avg_cognitive_load',
+    'emotional_load': 'avg_emotional_load',
+    'duration_minutes': 'avg_duration',
+    'stress_level': 'avg_stress_level',
+    'behavioral_score': 'avg_behavioral_score',
+    'net_wellbeing_normalized': 'avg_net_wellbeing',
+    'physical_load': 'avg_physical_load',
+}
+
+
+def task_feature_matrix(completed: pd.DataFrame, efficiency: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Task x feature frame from completed instances, in one groupby.
+
+    Args:
+        completed: Completed instances (task_id plus any TASK_FEATURES columns)
+        efficiency: Optional per-row efficiency scores aligned with completed; only
+            scores > 0 count towards historical_efficiency
+
+    Returns:
+        Frame indexed by task_id with the TASK_FEATURES means (NaN = no values),
+        count, and historical_efficiency (rounded mean, NaN if none)
+    """
+    columns = list(TASK_FEATURES.values()) + ['count', 'historical_efficiency']
+    if completed is None or completed.empty or 'task_id' not in completed.columns:
+        return pd.DataFrame(columns=columns, dtype='float64')
+    values = pd.DataFrame({
+        feature: pd.to_numeric(completed[column], errors='coerce') if column in completed.columns else np.nan
+        for column, feature in TASK_FEATURES.items()
+    }, index=completed.index).astype('float64')
+    if efficiency is not None:
+        values['historical_efficiency'] = np.where(np.asarray(efficiency, dtype=float) > 0, efficiency, np.nan)
+    else:
+        values['historical_efficiency'] = np.nan
+    grouped = values.groupby(completed['task_id'], sort=False)
+    features = grouped.mean()
+    features['count'] = grouped.size()
+    features['historical_efficiency'] = features['historical_efficiency'].round(2)
+    return features[columns]
+
+
+def metric_matrix(candidates: pd.DataFrame, metrics: List[str]) -> np.ndarray:
+    """Per-metric score contributions, shape (candidates, metrics)."""
+    matrix = np.column_stack([
+        pd.to_numeric(candidates[metric], errors='coerce').to_numpy(dtype=float)
+        if metric in candidates.columns else np.zeros(len(candidates))
+        for metric in metrics
+    ]) if metrics else np.zeros((len(candidates), 0))
+    matrix = np.nan_to_num(matrix, nan=0.0)
+    low = np.array([metric in LOW_IS_GOOD for metric in metrics], dtype=bool)
+    if low.any():
+        matrix[:, low] = np.maximum(0.0, 100.0 - matrix[:, low])
+    return matrix
+
+
+def score_candidates(candidates: pd.DataFrame, metrics: List[str],
+                     weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Weighted score per candidate: metric_matrix(...) @ weights (weight 1.0 unless given)."""
+    weights = weights or {}
+    vector = np.array([float(weights.get(metric, 1.0)) for metric in metrics], dtype=float)
+    return metric_matrix(candidates, metrics) @ vector
+
+
+def normalized_scores(scores: np.ndarray, metrics: List[str]) -> np.ndarray:
+    """Scores as 0-100 of the maximum possible (100 per metric), clamped."""
+    max_possible_score = max(len(metrics), 1) * 100.0
+    return np.clip(scores / max_possible_score * 100.0, 0.0, 100.0)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first (ties keep candidate order)."""
+    n = len(scores)
+    if n == 0 or k <= 0:
+        return np.array([], dtype=int)
+    # NaN scores rank last
+    keys = np.where(np.isnan(scores), -np.inf, scores)
+    if k < n:
+        # Include every candidate tied with the k-th best so the tie-break is deterministic
+        kth = np.partition(keys, n - k)[n - k]
+        positions = np.flatnonzero(keys >= kth)
+    else:
+        positions = np.arange(n)
+    order = np.lexsort((positions, -keys[positions]))
+    return positions[order][:k]
+
+
+class CandidatePool:
+    """Candidates of one (mode, filters) with each metric's contribution computed once.
+
+    The first ranking by a metric stores its contribution column and the full
+    single-metric order (best first); a single-metric request is a slice of
+    that order. Multi-metric requests merge the stored columns with their
+    weights and take the top k, so changing the metric selection never
+    rebuilds the candidates.
+    """
+
+    def __init__(self, candidates: pd.DataFrame):
+        self.candidates = candidates.reset_index(drop=True)
+        self._contributions: Dict[str, np.ndarray] = {}
+        self._orders: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def contribution(self, metric: str) -> np.ndarray:
+        """Score contribution of one metric per candidate (unweighted)."""
+        column = self._contributions.get(metric)
+        if column is None:
+            column = metric_matrix(self.candidates, [metric])[:, 0]
+            self._contributions[metric] = column
+        return column
+
+    def order(self, metric: str) -> np.ndarray:
+        """Candidate positions by one metric's contribution, best first (ties keep candidate order)."""
+        positions = self._orders.get(metric)
+        if positions is None:
+            positions = np.argsort(-self.contribution(metric), kind='stable')
+            self._orders[metric] = positions
+        return positions
+
+    def rank(self, metrics: Iterable[str], limit: int,
+             weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """Top `limit` candidates by weighted score, with 'score' and 'score_normalized' columns."""
+        metrics = list(metrics)
+        weights = weights or {}
+        vector = [float(weights.get(metric, 1.0)) for metric in metrics]
+        if len(metrics) == 1 and vector[0] > 0:
+            best = self.order(metrics[0])[:max(limit, 0)]
+            scores = vector[0] * self.contribution(metrics[0])[best]
+        else:
+            total = np.zeros(len(self.candidates))
+            for metric, weight in zip(metrics, vector):
+                total += weight * self.contribution(metric)
+            best = top_k(total, limit)
+            scores = total[best]
+        top = self.candidates.iloc[best].copy()
+        top['score'] = scores
+        top['score_normalized'] = normalized_scores(scores, metrics)
+        return top
+
+
+def rank(candidates: pd.DataFrame, metrics: Iterable[str], limit: int,
+         weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """Top `limit` candidates by weighted score, with 'score' and 'score_normalized' columns."""
+    return CandidatePool(candidates).rank(metrics, limit, weights)
@@ -29,7 +29,8 @@ logger.setLevel(logging.INFO)
 if not logger.handlers:
     handler = logging.FileHandler(
         os.path.join(LOG_DIR, f'recommendation_debug_{datetime.now().strftime("%Y%m%d")}.log'),
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True,  # Create the file on the first record, not at import
     )
     formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
     handler.setFormatter(formatter)
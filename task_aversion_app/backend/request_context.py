@@ -0,0 +1,134 @@
+"""
+Request-scoped data context: load shared inputs once per page render.
+
+One dashboard or /analytics render calls many backend methods that each load
+the same inputs (TaskManager.get_all, Analytics._load_instances, popup trigger
+state, ...). Inside request_data_context() those loads are memoized in a
+RequestDataContext held in a ContextVar, so every call made by the render -
+including tasks it starts, which copy the context - reuses one snapshot
+without the data being passed around. Outside a context, memo() just calls
+the loader.
+
+Entries are grouped by input and user. Writes drop the affected group in every
+live context: TASKS / INSTANCES / GAP_PREFERENCE through a cache_registry
+listener, popup state through discard(POPUPS, user_id). A render therefore
+sees its own writes.
+
+Preferences are not memoized here: UserStateManager already serves them from
+its process-wide cache.
+"""
+import threading
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from backend.cache_registry import cache_registry, GAP_PREFERENCE, INSTANCES, TASKS
+
+# Popup trigger state and daily popup counts (written by PopupStateManager)
+POPUPS = 'popups'
+
+# cache_registry input -> memo groups derived from it
+_GROUPS_BY_INPUT = {
+    TASKS: (TASKS,),
+    INSTANCES: (INSTANCES,),
+    GAP_PREFERENCE: (INSTANCES,),  # gap filtering is applied to the instances frame
+}
+
+_current: ContextVar[Optional['RequestDataContext']] = ContextVar('request_data_context', default=None)
+_live_contexts: 'weakref.WeakSet[RequestDataContext]' = weakref.WeakSet()
+_live_lock = threading.Lock()
+
+
+class RequestDataContext:
+    """Loads memoized for one request, keyed by (group, user_id, key)."""
+
+    def __init__(self):
+        self._values: Dict[Tuple[str, str, Hashable], Any] = {}
+        self._lock = threading.Lock()
+        self.active = True
+        self.hits = 0
+        self.loads = 0
+
+    def memo(self, group: str, user_id: Any, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the memoized value, calling loader() on the first use in this request."""
+        if not self.active:
+            return loader()
+        entry_key = (group, str(user_id), key)
+        with self._lock:
+            if entry_key in self._values:
+                self.hits += 1
+                return self._values[entry_key]
+        # Load outside the lock; concurrent first loads of one key just store the same data twice
+        value = loader()
+        with self._lock:
+            self.loads += 1
+            if self.active:
+                self._values[entry_key] = value
+        return value
+
+    def discard(self, group: str, user_id: Any = None) -> None:
+        """Drop memoized values of group for one user (or all users when user_id is None)."""
+        with self._lock:
+            for entry_key in [k for k in self._values if k[0] == group and (user_id is None or k[1] == str(user_id))]:
+                del self._values[entry_key]
+
+    def close(self) -> None:
+        """End the request: later memo() calls (e.g. from timers created by the page) load fresh data."""
+        with self._lock:
+            self.active = False
+            self._values.clear()
+
+
+@contextmanager
+def request_data_context() -> Iterator[RequestDataContext]:
+    """Memoize shared loads for the duration of the block (nested blocks reuse the outer context)."""
+    existing = _current.get()
+    if existing is not None and existing.active:
+        yield existing
+        return
+    ctx = RequestDataContext()
+    with _live_lock:
+        _live_contexts.add(ctx)
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
+        ctx.close()
+        with _live_lock:
+            _live_contexts.discard(ctx)
+
+
+def current_data_context() -> Optional[RequestDataContext]:
+    """The active request context, or None outside a request."""
+    ctx = _current.get()
+    return ctx if ctx is not None and ctx.active else None
+
+
+def memo(group: str, user_id: Any, key: Hashable, loader: Callable[[], Any]) -> Any:
+    """Memoize loader() in the current request context (plain call outside a request).
+
+    The value is shared by every caller in the request: return copies of
+    mutable values (DataFrames, dicts) to callers that may modify them.
+    """
+    ctx = current_data_context()
+    if ctx is None:
+        return loader()
+    return ctx.memo(group, user_id, key, loader)
+
+
+def discard(group: str, user_id: Any = None) -> None:
+    """Drop group for a user (or all users) in every live request context."""
+    with _live_lock:
+        contexts = list(_live_contexts)
+    for ctx in contexts:
+        ctx.discard(group, user_id)
+
+
+def _on_invalidate(input_name: str, user_id: Optional[int]) -> None:
+    for group in _GROUPS_BY_INPUT.get(input_name, ()):
+        discard(group, user_id)
+
+
+cache_registry.add_listener(_on_invalidate)
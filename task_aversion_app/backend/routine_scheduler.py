@@ -77,6 +77,8 @@ class RoutineScheduler:
         if all_tasks is None or all_tasks.empty:
             return
         
+        # Due instances are created together, one apply_transitions() per user
+        pending = []
         for _, task_row in all_tasks.iterrows():
             try:
                 task = task_row.to_dict()
@@ -125,19 +127,41 @@ class RoutineScheduler:
                             should_initialize = True
                 
                 if should_initialize:
-                    self._initialize_routine_task(task, now)
+                    transition = self._initialize_routine_task(task, now)
+                    if transition is not None:
+                        pending.append(transition)
                     
             except Exception as e:
                 print(f"[RoutineScheduler] Error processing task {task.get('task_id', 'unknown')}: {e}")
                 continue
+        
+        self._create_routine_instances(pending)
+    
+    def _create_routine_instances(self, transitions: List[dict]):
+        """Create the due routine instances with one apply_transitions() call per user."""
+        by_user = {}
+        for transition in transitions:
+            by_user.setdefault(transition.get('user_id'), []).append(transition)
+        for user_id, user_transitions in by_user.items():
+            try:
+                instance_ids = self.instance_manager.apply_transitions(user_transitions, user_id=user_id)
+            except Exception as e:
+                print(f"[RoutineScheduler] Error initializing routine tasks for user {user_id}: {e}")
+                continue
+            for transition, instance_id in zip(user_transitions, instance_ids):
+                print(f"[RoutineScheduler] Initialized routine task: {transition['task_name']} (instance: {instance_id}, user_id: {user_id})")
     
-    def _initialize_routine_task(self, task: dict, scheduled_time: datetime):
+    def _initialize_routine_task(self, task: dict, scheduled_time: datetime) -> Optional[dict]:
         """
-        Initialize a routine task instance.
+        Build the 'create' transition for a routine task instance.
         
         Args:
             task: Task template dictionary
             scheduled_time: When the task was scheduled to be initialized
+        
+        Returns:
+            Transition for InstanceManager.apply_transitions(), or None if the task
+            was already initialized today
         """
         task_id = task.get('task_id')
         task_name = task.get('name', 'Unknown Task')
@@ -195,7 +219,7 @@ class RoutineScheduler:
                             if today_start <= created_at < today_end:
                                 # Already initialized today, skip
                                 print(f"[RoutineScheduler] Task {task_name} already initialized today, skipping")
-                                return
+                                return None
                         except (ValueError, TypeError):
                             pass
         
@@ -206,15 +230,14 @@ class RoutineScheduler:
         except (TypeError, ValueError):
             default_estimate = 0
         
-        instance_id = self.instance_manager.create_instance(
-            task_id=task_id,
-            task_name=task_name,
-            task_version=task.get('version') or 1,
-            predicted={'time_estimate_minutes': default_estimate},
-            user_id=task_user_id
-        )
-        
-        print(f"[RoutineScheduler] Initialized routine task: {task_name} (instance: {instance_id}, user_id: {task_user_id})")
+        return {
+            'op': 'create',
+            'task_id': task_id,
+            'task_name': task_name,
+            'task_version': task.get('version') or 1,
+            'predicted': {'time_estimate_minutes': default_estimate},
+            'user_id': task_user_id,
+        }
     
     def get_scheduled_tasks(self) -> List[dict]:
         """
@@ -0,0 +1,145 @@
+# backend/running_sessions.py
+"""
+In-memory registry of running task sessions.
+
+The dashboard's "Ongoing for X" label used to re-read every running instance
+from the database once per second per connected client (get_instances_bulk),
+re-parse its actual JSON and call pd.to_datetime on the timestamps. The only
+inputs the label needs are when the current session started and how much time
+earlier sessions accumulated, and those change only on start / resume / pause.
+
+InstanceManager records them here on start_instance / resume_instance and
+drops them on pause / complete / cancel / delete, so the live timer
+(ui/dashboard.py) computes elapsed times from memory. After a server restart
+the registry is empty; the first render of a running instance seeds it from
+the instance row the page already loaded (seed_from_instance).
+"""
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+
+
+@dataclass(frozen=True)
+class RunningSession:
+    """Start of the current session and minutes accumulated before it."""
+    instance_id: str
+    user_id: Optional[str]
+    session_start: datetime
+    time_spent_before_pause: float = 0.0
+
+    def elapsed_minutes(self, now: Optional[datetime] = None) -> float:
+        """Total minutes worked: current session (no paused time) + earlier sessions."""
+        now = now or datetime.now()
+        current = (now - self.session_start).total_seconds() / 60.0
+        return current + self.time_spent_before_pause
+
+
+def _to_minutes(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if not value or not str(value).strip():
+        return None
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except (ValueError, TypeError):
+        pass
+    try:
+        import pandas as pd
+        parsed = pd.to_datetime(value)
+        return None if pd.isna(parsed) else parsed.to_pydatetime()
+    except (ValueError, TypeError):
+        return None
+
+
+class RunningSessionRegistry:
+    """Thread-safe instance_id -> RunningSession map."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, RunningSession] = {}
+
+    def mark_running(
+        self,
+        instance_id: str,
+        session_start: datetime,
+        time_spent_before_pause: Any = 0.0,
+        user_id: Optional[Union[int, str]] = None,
+    ) -> RunningSession:
+        """Record that instance_id is running since session_start."""
+        session = RunningSession(
+            instance_id=str(instance_id),
+            user_id=None if user_id is None else str(user_id),
+            session_start=session_start,
+            time_spent_before_pause=_to_minutes(time_spent_before_pause),
+        )
+        with self._lock:
+            self._sessions[session.instance_id] = session
+        return session
+
+    def mark_stopped(self, instance_id: str):
+        """Forget instance_id (paused, completed, cancelled or deleted)."""
+        with self._lock:
+            self._sessions.pop(str(instance_id), None)
+
+    def get(self, instance_id: str, user_id: Optional[Union[int, str]] = None) -> Optional[RunningSession]:
+        """Running session of instance_id, or None. With user_id, only that user's session is returned."""
+        with self._lock:
+            session = self._sessions.get(str(instance_id))
+        if session is None:
+            return None
+        if user_id is not None and session.user_id is not None and session.user_id != str(user_id):
+            return None
+        return session
+
+    def seed_from_instance(self, instance: Optional[dict], user_id: Optional[Union[int, str]] = None) -> Optional[RunningSession]:
+        """Return the registered session of an instance row, recording it first if missing.
+
+        Parses the row once (resume_started_at from actual, else started_at), so a
+        running instance costs one parse per server lifetime instead of one per tick.
+        Returns None when the row is not running.
+        """
+        if not instance or not instance.get('instance_id'):
+            return None
+        instance_id = str(instance['instance_id'])
+        existing = self.get(instance_id, user_id=user_id)
+        if existing is not None:
+            return existing
+        started_at = _to_datetime(instance.get('started_at'))
+        if started_at is None:
+            return None
+        actual = instance.get('actual') or {}
+        if isinstance(actual, str):
+            try:
+                actual = json.loads(actual)
+            except (json.JSONDecodeError, ValueError, TypeError):
+                actual = {}
+        if not isinstance(actual, dict):
+            actual = {}
+        session_start = _to_datetime(actual.get('resume_started_at')) or started_at
+        return self.mark_running(
+            instance_id,
+            session_start,
+            actual.get('time_spent_before_pause', 0.0),
+            user_id=user_id if user_id is not None else instance.get('user_id'),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+# Process-wide registry (InstanceManager writes, the dashboard live timer reads)
+running_sessions = RunningSessionRegistry()
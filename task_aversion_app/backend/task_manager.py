@@ -1,11 +1,16 @@
 # backend/task_manager.py
+import asyncio
 import os
 import json
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from backend.bounded_cache import get_cache
+from backend.cache_registry import cache_registry, TASKS
+from backend.request_context import memo as request_memo
 from backend.performance_logger import get_perf_logger
+from backend.csv_journal import get_csv_journal
 from backend.security_utils import (
     validate_task_name, validate_description, validate_note,
     sanitize_for_storage, ValidationError
@@ -16,10 +21,13 @@ TASKS_FILE = 'data/tasks.csv'
 perf_logger = get_perf_logger()
 
 class TaskManager:
-    # Class-level cache for get_all shared across instances (recommendations create new
-    # TaskManager per call; this avoids 8x get_all on dashboard load).
-    _get_all_shared: dict = {}
-    _get_all_shared_time: dict = {}
+    # Class-level caches shared across instances (recommendations create new
+    # TaskManager per call; this avoids 8x get_all on dashboard load). TTL 5 minutes.
+    _cache_ttl_seconds = 300
+    _task_cache = get_cache('tasks.by_id', max_entries=4096, ttl_seconds=_cache_ttl_seconds)  # {"task_id:user_id": task_dict}
+    _tasks_list_cache = get_cache('tasks.names', max_entries=256, ttl_seconds=_cache_ttl_seconds)  # {"list:user_id": [names]}
+    _tasks_all_cache = get_cache('tasks.all', max_entries=256, max_bytes=64 * 1024 * 1024,
+                                 ttl_seconds=_cache_ttl_seconds)  # {"all:user_id": DataFrame or list of dicts}
 
     def __init__(self, use_csv: Optional[bool] = None):
         # use_csv=None: read from env. use_csv=True: explicit e.g. scheduler (no startup message)
@@ -41,14 +49,6 @@ class TaskManager:
         # Strict mode: If DISABLE_CSV_FALLBACK is set, fail instead of falling back to CSV
         self.strict_mode = bool(os.getenv('DISABLE_CSV_FALLBACK', '').lower() in ('1', 'true', 'yes'))
         
-        # Cache for frequently accessed data
-        self._tasks_list_cache = None
-        self._tasks_list_cache_time = None
-        self._tasks_all_cache = None
-        self._tasks_all_cache_time = None
-        self._task_cache = {}  # Per-task cache: {task_id: (task_dict, timestamp)}
-        self._cache_ttl_seconds = 300  # 5 minutes
-        
         if self.use_db:
             # Database backend
             try:
@@ -92,38 +92,9 @@ class TaskManager:
             log_cache_invalidation('TaskManager', '_invalidate_task_caches')
         except ImportError:
             pass
-        # Clear old-style cache attributes
-        self._tasks_list_cache = None
-        self._tasks_list_cache_time = None
-        self._tasks_all_cache = None
-        self._tasks_all_cache_time = None
-        self._task_cache.clear()
-        TaskManager._get_all_shared.clear()
-        TaskManager._get_all_shared_time.clear()
-
-        # Clear dynamic cache keys (used by get_all() and list_tasks() with user_id)
-        # These are stored as attributes like: _tasks_all_cache_all:1, _tasks_all_cache_time_all:1, etc.
-        # We need to iterate through all attributes and remove cache-related ones
-        attrs_to_remove = []
-        for attr_name in dir(self):
-            # Match patterns like:
-            # - _tasks_all_cache_all:1
-            # - _tasks_all_cache_time_all:1
-            # - _tasks_list_cache_all:1
-            # - _tasks_list_cache_time_all:1
-            if (attr_name.startswith('_tasks_all_cache_') or 
-                attr_name.startswith('_tasks_all_cache_time_') or
-                attr_name.startswith('_tasks_list_cache_') or
-                attr_name.startswith('_tasks_list_cache_time_')):
-                attrs_to_remove.append(attr_name)
-        
-        for attr_name in attrs_to_remove:
-            try:
-                delattr(self, attr_name)
-            except AttributeError:
-                pass  # Attribute doesn't exist, skip
-        
-        print(f"[TaskManager] Invalidated task caches (cleared {len(attrs_to_remove)} dynamic cache attributes)")
+        TaskManager._task_cache.clear()
+        TaskManager._tasks_list_cache.clear()
+        TaskManager._tasks_all_cache.clear()
     
     def _init_csv(self):
         """Initialize CSV backend."""
@@ -133,6 +104,8 @@ class TaskManager:
         # task_id, name, description, type, version, created_at, is_recurring, categories (json), default_estimate_minutes, task_type, default_initial_aversion, routine_frequency, routine_days_of_week, routine_time, completion_window_hours, completion_window_days, notes
         if not os.path.exists(self.tasks_file):
             pd.DataFrame(columns=['task_id','name','description','type','version','created_at','is_recurring','categories','default_estimate_minutes','task_type','default_initial_aversion','routine_frequency','routine_days_of_week','routine_time','completion_window_hours','completion_window_days','notes']).to_csv(self.tasks_file, index=False)
+        self._journal = get_csv_journal(self.tasks_file, ['task_id'])
+        self._csv_base = None
         self._reload()
     def _reload(self):
         """Reload data (CSV only)."""
@@ -145,8 +118,9 @@ class TaskManager:
             self._init_csv()
     
     def _reload_csv(self):
-        """CSV-specific reload."""
-        self.df = pd.read_csv(self.tasks_file, dtype=str).fillna('')
+        """CSV-specific reload (canonical CSV + journal, see csv_journal)."""
+        self._csv_base = self._journal.read()
+        self.df = self._csv_base.copy()
         # ensure proper dtypes for numeric fields where necessary
         if 'version' not in self.df.columns:
             self.df['version'] = 1
@@ -178,8 +152,8 @@ class TaskManager:
             self._save_csv()
     
     def _save_csv(self):
-        """CSV-specific save."""
-        self.df.to_csv(self.tasks_file, index=False)
+        """CSV-specific save: appends the changed rows to the journal."""
+        self._csv_base = self._journal.write(self._csv_base, self.df)
         self._reload_csv()
     
     def get_task(self, task_id, user_id: Optional[int] = None):
@@ -191,15 +165,11 @@ class TaskManager:
             task_id: Task ID to retrieve
             user_id: User ID to filter by (required for database, optional for CSV during migration)
         """
-        import time
-        
         # Check per-task cache first (cache key includes user_id for isolation)
         cache_key = f"{task_id}:{user_id}" if user_id else task_id
-        current_time = time.time()
-        if cache_key in self._task_cache:
-            cached_task, cache_time = self._task_cache[cache_key]
-            if (current_time - cache_time) < self._cache_ttl_seconds:
-                return cached_task.copy() if isinstance(cached_task, dict) else cached_task
+        cached_task = self._task_cache.get(cache_key)
+        if cached_task is not None:
+            return cached_task.copy() if isinstance(cached_task, dict) else cached_task
         
         # Cache miss - load from database/CSV
         if self.use_db:
@@ -209,7 +179,7 @@ class TaskManager:
         
         # Store in per-task cache
         if result is not None:
-            self._task_cache[cache_key] = (result.copy() if isinstance(result, dict) else result, time.time())
+            self._task_cache[cache_key] = result.copy() if isinstance(result, dict) else result
         
         return result
 
@@ -307,17 +277,11 @@ class TaskManager:
         Args:
             user_id: User ID to filter by (required for database, optional for CSV during migration)
         """
-        import time
-        
         # Check cache first (cache key includes user_id for isolation)
         cache_key = f"list:{user_id}" if user_id else "list:all"
-        current_time = time.time()
-        if (hasattr(self, f'_tasks_list_cache_{cache_key}') and 
-            hasattr(self, f'_tasks_list_cache_time_{cache_key}')):
-            cache = getattr(self, f'_tasks_list_cache_{cache_key}')
-            cache_time = getattr(self, f'_tasks_list_cache_time_{cache_key}')
-            if cache is not None and cache_time is not None and (current_time - cache_time) < self._cache_ttl_seconds:
-                return cache.copy()
+        cache = self._tasks_list_cache.get(cache_key)
+        if cache is not None:
+            return cache.copy()
         
         # Cache miss - load from database/CSV
         if self.use_db:
@@ -326,8 +290,7 @@ class TaskManager:
             result = self._list_tasks_csv()
         
         # Store in cache
-        setattr(self, f'_tasks_list_cache_{cache_key}', result.copy() if isinstance(result, list) else result)
-        setattr(self, f'_tasks_list_cache_time_{cache_key}', time.time())
+        self._tasks_list_cache[cache_key] = result.copy() if isinstance(result, list) else result
         
         return result
     
@@ -372,8 +335,6 @@ class TaskManager:
         Raises:
             ValueError: If user_id is None in database mode (data isolation requirement)
         """
-        import time
-        
         # Data isolation: require user_id in database mode
         if self.use_db and user_id is None:
             raise ValueError(
@@ -381,20 +342,17 @@ class TaskManager:
                 "Unauthenticated users should use CSV mode (set USE_CSV=1)."
             )
         
-        # Check cache first (cache key includes user_id for isolation)
+        # Check cache first (cache key includes user_id for isolation). Within a page
+        # render the frame is also memoized per request (see backend/request_context).
         cache_key = f"all:{user_id}" if user_id else "all:all"
-        current_time = time.time()
+        return request_memo(TASKS, user_id, cache_key, lambda: self._get_all_cached(cache_key, user_id)).copy()
+
+    def _get_all_cached(self, cache_key: str, user_id: Optional[int]):
+        """All tasks from the class-level cache or the backend (shared frame, do not modify)."""
         # Class-level shared cache (shared across TaskManager instances, e.g. 8x recommendations on dashboard)
-        if (cache_key in getattr(TaskManager, '_get_all_shared', {}) and
-            cache_key in getattr(TaskManager, '_get_all_shared_time', {}) and
-            (current_time - TaskManager._get_all_shared_time[cache_key]) < self._cache_ttl_seconds):
-            return TaskManager._get_all_shared[cache_key].copy()
-        if (hasattr(self, f'_tasks_all_cache_{cache_key}') and
-            hasattr(self, f'_tasks_all_cache_time_{cache_key}')):
-            cache = getattr(self, f'_tasks_all_cache_{cache_key}')
-            cache_time = getattr(self, f'_tasks_all_cache_time_{cache_key}')
-            if cache is not None and cache_time is not None and (current_time - cache_time) < self._cache_ttl_seconds:
-                return cache.copy()
+        cache = self._tasks_all_cache.get(cache_key)
+        if cache is not None:
+            return cache
 
         # Cache miss - load from database/CSV
         if self.use_db:
@@ -402,14 +360,82 @@ class TaskManager:
         else:
             result = self._get_all_csv(user_id)
         
-        # Store in instance and class-level cache
-        setattr(self, f'_tasks_all_cache_{cache_key}', result.copy())
-        setattr(self, f'_tasks_all_cache_time_{cache_key}', time.time())
-        TaskManager._get_all_shared[cache_key] = result.copy()
-        TaskManager._get_all_shared_time[cache_key] = time.time()
+        # Store in class-level cache
+        self._tasks_all_cache[cache_key] = result.copy()
 
         return result
 
+    # Async reads for UI callbacks: await instead of blocking the event loop. Use
+    # AsyncSession when an async driver is installed (see database.async_db_available),
+    # otherwise run the sync method in a worker thread. Both share the sync caches.
+
+    async def get_task_async(self, task_id, user_id: Optional[int] = None):
+        """Async get_task(). Same arguments and return value."""
+        cache_key = f"{task_id}:{user_id}" if user_id else task_id
+        cached_task = self._task_cache.get(cache_key)
+        if cached_task is not None:
+            return cached_task.copy() if isinstance(cached_task, dict) else cached_task
+        if self.use_db and self._async_db_available():
+            try:
+                from sqlalchemy import or_, select
+                from backend.database import Job, JobTaskMapping, get_async_session
+                query = select(self.Task).where(self.Task.task_id == task_id)
+                if user_id is not None:
+                    query = query.where(or_(self.Task.user_id == user_id, self.Task.user_id.is_(None)))
+                async with get_async_session() as session:
+                    task = (await session.execute(query.limit(1))).scalars().first()
+                    if task is None:
+                        return None
+                    out = task.to_dict()
+                    job_ids = await session.execute(
+                        select(JobTaskMapping.job_id)
+                        .join(Job, Job.job_id == JobTaskMapping.job_id)
+                        .where(JobTaskMapping.task_id == task_id)
+                    )
+                    out['job_ids'] = list(job_ids.scalars())
+                self._task_cache[cache_key] = out.copy()
+                return out
+            except Exception as e:
+                if self.strict_mode:
+                    raise RuntimeError(f"Database error in get_task_async: {e}") from e
+                print(f"[TaskManager] Async database error in get_task: {e}, using sync read")
+        return await asyncio.to_thread(self.get_task, task_id, user_id)
+
+    async def get_all_async(self, user_id: Optional[int] = None):
+        """Async get_all(). Same arguments, return value and errors."""
+        if self.use_db and user_id is None:
+            raise ValueError(
+                "user_id is required in database mode for data isolation. "
+                "Unauthenticated users should use CSV mode (set USE_CSV=1)."
+            )
+        cache_key = f"all:{user_id}" if user_id else "all:all"
+        cache = self._tasks_all_cache.get(cache_key)
+        if cache is not None:
+            return cache.copy()
+        if self.use_db and self._async_db_available():
+            try:
+                from sqlalchemy import select
+                from backend.database import get_async_session
+                async with get_async_session() as session:
+                    result = await session.execute(select(self.Task).where(self.Task.user_id == user_id))
+                    task_dicts = [task.to_dict() for task in result.scalars()]
+                if task_dicts:
+                    df = pd.DataFrame(task_dicts)
+                else:
+                    df = pd.DataFrame(columns=['task_id','name','description','type','version','created_at','is_recurring','categories','default_estimate_minutes','task_type','default_initial_aversion','routine_frequency','routine_days_of_week','routine_time','completion_window_hours','completion_window_days','notes','user_id'])
+                self._tasks_all_cache[cache_key] = df.copy()
+                return df
+            except Exception as e:
+                if self.strict_mode:
+                    raise RuntimeError(f"Database error in get_all_async: {e}") from e
+                print(f"[TaskManager] Async database error in get_all: {e}, using sync read")
+        return await asyncio.to_thread(self.get_all, user_id)
+
+    @staticmethod
+    def _async_db_available() -> bool:
+        from backend.database import async_db_available
+        return async_db_available()
+
     def _get_all_csv(self, user_id: Optional[int] = None):
         """CSV-specific get_all."""
         self._reload_csv()
@@ -480,6 +506,8 @@ class TaskManager:
             routine_days_of_week = []
         # Invalidate caches before creating
         self._invalidate_task_caches()
+        # Analytics products that read task templates (task_type, categories), for this user only
+        cache_registry.invalidate(TASKS, user_id)
         if self.use_db:
             task_id = self._create_task_db(name, description, ttype, is_recurring, categories, default_estimate_minutes, task_type, default_initial_aversion, routine_frequency, routine_days_of_week, routine_time, completion_window_hours, completion_window_days, user_id)
         else:
@@ -601,6 +629,8 @@ class TaskManager:
         """
         # Invalidate caches before updating
         self._invalidate_task_caches()
+        # Analytics products that read task templates (task_type, categories), for this user only
+        cache_registry.invalidate(TASKS, user_id)
         if self.use_db:
             return self._update_task_db(task_id, user_id, **kwargs)
         else:
@@ -1026,6 +1056,8 @@ class TaskManager:
         print(f"[TaskManager] delete_by_id called with: {task_id}")
         # Invalidate caches before deleting
         self._invalidate_task_caches()
+        # Analytics products that read task templates (task_type, categories), for this user only
+        cache_registry.invalidate(TASKS, user_id)
         if self.use_db:
             return self._delete_by_id_db(task_id, user_id)
         else:
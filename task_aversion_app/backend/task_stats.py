@@ -0,0 +1,306 @@
+"""
+Per-user, per-task statistics table.
+
+The initialize and recommend paths (InstanceManager.get_previous_task_averages,
+get_previous_actual_averages, get_initial_aversion, the baseline aversion
+getters and their bulk variants) used to load every instance of a task and
+unpack its JSON payloads on each call. The results are stored instead in
+task_stats, one row per (user_id, task_id), and those calls are a primary key
+lookup.
+
+Maintenance: InstanceManager calls refresh_tasks() inside the write
+transaction of every instance write that changes an aggregated value,
+recomputing the row of the instance's task from that task's instances.
+Medians and IQR-trimmed means cannot be updated from deltas, so the row is
+recomputed rather than adjusted. Writes that change nothing aggregated (start,
+pause, resume, postpone) only advance the row's source_updated_at
+(touch_task()).
+
+Rows written by code that bypasses InstanceManager (CSV importer, scripts) are
+caught by ensure_fresh(): if the user's instance count or latest updated_at
+disagrees with task_stats, the user's rows are rebuilt. This also serves as the
+lazy backfill for existing databases.
+
+All values use the legacy rules: 0-10 values are scaled to 0-100, means and
+baselines are rounded, averages cover initialized instances (predicted) or
+completed instances (actual).
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Predicted keys averaged over initialized instances
+PREDICTED_KEYS = (
+    'expected_relief',
+    'expected_mental_energy',
+    'expected_difficulty',
+    'expected_cognitive_load',  # Backward compatibility
+    'expected_physical_load',
+    'expected_emotional_load',
+    'motivation',
+    'expected_aversion',
+    'expected_stress',  # Direct user-reported stress only
+)
+
+# Actual keys averaged over completed instances
+ACTUAL_KEYS = ('actual_relief', 'actual_cognitive', 'actual_physical', 'actual_emotional')
+
+# Columns read from task_instances
+_INSTANCE_COLUMNS = ('task_id', 'predicted', 'actual', 'initialized_at', 'completed_at', 'updated_at')
+
+
+def scaled(value: Any) -> Optional[float]:
+    """value as a float on the 0-100 scale (0-10 values x10), or None if not numeric."""
+    if value is None:
+        return None
+    try:
+        num_val = float(value)
+    except (ValueError, TypeError):
+        return None
+    if num_val <= 10 and num_val >= 0:
+        num_val = num_val * 10
+    return num_val
+
+
+def payload_dict(inst: Any, key: str) -> dict:
+    """The predicted/actual dict of an ORM row, query row or CSV dict (JSON strings parsed)."""
+    raw = inst.get(key) if isinstance(inst, dict) else getattr(inst, key, None)
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw or '{}')
+        except (json.JSONDecodeError, TypeError):
+            raw = {}
+    return raw if isinstance(raw, dict) else {}
+
+
+def predicted_averages(instances: Iterable[Any]) -> Tuple[Dict[str, int], Optional[float]]:
+    """Averages of the predicted payloads and the average time estimate.
+
+    Returns:
+        (dict of PREDICTED_KEYS present -> rounded 0-100 mean, mean time estimate or None)
+    """
+    values: Dict[str, List[float]] = {key: [] for key in PREDICTED_KEYS}
+    time_values = []
+    for inst in instances:
+        pred = payload_dict(inst, 'predicted')
+        for key in PREDICTED_KEYS:
+            num_val = scaled(pred.get(key))
+            if num_val is not None:
+                values[key].append(num_val)
+        # Backward compatibility: old cognitive_load stands in for both new fields
+        if 'expected_mental_energy' not in pred and 'expected_difficulty' not in pred:
+            num_val = scaled(pred.get('expected_cognitive_load'))
+            if num_val is not None:
+                values['expected_mental_energy'].append(num_val)
+                values['expected_difficulty'].append(num_val)
+        t = pred.get('time_estimate_minutes') or pred.get('estimate')
+        if t is not None:
+            try:
+                time_values.append(float(t))
+            except (ValueError, TypeError):
+                pass
+    result = {key: round(sum(vals) / len(vals)) for key, vals in values.items() if vals}
+    avg_time = (sum(time_values) / len(time_values)) if time_values else None
+    return result, avg_time
+
+
+def actual_averages(instances: Iterable[Any]) -> Dict[str, int]:
+    """Rounded 0-100 means of the ACTUAL_KEYS present in the actual payloads."""
+    values: Dict[str, List[float]] = {key: [] for key in ACTUAL_KEYS}
+    for inst in instances:
+        actual = payload_dict(inst, 'actual')
+        for key in ACTUAL_KEYS:
+            num_val = scaled(actual.get(key))
+            if num_val is not None:
+                values[key].append(num_val)
+    return {key: round(sum(vals) / len(vals)) for key, vals in values.items() if vals}
+
+
+def _trimmed_mean(values: List[float]) -> int:
+    """Rounded mean after dropping values outside the 1.5 IQR fences (plain mean for 1-2 values).
+
+    With 3 values the fences always include all of them, so this also matches the
+    batch loader, which only trims from 4 values.
+    """
+    if len(values) <= 2:
+        return round(float(np.mean(values)))
+    q1 = np.percentile(values, 25)
+    q3 = np.percentile(values, 75)
+    iqr = q3 - q1
+    lower_bound = q1 - 1.5 * iqr
+    upper_bound = q3 + 1.5 * iqr
+    trimmed = [v for v in values if lower_bound <= v <= upper_bound]
+    return round(float(np.mean(trimmed or values)))
+
+
+def compute_task_stats(instances: List[Any]) -> Dict[str, Any]:
+    """task_stats column values (without user_id/task_id) for one task's instances."""
+    initialized = [i for i in instances if getattr(i, 'initialized_at', None) is not None]
+    completed = [i for i in instances if getattr(i, 'completed_at', None) is not None]
+    predicted, avg_time = predicted_averages(initialized)
+    aversions = [
+        v for v in (scaled(payload_dict(i, 'predicted').get('expected_aversion')) for i in initialized)
+        if v is not None
+    ]
+
+    initial_aversion = None
+    last_expected_aversion = None
+    if initialized:
+        by_initialized = sorted(initialized, key=lambda i: i.initialized_at)
+        first = scaled(payload_dict(by_initialized[0], 'predicted').get('initial_aversion'))
+        initial_aversion = round(first) if first is not None else None
+        last_expected_aversion = scaled(payload_dict(by_initialized[-1], 'predicted').get('expected_aversion'))
+    last_actual_relief = None
+    if completed:
+        latest = max(completed, key=lambda i: i.completed_at)
+        last_actual_relief = scaled(payload_dict(latest, 'actual').get('actual_relief'))
+
+    updated = [i.updated_at for i in instances if getattr(i, 'updated_at', None) is not None]
+    return {
+        'instance_count': len(instances),
+        'initialized_count': len(initialized),
+        'completed_count': len(completed),
+        'predicted_averages': predicted,
+        'actual_averages': actual_averages(completed),
+        'avg_time_estimate': avg_time,
+        'initial_aversion': initial_aversion,
+        'baseline_aversion_robust': round(float(np.median(aversions))) if aversions else None,
+        'baseline_aversion_sensitive': _trimmed_mean(aversions) if aversions else None,
+        'last_initialized_at': max((i.initialized_at for i in initialized), default=None),
+        'last_completed_at': max((i.completed_at for i in completed), default=None),
+        'last_expected_aversion': last_expected_aversion,
+        'last_actual_relief': last_actual_relief,
+        'source_updated_at': max(updated, default=None),
+    }
+
+
+# Stats of a task without instances (what the legacy getters return for it)
+EMPTY_STATS = compute_task_stats([])
+
+
+def _instance_rows(session, user_id: int, task_ids: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+    from .database import TaskInstance
+
+    query = session.query(*[getattr(TaskInstance, c) for c in _INSTANCE_COLUMNS]).filter(
+        TaskInstance.user_id == user_id,
+        TaskInstance.task_id.isnot(None),
+    )
+    if task_ids is not None:
+        query = query.filter(TaskInstance.task_id.in_(task_ids))
+    groups: Dict[str, List[Any]] = {}
+    for row in query.all():
+        groups.setdefault(row.task_id, []).append(row)
+    return groups
+
+
+def refresh_tasks(session, user_id: int, task_ids: Iterable[str]) -> None:
+    """Recompute the task_stats rows of the given tasks for a user (caller commits).
+
+    Reads the session's pending state, so call it after the instance change
+    (flushes first). Tasks left without instances lose their row.
+    """
+    from .database import TaskStats
+
+    task_ids = sorted({t for t in task_ids if t})
+    if user_id is None or not task_ids:
+        return
+    session.flush()
+    groups = _instance_rows(session, user_id, task_ids)
+    stamp = datetime.utcnow()
+    for task_id in task_ids:
+        instances = groups.get(task_id)
+        if instances:
+            session.merge(TaskStats(user_id=user_id, task_id=task_id, updated_at=stamp,
+                                    **compute_task_stats(instances)))
+        else:
+            session.query(TaskStats).filter(
+                TaskStats.user_id == user_id, TaskStats.task_id == task_id
+            ).delete(synchronize_session=False)
+
+
+def touch_task(session, user_id: int, task_id: str, updated_at: Optional[datetime]) -> bool:
+    """Record a write that changes none of a task's statistics (caller commits).
+
+    Advances the row's source_updated_at to the instance's new updated_at so
+    is_fresh() stays true, without recomputing the row.
+
+    Returns:
+        False if the task has no row yet (the caller then uses refresh_tasks)
+    """
+    from .database import TaskStats
+
+    row = session.query(TaskStats).filter(
+        TaskStats.user_id == user_id, TaskStats.task_id == task_id
+    ).first()
+    if row is None:
+        return False
+    if updated_at is not None and (row.source_updated_at is None or updated_at > row.source_updated_at):
+        row.source_updated_at = updated_at
+    return True
+
+
+def rebuild_user(session, user_id: int) -> int:
+    """Rebuild all of a user's task_stats rows from task_instances and commit. Returns rows written."""
+    from .database import TaskStats
+
+    groups = _instance_rows(session, user_id)
+    session.query(TaskStats).filter(TaskStats.user_id == user_id).delete(synchronize_session=False)
+    stamp = datetime.utcnow()
+    session.bulk_insert_mappings(TaskStats, [
+        {'user_id': user_id, 'task_id': task_id, 'updated_at': stamp, **compute_task_stats(instances)}
+        for task_id, instances in groups.items()
+    ])
+    session.commit()
+    return len(groups)
+
+
+def is_fresh(session, user_id: int) -> bool:
+    """True if the user's task_stats cover every instance and every write to them."""
+    from sqlalchemy import func
+    from .database import TaskInstance, TaskStats
+
+    instance_count, instance_updated = session.query(
+        func.count(TaskInstance.instance_id), func.max(TaskInstance.updated_at)
+    ).filter(
+        TaskInstance.user_id == user_id,
+        TaskInstance.task_id.isnot(None),
+    ).one()
+    stats_count, stats_updated = session.query(
+        func.sum(TaskStats.instance_count), func.max(TaskStats.source_updated_at)
+    ).filter(TaskStats.user_id == user_id).one()
+    if int(instance_count or 0) != int(stats_count or 0):
+        return False
+    if instance_updated is not None and (stats_updated is None or instance_updated > stats_updated):
+        return False
+    return True
+
+
+def ensure_fresh(session, user_id: int) -> None:
+    """Rebuild the user's task_stats if is_fresh() says they missed instances or writes."""
+    if not is_fresh(session, user_id):
+        written = rebuild_user(session, user_id)
+        print(f"[TaskStats] Rebuilt task_stats for user {user_id} ({written} rows)")
+
+
+def load_task_stats(session, user_id: int, task_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Read the stats of several tasks for a user in one query.
+
+    Returns:
+        Dict of task_id -> column values as in compute_task_stats() (EMPTY_STATS
+        for tasks without a row, i.e. without instances)
+    """
+    from .database import TaskStats
+
+    task_ids = list(dict.fromkeys(task_ids))
+    stats = {task_id: EMPTY_STATS for task_id in task_ids}
+    if not task_ids:
+        return stats
+    rows = session.query(TaskStats).filter(
+        TaskStats.user_id == user_id,
+        TaskStats.task_id.in_(task_ids),
+    ).all()
+    for row in rows:
+        stats[row.task_id] = {column: getattr(row, column) for column in EMPTY_STATS}
+    return stats
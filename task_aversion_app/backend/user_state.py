@@ -1,10 +1,14 @@
+import copy
+import json
 import os
-import threading
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
+from .bounded_cache import get_cache
+from .cache_registry import cache_registry, PRODUCTIVITY_SETTINGS
+from .csv_journal import get_csv_journal
 
 DATA_DIR = os.path.join(Path(__file__).resolve().parent.parent, "data")
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -22,79 +26,316 @@ DEFAULT_PREFS = {
     "last_active": "",
 }
 
-# In-process cache for get_productivity_goal_settings (shared by Analytics + Settings).
-# Invalidated on set_productivity_goal_settings for the same user_id.
-# TTL 5 minutes so we refresh occasionally even if set was called from another process/tab.
-_productivity_goal_cache: Dict[str, Dict[str, Any]] = {}
-_productivity_goal_cache_time: Dict[str, float] = {}
-_productivity_goal_cache_ttl_seconds = 300
-_productivity_goal_cache_lock = threading.Lock()
+# Typed columns of the user_preferences table. Any other preference key
+# (task_horizon_days, recommendation_weights, milestones, ...) is stored as a
+# string in its extra_preferences JSON column.
+_BOOL_COLUMNS = ("tutorial_completed", "tutorial_auto_show", "tooltip_mode_enabled", "survey_completed")
+_DATETIME_COLUMNS = ("created_at", "last_active")
+_STRING_COLUMNS = ("tutorial_choice", "gap_handling", "timezone", "detected_tz")
+_JSON_COLUMNS = (
+    "persistent_emotion_values",
+    "productivity_history",
+    "productivity_goal_settings",
+    "monitored_metrics_config",
+    "execution_score_chunk_state",
+    "productivity_settings",
+)
+
+# Database backend: also write every change to user_preferences.csv (for tools that read the file)
+CSV_MIRROR_ENABLED = os.getenv("USER_PREFS_CSV_MIRROR", "").lower() in ("1", "true", "yes")
+
+# In-process preference cache shared by all UserStateManager instances (Analytics and
+# every UI module build their own). user_id -> _CachedPrefs, or _NO_USER for users
+# without a row. Writes through a UserStateManager replace the entry (write-through);
+# the TTL picks up writes made by another process.
+_prefs_cache_ttl_seconds = 300
+_prefs_cache = get_cache('user_state.preferences', max_entries=1024, ttl_seconds=_prefs_cache_ttl_seconds)
+_NO_USER = object()
+
+
+class _CachedPrefs:
+    """A user's preferences (CSV string format) with JSON fields parsed on first use."""
+
+    __slots__ = ("prefs", "parsed")
+
+    def __init__(self, prefs: Dict[str, Any]):
+        self.prefs = prefs
+        self.parsed: Dict[str, Any] = {}
+
+    def json_value(self, key: str) -> Any:
+        """Parsed JSON of a preference (a copy), or None if empty or not valid JSON."""
+        if key not in self.parsed:
+            raw = self.prefs.get(key, "")
+            value = None
+            if raw:
+                try:
+                    value = json.loads(raw)
+                except (json.JSONDecodeError, TypeError):
+                    value = None
+            self.parsed[key] = value
+        return copy.deepcopy(self.parsed[key])
+
+
+def invalidate_preferences_cache(user_id: Optional[str] = None) -> None:
+    """Drop cached preferences of one user (or all users), e.g. after editing the table directly."""
+    if user_id is None:
+        _prefs_cache.clear()
+    else:
+        _prefs_cache.pop(str(user_id), None)
+
+
+def _prefs_from_row(row) -> Dict[str, Any]:
+    """UserPreferences row -> preferences dict in the CSV string format."""
+    prefs: Dict[str, Any] = {"user_id": row.user_id}
+    for column in _BOOL_COLUMNS:
+        prefs[column] = str(bool(getattr(row, column)))
+    for column in _DATETIME_COLUMNS:
+        value = getattr(row, column)
+        prefs[column] = value.isoformat() if value else ""
+    for column in _STRING_COLUMNS:
+        prefs[column] = getattr(row, column) or ""
+    for column in _JSON_COLUMNS:
+        value = getattr(row, column)
+        if isinstance(value, (dict, list)):
+            # Empty column defaults read as unset, like a blank CSV cell
+            prefs[column] = json.dumps(value) if value else ""
+        else:
+            prefs[column] = value or ""
+    extra = row.extra_preferences if isinstance(row.extra_preferences, dict) else {}
+    for key, value in extra.items():
+        prefs.setdefault(key, "" if value is None else str(value))
+    return prefs
+
+
+def _assign(row, key: str, value: Any) -> None:
+    """Set one preference (CSV string semantics) on a UserPreferences row."""
+    text = "" if value is None else str(value)
+    if key in _BOOL_COLUMNS:
+        setattr(row, key, text.strip().lower() == "true")
+    elif key in _DATETIME_COLUMNS:
+        if not text:
+            if key != "created_at":
+                setattr(row, key, None)
+            return
+        try:
+            setattr(row, key, datetime.fromisoformat(text))
+        except ValueError:
+            pass
+    elif key in _STRING_COLUMNS:
+        setattr(row, key, text or None)
+    elif key in _JSON_COLUMNS:
+        if not text:
+            setattr(row, key, None)
+            return
+        try:
+            setattr(row, key, json.loads(text))
+        except (json.JSONDecodeError, TypeError):
+            setattr(row, key, text)
+    else:
+        extra = dict(row.extra_preferences) if isinstance(row.extra_preferences, dict) else {}
+        extra[key] = text
+        row.extra_preferences = extra
 
 
 class UserStateManager:
-    """Manage anonymous user ids and onboarding preferences backed by CSV."""
+    """Manage anonymous user ids and onboarding preferences.
+
+    Backed by the user_preferences table (CSV when USE_CSV is set). Reads go
+    through an in-process per-user cache; a user that only exists in the legacy
+    user_preferences.csv is copied into the table on first read.
+    """
 
-    def __init__(self, prefs_file: Optional[str] = None):
+    def __init__(self, prefs_file: Optional[str] = None, use_csv: Optional[bool] = None,
+                 session_factory: Optional[Callable[[], Any]] = None):
         self.file = prefs_file or PREFS_FILE
-        os.makedirs(os.path.dirname(self.file), exist_ok=True)
-        self._ensure_file()
-        self._reload()
+        if use_csv is None:
+            use_csv = os.getenv('USE_CSV', '').lower() in ('1', 'true', 'yes')
+        self.use_db = not use_csv
+        self.strict_mode = bool(os.getenv('DISABLE_CSV_FALLBACK', '').lower() in ('1', 'true', 'yes'))
+        self._journal = None
+        self._csv_base = None
+        self.df = None
+
+        if self.use_db:
+            try:
+                from backend.database import get_session, UserPreferences, init_db
+                self.db_session = session_factory or get_session
+                self.UserPreferences = UserPreferences
+                if session_factory is None:
+                    init_db()
+            except Exception as e:
+                if self.strict_mode:
+                    raise RuntimeError(
+                        f"Database initialization failed and CSV fallback is disabled: {e}\n"
+                        "Set DISABLE_CSV_FALLBACK=false or unset DATABASE_URL to allow CSV fallback."
+                    ) from e
+                print(f"[UserStateManager] Database initialization failed: {e}, falling back to CSV")
+                self.use_db = False
+        if not self.use_db:
+            self._init_csv()
 
     # -----------------------------
     # File helpers
     # -----------------------------
+    def _init_csv(self):
+        os.makedirs(os.path.dirname(self.file), exist_ok=True)
+        self._ensure_file()
+        self._journal = get_csv_journal(self.file, ["user_id"])
+        self._reload()
+
     def _ensure_file(self):
         if not os.path.exists(self.file):
             pd.DataFrame(columns=DEFAULT_PREFS.keys()).to_csv(self.file, index=False)
 
     def _reload(self):
         try:
-            self.df = pd.read_csv(self.file, dtype=str).fillna("")
+            self._csv_base = self._journal.read()
+            self.df = self._csv_base.copy()
         except Exception:
             self.df = pd.DataFrame(columns=DEFAULT_PREFS.keys())
 
     def _save(self):
-        self.df.to_csv(self.file, index=False)
+        # Appends only changed rows to the journal (see csv_journal); the returned
+        # table is the next base, so nothing is read back
+        self._csv_base = self._journal.write(self._csv_base, self.df)
+        self.df = self._csv_base.copy()
+
+    def _csv_row(self, user_id: str) -> Optional[Dict[str, Any]]:
+        if self._journal is None:
+            if not os.path.exists(self.file):
+                return None
+            self._journal = get_csv_journal(self.file, ["user_id"])
         self._reload()
+        rows = self.df[self.df["user_id"] == user_id]
+        if rows.empty:
+            return None
+        return rows.iloc[0].to_dict()
+
+    def _mirror_csv(self, prefs: Dict[str, Any]):
+        """Write one user's preferences to the CSV (database backend with USER_PREFS_CSV_MIRROR)."""
+        try:
+            if self._journal is None:
+                os.makedirs(os.path.dirname(self.file), exist_ok=True)
+                self._ensure_file()
+                self._journal = get_csv_journal(self.file, ["user_id"])
+            self._reload()
+            others = self.df[self.df["user_id"] != prefs["user_id"]]
+            self.df = pd.concat([others, pd.DataFrame([prefs])], ignore_index=True).fillna("")
+            self._save()
+        except Exception as e:
+            print(f"[UserStateManager] CSV mirror write failed: {e}")
+
+    # -----------------------------
+    # Database helpers
+    # -----------------------------
+    def _db_read(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self.db_session() as session:
+            row = session.get(self.UserPreferences, user_id)
+            if row is not None:
+                return _prefs_from_row(row)
+        # Not in the table yet: copy the user's row from the legacy CSV, if any
+        legacy = self._csv_row(user_id)
+        if legacy is None:
+            return None
+        return self._db_write(user_id, {k: v for k, v in legacy.items() if v != ""})
+
+    def _db_write(self, user_id: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply values to the user's row (created if missing); returns the stored preferences."""
+        with self.db_session() as session:
+            row = session.get(self.UserPreferences, user_id)
+            if row is None:
+                row = self.UserPreferences(user_id=user_id)
+                session.add(row)
+            for key, value in values.items():
+                if key != "user_id":
+                    _assign(row, key, value)
+            session.flush()
+            prefs = _prefs_from_row(row)
+            session.commit()
+        if CSV_MIRROR_ENABLED:
+            self._mirror_csv(prefs)
+        return prefs
+
+    # -----------------------------
+    # Cache
+    # -----------------------------
+    def _cached(self, user_id: str) -> Optional[_CachedPrefs]:
+        entry = _prefs_cache.get(user_id)
+        if entry is None:
+            if self.use_db:
+                prefs = self._db_read(user_id)
+            else:
+                prefs = self._csv_row(user_id)
+            entry = _CachedPrefs(prefs) if prefs is not None else _NO_USER
+            _prefs_cache[user_id] = entry
+        return None if entry is _NO_USER else entry
+
+    def _store(self, prefs: Dict[str, Any]) -> Dict[str, Any]:
+        _prefs_cache[str(prefs["user_id"])] = _CachedPrefs(prefs)
+        return dict(prefs)
+
+    def _json_preference(self, user_id: str, key: str) -> Any:
+        """Parsed JSON preference (parsed once per cached version), or None if unset/invalid."""
+        entry = self._cached(str(user_id))
+        if entry is None:
+            return None
+        return entry.json_value(key)
 
     # -----------------------------
     # Public API
     # -----------------------------
     def ensure_user(self, user_id: str) -> Dict[str, Any]:
         """Ensure a row exists for user_id, return preferences dict."""
-        self._reload()
-        existing = self.df[self.df["user_id"] == user_id]
-        if not existing.empty:
-            prefs = existing.iloc[0].to_dict()
-            return prefs
+        user_id = str(user_id)
+        entry = self._cached(user_id)
+        if entry is not None:
+            return dict(entry.prefs)
 
         now = datetime.utcnow().isoformat()
+        if self.use_db:
+            return self._store(self._db_write(user_id, {"created_at": now, "last_active": now}))
+
+        existing = self._csv_row(user_id)
+        if existing is not None:
+            return self._store(existing)
         row = {**DEFAULT_PREFS}
         row["user_id"] = user_id
         row["created_at"] = now
         row["last_active"] = now
         self.df = pd.concat([self.df, pd.DataFrame([row])], ignore_index=True)
         self._save()
-        return row
+        return self._store(row)
 
     def get_user_preferences(self, user_id: str) -> Optional[Dict[str, Any]]:
-        self._reload()
-        rows = self.df[self.df["user_id"] == user_id]
-        if rows.empty:
+        entry = self._cached(str(user_id))
+        if entry is None:
             return None
-        return rows.iloc[0].to_dict()
+        return dict(entry.prefs)
 
     def update_preference(self, user_id: str, key: str, value: Any) -> Dict[str, Any]:
         """Update a single preference; creates the user row if needed."""
+        return self.update_preferences(user_id, {key: value})
+
+    def update_preferences(self, user_id: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Update several preferences in one write; creates the user row if needed."""
+        user_id = str(user_id)
+        values = {key: value for key, value in values.items() if key and key != "user_id"}
         self.ensure_user(user_id)
+        now = datetime.utcnow().isoformat()
+        if self.use_db:
+            return self._store(self._db_write(user_id, {**values, "last_active": now}))
+
         self._reload()
-        if key not in self.df.columns:
-            # Expand CSV dynamically if new preference keys are introduced
-            self.df[key] = ""
-        self.df.loc[self.df["user_id"] == user_id, key] = str(value)
-        self.df.loc[self.df["user_id"] == user_id, "last_active"] = datetime.utcnow().isoformat()
+        mask = self.df["user_id"] == user_id
+        for key, value in values.items():
+            if key not in self.df.columns:
+                # Expand CSV dynamically if new preference keys are introduced
+                self.df[key] = ""
+            self.df.loc[mask, key] = str(value)
+        self.df.loc[mask, "last_active"] = now
         self._save()
-        return self.get_user_preferences(user_id) or {}
+        rows = self.df[self.df["user_id"] == user_id]
+        return self._store(rows.iloc[0].to_dict()) if not rows.empty else {}
 
     def is_new_user(self, user_id: str) -> bool:
         return self.get_user_preferences(user_id) is None
@@ -163,19 +404,8 @@ class UserStateManager:
         Returns:
             Dict of component_name -> weight (default: equal weights)
         """
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return {}
-        
-        weights_json = prefs.get("composite_score_weights", "")
-        if not weights_json:
-            return {}
-        
-        try:
-            import json
-            return json.loads(weights_json)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        value = self._json_preference(user_id, "composite_score_weights")
+        return value if value is not None else {}
 
     def set_score_weights(self, user_id: str, weights: Dict[str, float]) -> Dict[str, Any]:
         """Set composite score weights for a user.
@@ -221,19 +451,14 @@ class UserStateManager:
 
     def get_recommendation_weights(self, user_id: str) -> Dict[str, float]:
         """Get recommendation score weights (e.g. urgency_score, relief_score). Urgency cap 0.5."""
-        import json as _json
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return dict(self.DEFAULT_RECOMMENDATION_WEIGHTS)
-        weights_json = prefs.get("recommendation_weights", "")
-        if not weights_json:
+        w = self._json_preference(user_id, "recommendation_weights")
+        if w is None:
             return dict(self.DEFAULT_RECOMMENDATION_WEIGHTS)
         try:
-            w = _json.loads(weights_json)
             if "urgency_score" in w and w["urgency_score"] > 0.5:
                 w["urgency_score"] = 0.5
             return w
-        except (_json.JSONDecodeError, TypeError):
+        except TypeError:
             return dict(self.DEFAULT_RECOMMENDATION_WEIGHTS)
 
     def set_recommendation_weights(self, user_id: str, weights: Dict[str, float]) -> Dict[str, Any]:
@@ -249,39 +474,26 @@ class UserStateManager:
     # -----------------------------
     def get_productivity_settings(self, user_id: str) -> Dict[str, Any]:
         """Get productivity scoring settings (curve + burnout thresholds)."""
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return {}
-
-        settings_json = prefs.get("productivity_settings", "")
-        if not settings_json:
-            return {}
-
-        try:
-            import json
-            return json.loads(settings_json)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        value = self._json_preference(user_id, "productivity_settings")
+        return value if value is not None else {}
 
     def set_productivity_settings(self, user_id: str, settings: Dict[str, Any]) -> Dict[str, Any]:
         """Persist productivity scoring settings."""
         import json
         settings_json = json.dumps(settings)
-        return self.update_preference(user_id, "productivity_settings", settings_json)
+        result = self.update_preference(user_id, "productivity_settings", settings_json)
+        # Analytics reads these settings for every user (default_user row), so drop all users' products
+        cache_registry.invalidate(PRODUCTIVITY_SETTINGS)
+        return result
 
     def get_analytics_section_prefs(self, user_id: str) -> Dict[str, bool]:
         """Get which analytics sections the user wants to load (section_id -> True/False). Missing => True."""
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return {}
-        raw = prefs.get("analytics_section_prefs", "")
-        if not raw:
+        out = self._json_preference(user_id, "analytics_section_prefs")
+        if out is None:
             return {}
         try:
-            import json
-            out = json.loads(raw)
             return {k: bool(v) for k, v in out.items()}
-        except (json.JSONDecodeError, TypeError):
+        except (AttributeError, TypeError):
             return {}
 
     def set_analytics_section_prefs(self, user_id: str, prefs: Dict[str, bool]) -> Dict[str, Any]:
@@ -293,8 +505,7 @@ class UserStateManager:
     def get_productivity_goal_settings(self, user_id: str) -> Dict[str, Any]:
         """Get productivity goal tracking settings.
         
-        Uses an in-process cache (shared by Analytics and Settings); cache is
-        invalidated when set_productivity_goal_settings is called for the same user.
+        The JSON is parsed once per cached preferences version (see _CachedPrefs).
         
         Returns:
             Dict with:
@@ -307,21 +518,10 @@ class UserStateManager:
             - user_override_flag (bool, default False)
             - week_calculation_mode (str, default 'rolling'): 'rolling' or 'monday_based'
         """
-        import time
-        now = time.time()
-        with _productivity_goal_cache_lock:
-            if user_id in _productivity_goal_cache and user_id in _productivity_goal_cache_time:
-                if (now - _productivity_goal_cache_time[user_id]) < _productivity_goal_cache_ttl_seconds:
-                    return _productivity_goal_cache[user_id].copy()
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return {}
-        goal_settings_json = prefs.get("productivity_goal_settings", "")
-        if not goal_settings_json:
+        settings = self._json_preference(user_id, "productivity_goal_settings")
+        if settings is None:
             return {}
         try:
-            import json
-            settings = json.loads(goal_settings_json)
             # Ensure defaults
             if 'goal_hours_per_week' not in settings:
                 settings['goal_hours_per_week'] = 40.0
@@ -333,11 +533,8 @@ class UserStateManager:
                 settings['user_override_flag'] = False
             if 'week_calculation_mode' not in settings:
                 settings['week_calculation_mode'] = 'rolling'  # Default to rolling 7-day
-            with _productivity_goal_cache_lock:
-                _productivity_goal_cache[user_id] = settings.copy()
-                _productivity_goal_cache_time[user_id] = time.time()
             return settings
-        except (json.JSONDecodeError, TypeError):
+        except TypeError:
             return {}
     
     def set_productivity_goal_settings(self, user_id: str, settings: Dict[str, Any]) -> Dict[str, Any]:
@@ -375,9 +572,7 @@ class UserStateManager:
         
         settings_json = json.dumps(normalized)
         result = self.update_preference(user_id, "productivity_goal_settings", settings_json)
-        with _productivity_goal_cache_lock:
-            _productivity_goal_cache.pop(user_id, None)
-            _productivity_goal_cache_time.pop(user_id, None)
+        cache_registry.invalidate(PRODUCTIVITY_SETTINGS, user_id)
         return result
 
     def get_target_hours_settings(self, user_id: str) -> Dict[str, float]:
@@ -387,21 +582,16 @@ class UserStateManager:
             Dict with keys work, sleep, play, self_care (hours per day). Defaults: work from
             goal_hours_per_week/5, sleep 8, play 2, self_care 1.
         """
-        import json
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return self._default_target_hours(user_id)
-        raw = prefs.get("target_hours_settings", "")
-        if not raw:
+        data = self._json_preference(user_id, "target_hours_settings")
+        if data is None:
             return self._default_target_hours(user_id)
         try:
-            data = json.loads(raw)
             out = self._default_target_hours(user_id)
             for key in ('work', 'sleep', 'play', 'self_care'):
                 if key in data and data[key] is not None:
                     out[key] = max(0.0, min(24.0, float(data[key])))
             return out
-        except (json.JSONDecodeError, TypeError, ValueError):
+        except (TypeError, ValueError):
             return self._default_target_hours(user_id)
 
     def _default_target_hours(self, user_id: str) -> Dict[str, float]:
@@ -422,7 +612,9 @@ class UserStateManager:
         for key in ('work', 'sleep', 'play', 'self_care'):
             if key in settings and settings[key] is not None:
                 normalized[key] = max(0.0, min(24.0, float(settings[key])))
-        return self.update_preference(user_id, "target_hours_settings", json.dumps(normalized))
+        result = self.update_preference(user_id, "target_hours_settings", json.dumps(normalized))
+        cache_registry.invalidate(PRODUCTIVITY_SETTINGS, user_id)
+        return result
     
     def get_productivity_history(self, user_id: str) -> List[Dict[str, Any]]:
         """Get historical productivity tracking data (weekly snapshots).
@@ -436,19 +628,8 @@ class UserStateManager:
             - productivity_points (float)
             - recorded_at (ISO datetime string)
         """
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return []
-        
-        history_json = prefs.get("productivity_history", "")
-        if not history_json:
-            return []
-        
-        try:
-            import json
-            return json.loads(history_json)
-        except (json.JSONDecodeError, TypeError):
-            return []
+        value = self._json_preference(user_id, "productivity_history")
+        return value if value is not None else []
     
     def add_productivity_history_entry(
         self,
@@ -519,19 +700,8 @@ class UserStateManager:
         Returns:
             Dict of emotion -> value (0-100)
         """
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return {}
-        
-        emotion_json = prefs.get("persistent_emotion_values", "")
-        if not emotion_json:
-            return {}
-        
-        try:
-            import json
-            return json.loads(emotion_json)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        value = self._json_preference(user_id, "persistent_emotion_values")
+        return value if value is not None else {}
 
     def set_persistent_emotions(self, emotion_values: Dict[str, int], user_id: str = "default") -> Dict[str, Any]:
         """Set persistent emotion values that persist across tasks.
@@ -561,19 +731,8 @@ class UserStateManager:
         Returns:
             Dict of category_key -> category_label
         """
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return {}
-        
-        categories_json = prefs.get("cancellation_categories", "")
-        if not categories_json:
-            return {}
-        
-        try:
-            import json
-            return json.loads(categories_json)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        value = self._json_preference(user_id, "cancellation_categories")
+        return value if value is not None else {}
     
     def set_cancellation_categories(self, categories: Dict[str, str], user_id: str = "default") -> Dict[str, Any]:
         """Set custom cancellation categories for a user.
@@ -713,19 +872,8 @@ class UserStateManager:
         Returns:
             Dict of category_key -> penalty_multiplier (0.0 to 1.0)
         """
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return {}
-        
-        penalties_json = prefs.get("cancellation_penalties", "")
-        if not penalties_json:
-            return {}
-        
-        try:
-            import json
-            return json.loads(penalties_json)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        value = self._json_preference(user_id, "cancellation_penalties")
+        return value if value is not None else {}
     
     def set_cancellation_penalties(self, penalties: Dict[str, float], user_id: str = "default") -> Dict[str, Any]:
         """Set cancellation penalty multipliers for each category.
@@ -807,30 +955,21 @@ class UserStateManager:
             - selected_metrics: List of metric keys to display (default: ['productivity_time', 'productivity_score'])
             - coloration_baseline: Baseline for coloration ('last_3_months', 'last_month', 'last_week', 'average', 'all_data')
         """
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return {
-                'selected_metrics': ['productivity_time', 'productivity_score'],
-                'coloration_baseline': 'last_3_months'
-            }
-        
-        config_json = prefs.get("monitored_metrics_config", "")
-        if not config_json:
+        config = self._json_preference(user_id, "monitored_metrics_config")
+        if config is None:
             return {
                 'selected_metrics': ['productivity_time', 'productivity_score'],
                 'coloration_baseline': 'last_3_months'
             }
         
         try:
-            import json
-            config = json.loads(config_json)
             # Ensure defaults
             if 'selected_metrics' not in config:
                 config['selected_metrics'] = ['productivity_time', 'productivity_score']
             if 'coloration_baseline' not in config:
                 config['coloration_baseline'] = 'last_3_months'
             return config
-        except (json.JSONDecodeError, TypeError):
+        except TypeError:
             return {
                 'selected_metrics': ['productivity_time', 'productivity_score'],
                 'coloration_baseline': 'last_3_months'
@@ -843,19 +982,7 @@ class UserStateManager:
             Dict with chunking state (instances, current_index, execution_scores, etc.)
             or None if not found
         """
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return None
-        
-        state_json = prefs.get("execution_score_chunk_state", "")
-        if not state_json:
-            return None
-        
-        try:
-            import json
-            return json.loads(state_json)
-        except (json.JSONDecodeError, TypeError):
-            return None
+        return self._json_preference(user_id, "execution_score_chunk_state")
     
     def set_execution_score_chunk_state(self, state: Dict[str, Any], user_id: str = "default") -> Dict[str, Any]:
         """Persist execution score chunking state.
@@ -914,19 +1041,8 @@ class UserStateManager:
         Returns:
             Dict of milestone_id -> milestone_data (status, notes, etc.)
         """
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return {}
-        
-        milestones_json = prefs.get("milestones", "")
-        if not milestones_json:
-            return {}
-        
-        try:
-            import json
-            return json.loads(milestones_json)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        value = self._json_preference(user_id, "milestones")
+        return value if value is not None else {}
     
     def set_milestones(self, milestones: Dict[str, Dict[str, Any]], user_id: str = "default") -> Dict[str, Any]:
         """Set milestone tracking data.
@@ -972,19 +1088,8 @@ class UserStateManager:
         Returns:
             Dict of task_id -> goal_data (target_frequency, target_relief, etc.)
         """
-        prefs = self.get_user_preferences(user_id)
-        if not prefs:
-            return {}
-        
-        goals_json = prefs.get("template_goals", "")
-        if not goals_json:
-            return {}
-        
-        try:
-            import json
-            return json.loads(goals_json)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        value = self._json_preference(user_id, "template_goals")
+        return value if value is not None else {}
     
     def set_template_goals(self, goals: Dict[str, Dict[str, Any]], user_id: str = "default") -> Dict[str, Any]:
         """Set template-specific goals.
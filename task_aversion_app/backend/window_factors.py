@@ -0,0 +1,273 @@
+"""
+Sliding-window momentum, persistence and perseverance factors for whole frames.
+
+Analytics.calculate_momentum_factor, calculate_persistence_factor and
+calculate_perseverance_factor_v1_3 score one completed instance at a time. Each
+call re-parses the row and filters the user's other completions to a lookback
+window (24h clustering/volume, 7-day template repetition, 30-day task
+repetition and consistency). Applied to every completed row this is O(n^2).
+
+compute_window_factors() sorts the completions once by completed_at and finds
+every row's window with np.searchsorted (both ends inclusive, like the per-row
+`>= cutoff` / `<= completion time` filters). Window statistics come from
+cumulative sums:
+
+- clustering: the gaps of a sorted window telescope, so the average gap is
+  (last - first) / (n - 1)
+- acceleration: earlier/later mean durations from a cumulative sum of the
+  durations of completions with a numeric duration_minutes
+- same-task counts and consistency: per task, the same searchsorted on that
+  task's sorted times, and the variance of the gaps from cumulative sums of
+  the gaps and squared gaps
+
+The result is one array per factor, aligned positionally with `rows`. Values
+match the per-row methods for Series rows (predicted_dict as dict or JSON).
+Rows whose completed_at does not parse get the neutral 0.5 for every factor.
+"""
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.factor_engine import payload_floats
+
+_NS_PER_MINUTE = 60 * 10 ** 9
+_NS_PER_DAY = 24 * 60 * _NS_PER_MINUTE
+
+WINDOW_FACTOR_COLUMNS = (
+    'momentum_factor',
+    'persistence_factor',
+    'perseverance_factor',
+    'persistence_consistency',
+)
+
+
+def _truthy(value: Any) -> bool:
+    try:
+        return bool(value)
+    except (TypeError, ValueError):
+        return False
+
+
+def _to_ns(values: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse timestamps to int64 nanoseconds. Returns (ns, valid mask)."""
+    stamps = pd.to_datetime(pd.Series(values), errors='coerce')
+    if getattr(stamps.dt, 'tz', None) is not None:
+        stamps = stamps.dt.tz_convert(None)
+    valid = stamps.notna().to_numpy()
+    ns = np.zeros(len(stamps), dtype=np.int64)
+    ns[valid] = stamps[valid].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    return ns, valid
+
+
+def _column(frame: pd.DataFrame, name: str, default: Any) -> pd.Series:
+    if name in frame.columns:
+        return frame[name].reset_index(drop=True)
+    return pd.Series([default] * len(frame), dtype=object)
+
+
+def _window(sorted_ns: np.ndarray, at_ns: np.ndarray, span_ns: int) -> Tuple[np.ndarray, np.ndarray]:
+    """[lo, hi) positions of sorted_ns within [at - span, at]."""
+    lo = np.searchsorted(sorted_ns, at_ns - span_ns, side='left')
+    hi = np.searchsorted(sorted_ns, at_ns, side='right')
+    return lo, hi
+
+
+def count_score(count: np.ndarray) -> np.ndarray:
+    """1 -> 0.5, 5 -> 0.8, 10+ -> 1.0 (task repetition / template consistency)."""
+    count = np.asarray(count, dtype=float)
+    return np.select(
+        [count <= 1, count <= 5, count <= 10],
+        [np.full(count.shape, 0.5), 0.5 + (count - 1) / 4.0 * 0.3, 0.8 + (count - 5) / 5.0 * 0.2],
+        1.0,
+    )
+
+
+def load_score(value: np.ndarray) -> np.ndarray:
+    """0-50 -> 0.0-0.5, 50-100 -> 0.5-1.0; 0.5 when not positive (obstacle / aversion)."""
+    value = np.asarray(value, dtype=float)
+    with np.errstate(invalid='ignore'):
+        scaled = np.where(value <= 50, value / 100.0, 0.5 + (value - 50) / 50.0 * 0.5)
+        return np.where(value > 0, scaled, 0.5)
+
+
+def _volume_score(count: np.ndarray) -> np.ndarray:
+    count = count.astype(float)
+    return np.select(
+        [count <= 1, count <= 3, count <= 5, count <= 10],
+        [np.full(count.shape, 0.5), 0.5 + (count - 1) / 2.0 * 0.2,
+         0.7 + (count - 3) / 2.0 * 0.15, 0.85 + (count - 5) / 5.0 * 0.15],
+        1.0,
+    )
+
+
+def _clustering_score(first_ns: np.ndarray, last_ns: np.ndarray, count: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_gap = (last_ns - first_ns) / _NS_PER_MINUTE / (count - 1)
+        score = np.select(
+            [avg_gap <= 15, avg_gap <= 60, avg_gap <= 240],
+            [np.ones(avg_gap.shape), 1.0 - ((avg_gap - 15) / 45.0) * 0.5, 0.5 / (avg_gap / 60.0)],
+            0.1,
+        )
+    return np.where(count >= 2, score, 0.5)
+
+
+def _acceleration_score(lo: np.ndarray, hi: np.ndarray, cumulative: np.ndarray) -> np.ndarray:
+    count = hi - lo
+    mid = lo + count // 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        earlier = (cumulative[mid] - cumulative[lo]) / (mid - lo)
+        later = (cumulative[hi] - cumulative[mid]) / (hi - mid)
+        ratio = (later - earlier) / earlier
+        score = np.select(
+            [ratio <= -0.5, ratio <= 0, ratio <= 0.5],
+            [np.ones(ratio.shape), 0.5 + np.abs(ratio) / 0.5 * 0.5, 0.5 - ratio / 0.5 * 0.5],
+            0.0,
+        )
+    return np.where((count >= 3) & (earlier > 0), score, 0.5)
+
+
+def compute_window_factors(
+    rows: pd.DataFrame,
+    history: Optional[pd.DataFrame] = None,
+    task_completion_counts: Optional[Mapping[Any, int]] = None,
+    persistence_factors: Optional[Sequence[float]] = None,
+    lookback_hours: int = 24,
+    repetition_days: int = 7,
+    lookback_days: int = 30,
+) -> Dict[str, np.ndarray]:
+    """Momentum, persistence and perseverance (v1.3) factors for every row.
+
+    Args:
+        rows: Instances to score (completed_at, task_id, cognitive_load,
+            emotional_load, duration_minutes, predicted_dict)
+        history: The user's instances the windows are taken from (default: rows).
+            Only rows with a parseable completed_at count as completions.
+        task_completion_counts: Optional task_id -> count used for the repetition
+            component instead of the 30-day window count (per-row semantics)
+        persistence_factors: Completion count multipliers (1.0-5.0) per row that
+            scale perseverance consistency (default 1.0)
+        lookback_hours: Clustering/volume/acceleration window (momentum)
+        repetition_days: Template consistency window (momentum)
+        lookback_days: Repetition/consistency window (persistence, perseverance)
+
+    Returns:
+        Dict of float arrays aligned with rows: momentum_factor,
+        persistence_factor, perseverance_factor and persistence_consistency
+        (the consistency component, 0.5 when it cannot be measured)
+    """
+    n = len(rows)
+    if n == 0:
+        return {name: np.array([], dtype=float) for name in WINDOW_FACTOR_COLUMNS}
+    if history is None:
+        history = rows
+
+    at_ns, row_valid = _to_ns(_column(rows, 'completed_at', None))
+    hist_ns, hist_valid = _to_ns(_column(history, 'completed_at', None))
+
+    # Task ids of rows and history share one code space (-1 = missing)
+    row_tasks = _column(rows, 'task_id', None)
+    hist_tasks = _column(history, 'task_id', None)
+    codes, _ = pd.factorize(pd.concat([hist_tasks, row_tasks], ignore_index=True))
+    hist_codes = codes[:len(history)][hist_valid]
+    row_codes = codes[len(history):]
+    has_task = np.array([_truthy(tid) for tid in row_tasks], dtype=bool) & (row_codes >= 0)
+
+    # All completions, sorted once
+    hist_durations = pd.to_numeric(_column(history, 'duration_minutes', 0), errors='coerce').to_numpy(dtype=float)
+    hist_durations = hist_durations[hist_valid]
+    hist_ns = hist_ns[hist_valid]
+    order = np.argsort(hist_ns, kind='mergesort')
+    sorted_ns = hist_ns[order]
+    sorted_codes = hist_codes[order]
+    sorted_durations = hist_durations[order]
+
+    # --- Momentum ---
+    lo, hi = _window(sorted_ns, at_ns, lookback_hours * 60 * _NS_PER_MINUTE)
+    count = hi - lo
+    if len(sorted_ns):
+        first = sorted_ns[np.minimum(lo, len(sorted_ns) - 1)]
+        last = sorted_ns[np.maximum(hi - 1, 0)]
+    else:
+        first = last = np.zeros(n, dtype=np.int64)
+    clustering = _clustering_score(first.astype(float), last.astype(float), count)
+    volume = _volume_score(count)
+
+    timed = ~np.isnan(sorted_durations)
+    timed_ns = sorted_ns[timed]
+    duration_sums = np.concatenate(([0.0], np.cumsum(sorted_durations[timed])))
+    t_lo, t_hi = _window(timed_ns, at_ns, lookback_hours * 60 * _NS_PER_MINUTE)
+    acceleration = _acceleration_score(t_lo, t_hi, duration_sums)
+    row_has_duration = np.array([_truthy(v) for v in _column(rows, 'duration_minutes', 0)], dtype=bool)
+    acceleration = np.where(row_has_duration, acceleration, 0.5)
+
+    # --- Per-task windows ---
+    template_count = np.zeros(n, dtype=np.int64)
+    repetition_window_count = np.zeros(n, dtype=np.int64)
+    consistency = np.full(n, 0.5)
+    consistency_measured = np.zeros(n, dtype=bool)
+    for code in np.unique(row_codes[has_task]):
+        members = np.flatnonzero(has_task & (row_codes == code))
+        task_ns = sorted_ns[sorted_codes == code]
+        if len(task_ns) == 0:
+            continue
+        at = at_ns[members]
+        t_lo, t_hi = _window(task_ns, at, repetition_days * _NS_PER_DAY)
+        template_count[members] = t_hi - t_lo
+
+        c_lo, c_hi = _window(task_ns, at, lookback_days * _NS_PER_DAY)
+        repetition_window_count[members] = c_hi - c_lo
+        gaps = np.diff(task_ns) / _NS_PER_DAY
+        gap_sums = np.concatenate(([0.0], np.cumsum(gaps)))
+        gap_squares = np.concatenate(([0.0], np.cumsum(gaps * gaps)))
+        k = c_hi - c_lo
+        measured = k >= 3
+        if not measured.any():
+            continue
+        a = c_lo[measured]
+        b = c_hi[measured] - 1
+        m = (b - a).astype(float)
+        mean = (gap_sums[b] - gap_sums[a]) / m
+        variance = np.maximum(0.0, (gap_squares[b] - gap_squares[a]) / m - mean * mean)
+        consistency[members[measured]] = np.clip(1.0 - np.minimum(1.0, variance / 900.0), 0.0, 1.0)
+        consistency_measured[members[measured]] = True
+
+    template_consistency = np.where(has_task, count_score(template_count), 0.5)
+    momentum = clustering * 0.4 + volume * 0.3 + template_consistency * 0.2 + acceleration * 0.1
+
+    # --- Persistence / perseverance ---
+    cognitive = pd.to_numeric(_column(rows, 'cognitive_load', 0), errors='coerce').to_numpy(dtype=float)
+    emotional = pd.to_numeric(_column(rows, 'emotional_load', 0), errors='coerce').to_numpy(dtype=float)
+    obstacle = load_score((cognitive + emotional) / 2.0)
+    aversion = load_score(payload_floats(_column(rows, 'predicted_dict', None).tolist(), 'initial_aversion', 'aversion'))
+
+    completion_count = repetition_window_count.astype(float)
+    if task_completion_counts:
+        for i, tid in enumerate(row_tasks):
+            if has_task[i] and tid in task_completion_counts:
+                completion_count[i] = task_completion_counts[tid]
+    repetition = np.where(has_task, count_score(completion_count), 0.5)
+
+    if persistence_factors is None:
+        multipliers = np.ones(n)
+    else:
+        multipliers = np.asarray(persistence_factors, dtype=float)
+    scaled_consistency = np.where(
+        consistency_measured,
+        np.clip(consistency / (1.0 + (multipliers - 1.0) * 0.125), 0.0, 1.0),
+        consistency,
+    )
+
+    base = obstacle * 0.4 + aversion * 0.3 + repetition * 0.2
+    persistence = base + consistency * 0.1
+    perseverance = base + scaled_consistency * 0.1
+
+    def finish(values: np.ndarray) -> np.ndarray:
+        return np.where(row_valid, np.clip(values, 0.0, 1.0), 0.5)
+
+    return {
+        'momentum_factor': finish(momentum),
+        'persistence_factor': finish(persistence),
+        'perseverance_factor': finish(perseverance),
+        'persistence_consistency': np.where(row_valid, consistency, 0.5),
+    }
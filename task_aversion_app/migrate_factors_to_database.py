@@ -1,18 +1,25 @@
 #!/usr/bin/env python
 """
-Migration script to calculate and store serendipity_factor and disappointment_factor
-for existing task instances in the database.
+Migration script to (re)calculate the stored factor columns of task instances.
 
-This script:
-1. Loads all completed task instances
-2. Calculates factors from expected_relief and actual_relief
-3. Stores the calculated values in the database
+Recomputes procrastination_score, proactive_score, behavioral_score, net_relief,
+net_emotional, serendipity_factor and disappointment_factor with
+backend.factor_engine:
+1. Reads instances in chunks of instance_id order (per user)
+2. Computes the factors for the whole chunk with array math
+3. Writes only changed rows back in one executemany UPDATE per chunk
 
-Run this after adding the new columns to the database schema.
+Interrupted runs resume after the last committed chunk (checkpoint in
+data/factor_recompute_checkpoint.json). Run this after adding factor columns or
+bumping FACTOR_VERSION.
+
+Usage:
+    python migrate_factors_to_database.py [--user USER_ID] [--chunk-size N] [--restart]
 """
+import argparse
 import os
 import sys
-from datetime import datetime
+import time
 
 # Set DATABASE_URL
 os.environ['DATABASE_URL'] = os.getenv('DATABASE_URL', 'sqlite:///data/task_aversion.db')
@@ -20,10 +27,17 @@ os.environ['DATABASE_URL'] = os.getenv('DATABASE_URL', 'sqlite:///data/task_aver
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from backend.database import init_db, get_session, TaskInstance
+from backend.database import init_db, get_session
+from backend.factor_engine import FACTOR_VERSION, recompute_factors
+
+parser = argparse.ArgumentParser(description="Recompute stored factor columns of task instances")
+parser.add_argument('--user', type=int, default=None, help="Only recompute this user_id (default: all users)")
+parser.add_argument('--chunk-size', type=int, default=2000, help="Rows per chunk / commit (default: 2000)")
+parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint of an interrupted run")
+args = parser.parse_args()
 
 print("=" * 70)
-print("Factor Migration: Calculate and Store Serendipity/Disappointment Factors")
+print(f"Factor Migration: Recompute Stored Factor Columns (version {FACTOR_VERSION})")
 print("=" * 70)
 
 # Initialize database (creates tables if they don't exist)
@@ -31,109 +45,29 @@ print("\n1. Initializing database...")
 init_db()
 print("   [OK] Database initialized")
 
-# Load all completed instances
-print("\n2. Loading completed task instances...")
-with get_session() as session:
-    instances = session.query(TaskInstance).filter(
-        TaskInstance.is_completed == True,
-        TaskInstance.completed_at.isnot(None)
-    ).all()
-    print(f"   Found {len(instances)} completed instance(s)")
-
-if len(instances) == 0:
-    print("\n   [INFO] No completed instances found. Nothing to migrate.")
-    sys.exit(0)
-
-# Helper function to normalize relief values
-def normalize_relief(val):
-    """Normalize relief value: scale 0-10 to 0-100 if needed."""
-    if val is None:
-        return None
-    try:
-        val = float(val)
-        # Note: All inputs now use 0-100 scale natively.
-        # Old data may have 0-10 scale values, but we use them as-is (no scaling).
-        return val
-    except (ValueError, TypeError):
-        return None
-
-# Calculate and store factors
-print("\n3. Calculating and storing factors...")
-updated = 0
-skipped = 0
-errors = 0
-
-with get_session() as session:
-    for instance in instances:
-        try:
-            # Get expected and actual relief from JSON
-            predicted = instance.predicted or {}
-            actual = instance.actual or {}
-            
-            expected_relief = predicted.get('expected_relief')
-            actual_relief = actual.get('actual_relief')
-            
-            # Normalize relief values
-            expected_relief = normalize_relief(expected_relief)
-            actual_relief = normalize_relief(actual_relief)
-            
-            # If we have both values, calculate factors
-            if expected_relief is not None and actual_relief is not None:
-                net_relief = actual_relief - expected_relief
-                
-                # Store net_relief if not already set
-                if instance.net_relief is None:
-                    instance.net_relief = net_relief
-                
-                # Only update factors if they're missing (idempotent - safe to run multiple times)
-                needs_update = (
-                    instance.serendipity_factor is None or 
-                    instance.disappointment_factor is None
-                )
-                
-                if needs_update:
-                    # Calculate factors
-                    instance.serendipity_factor = max(0.0, net_relief)  # Positive net relief
-                    instance.disappointment_factor = max(0.0, -net_relief)  # Negative net relief (as positive value)
-                    
-                    updated += 1
-                    if updated % 10 == 0:
-                        print(f"   Processed {updated} instance(s)...")
-                else:
-                    # Factors already exist, skip
-                    skipped += 1
-            else:
-                # Skip if we don't have both values
-                skipped += 1
-                if instance.serendipity_factor is None:
-                    instance.serendipity_factor = None
-                if instance.disappointment_factor is None:
-                    instance.disappointment_factor = None
-                
-        except Exception as e:
-            errors += 1
-            print(f"   [ERROR] Instance {instance.instance_id}: {e}")
-            instance.serendipity_factor = None
-            instance.disappointment_factor = None
-    
-    # Commit all changes
-    print("\n4. Committing changes to database...")
-    session.commit()
-    print("   [OK] Changes committed")
+scope = f"user {args.user}" if args.user is not None else "all users"
+print(f"\n2. Recomputing factors for {scope} (chunk size {args.chunk_size})...")
+started = time.perf_counter()
+try:
+    updated_by_user = recompute_factors(
+        get_session,
+        user_id=args.user,
+        chunk_size=args.chunk_size,
+        resume=not args.restart,
+    )
+except Exception as e:
+    print(f"\n[ERROR] Recompute failed: {e}")
+    print("   Committed chunks are kept; run the script again to resume.")
+    sys.exit(1)
+elapsed = time.perf_counter() - started
 
 # Summary
 print("\n" + "=" * 70)
 print("Migration Summary")
 print("=" * 70)
-print(f"Total instances processed: {len(instances)}")
-print(f"Successfully updated: {updated}")
-print(f"Skipped (already have factors or missing data): {skipped}")
-print(f"Errors: {errors}")
+print(f"Users processed: {len(updated_by_user)}")
+print(f"Rows updated: {sum(updated_by_user.values())}")
+print(f"Elapsed: {elapsed:.1f}s")
 print("=" * 70)
-
-if errors > 0:
-    print("\n[WARNING] Some instances had errors. Check the output above for details.")
-    sys.exit(1)
-else:
-    print("\n[SUCCESS] Migration completed successfully!")
-    sys.exit(0)
+print("\n[SUCCESS] Migration completed successfully!")
+sys.exit(0)
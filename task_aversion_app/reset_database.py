@@ -119,7 +119,7 @@ def reset_sqlite() -> bool:
 
     print("\nInitializing schema (init_db)...")
     try:
-        init_db()
+        init_db(force=True)
         print("[OK] Schema initialized.")
     except Exception as e:
         print(f"[ERROR] init_db failed: {e}")
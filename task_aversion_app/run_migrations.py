@@ -137,6 +137,9 @@ def run_sqlite_migrations() -> bool:
     # Cross-DB migrations that support both PostgreSQL and SQLite (e.g. 015)
     cross_db = [
         ("015_add_due_at_to_task_instances.py", "015 Add due_at to task_instances"),
+        ("019_add_updated_at_to_task_instances.py", "019 Add updated_at to task_instances"),
+        ("023_add_extra_preferences_to_user_preferences.py", "023 Add extra_preferences to user_preferences"),
+        ("025_add_execution_score_to_task_instances.py", "025 Add execution_score to task_instances"),
     ]
     mig_dir = _APP_ROOT / "PostgreSQL_migration"
     for filename, desc in cross_db:
@@ -55,6 +55,8 @@ def backfill_aversion(dry_run=True, default_value=0, use_database=None):
     
     updated_count = 0
     changes_summary = []
+    # user_id -> update_predicted transitions, applied in one batch per user
+    pending = {}
     
     # Get all instances
     if im.use_db:
@@ -140,40 +142,11 @@ def backfill_aversion(dry_run=True, default_value=0, use_database=None):
                         # This might be the first time, set initial_aversion too
                         predicted['initial_aversion'] = backfill_value
                 
-                # Save the update
-                if not dry_run:
-                    if im.use_db:
-                        # Update database - merge with existing predicted data
-                        try:
-                            with im.db_session() as session:
-                                db_instance = session.query(im.TaskInstance).filter(
-                                    im.TaskInstance.instance_id == instance_id
-                                ).first()
-                                if db_instance:
-                                    # Merge with existing predicted data
-                                    existing_predicted = db_instance.predicted or {}
-                                    existing_predicted.update(predicted)
-                                    db_instance.predicted = existing_predicted
-                                    session.commit()
-                                    updated_count += 1
-                        except Exception as e:
-                            print(f"[Backfill] Error updating {instance_id} in database: {e}")
-                    else:
-                        # Update CSV - merge with existing predicted data
-                        try:
-                            idx = im.df.index[im.df['instance_id'] == instance_id]
-                            if len(idx) > 0:
-                                existing_predicted_str = im.df.at[idx[0], 'predicted'] or '{}'
-                                try:
-                                    existing_predicted = json.loads(existing_predicted_str) if existing_predicted_str else {}
-                                except json.JSONDecodeError:
-                                    existing_predicted = {}
-                                existing_predicted.update(predicted)
-                                im.df.at[idx[0], 'predicted'] = json.dumps(existing_predicted)
-                                im._save_csv()
-                                updated_count += 1
-                        except Exception as e:
-                            print(f"[Backfill] Error updating {instance_id} in CSV: {e}")
+                # Queue the update (merged into the stored predicted payload)
+                owner = instance.get('user_id')
+                pending.setdefault(None if owner in (None, '') else str(owner), []).append(
+                    {'op': 'update_predicted', 'instance_id': instance_id, 'predicted': predicted}
+                )
                 
                 # Record change
                 task_name = instance.get('task_name', 'Unknown')
@@ -187,6 +160,15 @@ def backfill_aversion(dry_run=True, default_value=0, use_database=None):
             print(f"[Backfill] Error processing instance {instance_id}: {e}")
             continue
     
+    # Save the updates: one transaction and one cache invalidation per user
+    if not dry_run:
+        for owner, transitions in pending.items():
+            try:
+                im.apply_transitions(transitions, user_id=int(owner) if owner and owner.isdigit() else None)
+                updated_count += len(transitions)
+            except Exception as e:
+                print(f"[Backfill] Error updating {len(transitions)} instances of user {owner}: {e}")
+    
     # Print summary
     print(f"\n[Backfill Aversion] Summary:")
     print(f"  Instances found: {len(instances)}")
@@ -44,25 +44,10 @@ def run_analytics_page_backend(user_id: int = 1, warm: bool = False) -> None:
     analytics = Analytics()
 
     if not warm:
-        # Cold load: clear caches
-        for attr in (
-            "_relief_summary_cache", "_relief_summary_cache_time",
-            "_life_balance_cache", "_life_balance_cache_time",
-            "_composite_scores_cache", "_composite_scores_cache_time",
-            "_instances_cache_all", "_instances_cache_all_time",
-            "_instances_cache_completed", "_instances_cache_completed_time",
-            "_dashboard_metrics_cache", "_dashboard_metrics_cache_time",
-            "_time_tracking_cache", "_time_tracking_cache_time",
-            "_time_tracking_cache_params",
-            "_trend_series_cache", "_trend_series_cache_time",
-            "_attribute_distribution_cache", "_attribute_distribution_cache_time",
-            "_stress_dimension_cache", "_stress_dimension_cache_time",
-            "_rankings_cache", "_leaderboard_cache", "_leaderboard_cache_time",
-            "_leaderboard_cache_top_n",
-        ):
-            c = getattr(Analytics, attr, None)
-            if c is not None and hasattr(c, "clear"):
-                c.clear()
+        # Cold load: clear caches (registered Analytics products; base frames are separate)
+        from backend.cache_registry import cache_registry
+        cache_registry.clear_all()
+        Analytics._instances_base_cache.clear()
 
     # 1. Warm instances (build_analytics_page does this first)
     analytics._load_instances(user_id=user_id)
@@ -156,6 +141,15 @@ def main() -> int:
     output = s.getvalue()
     print(output)
 
+    from backend.bounded_cache import cache_stats
+
+    print("Cache namespaces (entries / hits / misses / evictions / bytes):")
+    for namespace, st in sorted(cache_stats().items()):
+        print(
+            f"  {namespace:40s} {st['entries']:>5} {st['hits']:>6} {st['misses']:>6} "
+            f"{st['evictions']:>5} {st['bytes']:>10}"
+        )
+
     if args.output:
         out_path = Path(args.output)
         stamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
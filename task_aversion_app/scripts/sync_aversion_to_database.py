@@ -51,6 +51,21 @@ def sync_aversion_csv_to_db(dry_run=True):
     
     updated_count = 0
     changes_summary = []
+    # user_id -> update_predicted transitions, applied in one batch per user
+    pending = {}
+    
+    # Load predicted data of every database instance in one query
+    try:
+        with im.db_session() as session:
+            db_rows = {
+                instance_id: (user_id, predicted)
+                for instance_id, user_id, predicted in session.query(
+                    im.TaskInstance.instance_id, im.TaskInstance.user_id, im.TaskInstance.predicted
+                )
+            }
+    except Exception as e:
+        print(f"[Sync] Error loading database instances: {e}")
+        return 0
     
     # Process each CSV row
     for idx, row in csv_df.iterrows():
@@ -77,54 +92,48 @@ def sync_aversion_csv_to_db(dry_run=True):
             if csv_aversion is None:
                 continue  # No aversion in CSV, skip
             
-            # Get database instance
-            try:
-                with im.db_session() as session:
-                    db_instance = session.query(im.TaskInstance).filter(
-                        im.TaskInstance.instance_id == instance_id
-                    ).first()
-                    
-                    if not db_instance:
-                        continue  # Instance not in database yet
-                    
-                    # Get database predicted data
-                    db_predicted = db_instance.predicted or {}
-                    if not isinstance(db_predicted, dict):
-                        db_predicted = {}
-                    
-                    # Check if database already has aversion
-                    db_aversion = (db_predicted.get('initial_aversion') or 
-                                 db_predicted.get('expected_aversion') or 
-                                 db_predicted.get('aversion'))
-                    
-                    # Update if CSV has aversion and database doesn't, or if they differ
-                    if db_aversion is None or db_aversion != csv_aversion:
-                        # Merge CSV predicted data into database
-                        db_predicted['expected_aversion'] = csv_aversion
-                        
-                        # Also set initial_aversion if CSV has it
-                        if 'initial_aversion' in predicted_csv:
-                            db_predicted['initial_aversion'] = predicted_csv['initial_aversion']
-                        
-                        if not dry_run:
-                            db_instance.predicted = db_predicted
-                            session.commit()
-                            updated_count += 1
-                        
-                        task_name = row.get('task_name', 'Unknown')
-                        changes_summary.append({
-                            'instance_id': instance_id,
-                            'task_name': task_name,
-                            'csv_aversion': csv_aversion,
-                            'db_aversion': db_aversion
-                        })
-            except Exception as e:
-                print(f"[Sync] Error processing {instance_id}: {e}")
-                continue
+            if instance_id not in db_rows:
+                continue  # Instance not in database yet
+            user_id, db_predicted = db_rows[instance_id]
+            if not isinstance(db_predicted, dict):
+                db_predicted = {}
+            
+            # Check if database already has aversion
+            db_aversion = (db_predicted.get('initial_aversion') or 
+                         db_predicted.get('expected_aversion') or 
+                         db_predicted.get('aversion'))
+            
+            # Update if CSV has aversion and database doesn't, or if they differ
+            if db_aversion is None or db_aversion != csv_aversion:
+                # Merged into the database predicted data by apply_transitions
+                update = {'expected_aversion': csv_aversion}
+                # Also set initial_aversion if CSV has it
+                if 'initial_aversion' in predicted_csv:
+                    update['initial_aversion'] = predicted_csv['initial_aversion']
+                pending.setdefault(user_id, []).append(
+                    {'op': 'update_predicted', 'instance_id': instance_id, 'predicted': update}
+                )
+                
+                task_name = row.get('task_name', 'Unknown')
+                changes_summary.append({
+                    'instance_id': instance_id,
+                    'task_name': task_name,
+                    'csv_aversion': csv_aversion,
+                    'db_aversion': db_aversion
+                })
         except Exception as e:
             print(f"[Sync] Error processing row {idx}: {e}")
             continue
     
+    # Apply the updates: one transaction and one cache invalidation per user
+    if not dry_run:
+        for user_id, transitions in pending.items():
+            try:
+                im.apply_transitions(transitions, user_id=user_id)
+                updated_count += len(transitions)
+            except Exception as e:
+                print(f"[Sync] Error updating {len(transitions)} instances of user {user_id}: {e}")
+    
     # Print summary
     print(f"\n[Sync Aversion] Summary:")
     print(f"  CSV instances: {len(csv_df)}")
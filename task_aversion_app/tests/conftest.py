@@ -0,0 +1,76 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend import (
+    analytics,
+    database,
+    gap_detector,
+    instance_manager as instance_manager_module,
+    performance_logger,
+    recommendation_logger,
+    task_manager,
+    user_state,
+)
+from backend.database import Base, TaskInstance, TaskInstanceProjection
+from backend.instance_manager import InstanceManager
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Sessions on a fresh SQLite database with every table created."""
+    engine = create_engine(f'sqlite:///{tmp_path / "test.db"}')
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def instance_manager(session_factory):
+    """Database-mode InstanceManager on session_factory (no CSV fallback, fresh freshness checks)."""
+    manager = InstanceManager.__new__(InstanceManager)
+    manager.use_db = True
+    manager.strict_mode = True
+    manager.TaskInstance = TaskInstance
+    manager.TaskInstanceProjection = TaskInstanceProjection
+    manager.db_session = session_factory
+    InstanceManager._task_stats_checked.clear()
+    InstanceManager._metric_sketch_checked.clear()
+    return manager
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point DATABASE_URL, the data directory and data/logs at tmp_path instead of task_aversion_app/data.
+
+    backend.database builds its engine at import, so the engine and session factory
+    are swapped too; spawned worker processes pick up the DATABASE_URL variable.
+    """
+    data = tmp_path / 'data'
+    logs = data / 'logs'
+    logs.mkdir(parents=True)
+    url = f'sqlite:///{data / "task_aversion.db"}'
+    engine = create_engine(url, connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    monkeypatch.setenv('DATABASE_URL', url)
+    monkeypatch.setattr(database, 'DATABASE_URL', url)
+    monkeypatch.setattr(database, 'engine', engine)
+    monkeypatch.setattr(database, 'SessionLocal', sessionmaker(bind=engine, autocommit=False, autoflush=False))
+    monkeypatch.setattr(database, '_db_initialized', False)
+    monkeypatch.setattr(database, '_async_engine', None)
+    monkeypatch.setattr(database, '_AsyncSessionLocal', None)
+    monkeypatch.setattr(database, '_async_db_checked', False)
+
+    for module in (analytics, gap_detector, instance_manager_module, task_manager, user_state):
+        monkeypatch.setattr(module, 'DATA_DIR', str(data))
+    monkeypatch.setattr(gap_detector, 'PREFERENCES_FILE', str(data / 'user_preferences.csv'))
+    monkeypatch.setattr(user_state, 'PREFS_FILE', str(data / 'user_preferences.csv'))
+    monkeypatch.setattr(performance_logger.get_perf_logger(), 'log_file', str(logs / 'initialization_performance.log'))
+    monkeypatch.setattr(recommendation_logger, 'LOG_DIR', str(logs))
+    monkeypatch.setattr(recommendation_logger, 'REC_LOG_FILE', str(logs / 'recommendations.jsonl'))
+    debug_handler = logging.FileHandler(str(logs / 'recommendation_debug.log'), encoding='utf-8', delay=True)
+    monkeypatch.setattr(recommendation_logger.logger, 'handlers', [debug_handler])
+    yield data
+    debug_handler.close()
+    engine.dispose()
@@ -0,0 +1,42 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend import analytics_pool, user_state
+
+pytestmark = pytest.mark.usefixtures('data_dir')
+
+
+def test_pool_runs_offloaded_methods_in_worker_process(monkeypatch):
+    monkeypatch.setenv('ANALYTICS_PROCESSES', '1')
+    analytics_pool.shutdown_analytics_pool()
+    try:
+        local = analytics_pool._run_local('get_emotional_flow_data', {'user_id': 1})
+        pooled = analytics_pool.run_analytics_sync('get_emotional_flow_data', user_id=1)
+        assert analytics_pool._executor is not None
+        assert pooled == local
+        assert asyncio.run(analytics_pool.run_analytics('get_emotional_flow_data', user_id=1)) == local
+
+        with pytest.raises(ValueError):
+            analytics_pool.submit('get_chart_data', user_id=1)
+    finally:
+        analytics_pool.shutdown_analytics_pool()
+
+
+def test_worker_drops_cached_preferences_on_new_user_epoch(monkeypatch):
+    monkeypatch.setattr(analytics_pool, '_worker_analytics', SimpleNamespace(
+        cached_settings=lambda user_id: user_state._prefs_cache.get(str(user_id)),
+    ))
+    monkeypatch.setattr(analytics_pool, '_worker_global_epoch', 0)
+    monkeypatch.setattr(analytics_pool, '_worker_user_epochs', {'1': 3})
+    user_state._prefs_cache['1'] = 'stale settings'
+    user_state._prefs_cache['2'] = 'other user'
+    try:
+        # Same epoch: the worker keeps what it cached
+        assert analytics_pool._run_in_worker('cached_settings', {'user_id': 1}, 0, 3) == 'stale settings'
+        # Settings saved in the server process bumped user 1's epoch
+        assert analytics_pool._run_in_worker('cached_settings', {'user_id': 1}, 0, 4) is None
+        assert user_state._prefs_cache.get('2') == 'other user'
+    finally:
+        user_state.invalidate_preferences_cache()
@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend import database
+from backend.database import Base, TaskInstance, get_async_database_url
+from backend.instance_manager import InstanceManager
+
+
+def test_async_database_url_mapping():
+    assert get_async_database_url('sqlite:///data/task_aversion.db') == 'sqlite+aiosqlite:///data/task_aversion.db'
+    assert get_async_database_url('postgresql://u:p@db:5432/app?sslmode=require') == \
+        'postgresql+asyncpg://u:p@db:5432/app?ssl=require'
+    assert get_async_database_url('postgresql+psycopg2://u@db/app') == 'postgresql+asyncpg://u@db/app'
+    assert get_async_database_url('mysql://u@db/app') is None
+
+
+def test_get_instances_bulk_async_matches_sync(tmp_path, monkeypatch):
+    pytest.importorskip('aiosqlite')
+    pytest.importorskip('greenlet')
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    db_file = tmp_path / 'async.db'
+    engine = create_engine(f'sqlite:///{db_file}')
+    Base.metadata.create_all(engine)
+    sync_session = sessionmaker(bind=engine)
+    with sync_session() as session:
+        session.add_all([
+            TaskInstance(instance_id='i1', task_id='t1', task_name='Task', user_id=1,
+                         predicted={}, actual={}, started_at=datetime(2026, 3, 1, 9)),
+            TaskInstance(instance_id='i2', task_id='t1', task_name='Task', user_id=2, predicted={}, actual={}),
+        ])
+        session.commit()
+
+    async_engine = create_async_engine(f'sqlite+aiosqlite:///{db_file}')
+    monkeypatch.setattr(database, '_async_db_checked', True)
+    monkeypatch.setattr(database, '_async_engine', async_engine)
+    monkeypatch.setattr(database, '_AsyncSessionLocal', async_sessionmaker(bind=async_engine, expire_on_commit=False))
+
+    manager = InstanceManager.__new__(InstanceManager)
+    manager.use_db = True
+    manager.strict_mode = True
+    manager.TaskInstance = TaskInstance
+    manager.db_session = sync_session
+
+    async def reads():
+        try:
+            bulk = await manager.get_instances_bulk_async(['i1', 'i2', 'missing'], user_id=1)
+            single = await manager.get_instance_async('i2', user_id=1)
+            return bulk, single
+        finally:
+            await async_engine.dispose()
+
+    bulk, single = asyncio.run(reads())
+    assert bulk == manager.get_instances_bulk(['i1', 'i2', 'missing'], user_id=1)
+    assert list(bulk) == ['i1'] and bulk['i1']['started_at']
+    assert single is None  # other user's instance
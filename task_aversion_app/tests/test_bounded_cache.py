@@ -0,0 +1,46 @@
+import time
+
+import pandas as pd
+
+from backend.bounded_cache import BoundedCache, estimate_size
+
+
+def test_lru_eviction_by_entry_count():
+    cache = BoundedCache('test.lru', max_entries=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1  # 'a' becomes most recently used
+    cache['c'] = 3
+
+    assert 'b' not in cache
+    assert cache.keys() == ['a', 'c']
+    assert cache.stats()['evictions'] == 1
+
+
+def test_ttl_expiry_counts_as_miss():
+    cache = BoundedCache('test.ttl', max_entries=4, ttl_seconds=0.05)
+    cache['a'] = 'value'
+    assert cache.get('a') == 'value'
+    time.sleep(0.06)
+
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (1, 1, 1)
+    assert stats['entries'] == 0
+
+
+def test_byte_budget_evicts_oldest_frames():
+    frame = pd.DataFrame({'x': range(1000)})
+    budget = int(estimate_size(frame) * 2.5)
+    cache = BoundedCache('test.bytes', max_entries=100, max_bytes=budget)
+    for key in ('1', '2', '3'):
+        cache[key] = frame.copy()
+
+    assert cache.keys() == ['2', '3']
+    assert cache.size_bytes <= budget
+    # A value larger than the whole budget is not stored and does not flush the rest
+    cache['big'] = pd.concat([frame] * 3)
+    assert 'big' not in cache and len(cache) == 2
+
+    assert cache.discard(lambda key: key == '2') == 1
+    assert cache.pop('3') is not None and cache.size_bytes == 0
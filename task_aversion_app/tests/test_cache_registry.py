@@ -0,0 +1,41 @@
+import pytest
+
+from backend.analytics import Analytics
+from backend.cache_registry import (
+    CacheRegistry,
+    GAP_PREFERENCE,
+    INSTANCES,
+    TASKS,
+    cache_registry,
+)
+
+pytestmark = pytest.mark.usefixtures('data_dir')
+
+
+def test_invalidate_only_drops_dependents_for_that_user():
+    registry = CacheRegistry()
+    instances_store = {'1': 'a', '2': 'b'}
+    tasks_store = {'1': 'c', '2': 'd'}
+    registry.register('instances_product', (instances_store,), (INSTANCES,))
+    registry.register('tasks_product', (tasks_store,), (TASKS, INSTANCES))
+
+    assert sorted(registry.invalidate(TASKS, user_id=1)) == ['tasks_product']
+    assert instances_store == {'1': 'a', '2': 'b'}
+    assert tasks_store == {'2': 'd'}
+
+    registry.invalidate(INSTANCES)
+    assert instances_store == {} and tasks_store == {}
+
+
+def test_analytics_instances_invalidation_keeps_other_users():
+    Analytics._relief_summary_cache.update({'1': 'r1', '2': 'r2'})
+    Analytics._trend_series_cache.update({'1': 't1', '2': 't2'})
+    try:
+        Analytics()._invalidate_instances_cache(user_id=1)
+        assert '1' not in Analytics._relief_summary_cache
+        assert '1' not in Analytics._trend_series_cache
+        assert Analytics._relief_summary_cache.get('2') == 'r2'
+        assert Analytics._trend_series_cache.get('2') == 't2'
+        assert 'analytics.trend_series' in cache_registry.dependents(GAP_PREFERENCE)
+    finally:
+        cache_registry.clear_all()
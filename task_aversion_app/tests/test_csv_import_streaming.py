@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+import backend.csv_import as csv_import
+from backend.database import Base, Note, PopupTrigger, Task
+
+
+def _session(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "import.db"}')
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _write_csv(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_iter_csv_chunks_caps_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_import, 'MAX_ROWS_PER_CSV', 5)
+    csv_path = _write_csv(tmp_path / 'rows.csv', 'a,b\n' + ''.join(f'{i},\n' for i in range(12)))
+    chunks = list(csv_import.iter_csv_chunks(csv_path, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0]['b'].tolist() == ['', '']
+
+
+def test_notes_import_resolves_existing_keys_per_chunk(tmp_path):
+    session = _session(tmp_path)
+    session.add_all([
+        Note(note_id='n1', content='mine', timestamp=datetime(2026, 1, 1), user_id=1),
+        Note(note_id='n2', content='theirs', timestamp=datetime(2026, 1, 1), user_id=2),
+    ])
+    session.commit()
+    csv_path = _write_csv(tmp_path / 'notes.csv', (
+        'note_id,content,timestamp,user_id\n'
+        'n1,again,2026-02-01 10:00:00,\n'
+        'n2,steal,2026-02-01 10:00:00,\n'
+        'n3,new,2026-02-01 10:00:00,1\n'
+        'n3,duplicate,2026-02-01 10:00:00,1\n'
+        'n4,other user,2026-02-01 10:00:00,2\n'
+        ',missing id,,\n'
+    ))
+
+    assert csv_import.import_notes_from_csv(csv_path, session, user_id=1) == (1, 4, 1)
+    assert session.get(Note, 'n1').content == 'mine'
+    assert session.get(Note, 'n2').user_id == 2
+    assert session.get(Note, 'n3').content == 'new'
+    assert session.get(Note, 'n4') is None
+
+
+def test_popup_triggers_update_and_insert_in_bulk(tmp_path):
+    session = _session(tmp_path)
+    session.add(PopupTrigger(user_id='1', trigger_id='t-a', count=1))
+    session.commit()
+    csv_path = _write_csv(tmp_path / 'popup_triggers.csv', (
+        'trigger_id,count,helpful\n'
+        't-a,7,true\n'
+        't-b,2,\n'
+    ))
+
+    assert csv_import.import_popup_triggers_from_csv(csv_path, session, skip_existing=True, user_id=1) == (1, 1, 0)
+    assert csv_import.import_popup_triggers_from_csv(csv_path, session, skip_existing=False, user_id=1) == (2, 0, 0)
+    rows = {t.trigger_id: t for t in session.query(PopupTrigger).filter_by(user_id='1')}
+    assert sorted(rows) == ['t-a', 't-b']
+    assert rows['t-a'].count == 7 and rows['t-a'].helpful is True
+    assert rows['t-b'].count == 2 and rows['t-b'].created_at is not None
+
+
+def test_bulk_insert_into_reflected_table_applies_defaults_and_counts_inserted(tmp_path):
+    session = _session(tmp_path)
+    session.add(Task(task_id='t1', name='Existing', user_id=1))
+    session.commit()
+    # An extra CSV column was added to the table: inserts go to the reflected table
+    session.execute(text('ALTER TABLE tasks ADD COLUMN mood TEXT'))
+    table = csv_import.import_target_table(session, Task, {'mood': 'TEXT'})
+
+    rows = [
+        {'task_id': 't1', 'name': 'Written concurrently', 'user_id': 1, 'mood': None},
+        {'task_id': 't2', 'name': 'New', 'user_id': 1, 'mood': 'calm'},
+    ]
+    assert csv_import.bulk_insert_rows(session, Task, rows, table) == 1
+    session.commit()
+
+    new = session.get(Task, 't2')
+    assert new.updated_at is not None and new.created_at is not None
+    assert new.routine_frequency == 'none' and new.categories == []
+    assert session.get(Task, 't1').name == 'Existing'
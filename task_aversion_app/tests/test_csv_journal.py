@@ -0,0 +1,120 @@
+import os
+
+import pandas as pd
+import pytest
+
+from backend import csv_snapshot
+from backend.csv_journal import CsvJournal
+
+
+def _journal_lines(journal):
+    if not os.path.exists(journal.journal_path):
+        return 0
+    with open(journal.journal_path, encoding='utf-8') as f:
+        return sum(1 for _ in f)
+
+
+def test_writes_append_changed_rows_and_compact_to_canonical_csv(tmp_path):
+    path = str(tmp_path / 'task_instances.csv')
+    pd.DataFrame({
+        'instance_id': ['i1', 'i2', 'i3'],
+        'status': ['active', 'active', 'completed'],
+        'actual': ['', '', '{"relief_score": 40}'],
+    }).to_csv(path, index=False)
+    canonical_before = open(path, encoding='utf-8').read()
+
+    journal = CsvJournal(path, ['instance_id'])
+    base = journal.read()
+    df = base.copy()
+    df.at[0, 'status'] = 'completed'
+    df.at[0, 'actual'] = '{"note": "line1\\nline2, with comma"}'
+    df = df[df['instance_id'] != 'i2']
+    df = pd.concat([df, pd.DataFrame([{'instance_id': 'i4', 'status': 'active', 'actual': None}])])
+    base = journal.write(base, df)
+
+    # One put per changed/new row plus one delete record; the canonical file is untouched
+    assert _journal_lines(journal) == 3
+    assert open(path, encoding='utf-8').read() == canonical_before
+
+    # Unchanged frames write nothing
+    journal.write(base, base.copy())
+    assert _journal_lines(journal) == 3
+
+    # A fresh engine (e.g. after a restart) replays the journal onto the canonical file
+    restarted = CsvJournal(path, ['instance_id'])
+    restarted._schedule_compaction = lambda: None
+    replayed = restarted.read()
+    assert replayed.to_dict('records') == base.to_dict('records')
+    assert replayed['instance_id'].tolist() == ['i1', 'i3', 'i4']
+    assert replayed.loc[2, 'actual'] == ''
+
+    assert journal.compact()
+    assert _journal_lines(journal) == 0
+    compacted = pd.read_csv(path, dtype=str).fillna('')
+    assert compacted.to_dict('records') == base.to_dict('records')
+
+
+def test_composite_keys_and_duplicate_fallback(tmp_path):
+    path = str(tmp_path / 'emotions.csv')
+    pd.DataFrame({'emotion': ['calm', 'calm'], 'user_id': ['1', '2']}).to_csv(path, index=False)
+    journal = CsvJournal(path, ['user_id', 'emotion'])
+
+    base = journal.read()
+    df = pd.concat([base, pd.DataFrame([{'emotion': 'tense', 'user_id': '1'}])], ignore_index=True)
+    base = journal.write(base, df)
+    assert _journal_lines(journal) == 1
+
+    # Duplicate keys cannot be journaled: the canonical file is rewritten instead
+    df = pd.concat([base, base.iloc[[0]]], ignore_index=True)
+    journal.write(base, df)
+    assert _journal_lines(journal) == 0
+    assert len(pd.read_csv(path, dtype=str)) == 4
+
+
+def test_parsed_columns_are_shared_per_table_version(tmp_path):
+    path = str(tmp_path / 'task_instances.csv')
+    pd.DataFrame({
+        'instance_id': ['i1', 'i2'],
+        'completed_at': ['2026-03-01 09:30', ''],
+        'relief_score': ['40', 'n/a'],
+    }).to_csv(path, index=False)
+    journal = CsvJournal(path, ['instance_id'], {'completed_at': 'datetime', 'relief_score': 'number'})
+
+    completed_at = journal.parsed('completed_at')
+    assert completed_at.iloc[0] == pd.Timestamp('2026-03-01 09:30') and pd.isna(completed_at.iloc[1])
+    assert journal.parsed('completed_at') is completed_at
+    assert journal.parsed('relief_score').tolist()[0] == 40.0
+
+    base = journal.read()
+    df = base.copy()
+    df.at[1, 'completed_at'] = '2026-03-02 10:00'
+    journal.write(base, df)
+    assert journal.parsed('completed_at').iloc[1] == pd.Timestamp('2026-03-02 10:00')
+
+
+def test_arrow_snapshot_replaces_csv_parse_on_load(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'task_instances.csv')
+    pd.DataFrame({'instance_id': ['i1', 'i2'], 'created_at': ['2026-03-01 09:30', 'bad']}).to_csv(path, index=False)
+    typed = {'created_at': 'datetime'}
+    journal = CsvJournal(path, ['instance_id'], typed)
+    base = journal.read()
+    df = base.copy()
+    df.at[0, 'created_at'] = '2026-03-05 08:00'
+    journal.write(base, df)
+    assert journal.compact()
+    assert os.path.exists(csv_snapshot.snapshot_path(path))
+
+    def fail_read_csv(*args, **kwargs):
+        raise AssertionError('CSV re-parsed despite a current snapshot')
+
+    monkeypatch.setattr(pd, 'read_csv', fail_read_csv)
+    restarted = CsvJournal(path, ['instance_id'], typed)
+    assert restarted.read().to_dict('records') == journal.read().to_dict('records')
+    created_at = restarted.parsed('created_at')
+    assert created_at.iloc[0] == pd.Timestamp('2026-03-05 08:00') and pd.isna(created_at.iloc[1])
+    monkeypatch.undo()
+
+    # A CSV edited outside the app no longer matches the snapshot and is parsed again
+    pd.DataFrame({'instance_id': ['i9'], 'created_at': ['2026-04-01 12:00']}).to_csv(path, index=False)
+    assert CsvJournal(path, ['instance_id'], typed).read()['instance_id'].tolist() == ['i9']
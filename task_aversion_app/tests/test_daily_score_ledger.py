@@ -0,0 +1,78 @@
+from datetime import date, datetime, timedelta
+
+from backend.daily_score_ledger import load_day_scores, load_top_scores, stale_days, sync_days, with_settings
+from backend.database import DailyScore, TaskInstance
+
+VERSIONS = {'execution_score': '1.2', 'grit_score': '1.0'}
+
+
+def _instance(instance_id, completed_at):
+    return TaskInstance(
+        instance_id=instance_id, task_id='t1', task_name='Task', user_id=1,
+        predicted={}, actual={}, completed_at=completed_at, is_completed=True,
+        status='completed', updated_at=datetime(2026, 1, 1),
+    )
+
+
+def test_closed_days_are_computed_once_and_recomputed_after_edits(session_factory):
+    today = date.today()
+    day1, day2 = today - timedelta(days=3), today - timedelta(days=2)
+    with session_factory() as session:
+        session.add_all([
+            _instance('a', datetime.combine(day1, datetime.min.time()) + timedelta(hours=9)),
+            _instance('b', datetime.combine(day1, datetime.min.time()) + timedelta(hours=17)),
+            _instance('c', datetime.combine(day2, datetime.min.time()) + timedelta(hours=12)),
+            _instance('now', datetime.now()),
+        ])
+        session.commit()
+
+    computed = []
+
+    def compute(day):
+        computed.append(day)
+        return {'execution_score': 10.0 * day.day, 'grit_score': 0.0}
+
+    assert sync_days(session_factory, 1, VERSIONS, compute) == 2
+    assert sync_days(session_factory, 1, VERSIONS, compute) == 0
+    assert computed == [day1, day2]  # today is never stored
+
+    with session_factory() as session:
+        stored = load_day_scores(session, 1, VERSIONS)
+        assert sorted(stored) == [day1, day2]
+        assert stored[day1]['task_count'] == 2
+        assert stored[day1]['last_completed_at'].hour == 17
+        top = load_top_scores(session, 1, 'execution_score', '1.2', 1)
+        assert top == [{'date': max(day1, day2, key=lambda d: d.day), 'score': 10.0 * max(day1.day, day2.day)}]
+        assert load_top_scores(session, 1, 'grit_score', '1.0', 5) == []
+
+        # Edit one completion and delete the other day's only completion
+        session.get(TaskInstance, 'a').updated_at = datetime(2026, 2, 1)
+        session.delete(session.get(TaskInstance, 'c'))
+        session.commit()
+        assert stale_days(session, 1, VERSIONS)[1] == [day1, day2]
+
+    assert sync_days(session_factory, 1, VERSIONS, compute) == 2
+    assert computed == [day1, day2, day1]
+    with session_factory() as session:
+        assert sorted(load_day_scores(session, 1, VERSIONS)) == [day1]
+        # A version bump makes the day stale again; old-version rows are ignored
+        assert stale_days(session, 1, {**VERSIONS, 'grit_score': '2.0'})[1] == [day1]
+        assert session.query(DailyScore).count() == 2
+
+
+def test_settings_change_makes_stored_days_stale(session_factory):
+    day = date.today() - timedelta(days=1)
+    with session_factory() as session:
+        session.add(_instance('a', datetime.combine(day, datetime.min.time()) + timedelta(hours=9)))
+        session.commit()
+
+    penalties = {'cancellation_penalties': {'other': 0.5}}
+    versions = with_settings(VERSIONS, penalties)
+    assert versions == with_settings(VERSIONS, {'cancellation_penalties': {'other': 0.5}})
+    assert versions['grit_score'].startswith('1.0+')
+    assert sync_days(session_factory, 1, versions, lambda d: {'execution_score': 1.0, 'grit_score': 2.0}) == 1
+
+    changed = with_settings(VERSIONS, {'cancellation_penalties': {'other': 1.0}})
+    with session_factory() as session:
+        assert stale_days(session, 1, versions)[1] == []
+        assert stale_days(session, 1, changed)[1] == [day]
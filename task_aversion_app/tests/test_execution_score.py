@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from backend.analytics import Analytics
+from backend.database import TaskInstance
+from backend.execution_score import (
+    EXECUTION_SCORE_VERSION, compute_execution_scores, recent_execution_score, recompute_execution_scores,
+)
+
+DUE = datetime(2026, 3, 2, 12)
+
+ROWS = [
+    # Hard task, fast, started 45 minutes after the due date
+    dict(predicted={'initial_aversion': 80, 'time_estimate_minutes': 60, 'task_difficulty': 70},
+         actual={'stress_level': 60, 'time_actual_minutes': 25},
+         started_at=DUE + timedelta(minutes=45), completed_at=DUE + timedelta(minutes=70), due_at=DUE),
+    # No aversion, slow, partly done, completed late but started on time
+    dict(predicted={'estimate': 30, 'mental_energy_needed': 40},
+         actual={'time_actual_minutes': 90, 'completion_percent': 70},
+         started_at=DUE - timedelta(minutes=10), completed_at=DUE + timedelta(hours=1), due_at=DUE),
+    # Fallback keys, near-complete, long start delay
+    dict(predicted={'aversion': 30, 'cognitive_load': 90},
+         actual={'completion_percent': 95, 'time_actual_minutes': 40},
+         started_at=DUE + timedelta(hours=6), completed_at=DUE + timedelta(hours=7), due_at=DUE),
+    # Empty payloads, no due date; completion_percent 0 counts as 100 (`or 100`)
+    dict(predicted={}, actual={'completion_percent': 0}, started_at=None, completed_at=DUE, due_at=None),
+    # Low completion, done before the due date
+    dict(predicted={'initial_aversion': 0, 'aversion': 50}, actual={'completion_percent': 20, 'stress_level': 0},
+         started_at=DUE - timedelta(hours=2), completed_at=DUE - timedelta(hours=1), due_at=DUE),
+]
+
+
+def test_vectorized_scores_match_per_row_formula():
+    analytics = Analytics.__new__(Analytics)
+    expected = [analytics.calculate_execution_score(row) for row in ROWS]
+    assert compute_execution_scores(pd.DataFrame(ROWS)).tolist() == pytest.approx(expected)
+
+
+def test_stale_rows_are_scored_without_touching_updated_at(session_factory):
+    stamp = datetime(2026, 1, 1)
+    with session_factory() as session:
+        for i, row in enumerate(ROWS):
+            # i0 is already scored with the current formula: kept as is
+            scored = dict(execution_score=10.0, execution_score_version=EXECUTION_SCORE_VERSION) if i == 0 else {}
+            session.add(TaskInstance(instance_id=f'i{i}', task_id='t1', task_name='Write', user_id=1,
+                                     status='completed', is_completed=True, updated_at=stamp, **row, **scored))
+        session.add(TaskInstance(instance_id='open', task_id='t1', task_name='Write', user_id=1,
+                                 predicted={}, actual={}, updated_at=stamp))
+        session.commit()
+
+    computed = compute_execution_scores(pd.DataFrame(ROWS))
+    assert recent_execution_score(session_factory, 1, limit=2) == pytest.approx(
+        (10.0 + computed[2]) / 2  # the two latest completions
+    )
+    assert recompute_execution_scores(session_factory, user_id=1, chunk_size=2, progress=None) == {1: 3}
+    assert recompute_execution_scores(session_factory, progress=None) == {}
+
+    with session_factory() as session:
+        stored = {row.instance_id: row for row in session.query(TaskInstance)}
+    assert stored['i0'].execution_score == 10.0
+    assert [stored[f'i{i}'].execution_score for i in range(1, 5)] == pytest.approx(computed[1:].tolist())
+    assert {row.updated_at for row in stored.values()} == {stamp}
+    assert stored['open'].execution_score_version is None
+    assert recent_execution_score(session_factory, 2) is None
+
+
+def test_editing_inputs_of_a_scored_row_marks_it_stale(session_factory):
+    row = ROWS[1]
+    with session_factory() as session:
+        session.add(TaskInstance(instance_id='done', task_id='t1', task_name='Write', user_id=1, status='completed',
+                                 is_completed=True, execution_score=10.0,
+                                 execution_score_version=EXECUTION_SCORE_VERSION, **row))
+        session.commit()
+
+    # Editing a completed task's actual payload (task editing page, CSV re-import)
+    edited = {**row['actual'], 'completion_percent': 100}
+    with session_factory() as session:
+        instance = session.get(TaskInstance, 'done')
+        instance.actual = edited
+        session.commit()
+        assert instance.execution_score_version is None
+
+    expected = compute_execution_scores(pd.DataFrame([{**row, 'actual': edited}]))[0]
+    assert recent_execution_score(session_factory, 1) == pytest.approx(expected)
+    with session_factory() as session:
+        assert session.get(TaskInstance, 'done').execution_score_version == EXECUTION_SCORE_VERSION
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from backend.database import TaskInstance
+from backend.factor_engine import FACTOR_COLUMNS, recompute_factors
+from backend.instance_manager import InstanceManager
+
+CREATED = datetime(2026, 3, 1, 9)
+
+
+def _seed(session_factory):
+    rows = [
+        # Completed, started 60 minutes late on a 30 minute estimate
+        dict(instance_id='i1', user_id=1, status='completed', is_completed=True,
+             started_at=CREATED + timedelta(minutes=60),
+             predicted={'time_estimate_minutes': 30, 'expected_relief': 40, 'expected_emotional_load': 30},
+             actual={'actual_relief': 70, 'actual_emotional': 20, 'behavioral_score': 6}),
+        # Completed without a start: no delay; payload net_relief wins
+        dict(instance_id='i2', user_id=1, status='completed', is_completed=True,
+             predicted={'expected_relief': 60}, actual={'actual_relief': 20, 'net_relief': -35}),
+        # Not completed: no procrastination/proactive scores
+        dict(instance_id='i3', user_id=1, status='initialized', predicted={}, actual={},
+             procrastination_score=4.0),
+        dict(instance_id='i4', user_id=2, status='completed', is_completed=True,
+             predicted={'expected_relief': 10}, actual={'actual_relief': 15}),
+    ]
+    with session_factory() as session:
+        for row in rows:
+            session.add(TaskInstance(task_id='t1', task_name='Write', created_at=CREATED,
+                                     updated_at=CREATED, **row))
+        session.commit()
+
+
+def _factors(session_factory, instance_id):
+    with session_factory() as session:
+        instance = session.get(TaskInstance, instance_id)
+        return {column: getattr(instance, column) for column in FACTOR_COLUMNS}, instance.updated_at
+
+
+def test_recompute_matches_completion_rules(tmp_path, session_factory):
+    _seed(session_factory)
+    calls = []
+    updated = recompute_factors(session_factory, user_id=1, chunk_size=2, checkpoint_path=str(tmp_path / 'cp.json'),
+                                progress=lambda *args: calls.append(args))
+    assert updated == {1: 3}
+    assert [call[1:3] for call in calls] == [(2, 3), (3, 3)]
+
+    done, stamp = _factors(session_factory, 'i1')
+    assert done['procrastination_score'] == 2.0 and done['proactive_score'] == 0.0
+    assert (done['net_relief'], done['serendipity_factor'], done['disappointment_factor']) == (30.0, 30.0, 0.0)
+    assert done['net_emotional'] == -10.0 and done['behavioral_score'] == 6.0
+    assert stamp > CREATED
+
+    unstarted, _ = _factors(session_factory, 'i2')
+    assert unstarted['procrastination_score'] == 0.0 and unstarted['proactive_score'] == 10.0
+    assert unstarted['net_relief'] == -35.0 and unstarted['disappointment_factor'] == 40.0
+
+    pending, _ = _factors(session_factory, 'i3')
+    assert pending['procrastination_score'] is None
+
+    # Other users are untouched; a second run writes nothing
+    assert _factors(session_factory, 'i4')[0]['net_relief'] is None
+    assert recompute_factors(session_factory, user_id=1, checkpoint_path=str(tmp_path / 'cp.json'),
+                             progress=None) == {1: 0}
+    assert not (tmp_path / 'cp.json').exists()
+
+
+def test_recompute_resumes_after_interrupted_chunk(tmp_path, session_factory):
+    _seed(session_factory)
+    checkpoint = str(tmp_path / 'cp.json')
+
+    def interrupt(user_id, processed, total, updated, elapsed):
+        raise KeyboardInterrupt
+
+    try:
+        recompute_factors(session_factory, chunk_size=2, checkpoint_path=checkpoint, progress=interrupt)
+    except KeyboardInterrupt:
+        pass
+    # First chunk of user 1 (i1, i2) was committed before the interruption
+    assert _factors(session_factory, 'i1')[0]['net_relief'] == 30.0
+    assert _factors(session_factory, 'i3')[0]['procrastination_score'] == 4.0
+
+    seen = []
+    updated = recompute_factors(session_factory, chunk_size=2, checkpoint_path=checkpoint,
+                                progress=lambda *args: seen.append(args[:3]))
+    assert updated == {1: 1, 2: 1}
+    assert seen == [(1, 3, 3), (2, 1, 1)]
+    assert _factors(session_factory, 'i3')[0]['procrastination_score'] is None
+    assert _factors(session_factory, 'i4')[0]['serendipity_factor'] == 5.0
+
+
+def test_batch_factors_use_engine_rules():
+    manager = InstanceManager.__new__(InstanceManager)
+    instances = [SimpleNamespace(predicted='{"expected_relief": 40}', actual={'actual_relief': 30}, net_relief=None)]
+    manager._calculate_and_store_factors_batch_db(instances)
+    assert (instances[0].net_relief, instances[0].disappointment_factor) == (-10.0, 10.0)
@@ -0,0 +1,94 @@
+import math
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, TaskInstance, TaskInstanceProjection
+from backend.instance_projection import (
+    PROJECTION_VERSION,
+    load_instance_ids,
+    load_projected_instances,
+    patch_projected_frame,
+    resolve_projection,
+)
+
+
+def test_resolve_projection_fallback_chain():
+    predicted = {
+        'time_estimate_minutes': 45,
+        'expected_relief': 70,
+        'expected_cognitive_load': 55,
+        'expected_emotional': 30,
+        'expected_aversion': 20,
+    }
+    actual = {'actual_relief': 80, 'actual_stress': 35, 'actual_physical': 10}
+    stored = {'duration_minutes': None, 'relief_score': '', 'emotional_load': 65.0}
+
+    resolved = resolve_projection(predicted, actual, stored)
+
+    assert resolved['duration_minutes'] == 45.0        # predicted time estimate
+    assert resolved['relief_score'] == 80.0            # actual_relief, never expected_relief
+    assert resolved['mental_energy_needed'] == 55.0    # expected cognitive alias
+    assert resolved['task_difficulty'] == 55.0
+    assert resolved['emotional_load'] == 65.0          # stored column wins
+    assert resolved['expected_emotional_load'] == 30.0
+    assert resolved['expected_relief'] == 70.0
+    assert resolved['expected_aversion'] == 20.0
+    assert resolved['actual_stress'] == 35.0
+    assert resolved['physical_load'] == 10.0
+    assert resolved['environmental_effect'] is None    # default applied at load time
+
+
+def test_load_projected_instances_writes_back_missing_rows():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        session.add(TaskInstance(
+            instance_id='i1', task_id='t1', task_name='Task', user_id=1,
+            predicted={'expected_relief': 40}, actual={'actual_relief': 90},
+        ))
+        session.commit()
+
+        df = load_projected_instances(session, 1)
+
+        assert df.loc[0, 'relief_score'] == 90.0
+        assert df.loc[0, 'expected_relief'] == 40.0
+        assert math.isnan(df.loc[0, 'duration_minutes'])
+        assert df.loc[0, 'predicted_dict'] == {'expected_relief': 40}
+        row = session.get(TaskInstanceProjection, 'i1')
+        assert row is not None and row.projection_version == PROJECTION_VERSION
+        assert load_projected_instances(session, 2).empty
+    finally:
+        session.close()
+
+
+def test_patch_projected_frame_applies_changes_and_deletions():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        for i in range(3):
+            session.add(TaskInstance(
+                instance_id=f'i{i}', task_id='t1', task_name='Task', user_id=1,
+                predicted={}, actual={'actual_relief': 10 * i},
+            ))
+        session.commit()
+        base = load_projected_instances(session, 1)
+        mark = datetime.utcnow()
+
+        changed = session.get(TaskInstance, 'i1')
+        changed.actual = {'actual_relief': 99}
+        session.add(TaskInstance(instance_id='i3', task_id='t1', task_name='Task', user_id=1, actual={}))
+        session.query(TaskInstance).filter(TaskInstance.instance_id == 'i0').delete()
+        session.commit()
+
+        delta = load_projected_instances(session, 1, changed_since=mark)
+        patched = patch_projected_frame(base, delta, load_instance_ids(session, 1))
+
+        assert sorted(delta['instance_id']) == ['i1', 'i3']
+        assert list(patched['instance_id']) == ['i1', 'i2', 'i3']
+        assert patched.set_index('instance_id').loc['i1', 'relief_score'] == 99.0
+    finally:
+        session.close()
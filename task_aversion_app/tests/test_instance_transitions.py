@@ -0,0 +1,101 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from backend.database import TaskInstance, TaskInstanceProjection, TaskStats
+from backend.instance_manager import InstanceManager
+from backend.running_sessions import running_sessions
+
+
+def test_batch_lifecycle_in_one_call(instance_manager):
+    manager = instance_manager
+    running_sessions.clear()
+    created = manager.apply_transitions([
+        {'op': 'create', 'task_id': 't1', 'task_name': 'Write', 'predicted': {'time_estimate_minutes': 30}},
+        {'op': 'create', 'task_id': 't2', 'task_name': 'Read'},
+    ], user_id=1)
+    assert len(set(created)) == 2
+
+    predicted = {'expected_relief': 40, 'expected_emotional_load': 30, 'time_estimate_minutes': 30}
+    result = manager.apply_transitions([
+        {'op': 'add_prediction', 'instance_id': created[0], 'predicted': predicted},
+        {'op': 'add_prediction', 'instance_id': created[1], 'predicted': {'expected_relief': 50}},
+        {'op': 'start', 'instance_id': created[0]},
+        {'op': 'start', 'instance_id': created[1]},
+        {'op': 'complete', 'instance_id': created[0], 'actual': {'actual_relief': 70, 'actual_emotional': 20}},
+        {'op': 'pause', 'instance_id': created[1], 'reason': 'later', 'completion_percentage': 150},
+    ], user_id=1)
+    assert result == [created[0], created[1], created[0], created[1], created[0], created[1]]
+
+    with manager.db_session() as session:
+        done = session.get(TaskInstance, created[0])
+        paused = session.get(TaskInstance, created[1])
+        assert done.status == 'completed' and done.is_completed
+        assert (done.net_relief, done.serendipity_factor, done.disappointment_factor) == (30.0, 30.0, 0.0)
+        assert done.net_emotional == -10.0
+        assert paused.status == 'initialized' and paused.started_at is None
+        assert paused.actual['pause_reason'] == 'later'
+        assert paused.actual['pause_completion_percentage'] == 100.0
+        assert session.get(TaskInstanceProjection, created[0]) is not None
+        assert session.query(TaskStats).filter_by(user_id=1).count() == 2
+    assert running_sessions.get(created[0]) is None and running_sessions.get(created[1]) is None
+
+
+def test_two_owners_in_one_tick_get_distinct_ids(monkeypatch, instance_manager):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2026, 3, 2, 7, 0, 0)
+
+    # RoutineScheduler creates each user's routines back to back within one second
+    monkeypatch.setattr('backend.instance_manager.datetime', FrozenDatetime)
+    manager = instance_manager
+    first = manager.apply_transitions([
+        {'op': 'create', 'task_id': 't1', 'task_name': 'Stretch'},
+        {'op': 'create', 'task_id': 't2', 'task_name': 'Plan'},
+    ], user_id=1)
+    second = manager.apply_transitions([{'op': 'create', 'task_id': 't3', 'task_name': 'Stretch'}], user_id=2)
+
+    assert len(set(first + second)) == 3
+    assert all(instance_id[0] == 'i' and instance_id[1:].isdigit() for instance_id in first + second)
+    with manager.db_session() as session:
+        assert session.get(TaskInstance, second[0]).user_id == 2
+        assert session.query(TaskInstance).count() == 3
+
+
+def test_batch_is_all_or_nothing(instance_manager):
+    manager = instance_manager
+    (instance_id,) = manager.apply_transitions([{'op': 'create', 'task_id': 't1', 'task_name': 'Write'}], user_id=1)
+
+    with pytest.raises(ValueError):
+        manager.apply_transitions([
+            {'op': 'add_prediction', 'instance_id': instance_id, 'predicted': {'expected_relief': 10}},
+            {'op': 'start', 'instance_id': 'missing'},
+        ], user_id=1)
+    with pytest.raises(ValueError):
+        manager.apply_transitions([{'op': 'start', 'instance_id': instance_id}], user_id=2)
+    with pytest.raises(ValueError):
+        manager.apply_transitions([{'op': 'teleport', 'instance_id': instance_id}], user_id=1)
+
+    with manager.db_session() as session:
+        assert session.get(TaskInstance, instance_id).status == 'draft'
+
+
+def test_batch_factors_match_row_by_row():
+    manager = InstanceManager.__new__(InstanceManager)
+    payloads = [
+        ({'expected_relief': 40, 'expected_emotional_load': 0, 'expected_emotional': 25},
+         {'actual_relief': '55', 'emotional_load': 10}),
+        ({'expected_relief': 60}, {'actual_relief': 20}),
+        ({}, {'actual_relief': 20, 'actual_emotional': 'n/a'}),
+    ]
+
+    def rows():
+        return [SimpleNamespace(predicted=p, actual=a, net_relief=None) for p, a in payloads]
+
+    reference, batch = rows(), rows()
+    for instance in reference:
+        manager._calculate_and_store_factors_db(instance)
+    manager._calculate_and_store_factors_batch_db(batch)
+    assert [vars(r) for r in reference] == [vars(b) for b in batch]
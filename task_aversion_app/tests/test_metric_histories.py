@@ -0,0 +1,53 @@
+"""get_metric_histories (one pass) vs the per-metric history methods on the same frame."""
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.analytics import Analytics
+
+pytestmark = pytest.mark.usefixtures('data_dir')
+
+
+def _completed_frame(n=300, seed=11):
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    completed_at = [
+        (now - timedelta(days=float(d))).strftime('%Y-%m-%d %H:%M') for d in rng.uniform(0, 40, n)
+    ]
+    completed_at[-2] = ''           # not completed / unparseable rows are skipped
+    completed_at[-1] = 'not a date'
+    net_relief = rng.uniform(-50, 50, n)
+    net_relief[rng.random(n) < 0.2] = np.nan
+    return pd.DataFrame({
+        'completed_at': completed_at,
+        'stress_level': rng.uniform(0, 100, n),
+        'net_relief': net_relief,
+        'actual_dict': [
+            {'motivation': None if rng.random() < 0.3 else float(rng.uniform(0, 10))} for _ in range(n)
+        ],
+        'predicted_dict': [{'motivation': float(rng.uniform(0, 10))} for _ in range(n)],
+    })
+
+
+def _assert_same_history(actual, expected):
+    assert actual['dates'] == expected['dates']
+    np.testing.assert_allclose(actual['values'], expected['values'], rtol=1e-12)
+    for key in ('current_value', 'weekly_average', 'three_month_average'):
+        assert math.isclose(actual[key], expected[key], rel_tol=1e-12, abs_tol=1e-12), key
+
+
+def test_metric_histories_match_per_metric_histories():
+    analytics = Analytics()
+    df = _completed_frame()
+    keys = ['stress_level', 'net_relief', 'motivation']
+
+    histories = analytics.get_metric_histories(keys, days=30, user_id=1, instances_completed_df=df)
+
+    assert list(histories) == keys
+    for key in keys:
+        expected = analytics.get_generic_metric_history(key, days=30, user_id=1, instances_completed_df=df)
+        assert expected['dates'], key
+        _assert_same_history(histories[key], expected)
@@ -0,0 +1,89 @@
+from datetime import date, datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, DailyMetricRollup, TaskInstance
+from backend.metric_rollup import is_fresh, load_daily_history, rebuild_user, refresh_days
+
+
+def _session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _instance(instance_id, completed_at, relief, **predicted):
+    return TaskInstance(
+        instance_id=instance_id, task_id='t1', task_name='Task', user_id=1,
+        predicted=predicted, actual={'actual_relief': relief, 'time_actual_minutes': 30},
+        completed_at=completed_at, is_completed=True, status='completed',
+        updated_at=datetime.utcnow(),
+    )
+
+
+def test_rebuild_user_aggregates_per_day():
+    session = _session()
+    try:
+        session.add_all([
+            _instance('i1', datetime(2026, 3, 1, 9), 80, expected_relief=60),
+            _instance('i2', datetime(2026, 3, 1, 18), 40),
+            _instance('i3', datetime(2026, 3, 2, 12), 10, expected_aversion=50),
+            TaskInstance(instance_id='open', task_id='t1', task_name='Task', user_id=1, predicted={}, actual={}),
+        ])
+        session.commit()
+        assert not is_fresh(session, 1)
+
+        rebuild_user(session, 1)
+
+        assert is_fresh(session, 1)
+        relief = session.query(DailyMetricRollup).filter_by(
+            user_id=1, metric_key='relief_score', date=date(2026, 3, 1)
+        ).one()
+        assert (relief.sum, relief.count, relief.min, relief.max) == (120.0, 2, 40.0, 80.0)
+        # expected_relief only has a value for i1
+        assert load_daily_history(session, 1, 'expected_relief', date(2026, 1, 1)) == [
+            {'date': date(2026, 3, 1), 'value': 60.0}
+        ]
+        # stress_level = (50*0.5 + 50*0.5 + 40 + 0 + aversion*2) / 5 with attribute defaults
+        stress = load_daily_history(session, 1, 'stress_level', date(2026, 1, 1))
+        assert [row['value'] for row in stress] == [18.0, 38.0]
+        assert load_daily_history(session, 1, 'duration', date(2026, 3, 2), aggregation='sum') == [
+            {'date': date(2026, 3, 2), 'value': 30.0}
+        ]
+    finally:
+        session.close()
+
+
+def test_refresh_days_follows_edits_moves_and_deletes():
+    session = _session()
+    try:
+        session.add_all([
+            _instance('i1', datetime(2026, 3, 1, 9), 80),
+            _instance('i2', datetime(2026, 3, 1, 18), 40),
+        ])
+        session.commit()
+        rebuild_user(session, 1)
+
+        # Move i2 to the next day and raise its relief; both days are re-aggregated
+        moved = session.get(TaskInstance, 'i2')
+        moved.completed_at = datetime(2026, 3, 2, 8)
+        moved.relief_score = 95.0
+        moved.updated_at = datetime.utcnow()
+        refresh_days(session, 1, [date(2026, 3, 1), date(2026, 3, 2)])
+        session.commit()
+
+        history = load_daily_history(session, 1, 'relief_score', date(2026, 1, 1))
+        assert history == [{'date': date(2026, 3, 1), 'value': 80.0}, {'date': date(2026, 3, 2), 'value': 95.0}]
+        assert is_fresh(session, 1)
+
+        session.delete(session.get(TaskInstance, 'i1'))
+        refresh_days(session, 1, [date(2026, 3, 1)])
+        session.commit()
+
+        assert load_daily_history(session, 1, 'relief_score', date(2026, 1, 1)) == [
+            {'date': date(2026, 3, 2), 'value': 95.0}
+        ]
+        assert is_fresh(session, 1)
+    finally:
+        session.close()
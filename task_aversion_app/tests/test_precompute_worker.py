@@ -0,0 +1,68 @@
+import threading
+import time
+
+from backend.cache_registry import INSTANCES, cache_registry
+from backend.precompute_worker import PrecomputeWorker
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_worker_recomputes_after_debounced_writes():
+    calls = []
+    lock = threading.Lock()
+
+    def payload(analytics, user_id):
+        with lock:
+            calls.append(user_id)
+            return len(calls)
+
+    worker = PrecomputeWorker(
+        max_workers=1, debounce_seconds=0.2, payloads={'summary': payload}, analytics_factory=object
+    )
+    worker.start()
+    try:
+        worker.schedule(7, delay=0)  # login
+        assert _wait_for(lambda: worker.get(7, 'summary') is not None)
+        value, computed_at = worker.get(7, 'summary')
+        assert value == 1 and computed_at is not None
+        assert worker.get(8, 'summary') is None
+
+        # A burst of writes drops the stale snapshot at once and recomputes once
+        for _ in range(5):
+            cache_registry.invalidate(INSTANCES, 7)
+        assert worker.get(7, 'summary') is None
+        assert _wait_for(lambda: worker.get(7, 'summary') is not None)
+        time.sleep(0.3)
+        assert worker.get(7, 'summary')[0] == 2
+        assert calls == [7, 7]
+    finally:
+        worker.stop()
+    # Stopped worker no longer listens
+    cache_registry.invalidate(INSTANCES, 7)
+    assert worker.get(7, 'summary') is not None
+
+
+def test_page_refresh_of_instance_lists_keeps_precomputed_payloads():
+    from backend.instance_manager import InstanceManager
+
+    worker = PrecomputeWorker(
+        max_workers=1, debounce_seconds=0.05, payloads={'summary': lambda analytics, user_id: 1},
+        analytics_factory=object,
+    )
+    worker.start()
+    try:
+        worker.schedule(7, delay=0)
+        assert _wait_for(lambda: worker.get(7, 'summary') is not None)
+        InstanceManager._per_user_cache[('7', 'recent_completed', 20)] = ['stale']
+        InstanceManager.__new__(InstanceManager)._clear_instance_lists(7)
+        assert InstanceManager._per_user_cache.get(('7', 'recent_completed', 20)) is None
+        assert worker.get(7, 'summary') is not None
+    finally:
+        worker.stop()
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import numpy as np
+
+from backend.database import TaskInstance, TaskMetricSketch
+from backend.metric_sketch import is_fresh
+from backend.quantile_sketch import QuantileSketch
+
+
+def test_sketch_is_exact_when_small_and_bounded_when_large():
+    values = [12.0, 80.0, 35.0, 35.0, 60.0]
+    small = QuantileSketch.from_values(values)
+    assert small.exact
+    assert small.quantiles([0.25, 0.5, 0.75]) == {q: float(np.percentile(values, q * 100)) for q in (0.25, 0.5, 0.75)}
+
+    rng = np.random.default_rng(7)
+    stream = rng.normal(50, 15, 20000)
+    # Built in three parts and merged, as monthly sketches are
+    merged = QuantileSketch()
+    for part in np.array_split(stream, 3):
+        merged.merge(QuantileSketch.from_dict(QuantileSketch.from_values(part).to_dict()))
+    assert merged.n == 20000 and not merged.exact
+    assert len([v for items in merged.levels for v in items]) < 1000
+    for q in (0.1, 0.5, 0.9):
+        assert abs(float(np.mean(stream <= merged.quantile(q))) - q) < 0.01
+    assert abs(merged.rank(50.0) - float(np.mean(stream <= 50.0))) < 0.01
+
+
+def _instance(instance_id, month, aversion):
+    return TaskInstance(
+        instance_id=instance_id, task_id='t1', task_name='Task', user_id=1,
+        predicted={'expected_aversion': aversion}, actual={},
+        initialized_at=datetime(2026, month, 5, 9), updated_at=datetime(2026, month, 5, 9),
+    )
+
+
+def test_windowed_baselines_from_monthly_sketches(instance_manager):
+    manager = instance_manager
+    with manager.db_session() as session:
+        session.add_all([
+            _instance('a', 1, 20), _instance('b', 1, 30), _instance('c', 2, 60),
+            _instance('d', 3, 80), _instance('e', 3, 90),
+        ])
+        session.commit()
+
+    # First read backfills the sketches; the whole-history median matches the legacy query
+    assert manager.get_task_metric_quantiles('t1', [0.5], user_id=1)[0.5] == 60.0
+    assert manager.get_baseline_aversion_robust('t1', 1) == manager._get_baseline_aversion_robust_db('t1', 1)
+    assert manager.get_baseline_aversion_robust('t1', 1, since=datetime(2026, 2, 20)) == 80
+    assert manager.get_task_metric_rank('t1', 30, user_id=1, until=datetime(2026, 1, 31)) == 1.0
+    with manager.db_session() as session:
+        assert is_fresh(session, 1)
+        assert session.query(TaskMetricSketch).filter_by(metric_key='expected_aversion').count() == 3
+
+    # Moving an instance to another month through the write path re-sketches both months
+    with manager.db_session() as session:
+        moved = session.get(TaskInstance, 'c')
+        moved.initialized_at = datetime(2026, 3, 1, 8)
+        manager._refresh_projection_db(session, moved)
+        session.commit()
+    assert manager.get_task_metric_quantiles('t1', [0.5], user_id=1, since=datetime(2026, 2, 1))[0.5] == 80.0
+    with manager.db_session() as session:
+        assert is_fresh(session, 1)
+
+    # A write that changes no sketched value (timer start) only stamps the rows
+    with manager.db_session() as session:
+        ids = {row.id for row in session.query(TaskMetricSketch)}
+        started = session.get(TaskInstance, 'd')
+        started.started_at = datetime(2026, 3, 6, 9)
+        manager._refresh_projection_db(session, started)
+        session.commit()
+    with manager.db_session() as session:
+        assert {row.id for row in session.query(TaskMetricSketch)} == ids
+        assert is_fresh(session, 1)
@@ -0,0 +1,105 @@
+"""Vectorized recommendation scoring vs the per-candidate scoring rule."""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import recommendation_engine
+from backend.analytics import Analytics
+from backend.cache_registry import cache_registry, INSTANCES
+
+pytestmark = pytest.mark.usefixtures('data_dir')
+
+
+def _reference_score(row, metrics, weights):
+    total = 0.0
+    for metric in metrics:
+        value = row.get(metric)
+        v = float(value) if value is not None and not pd.isna(value) else 0.0
+        if metric in recommendation_engine.LOW_IS_GOOD:
+            v = max(0.0, 100.0 - v)
+        total += weights.get(metric, 1.0) * v
+    return total
+
+
+def test_matrix_scores_and_top_k_match_row_scoring():
+    rng = np.random.default_rng(5)
+    candidates = pd.DataFrame({
+        'relief_score': rng.uniform(0, 100, 500),
+        'duration_minutes': rng.choice([5.0, 30.0, 120.0, np.nan], 500),
+        'stress_level': rng.uniform(0, 100, 500),
+    })
+    metrics = ['relief_score', 'duration_minutes', 'stress_level', 'mental_energy_needed']
+    weights = {'relief_score': 2.0}
+
+    scores = recommendation_engine.score_candidates(candidates, metrics, weights)
+    expected = [_reference_score(row, metrics, weights) for row in candidates.to_dict('records')]
+    np.testing.assert_allclose(scores, expected, rtol=1e-12)
+
+    best = recommendation_engine.top_k(scores, 10)
+    assert list(best) == list(np.argsort(-scores, kind='stable')[:10])
+    # Ties keep candidate order
+    assert list(recommendation_engine.top_k(np.array([1.0, 3.0, 3.0, np.nan, 3.0]), 2)) == [1, 2]
+
+
+def _patch_sources(monkeypatch, tasks, instances, calls):
+    from backend.task_manager import TaskManager
+
+    def get_all(self, user_id=None):
+        calls.append('tasks')
+        return tasks.copy()
+    monkeypatch.setattr(TaskManager, 'get_all', get_all)
+    monkeypatch.setattr(Analytics, '_load_instances', lambda self, completed_only=False, user_id=None: instances.copy())
+    monkeypatch.setattr(Analytics, '_get_user_id', lambda self, user_id=None: 9901)
+    for cache in (Analytics._task_features_cache, Analytics._recommendation_pools_cache, Analytics._recommendations_cache):
+        cache.clear()
+
+
+def test_recommendations_by_category_ranks_feature_matrix(monkeypatch):
+    tasks = pd.DataFrame({
+        'task_id': ['a', 'b', 'c', 'd'],
+        'name': ['A', 'B', 'C', 'D'],
+        'default_estimate_minutes': ['30', '10', '', '90'],
+        'task_type': ['Work', 'Work', 'Play', 'Work'],
+        'is_recurring': ['False'] * 4,
+        'categories': [json.dumps(['home']), json.dumps(['health']), '[]', 'not json'],
+    })
+    instances = pd.DataFrame({
+        'task_id': ['a', 'a', 'b', 'd', 'c'],
+        'completed_at': ['2026-01-01 10:00'] * 4 + [''],
+        'relief_score': [80.0, 60.0, 90.0, None, 100.0],
+        'duration_minutes': [20.0, 40.0, None, 15.0, 5.0],
+        'actual_dict': [{}] * 5,
+        'predicted_dict': [{}] * 5,
+    })
+    calls = []
+    _patch_sources(monkeypatch, tasks, instances, calls)
+    analytics = Analytics()
+
+    ranked = analytics.recommendations_by_category('relief_score', limit=2)
+    # b: 90, a: mean(80, 60); c has no completed instances (default 5.0)
+    assert [(r['task_id'], r['score']) for r in ranked] == [('b', 90.0), ('a', 70.0)]
+
+    # Unparseable categories pass the filter; history duration (15) wins over the estimate
+    ranked = analytics.recommendations_by_category(
+        ['duration_minutes'], filters={'task_type': 'Work', 'categories': 'hea', 'max_duration': 20}, limit=5,
+    )
+    assert [(r['task_id'], r['duration']) for r in ranked] == [('b', 10.0), ('d', 15.0)]
+
+    # Other metric sets over the same filters merge the cached pool's columns; repeats are cached results
+    calls.clear()
+    first = analytics.recommendations_by_category(['relief_score', 'duration_minutes'], limit=3)
+    again = analytics.recommendations_by_category(['duration_minutes', 'relief_score'], limit=3)
+    assert calls == []
+    assert [r['task_id'] for r in again] == [r['task_id'] for r in first]
+    assert list(again[0]['metric_values']) == ['duration_minutes', 'relief_score']
+    first[0]['score'] = -1
+    assert analytics.recommendations_by_category(['relief_score', 'duration_minutes'], limit=3)[0]['score'] != -1
+
+    # A write to the user's instances drops the pools and results
+    cache_registry.invalidate(INSTANCES, 9901)
+    analytics.recommendations_by_category('relief_score', limit=2)
+    assert calls == ['tasks']
+    for cache in (Analytics._task_features_cache, Analytics._recommendation_pools_cache, Analytics._recommendations_cache):
+        cache.clear()
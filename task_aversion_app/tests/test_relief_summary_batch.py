@@ -0,0 +1,87 @@
+"""Golden parity: vectorized relief-summary sub-scores vs the row-wise reference functions."""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.analytics import Analytics
+
+pytestmark = pytest.mark.usefixtures('data_dir')
+
+
+def _frame(n=400, seed=7):
+    rng = np.random.default_rng(seed)
+
+    def maybe(values, p_missing=0.15):
+        return [None if rng.random() < p_missing else v for v in values]
+
+    completion = maybe(rng.choice([0, 25, 50, 80, 100, 100, 120], n).tolist())
+    time_actual = maybe(rng.uniform(0, 180, n).round(1).tolist())
+    time_estimate = maybe(rng.choice([0, 15, 30, 60, 90], n).tolist())
+    motivation = maybe(rng.uniform(0, 10, n).round(1).tolist(), 0.3)
+    actual_dicts = [
+        {'completion_percent': c, 'time_actual_minutes': t} for c, t in zip(completion, time_actual)
+    ]
+    predicted_dicts = [
+        {'time_estimate_minutes': e, 'motivation': m} for e, m in zip(time_estimate, motivation)
+    ]
+    # Rows the row version rejects or treats specially
+    actual_dicts[0] = None
+    predicted_dicts[1] = 'not a dict'
+    actual_dicts[2] = {'completion_percent': 'abc', 'time_actual_minutes': 10}
+    relief = rng.uniform(0, 12, n).round(1)
+    relief[3] = np.nan
+    relief[4] = 0.0
+    return pd.DataFrame({
+        'actual_dict': actual_dicts,
+        'predicted_dict': predicted_dicts,
+        'relief_score': relief,
+        'baseline': maybe(rng.uniform(0, 100, n).round(1).tolist()),
+        'current': maybe(rng.uniform(0, 100, n).round(1).tolist()),
+        'expected_relief': maybe(rng.uniform(-10, 110, n).round(1).tolist()),
+        'actual_relief': maybe(rng.uniform(-10, 110, n).round(1).tolist()),
+        'initial': rng.uniform(0, 100, n).round(1),
+        'task_type': rng.choice(['Work', 'work ', 'Self care', 'self-care', 'Play', 'sleep', None], n),
+        'task_name': rng.choice(['Write report', 'devtest thing', 'Example', None, 'Laundry', 'nan'], n),
+    })
+
+
+def _none(value):
+    return None if value is None or (isinstance(value, float) and math.isnan(value)) else value
+
+
+def test_efficiency_batch_matches_row_version():
+    analytics = Analytics()
+    df = _frame()
+    batch = analytics.calculate_efficiency_scores_batch(df)
+    rows = np.array([analytics.calculate_efficiency_score(row) for _, row in df.iterrows()], dtype=float)
+    np.testing.assert_allclose(batch, rows, atol=0.011, equal_nan=True)
+
+
+def test_obstacles_and_spike_batch_match_row_version():
+    df = _frame()
+    batch = Analytics.calculate_obstacles_scores_batch(
+        df['baseline'], df['current'], df['expected_relief'], df['actual_relief']
+    )
+    is_spontaneous, spike = Analytics.detect_spontaneous_aversion_batch(df['baseline'], df['current'])
+    for i, row in enumerate(df.itertuples()):
+        args = (_none(row.baseline), _none(row.current))
+        expected = Analytics.calculate_obstacles_scores(*args, _none(row.expected_relief), _none(row.actual_relief))
+        for variant, value in expected.items():
+            assert abs(batch[variant][i] - value) <= 0.011, (i, variant)
+        assert (bool(is_spontaneous[i]), float(spike[i])) == Analytics.detect_spontaneous_aversion(*args)
+
+
+def test_multiplier_and_test_task_batches_match_row_version():
+    df = _frame()
+    current = df['current'].astype(float).fillna(0.0)
+    multipliers = Analytics.calculate_aversion_multipliers_batch(df['initial'], current)
+    expected = [Analytics.calculate_aversion_multiplier(ia, ea) for ia, ea in zip(df['initial'], current)]
+    np.testing.assert_allclose(multipliers, expected, rtol=1e-12)
+
+    type_mults = Analytics.get_task_type_multipliers_batch(df['task_type'])
+    assert type_mults.tolist() == [Analytics.get_task_type_multiplier(t) for t in df['task_type']]
+
+    mask = Analytics._test_task_mask(df['task_name'])
+    assert mask.tolist() == [Analytics._is_test_task(name) for name in df['task_name']]
@@ -0,0 +1,74 @@
+import pandas as pd
+
+from backend.cache_registry import cache_registry, GAP_PREFERENCE, INSTANCES, TASKS
+from backend.request_context import POPUPS, discard, memo, request_data_context
+from backend.task_manager import TaskManager
+
+
+class _Loader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+def test_memo_loads_once_per_request():
+    load = _Loader()
+    assert memo(TASKS, 1, 'all', load) == 1
+    assert memo(TASKS, 1, 'all', load) == 2  # no request: plain call
+
+    with request_data_context() as ctx:
+        assert memo(TASKS, 1, 'all', load) == 3
+        assert memo(TASKS, '1', 'all', load) == 3
+        with request_data_context() as inner:
+            assert inner is ctx
+            assert memo(TASKS, 1, 'all', load) == 3
+        assert (ctx.loads, ctx.hits) == (1, 2)
+    assert not ctx.active
+    assert memo(TASKS, 1, 'all', load) == 4
+
+
+def test_writes_drop_affected_groups_in_live_contexts():
+    load = _Loader()
+    with request_data_context():
+        for group in (TASKS, INSTANCES, POPUPS):
+            memo(group, 1, 'k', load)
+            memo(group, 2, 'k', load)
+        assert load.calls == 6
+
+        cache_registry.invalidate(TASKS, 1)
+        memo(TASKS, 1, 'k', load)
+        memo(TASKS, 2, 'k', load)
+        assert load.calls == 7
+
+        cache_registry.invalidate(GAP_PREFERENCE)
+        memo(INSTANCES, 1, 'k', load)
+        memo(INSTANCES, 2, 'k', load)
+        assert load.calls == 9
+
+        discard(POPUPS, 2)
+        memo(POPUPS, 1, 'k', load)
+        memo(POPUPS, 2, 'k', load)
+        assert load.calls == 10
+
+
+def test_task_manager_get_all_shares_one_load_per_request(monkeypatch):
+    manager = TaskManager.__new__(TaskManager)
+    manager.use_db = False
+    loads = []
+
+    def load_csv(user_id):
+        loads.append(user_id)
+        return pd.DataFrame({'task_id': ['t1'], 'name': ['Write']})
+
+    monkeypatch.setattr(manager, '_get_all_csv', load_csv)
+    TaskManager._tasks_all_cache.clear()
+    with request_data_context():
+        first = manager.get_all(user_id=7)
+        first.loc[0, 'name'] = 'changed'
+        TaskManager._tasks_all_cache.clear()
+        assert manager.get_all(user_id=7).loc[0, 'name'] == 'Write'
+    assert loads == [7]
+    TaskManager._tasks_all_cache.clear()
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from backend.database import TaskInstance
+from backend.running_sessions import RunningSessionRegistry, running_sessions
+
+
+def test_seed_from_instance_parses_row_once():
+    registry = RunningSessionRegistry()
+    row = {
+        'instance_id': 'i1',
+        'started_at': '2026-03-01 09:00',
+        'actual': '{"resume_started_at": "2026-03-01T10:00:00", "time_spent_before_pause": 12.5}',
+    }
+    session = registry.seed_from_instance(row, user_id=1)
+    assert session.session_start == datetime(2026, 3, 1, 10)
+    assert session.elapsed_minutes(datetime(2026, 3, 1, 10, 30)) == 42.5
+
+    # Registered sessions win over (possibly stale) rows
+    assert registry.seed_from_instance({**row, 'actual': '{}'}, user_id=1) is session
+    assert registry.get('i1', user_id=2) is None
+    assert registry.seed_from_instance({'instance_id': 'i2', 'started_at': ''}) is None
+    assert len(registry) == 1
+
+
+def test_instance_manager_keeps_registry_in_sync(instance_manager):
+    manager = instance_manager
+    with manager.db_session() as session:
+        session.add(TaskInstance(
+            instance_id='i1', task_id='t1', task_name='Write', user_id=1,
+            predicted={'time_estimate_minutes': 30}, actual={},
+            initialized_at=datetime(2026, 3, 1, 9), status='initialized',
+        ))
+        session.commit()
+    running_sessions.clear()
+
+    manager.start_instance('i1', user_id=1)
+    started = running_sessions.get('i1', user_id=1)
+    assert started is not None and started.time_spent_before_pause == 0.0
+
+    # Pause folds the session into time_spent_before_pause; resume carries it over
+    manager.pause_instance('i1', completion_percentage=10, user_id=1)
+    assert running_sessions.get('i1') is None
+    with manager.db_session() as session:
+        instance = session.query(TaskInstance).filter_by(instance_id='i1').one()
+        instance.actual = {**instance.actual, 'time_spent_before_pause': 20.0}
+        session.commit()
+    manager.resume_instance('i1', user_id=1)
+    resumed = running_sessions.get('i1', user_id=1)
+    assert resumed.time_spent_before_pause == 20.0
+    assert 20.0 <= resumed.elapsed_minutes(resumed.session_start + timedelta(seconds=1)) < 20.1
+
+    manager.delete_instance('i1', user_id=1)
+    assert running_sessions.get('i1') is None
@@ -0,0 +1,128 @@
+from datetime import datetime
+
+from backend.database import TaskInstance, TaskStats
+from backend.instance_manager import InstanceManager
+from backend.task_stats import is_fresh
+
+
+def _instance(instance_id, task_id, day, aversion, completed=False, **predicted):
+    return TaskInstance(
+        instance_id=instance_id, task_id=task_id, task_name=task_id, user_id=1,
+        predicted={'expected_aversion': aversion, **predicted},
+        actual={'actual_relief': 7, 'actual_cognitive': 40} if completed else {},
+        initialized_at=datetime(2026, 3, day, 9),
+        completed_at=datetime(2026, 3, day, 10) if completed else None,
+        updated_at=datetime(2026, 3, day, 10),
+    )
+
+
+def _legacy(manager, task_ids):
+    return {
+        'averages': [manager._get_previous_task_averages_db(t, 1) for t in task_ids],
+        'bulk': manager._get_previous_task_averages_bulk_db(task_ids, 1),
+        'actual': [manager._get_previous_actual_averages_db(t, 1) for t in task_ids],
+        'initial': [manager._get_initial_aversion_db(t, 1) for t in task_ids],
+        'average_aversion': [manager._get_previous_aversion_average_db(t, 1) for t in task_ids],
+        'robust': [manager._get_baseline_aversion_robust_db(t, 1) for t in task_ids],
+        'sensitive': [manager._get_baseline_aversion_sensitive_db(t, 1) for t in task_ids],
+        'batch': manager._get_batch_baseline_aversions_db(task_ids, 1),
+    }
+
+
+def _from_stats(manager, task_ids):
+    return {
+        'averages': [manager.get_previous_task_averages(t, 1) for t in task_ids],
+        'bulk': manager.get_previous_task_averages_bulk(task_ids, 1),
+        'actual': [manager.get_previous_actual_averages(t, 1) for t in task_ids],
+        'initial': [manager.get_initial_aversion(t, 1) for t in task_ids],
+        'average_aversion': [manager.get_previous_aversion_average(t, 1) for t in task_ids],
+        'robust': [manager.get_baseline_aversion_robust(t, 1) for t in task_ids],
+        'sensitive': [manager.get_baseline_aversion_sensitive(t, 1) for t in task_ids],
+        'batch': manager.get_batch_baseline_aversions(task_ids, 1),
+    }
+
+
+def test_stats_lookups_match_instance_queries(instance_manager):
+    manager = instance_manager
+    with manager.db_session() as session:
+        session.add_all([
+            _instance('a1', 'ta', 1, 2, initial_aversion=6, expected_relief=5, time_estimate_minutes=30),
+            _instance('a2', 'ta', 2, 30, completed=True, expected_cognitive_load=4),
+            _instance('a3', 'ta', 3, 95, completed=True, expected_mental_energy=20, estimate=60),
+            _instance('b1', 'tb', 4, 50, completed=True),
+            TaskInstance(instance_id='b2', task_id='tb', task_name='tb', user_id=1, predicted={}, actual={}),
+            TaskInstance(instance_id='other', task_id='ta', task_name='ta', user_id=2,
+                         predicted={'expected_aversion': 100}, actual={}, initialized_at=datetime(2026, 3, 1)),
+        ])
+        session.commit()
+
+    task_ids = ['ta', 'tb', 'never-run']
+    expected = _legacy(manager, task_ids)
+    assert _from_stats(manager, task_ids) == expected
+
+    with manager.db_session() as session:
+        assert is_fresh(session, 1)
+        assert session.get(TaskStats, (1, 'ta')).completed_count == 2
+
+
+def test_instance_writes_refresh_task_stats(instance_manager):
+    manager = instance_manager
+    with manager.db_session() as session:
+        session.add_all([_instance('a1', 'ta', 1, 20), _instance('a2', 'ta', 2, 40)])
+        session.commit()
+    assert manager.get_baseline_aversion_robust('ta', 1) == 30
+
+    # An edit through InstanceManager's write path recomputes the task's row in the same commit
+    with manager.db_session() as session:
+        instance = session.get(TaskInstance, 'a2')
+        instance.predicted = {'expected_aversion': 90}
+        manager._refresh_projection_db(session, instance)
+        session.commit()
+    assert manager.get_baseline_aversion_robust('ta', 1) == 55
+
+    assert manager._delete_instance_db('a1', user_id=1)
+    assert manager.get_baseline_aversion_robust('ta', 1) == 90
+    assert manager.get_previous_task_averages_bulk(['ta'], 1) == {'ta': {'expected_aversion': 90, 'avg_time_estimate': None}}
+
+    # A row written around InstanceManager is picked up once the freshness check runs again
+    with manager.db_session() as session:
+        session.add(_instance('a9', 'ta', 9, 30))
+        session.commit()
+    InstanceManager._task_stats_checked.clear()
+    assert manager.get_baseline_aversion_robust('ta', 1) == 60
+
+
+def test_timer_writes_only_advance_the_stats_timestamp(monkeypatch, instance_manager):
+    import backend.task_stats as task_stats
+
+    manager = instance_manager
+    with manager.db_session() as session:
+        session.add_all([_instance('b1', 'tb', 1, 20), _instance('b2', 'tb', 2, 40)])
+        session.commit()
+    assert manager.get_baseline_aversion_robust('tb', 1) == 30
+
+    refreshed = []
+    original = task_stats.refresh_tasks
+    monkeypatch.setattr(task_stats, 'refresh_tasks', lambda *args: refreshed.append(args[2]) or original(*args))
+
+    # Start / pause style write: no aggregated value changes, the row is not recomputed
+    with manager.db_session() as session:
+        instance = session.get(TaskInstance, 'b2')
+        instance.started_at = datetime(2026, 3, 2, 11)
+        instance.status = 'active'
+        instance.actual = {'paused': True}
+        manager._refresh_projection_db(session, instance)
+        session.commit()
+    assert refreshed == []
+    with manager.db_session() as session:
+        assert is_fresh(session, 1)
+
+    # Editing the predicted payload of an initialized instance still recomputes
+    with manager.db_session() as session:
+        instance = session.get(TaskInstance, 'b2')
+        instance.predicted = {'expected_aversion': 80}
+        manager._refresh_projection_db(session, instance)
+        session.commit()
+    assert refreshed == [['tb']]
+    InstanceManager._task_stats_checked.clear()
+    assert manager.get_baseline_aversion_robust('tb', 1) == 50
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, UserPreferences
+from backend.user_state import UserStateManager, invalidate_preferences_cache
+
+
+@pytest.fixture
+def manager(tmp_path):
+    invalidate_preferences_cache()
+    engine = create_engine(f'sqlite:///{tmp_path / "prefs.db"}')
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    prefs_file = tmp_path / 'user_preferences.csv'
+    prefs_file.write_text(
+        'user_id,tutorial_completed,tutorial_choice,created_at,task_horizon_days\n'
+        'legacy,True,guided,2026-01-05T10:00:00,14\n',
+        encoding='utf-8',
+    )
+    yield UserStateManager(prefs_file=str(prefs_file), use_csv=False, session_factory=factory), factory
+    invalidate_preferences_cache()
+
+
+def test_legacy_csv_user_is_copied_into_table(manager):
+    state, factory = manager
+    prefs = state.get_user_preferences('legacy')
+    assert prefs['tutorial_completed'] == 'True'
+    assert prefs['tutorial_choice'] == 'guided'
+    assert prefs['task_horizon_days'] == '14'
+    with factory() as session:
+        row = session.get(UserPreferences, 'legacy')
+        assert row.extra_preferences == {'task_horizon_days': '14'}
+    assert state.is_new_user('nobody')
+
+
+def test_reads_are_cached_and_writes_go_through(manager):
+    state, factory = manager
+    state.ensure_user('u1')
+    state.update_preferences('u1', {'gap_handling': 'fresh_start', 'milestones': '[1, 2]'})
+
+    # Edit the table behind the manager's back: the cached copy is still served
+    with factory() as session:
+        session.get(UserPreferences, 'u1').gap_handling = 'continue_as_is'
+        session.commit()
+    assert state.get_user_preferences('u1')['gap_handling'] == 'fresh_start'
+
+    # Another manager instance shares the cache; invalidation reloads from the table
+    other = UserStateManager(use_csv=False, session_factory=factory)
+    assert other.get_user_preferences('u1')['milestones'] == '[1, 2]'
+    invalidate_preferences_cache('u1')
+    assert other.get_user_preferences('u1')['gap_handling'] == 'continue_as_is'
+
+
+def test_json_preferences_are_parsed_once_and_copied(manager, monkeypatch):
+    state, _ = manager
+    state.update_preference('u2', 'persistent_emotion_values', json.dumps({'calm': 40}))
+    loads = []
+    original_loads = json.loads
+    monkeypatch.setattr(json, 'loads', lambda text, **kw: loads.append(text) or original_loads(text, **kw))
+
+    first = state.get_persistent_emotions('u2')
+    first['calm'] = 99
+    assert state.get_persistent_emotions('u2') == {'calm': 40}
+    assert len(loads) == 1
+    assert state.get_productivity_goal_settings('u2') == state.get_productivity_goal_settings('nobody')
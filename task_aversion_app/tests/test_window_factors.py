@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.analytics import Analytics
+from backend.window_factors import compute_window_factors
+
+START = datetime(2026, 3, 1, 8)
+
+
+def _history():
+    offsets = [0, 10, 25, 70, 200, 600, 1500, 1510, 2900, 4400, 10000, 20000, 30000, 45000, 46000, 50000]
+    tasks = ['a', 'b', 'a', 'a', 'c', 'b', 'a', 'a', 'b', 'a', 'c', 'a', 'a', 'b', 'a', 'a']
+    rows = []
+    for i, (minutes, task) in enumerate(zip(offsets, tasks)):
+        rows.append({
+            'instance_id': f'i{i}',
+            'task_id': task,
+            'completed_at': (START + timedelta(minutes=minutes)).strftime('%Y-%m-%d %H:%M'),
+            'duration_minutes': [30, 20, '', 45, 10, 60, 15, 25][i % 8],
+            'cognitive_load': [20, 70, None, 90, 0, 40, 55, 10][i % 8],
+            'emotional_load': [30, 80, 40, 10, 0, 60, 65, 100][i % 8],
+            'predicted_dict': [{'initial_aversion': 80}, {'aversion': 30}, {}, '{"initial_aversion": 55}'][i % 4],
+        })
+    # Not completed: no window membership, neutral factors
+    rows.append({'instance_id': 'open', 'task_id': 'a', 'completed_at': '', 'duration_minutes': 10,
+                 'cognitive_load': 50, 'emotional_load': 50, 'predicted_dict': {}})
+    return pd.DataFrame(rows)
+
+
+def _analytics(history):
+    analytics = Analytics.__new__(Analytics)
+    analytics._get_user_id = lambda user_id=None: 1
+    analytics._load_instances = lambda user_id=None, **kwargs: history
+    return analytics
+
+
+@pytest.mark.parametrize('counts', [None, {'a': 12}])
+def test_window_factors_match_per_row_methods(counts):
+    history = _history()
+    analytics = _analytics(history)
+    multipliers = np.linspace(1.0, 3.0, len(history))
+    factors = compute_window_factors(history, history, task_completion_counts=counts,
+                                     persistence_factors=multipliers)
+
+    for i, (_, row) in enumerate(history.iterrows()):
+        assert factors['momentum_factor'][i] == pytest.approx(analytics.calculate_momentum_factor(row))
+        assert factors['persistence_factor'][i] == pytest.approx(
+            analytics.calculate_persistence_factor(row, task_completion_counts=counts, instances_df=history))
+        assert factors['perseverance_factor'][i] == pytest.approx(
+            analytics.calculate_perseverance_factor_v1_3(row, task_completion_counts=counts,
+                                                         persistence_factor=multipliers[i]))
+
+
+def test_batch_wrapper_aligns_subset_rows_with_full_history():
+    history = _history()
+    analytics = _analytics(history)
+    subset = history.iloc[[12, 3, 15]]
+    factors = analytics.calculate_window_factors_batch(subset)
+    expected = [analytics.calculate_persistence_factor(row) for _, row in subset.iterrows()]
+    assert factors['persistence_factor'] == pytest.approx(expected)
+    assert compute_window_factors(subset.iloc[:0])['momentum_factor'].size == 0
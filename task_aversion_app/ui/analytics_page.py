@@ -11,6 +11,8 @@ import plotly.express as px
 from backend.analytics import Analytics
 from backend.task_schema import TASK_ATTRIBUTES
 from backend.auth import get_current_user
+from backend.analytics_pool import run_analytics, run_analytics_sync
+from backend.precompute_worker import get_precomputed
 from backend.security_utils import escape_for_display
 from ui.error_reporting import handle_error_with_ui
 
@@ -1375,7 +1377,8 @@ def _build_analytics_main_content(
 
     if _section('charts'):
         _charts_part = (section_sub_chunk or 0) if sections_to_build and 'charts' in sections_to_build else 0
-        chart_data = analytics_service.get_chart_data(user_id=current_user_id)
+        precomputed = get_precomputed(current_user_id, 'chart_data')
+        chart_data = precomputed[0] if precomputed else analytics_service.get_chart_data(user_id=current_user_id)
         with container:
             if _charts_part == 0:
                 with ui.row().classes("analytics-grid flex-wrap w-full"):
@@ -1393,7 +1396,10 @@ def _build_analytics_main_content(
 
     if _section('rankings'):
         _rank_part = (section_sub_chunk or 0) if sections_to_build and 'rankings' in sections_to_build else 0
-        rankings_data = analytics_service.get_rankings_data(top_n=5, leaderboard_n=10, user_id=current_user_id)
+        precomputed = get_precomputed(current_user_id, 'rankings_data')
+        rankings_data = precomputed[0] if precomputed else analytics_service.get_rankings_data(
+            top_n=5, leaderboard_n=10, user_id=current_user_id
+        )
         with container:
             if _rank_part == 0:
                 render_task_rankings(rankings_data, user_id=current_user_id)
@@ -1419,8 +1425,8 @@ def register_analytics_page():
         build_analytics_page()
     
     @ui.page('/analytics/emotional-flow')
-    def emotional_flow_page():
-        build_emotional_flow_page()
+    async def emotional_flow_page():
+        await build_emotional_flow_page()
     
     @ui.page('/analytics/factors-comparison')
     def factors_comparison_page():
@@ -1539,6 +1545,7 @@ def build_analytics_page():
                 )
             ui.button("Load selected", on_click=do_load).classes("bg-blue-500 text-white")
     loading_analytics_label = ui.label("Loading analytics...").classes("text-sm text-gray-500 mb-4")
+    computed_at_label = ui.label("").classes("text-xs text-gray-400 mb-2").style("display: none;")
     error_row = ui.row().classes("items-center gap-2 mb-4").style("display: none;")
     content_container = ui.column().classes("w-full")
 
@@ -1552,8 +1559,15 @@ def build_analytics_page():
                         _rsel=_render_stress_efficiency_leaderboard, _rmc=_render_metric_comparison,
                         _rce=_render_correlation_explorer,
                         _comp_loading=loading_label, _comp_row=composite_row, _comp_score=score_label,
-                        _weights=current_weights):
+                        _weights=current_weights, _computed_at=computed_at_label):
         _loading.style("display: none;")
+        # Payload served by the background precompute worker: show when it was computed
+        computed_at = page_data.get('_computed_at')
+        if computed_at is not None:
+            _computed_at.text = f"Computed at {computed_at.strftime('%H:%M:%S')}"
+            _computed_at.style("display: block;")
+        else:
+            _computed_at.style("display: none;")
         # Composite score from same batch (consistent with rest of analytics)
         comp_components = page_data.get('composite_components')
         if comp_components is not None:
@@ -1604,12 +1618,19 @@ def build_analytics_page():
         _loading.classes("text-sm text-gray-500 mb-4")
         page_data_result.clear()
 
+        precomputed = get_precomputed(_uid, 'analytics_page_data')
+        if precomputed:
+            data, computed_at = precomputed
+            apply_page_data({**data, '_computed_at': computed_at})
+            return
+
         def fetch():
             # Run in thread so the request handler returns immediately (avoids timeout);
             # on single-CPU VPS this does not add a core, but still prevents blocking the connection.
             try:
                 page_data_start = time.perf_counter()
-                data = analytics_service.get_analytics_page_data(days=7, user_id=_uid)
+                # CPU work runs in the analytics process pool; this thread only waits
+                data = run_analytics_sync('get_analytics_page_data', days=7, user_id=_uid)
                 try:
                     from backend.instrumentation import log_analytics_event
                     log_analytics_event('get_analytics_page_data', duration_ms=(time.perf_counter() - page_data_start) * 1000)
@@ -1668,7 +1689,7 @@ def build_analytics_page():
             pass
 
 
-def build_emotional_flow_page():
+async def build_emotional_flow_page():
     """Emotional Flow Analytics - tracks emotion changes and patterns."""
     ui.add_head_html("<style>.analytics-grid { gap: 1rem; }</style>")
     
@@ -1685,8 +1706,8 @@ def build_emotional_flow_page():
         "text-gray-500 mb-4"
     )
     
-    # Get emotional flow data
-    flow_data = analytics_service.get_emotional_flow_data(user_id=current_user_id)
+    # Get emotional flow data (analytics process pool; the event loop stays free meanwhile)
+    flow_data = await run_analytics('get_emotional_flow_data', user_id=current_user_id)
     
     # Summary metrics
     with ui.row().classes("gap-3 flex-wrap mb-4"):
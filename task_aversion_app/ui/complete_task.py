@@ -50,7 +50,7 @@ def complete_task_page(task_manager, emotion_manager):
 
         # Invalidate instance caches so list_active_instances and instance data are fresh.
         # Avoids stale cache after DB/connection issues (e.g. "complete only works after pause").
-        im._invalidate_instance_caches()
+        im._clear_instance_lists(current_user_id)
         
         if instance_id:
             instance = im.get_instance(instance_id, user_id=current_user_id)
@@ -1,5 +1,6 @@
 # ui/dashboard.py
 from nicegui import ui, app
+import asyncio
 import json
 import html
 import os
@@ -12,9 +13,11 @@ from backend.task_manager import TaskManager
 from backend.instance_manager import InstanceManager
 from backend.emotion_manager import EmotionManager
 from backend.analytics import Analytics
+from backend.precompute_worker import get_precomputed
 from backend.user_state import UserStateManager
 from backend.performance_logger import get_perf_logger as get_init_perf_logger
 from backend.recommendation_logger import recommendation_logger
+from backend.running_sessions import running_sessions
 from backend.security_utils import escape_for_display
 from backend.app_time import format_for_display
 from backend.feedback_logger import log_feedback_submitted, log_feedback_error
@@ -283,7 +286,7 @@ def open_postpone_dialog(instance_id: str, task_name: str = ""):
     dialog.open()
 
 
-def open_pause_dialog(instance_id):
+async def open_pause_dialog(instance_id):
     """Show dialog to add optional notes and completion %; task is paused when user clicks Pause and save.
 
     The task keeps running until the user clicks "Pause and save". That single action records
@@ -298,7 +301,7 @@ def open_pause_dialog(instance_id):
     # Pre-fill completion % if instance is already paused (e.g. editing notes)
     default_completion = 0
     try:
-        instance = im.get_instance(instance_id, user_id=current_user_id)
+        instance = await im.get_instance_async(instance_id, user_id=current_user_id)
         if instance:
             actual_raw = instance.get("actual") or "{}"
             actual_data = json.loads(actual_raw) if isinstance(actual_raw, str) else (actual_raw if isinstance(actual_raw, dict) else {})
@@ -370,265 +373,103 @@ def format_elapsed_time(minutes):
         return f"{hours}:{mins:02d}"
 
 
-# Batched timer refresh: one get_instances_bulk per tick instead of N get_instance (N+1 fix)
-_timer_registry = {}  # client_key -> list of (instance_id, timer_element, user_id)
-_batch_timer_handle = {}  # client_key -> timer handle (so we don't create duplicate timers)
+# Live "Ongoing for X" labels: one shared 1s ticker for all clients, reading elapsed
+# times from the in-memory running-session registry (no database read per tick).
+_timer_subscribers = {}  # id(element) -> (instance_id, timer_element, user_id)
+_live_timer_task = None
 
 
-def _get_client_key():
-    """Key for the current request's client (for per-client timer registry)."""
+def _timer_element_gone(timer_element):
+    """True when the label was deleted or its client disconnected (NiceGUI issue #3028)."""
     try:
-        client = getattr(ui.context, 'client', None)
-        if client is not None:
-            return str(getattr(client, 'id', id(client)))
-    except (AttributeError, RuntimeError):
-        pass
-    return None
+        if getattr(timer_element, 'is_deleted', False):
+            return True
+        client = getattr(timer_element, 'client', None)
+        if client is None:
+            return True
+        from nicegui import Client
+        return client.id not in Client.instances
+    except (AttributeError, RuntimeError, KeyError):
+        return True
 
 
-def _batch_timer_tick(client_key):
-    """Run one batched refresh: get_instances_bulk for all registered instance_ids, update elements."""
-    global _timer_registry, _batch_timer_handle, current_user_id
-    reg = _timer_registry.get(client_key, [])
-    if not reg:
-        _batch_timer_handle.pop(client_key, None)
-        return
-    # Group by user_id (one bulk call per user)
-    by_user = {}
-    for instance_id, timer_element, uid in reg:
-        by_user.setdefault(uid, []).append((instance_id, timer_element))
-    still_active = []
-    for uid, items in by_user.items():
-        instance_ids = list({iid for iid, _ in items})
-        try:
-            bulk = im.get_instances_bulk(instance_ids, user_id=uid) if instance_ids else {}
-        except Exception:
-            bulk = {}
-        for instance_id, timer_element in items:
-            instance = bulk.get(instance_id) if isinstance(instance_id, str) else bulk.get(str(instance_id))
-            if not instance or not instance.get('started_at'):
-                try:
-                    timer_element.text = ""
-                except (AttributeError, RuntimeError, Exception):
-                    pass
-                continue
-            try:
-                import pandas as pd
-                now = datetime.now()
-                actual_str = instance.get('actual', '{}')
-                actual_data = {}
-                if actual_str:
-                    try:
-                        actual_data = json.loads(actual_str) if isinstance(actual_str, str) else (actual_str if isinstance(actual_str, dict) else {})
-                    except (json.JSONDecodeError, ValueError, TypeError):
-                        pass
-                # Session start = time since last start/resume (excludes paused time)
-                session_start = None
-                if actual_data.get('resume_started_at'):
-                    try:
-                        session_start = pd.to_datetime(actual_data['resume_started_at'])
-                    except (ValueError, TypeError):
-                        pass
-                if session_start is None:
-                    session_start = pd.to_datetime(instance['started_at'])
-                current_elapsed = (now - session_start).total_seconds() / 60.0
-                time_before = float(actual_data.get('time_spent_before_pause', 0.0) or 0.0)
-                total_min = current_elapsed + time_before
-                timer_element.text = f"Ongoing for {format_elapsed_time(total_min)}"
-                still_active.append((instance_id, timer_element, uid))
-            except (AttributeError, RuntimeError, KeyError, Exception):
-                pass
-    _timer_registry[client_key] = still_active
-    if still_active:
+def _live_timer_text(session, now=None):
+    return f"Ongoing for {format_elapsed_time(session.elapsed_minutes(now))}"
+
+
+def _live_timer_tick():
+    """Push elapsed times to every subscribed label; drop stale or stopped subscriptions."""
+    now = datetime.now()
+    for key, (instance_id, timer_element, user_id) in list(_timer_subscribers.items()):
+        if _timer_element_gone(timer_element):
+            _timer_subscribers.pop(key, None)
+            continue
+        session = running_sessions.get(instance_id, user_id=user_id)
+        text = _live_timer_text(session, now) if session is not None else ""
         try:
-            _batch_timer_handle[client_key] = ui.timer(
-                1.0, (lambda ck: lambda: _batch_timer_tick(ck))(client_key), once=True
-            )
-        except Exception:
-            pass
-    else:
-        _batch_timer_handle.pop(client_key, None)
+            if timer_element.text != text:
+                timer_element.text = text
+        except (AttributeError, RuntimeError, KeyError, Exception):
+            _timer_subscribers.pop(key, None)
+            continue
+        if session is None:
+            _timer_subscribers.pop(key, None)
 
 
-def _register_timer_for_batch(instance_id, timer_element, user_id):
-    """Register (instance_id, timer_element, user_id) for the next batched tick; start batch timer if needed."""
-    global _timer_registry, _batch_timer_handle
-    client_key = _get_client_key()
-    if client_key is None:
-        return False
-    _timer_registry.setdefault(client_key, []).append((instance_id, timer_element, user_id))
-    if client_key not in _batch_timer_handle:
+async def _live_timer_loop():
+    global _live_timer_task
+    import asyncio
+    while _timer_subscribers:
+        await asyncio.sleep(1.0)
         try:
-            _batch_timer_handle[client_key] = ui.timer(
-                1.0, (lambda ck: lambda: _batch_timer_tick(ck))(client_key), once=True
-            )
+            _live_timer_tick()
         except Exception:
             pass
-    return True
+    _live_timer_task = None
+
+
+def _subscribe_live_timer(instance_id, timer_element, user_id):
+    """Add a label to the shared ticker, starting the ticker if it is not running."""
+    global _live_timer_task
+    _timer_subscribers[id(timer_element)] = (instance_id, timer_element, user_id)
+    if _live_timer_task is None:
+        from nicegui import background_tasks
+        _live_timer_task = background_tasks.create(_live_timer_loop(), name='dashboard_live_timer')
 
 
 def update_ongoing_timer(instance_id, timer_element, instance=None):
-    """Update the ongoing timer display for a started instance.
-    
-    This function updates the timer display and schedules the next update.
-    It includes error handling to prevent timer leaks when clients disconnect.
-    When instance is provided (e.g. current_task), avoids N+1 get_instance call.
+    """Show the ongoing timer for a started instance and subscribe it to the shared ticker.
+
+    Elapsed time comes from the running-session registry. The instance row is only
+    read (and parsed once, into the registry) when the registry has no entry, e.g.
+    after a server restart. When instance is provided (e.g. current_task), no read
+    happens at all.
     """
-    # Early return if element is not provided
     if not timer_element:
         return
-    
+
     global current_user_id
-    if instance is None:
-        instance = im.get_instance(instance_id, user_id=current_user_id)
-    if not instance or not instance.get('started_at'):
-        # Instance no longer active or not started, stop timer
-        try:
-            timer_element.text = ""
-        except (AttributeError, RuntimeError, Exception):
-            # Element is invalid, silently stop
-            pass
-        return
-    
     try:
-        from datetime import datetime
-        import pandas as pd
-        import json
-
-        now = datetime.now()
-        actual_str = instance.get('actual', '{}')
-        actual_data = {}
-        if actual_str:
-            try:
-                actual_data = json.loads(actual_str) if isinstance(actual_str, str) and actual_str else (actual_str if isinstance(actual_str, dict) else {})
-            except (json.JSONDecodeError, ValueError, TypeError):
-                pass
-
-        # Session start = time since last start/resume (excludes paused time)
-        session_start = None
-        if actual_data.get('resume_started_at'):
-            try:
-                session_start = pd.to_datetime(actual_data['resume_started_at'])
-            except (ValueError, TypeError):
-                pass
-        if session_start is None:
-            session_start = pd.to_datetime(instance['started_at'])
-        current_elapsed_minutes = (now - session_start).total_seconds() / 60.0
-
-        time_spent_before_pause = 0.0
-        time_before = actual_data.get('time_spent_before_pause', 0.0)
-        if isinstance(time_before, (int, float)):
-            time_spent_before_pause = float(time_before)
-
-        # Total elapsed = current session (no paused time) + previous sessions
-        total_elapsed_minutes = current_elapsed_minutes + time_spent_before_pause
-        elapsed_str = format_elapsed_time(total_elapsed_minutes)
-
-        # Update the element text (with comprehensive error handling)
-        try:
-            timer_element.text = f"Ongoing for {elapsed_str}"
-        except (AttributeError, RuntimeError, Exception):
-            # Element is no longer valid (client disconnected), stop timer
+        if instance is not None and not instance.get('started_at'):
+            session = None
+        else:
+            session = running_sessions.get(instance_id, user_id=current_user_id)
+            if session is None:
+                if instance is None:
+                    instance = im.get_instance(instance_id, user_id=current_user_id)
+                if instance and instance.get('started_at'):
+                    session = running_sessions.seed_from_instance(instance, user_id=current_user_id)
+        if session is None:
+            timer_element.text = ""
             return
-        
-        # Schedule next update in 1 second (only if instance is still active and element/client are valid)
-        # Use try/except to catch any errors during timer creation
-        try:
-            # Verify element is still valid before creating new timer
-            try:
-                # Try to access element properties to verify it's still valid
-                _ = timer_element.text
-            except (AttributeError, RuntimeError, Exception):
-                # Element is no longer valid, stop timer
-                return
-            
-            # Check if element's client is still valid before creating timer
-            # Based on NiceGUI issue #3028: elements can be used after client disconnects
-            # We need to verify the element is still in the client's elements dictionary
-            try:
-                # Check element's client property (more reliable than ui.context.client)
-                element_client = getattr(timer_element, 'client', None)
-                context_client = None
-                try:
-                    context_client = ui.context.client
-                except (AttributeError, RuntimeError):
-                    pass
-                
-                # If element has a client, check if it's still valid
-                # Per NiceGUI issue #3028 (https://github.com/zauberzeug/nicegui/issues/3028),
-                # elements can be used after clients disconnect, causing KeyErrors when NiceGUI
-                # tries to clean them up. We verify the element is still functional before using it.
-                if element_client:
-                    try:
-                        # Try to access client properties to verify it's still valid
-                        _ = element_client.id
-                        _ = element_client.outbox
-                        
-                        # Additional check: try to access element's internal state
-                        # If element was removed from client, accessing its id might fail
-                        element_id = getattr(timer_element, 'id', None)
-                        if element_id is None:
-                            return
-                        
-                        # Try a "dry run" operation on the element to verify it's still functional
-                        # We already updated the text above, so if that succeeded, element should be valid
-                        # But we do one more check by trying to read a property
-                        try:
-                            _ = timer_element.text
-                        except (AttributeError, RuntimeError, KeyError, Exception):
-                            return
-                    except (AttributeError, RuntimeError, KeyError, Exception):
-                        return
-                elif context_client:
-                    # Fallback to context client if element doesn't have one
-                    try:
-                        _ = context_client.id
-                        _ = context_client.outbox
-                    except (AttributeError, RuntimeError, Exception):
-                        return
-                else:
-                    # No client available at all
-                    return
-            except (AttributeError, RuntimeError, KeyError, Exception):
-                # Error checking client, stop timer to be safe
-                return
-            
-            # N+1 fix: use batched timer (one get_instances_bulk per tick) instead of N get_instance
-            if _register_timer_for_batch(instance_id, timer_element, current_user_id):
-                return
-            # Fallback if no client key: per-instance timer
-            active_instances = im.list_active_instances(user_id=current_user_id)
-            is_still_active = any(inst.get('instance_id') == instance_id for inst in active_instances)
-            if is_still_active:
-                def safe_update():
-                    try:
-                        update_ongoing_timer(instance_id, timer_element)
-                    except Exception:
-                        pass
-                try:
-                    final_client = getattr(timer_element, 'client', None)
-                    if final_client:
-                        try:
-                            _ = final_client.id
-                            _ = final_client.outbox
-                        except (AttributeError, RuntimeError, Exception):
-                            return
-                except Exception:
-                    return
-                try:
-                    ui.timer(1.0, safe_update, once=True)
-                except (AttributeError, RuntimeError, Exception, BaseException):
-                    pass
-        except Exception:
-            # Stop timer if any error occurs during scheduling
-            pass
-    except Exception:
-        # Log unexpected errors but don't create new timer
-        # Silently fail to avoid console spam
+        timer_element.text = _live_timer_text(session)
+        _subscribe_live_timer(instance_id, timer_element, current_user_id)
+    except (AttributeError, RuntimeError, KeyError, Exception):
+        # Element is no longer valid (client disconnected); don't subscribe
         pass
 
 
-def show_details(instance_id):
+async def show_details(instance_id):
     # Get current user for data isolation
     from backend.auth import get_current_user
     user_id = get_current_user()
@@ -637,7 +478,7 @@ def show_details(instance_id):
         return
     
     # Use instance manager instance (not class method)
-    inst = im.get_instance(instance_id, user_id=user_id)
+    inst = await im.get_instance_async(instance_id, user_id=user_id)
     if not inst:
         ui.notify("Instance not found", color='negative')
         return
@@ -1235,7 +1076,7 @@ def delete_instance(instance_id):
         ui.notify("Not authenticated", color='negative')
         return
     im.delete_instance(instance_id, user_id=current_user_id)
-    im._invalidate_instance_caches()
+    im._invalidate_instance_caches(current_user_id)
     ui.notify("Deleted", color='negative')
     ui.navigate.reload()
 
@@ -1633,10 +1474,10 @@ def submit_feedback():
     dialog.open()
 
 
-def view_instance_notes(instance_id):
+async def view_instance_notes(instance_id):
     """View all notes for an instance (task-level notes + pause notes if any)."""
     global current_user_id
-    instance = im.get_instance(instance_id, user_id=current_user_id)
+    instance = await im.get_instance_async(instance_id, user_id=current_user_id)
     if not instance:
         ui.notify("Instance not found", color='negative')
         return
@@ -1726,10 +1567,10 @@ def copy_instance(instance_id):
         ui.notify("Failed to copy instance", color='negative')
 
 
-def view_initialized_instance(instance_id):
+async def view_initialized_instance(instance_id):
     """View an initialized instance's expected values, time, and notes in a friendly UI."""
     global current_user_id
-    instance = im.get_instance(instance_id, user_id=current_user_id)
+    instance = await im.get_instance_async(instance_id, user_id=current_user_id)
     if not instance:
         ui.notify("Instance not found", color='negative')
         return
@@ -1881,10 +1722,10 @@ def view_initialized_instance(instance_id):
     dialog.open()
 
 
-def edit_instance(instance_id):
+async def edit_instance(instance_id):
     """Edit a completed instance - navigate to completion page in edit mode."""
     global current_user_id
-    instance = im.get_instance(instance_id, user_id=current_user_id)
+    instance = await im.get_instance_async(instance_id, user_id=current_user_id)
     if not instance:
         ui.notify("Instance not found", color='negative')
         return
@@ -1900,10 +1741,10 @@ def edit_instance(instance_id):
     ui.notify("Instance not completed", color='warning')
 
 
-def edit_completed_instance(instance_id):
+async def edit_completed_instance(instance_id):
     """Edit a completed instance - navigate to completion page with edit mode."""
     global current_user_id
-    instance = im.get_instance(instance_id, user_id=current_user_id)
+    instance = await im.get_instance_async(instance_id, user_id=current_user_id)
     if not instance:
         ui.notify("Instance not found", color='negative')
         return
@@ -2806,8 +2647,7 @@ def render_monitored_metrics_section(container):
             'composite_scores': {},
             'weekly_completion_efficiency_history': None,
             'weekly_hours_history': None,
-            'stress_level_history': None,
-            'net_relief_history': None,
+            'metric_histories': {},
         }
         
         relief_metrics = {'productivity_time', 'completion_efficiency_score', 'robust_productivity_score'}
@@ -2833,6 +2673,10 @@ def render_monitored_metrics_section(container):
         except Exception:
             pass
         # #endregion
+        # Relief summary / dashboard metrics / composite scores precomputed in the background
+        # (backend/precompute_worker.py); None when missing or outdated by a write
+        precomputed = get_precomputed(uid, 'analytics_page_data')
+        precomputed_page = precomputed[0] if precomputed else None
         if needs_relief_or_quality and has_load_once:
             _t_gtv = time.perf_counter()
             df_all, df_completed = an.load_instances_once(user_id=uid)
@@ -2844,7 +2688,10 @@ def render_monitored_metrics_section(container):
                 pass
             if needs_productivity_time or needs_productivity_score or needs_robust_productivity:
                 _t_relief = time.perf_counter()
-                relief = an.get_relief_summary(user_id=uid, instances_completed_df=df_completed)
+                if precomputed_page is not None:
+                    relief = precomputed_page['relief_summary']
+                else:
+                    relief = an.get_relief_summary(user_id=uid, instances_completed_df=df_completed)
                 result['relief_summary']['weekly_completion_efficiency_score'] = relief.get('weekly_completion_efficiency_score', 0.0)
                 result['relief_summary']['weekly_robust_productivity_score'] = relief.get('weekly_robust_productivity_score', 0.0)
                 result['relief_summary']['productivity_time_minutes'] = relief.get('productivity_time_minutes', 0)
@@ -2882,7 +2729,10 @@ def render_monitored_metrics_section(container):
                     elif key in ['stress_level', 'net_wellbeing', 'net_wellbeing_normalized', 'cognitive_load', 'emotional_load', 'physical_load']:
                         dashboard_metric_keys.append(f'quality.avg_{key}')
                 _t_dm = time.perf_counter()
-                metrics_data = an.get_dashboard_metrics(metrics=dashboard_metric_keys, user_id=uid, instances_df=df_all) if hasattr(an, 'get_dashboard_metrics') else {}
+                if precomputed_page is not None:
+                    metrics_data = precomputed_page['dashboard_metrics']
+                else:
+                    metrics_data = an.get_dashboard_metrics(metrics=dashboard_metric_keys, user_id=uid, instances_df=df_all) if hasattr(an, 'get_dashboard_metrics') else {}
                 quality = metrics_data.get('quality', {})
                 aversion = metrics_data.get('aversion', {})
                 try:
@@ -2905,20 +2755,27 @@ def render_monitored_metrics_section(container):
                                        'work_volume_score', 'work_consistency_score', 'life_balance_score',
                                        'sleep_score', 'completion_rate', 'self_care_frequency', 'weekly_relief_score'}
             composite_metric_keys = [m for m in metrics_list if m in known_composite_metrics and m != 'execution_score']
-            if composite_metric_keys and hasattr(an, 'get_all_scores_for_composite'):
+            all_composite = {}
+            if composite_metric_keys and precomputed_page is not None:
+                all_composite = precomputed_page['composite_components'] or {}
+            elif composite_metric_keys and hasattr(an, 'get_all_scores_for_composite'):
                 all_composite = an.get_all_scores_for_composite(days=7, metrics=list(composite_metric_keys), user_id=uid)
+            if composite_metric_keys:
                 for key in composite_metric_keys:
                     if key in all_composite:
                         result['composite_scores'][key] = all_composite[key]
             # Pre-fetch chart histories from same df so _update_metric_cards_incremental does not trigger more loads
             if needs_productivity_time and hasattr(an, 'get_weekly_hours_history'):
                 result['weekly_hours_history'] = an.get_weekly_hours_history(user_id=uid, instances_df=df_all)
-            if 'stress_level' in metrics_list and hasattr(an, 'get_generic_metric_history'):
-                result['stress_level_history'] = an.get_generic_metric_history('stress_level', days=90, user_id=uid, instances_completed_df=df_completed)
-            if 'net_relief' in metrics_list and hasattr(an, 'get_generic_metric_history'):
-                result['net_relief_history'] = an.get_generic_metric_history('net_relief', days=90, user_id=uid, instances_completed_df=df_completed)
-            if 'sleep_score' in metrics_list and hasattr(an, 'get_generic_metric_history'):
-                result['sleep_score_history'] = an.get_generic_metric_history('sleep_score', days=90, user_id=uid, instances_completed_df=df_completed)
+            # Daily series for all selected history metrics in one pass (shared date parsing / groupby)
+            history_keys = [
+                m for m in metrics_list
+                if m in getattr(an, 'SERIES_HISTORY_METRICS', {}) or m == 'sleep_score'
+            ]
+            if history_keys and hasattr(an, 'get_metric_histories'):
+                result['metric_histories'] = an.get_metric_histories(
+                    history_keys, days=90, user_id=uid, instances_completed_df=df_completed
+                )
             try:
                 with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as _f:
                     _f.write(json.dumps({'id': 'targeted_total', 'location': 'dashboard.get_targeted_metric_values', 'message': 'get_targeted_metric_values done', 'data': {'total_ms': round((time.perf_counter() - _t_gtv) * 1000, 1)}, 'hypothesisId': 'WARM', 'timestamp': int(time.time() * 1000)}) + '\n')
@@ -2987,7 +2844,7 @@ def render_monitored_metrics_section(container):
         
         if composite_metric_keys:
             # Call get_all_scores_for_composite() with selective calculation
-            # (execution_score is handled separately in chunks)
+            # (execution_score is loaded in its own step)
             all_composite = an.get_all_scores_for_composite(days=7, metrics=list(composite_metric_keys), user_id=uid) if hasattr(an, 'get_all_scores_for_composite') else {}
             
             # Extract only the metrics we need
@@ -3038,6 +2895,13 @@ def render_monitored_metrics_section(container):
             'needs_execution_score': needs_execution_score
         }
     
+    def _pre_fetched_histories(load_state):
+        """Chart histories already loaded by get_targeted_metric_values, keyed by metric."""
+        pre_fetched = dict(load_state.get('metric_histories') or {})
+        if load_state.get('weekly_hours_history'):
+            pre_fetched['productivity_time'] = load_state['weekly_hours_history']
+        return pre_fetched
+    
     def load_and_render():
         """Load metrics data incrementally using ui.timer to keep UI responsive (single-threaded).
         
@@ -3057,9 +2921,7 @@ def render_monitored_metrics_section(container):
             'composite_scores': None,
             'weekly_completion_efficiency_history': None,
             'weekly_hours_history': None,
-            'stress_level_history': None,
-            'net_relief_history': None,
-            'sleep_score_history': None,
+            'metric_histories': {},  # metric_key -> daily history from get_metric_histories()
             'timer': None,
             'current_user_id': current_user_id,
             'user_id_str': user_id_str,
@@ -3090,9 +2952,7 @@ def render_monitored_metrics_section(container):
                             load_state['composite_scores'] = targeted_data.get('composite_scores', {})
                             load_state['weekly_completion_efficiency_history'] = targeted_data.get('weekly_completion_efficiency_history')
                             load_state['weekly_hours_history'] = targeted_data.get('weekly_hours_history')
-                            load_state['stress_level_history'] = targeted_data.get('stress_level_history')
-                            load_state['net_relief_history'] = targeted_data.get('net_relief_history')
-                            load_state['sleep_score_history'] = targeted_data.get('sleep_score_history')
+                            load_state['metric_histories'] = targeted_data.get('metric_histories') or {}
                     except Exception as e:
                         print(f"[Dashboard] Error getting targeted metric values: {e}")
                         import traceback
@@ -3105,23 +2965,13 @@ def render_monitored_metrics_section(container):
                     needs_execution_score = 'execution_score' in selected_metrics
                     
                     if needs_execution_score:
-                        # Initialize execution score chunked calculation state
-                        load_state['execution_score_state'] = {}
                         load_state['step'] = 1
                     else:
                         # Skip execution score - not needed, go straight to render
                         load_state['step'] = 2
                     
                     # Update metrics with loaded data (before execution_score if needed)
-                    _pre_fetched = {}
-                    if load_state.get('weekly_hours_history'):
-                        _pre_fetched['productivity_time'] = load_state['weekly_hours_history']
-                    if load_state.get('stress_level_history'):
-                        _pre_fetched['stress_level'] = load_state['stress_level_history']
-                    if load_state.get('net_relief_history'):
-                        _pre_fetched['net_relief'] = load_state['net_relief_history']
-                    if load_state.get('sleep_score_history'):
-                        _pre_fetched['sleep_score'] = load_state['sleep_score_history']
+                    _pre_fetched = _pre_fetched_histories(load_state)
                     _update_metric_cards_incremental(
                         metric_cards,
                         selected_metrics,
@@ -3140,67 +2990,30 @@ def render_monitored_metrics_section(container):
                     load_state['timer'] = ui.timer(0.1, process_next_step, once=True)
                     
                 elif load_state['step'] == 1:
-                    # Step 2: Calculate execution score in chunks (only if needed)
+                    # Step 2: Execution score (only if needed) - average of the scores stored at completion
                     # Use user_id from load_state (captured in request context), not get_current_user() in timer.
                     step_user_id = load_state.get('current_user_id')
-                    step_user_id_str = load_state.get('user_id_str') or (str(step_user_id) if step_user_id is not None else DEFAULT_USER_ID)
-                    # #region agent log
                     try:
-                        with open(r'c:\Users\rudol\OneDrive\Documents\PIF\Task_aversion_system\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                            f.write(json.dumps({'sessionId': 'debug-session', 'runId': 'run1', 'hypothesisId': 'CHUNK', 'location': 'dashboard.py:process_next_step', 'message': 'step 1: processing execution score chunk', 'data': {'timestamp': time.time()}, 'timestamp': int(time.time() * 1000)}) + '\n')
-                    except: pass
-                    # #endregion
-                    
-                    try:
-                        if hasattr(an, 'get_execution_score_chunked'):
-                            # Process a batch of instances (5 at a time) with persistence
-                            load_state['execution_score_state'] = an.get_execution_score_chunked(
-                                load_state['execution_score_state'],
-                                batch_size=5,
-                                user_id=step_user_id_str,
-                                persist=True
-                            )
-                            
-                            if load_state['execution_score_state'].get('completed', False):
-                                # All instances processed - update composite scores and move to render
-                                avg_score = load_state['execution_score_state'].get('avg_execution_score', 50.0)
-                                load_state['composite_scores']['execution_score'] = avg_score
-                                # Update metrics that depend on execution_score
-                                _pre_fetched = {}
-                                if load_state.get('weekly_hours_history'):
-                                    _pre_fetched['productivity_time'] = load_state['weekly_hours_history']
-                                if load_state.get('stress_level_history'):
-                                    _pre_fetched['stress_level'] = load_state['stress_level_history']
-                                if load_state.get('net_relief_history'):
-                                    _pre_fetched['net_relief'] = load_state['net_relief_history']
-                                if load_state.get('sleep_score_history'):
-                                    _pre_fetched['sleep_score'] = load_state['sleep_score_history']
-                                _update_metric_cards_incremental(
-                                    metric_cards,
-                                    selected_metrics,
-                                    load_state['relief_summary'],
-                                    load_state['quality_metrics'],
-                                    load_state['composite_scores'],
-                                    coloration_baseline,
-                                    an,
-                                    init_perf_logger,
-                                    step_user_id,
-                                    weekly_completion_efficiency_history=load_state.get('weekly_completion_efficiency_history'),
-                                    pre_fetched_histories=_pre_fetched,
-                                )
-                                load_state['step'] = 2
-                            else:
-                                # More chunks to process - schedule next chunk
-                                load_state['timer'] = ui.timer(0.1, process_next_step, once=True)
-                                return  # Yield back to event loop
-                        else:
-                            # Fallback if chunked method doesn't exist
-                            load_state['composite_scores']['execution_score'] = 50.0
-                            load_state['step'] = 2
+                        load_state['composite_scores']['execution_score'] = an.get_recent_execution_score(user_id=step_user_id)
+                        # Update metrics that depend on execution_score
+                        _pre_fetched = _pre_fetched_histories(load_state)
+                        _update_metric_cards_incremental(
+                            metric_cards,
+                            selected_metrics,
+                            load_state['relief_summary'],
+                            load_state['quality_metrics'],
+                            load_state['composite_scores'],
+                            coloration_baseline,
+                            an,
+                            init_perf_logger,
+                            step_user_id,
+                            weekly_completion_efficiency_history=load_state.get('weekly_completion_efficiency_history'),
+                            pre_fetched_histories=_pre_fetched,
+                        )
                     except Exception as e:
-                        print(f"[Dashboard] Error calculating execution score in chunks: {e}")
+                        print(f"[Dashboard] Error loading execution score: {e}")
                         load_state['composite_scores']['execution_score'] = 50.0
-                        load_state['step'] = 2
+                    load_state['step'] = 2
                     
                     # Schedule render step
                     if load_state['step'] == 2:
@@ -3223,15 +3036,7 @@ def render_monitored_metrics_section(container):
                     # Final update of all metric cards (relief_summary already from step 0)
                     final_user_id = load_state.get('current_user_id')
                     try:
-                        _pre_fetched = {}
-                        if load_state.get('weekly_hours_history'):
-                            _pre_fetched['productivity_time'] = load_state['weekly_hours_history']
-                        if load_state.get('stress_level_history'):
-                            _pre_fetched['stress_level'] = load_state['stress_level_history']
-                        if load_state.get('net_relief_history'):
-                            _pre_fetched['net_relief'] = load_state['net_relief_history']
-                        if load_state.get('sleep_score_history'):
-                            _pre_fetched['sleep_score'] = load_state['sleep_score_history']
+                        _pre_fetched = _pre_fetched_histories(load_state)
                         _update_metric_cards_incremental(
                             metric_cards,
                             selected_metrics,
@@ -5034,10 +4839,11 @@ def build_dashboard(task_manager, user_id: Optional[int] = None):
             print(f"[Dashboard] Warning: Could not warm instances cache: {e}")
     ui.timer(0.1, _warm_instances_cache, once=True)
 
-    def _deferred_user_data_check():
+    async def _deferred_user_data_check():
         try:
-            task_count = len(tm.get_all(user_id=current_user_id)) if hasattr(tm, 'get_all') else 0
-            instance_count = len(im.list_active_instances(user_id=current_user_id)) if hasattr(im, 'list_active_instances') else 0
+            tasks = await tm.get_all_async(user_id=current_user_id)
+            task_count = len(tasks) if tasks is not None else 0
+            instance_count = len(await asyncio.to_thread(im.list_active_instances, user_id=current_user_id))
             print(f"[Dashboard] User {current_user_id} data check: {task_count} tasks, {instance_count} active instances")
             if task_count == 0 and instance_count == 0:
                 print(f"[Dashboard] WARNING: User {current_user_id} appears to have no data. This may be a new user or data migration issue.")
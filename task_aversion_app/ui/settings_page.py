@@ -408,7 +408,7 @@ def _build_settings_content(user_id):
                     
                     # Invalidate caches so dashboard/analytics show newly imported data (including initialized/active instances)
                     try:
-                        im._invalidate_instance_caches()
+                        im._invalidate_instance_caches(current_user_id)
                         from backend.analytics import Analytics
                         Analytics()._invalidate_instances_cache(user_id=current_user_id)
                     except Exception: